@@ -4,6 +4,7 @@ ALM Agent - ReAct 패턴 구현
 from typing import List, Dict, Any, Optional
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 from prompts import SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
+from tool_execution import aexecute_tool_calls, execute_tool_calls, normalize_tool_calls, to_tool_messages
 
 # 설정
 MAX_ITERATIONS = 10
@@ -47,24 +48,7 @@ class ALMAgent:
         Returns:
             최종 응답
         """
-        if chat_history is None:
-            chat_history = []
-        
-        # 메시지 구성 (TODO 2: 분리된 프롬프트 사용)
-        system_message = SystemMessage(content=SYSTEM_PROMPT)
-        
-        # 단계별 추론을 유도하는 프롬프트
-        enhanced_prompt = f"""{user_input}
-
-분석 과정을 단계별로 진행하세요:
-1. 필요한 정보 파악
-2. 적절한 도구로 데이터 조회
-3. 추가 정보 필요시 다른 도구 사용
-4. 모든 정보를 종합하여 최종 답변"""
-        
-        messages = [system_message]
-        messages.extend(chat_history)
-        messages.append(HumanMessage(content=enhanced_prompt))
+        messages = self._build_messages(user_input, chat_history)
         
         # ReAct 반복 루프 (TODO 1)
         iteration = 0
@@ -72,47 +56,114 @@ class ALMAgent:
         
         while iteration < self.max_iterations:
             iteration += 1
-            self._log(f"\n{'='*60}")
-            self._log(f"🔄 Iteration {iteration}")
-            self._log(f"{'='*60}")
+            self._log_iteration(iteration)
             
             # LLM 추론
             response = self.llm_with_tools.invoke(messages)
             
             # 종료 조건 확인
-            if not hasattr(response, 'tool_calls') or not response.tool_calls:
+            tool_calls = self._prepare_tool_calls(response, iteration)
+            if not tool_calls:
                 self._log("✓ 분석 완료")
                 return self._format_response(response.content, tool_log)
             
-            # 도구 실행 (한 번에 하나씩 - TODO 1의 핵심)
-            tool_call = response.tool_calls[0]
-            tool_name = tool_call['name']
-            tool_args = tool_call['args']
+            # 도구 실행 (한 턴의 모든 tool_calls, 읽기 전용 도구는 동시 실행)
+            results = execute_tool_calls(tool_calls, self._execute_tool, self.tools)
+            self._observe(messages, response, tool_calls, results, iteration, tool_log)
+        
+        return "최대 반복 횟수에 도달했습니다."
+    
+    async def arun(self, user_input: str, chat_history: list = None) -> str:
+        """
+        사용자 질문 처리 (비동기)
+
+        run()과 같은 ReAct 루프를 LLM ainvoke로 수행하고, 도구(DB 조회)는
+        스레드 풀에서 실행하여 한 프로세스에서 여러 세션을 동시에 처리합니다.
+        
+        Args:
+            user_input: 사용자 질문
+            chat_history: 대화 이력
+        
+        Returns:
+            최종 응답
+        """
+        messages = self._build_messages(user_input, chat_history)
+        iteration = 0
+        tool_log = []
+        
+        while iteration < self.max_iterations:
+            iteration += 1
+            self._log_iteration(iteration)
             
-            self._log(f"🔧 도구: {tool_name}")
-            self._log(f"📝 인자: {tool_args}")
+            response = await self.llm_with_tools.ainvoke(messages)
             
-            # 도구 실행
-            observation = self._execute_tool(tool_name, tool_args)
+            tool_calls = self._prepare_tool_calls(response, iteration)
+            if not tool_calls:
+                self._log("✓ 분석 완료")
+                return self._format_response(response.content, tool_log)
             
-            # 로그 기록
+            results = await aexecute_tool_calls(tool_calls, self._execute_tool, self.tools)
+            self._observe(messages, response, tool_calls, results, iteration, tool_log)
+        
+        return "최대 반복 횟수에 도달했습니다."
+    
+    def _log_iteration(self, iteration: int):
+        """반복 시작 구분선 출력"""
+        self._log(f"\n{'='*60}")
+        self._log(f"🔄 Iteration {iteration}")
+        self._log(f"{'='*60}")
+    
+    def _prepare_tool_calls(self, response, iteration: int) -> list:
+        """LLM 응답의 tool_calls에 id를 부여하고 로그 출력 (도구 호출이 없으면 빈 리스트)"""
+        if not getattr(response, 'tool_calls', None):
+            return []
+        
+        tool_calls = normalize_tool_calls(response.tool_calls, prefix=f"call_{iteration}")
+        for tool_call in tool_calls:
+            self._log(f"🔧 도구: {tool_call['name']}")
+            self._log(f"📝 인자: {tool_call['args']}")
+        return tool_calls
+    
+    def _observe(self, messages: list, response, tool_calls: list, results: list, iteration: int, tool_log: list):
+        """도구 실행 결과를 기록하고 대화에 추가"""
+        self._record_results(iteration, results, tool_log)
+        
+        # 관찰 결과를 컨텍스트에 추가 (다음 반복에서 LLM이 이 결과를 보고 다음 행동 결정)
+        messages.append(AIMessage(content=response.content, tool_calls=tool_calls))
+        messages.extend(to_tool_messages(results))
+    
+    def _build_messages(self, user_input: str, chat_history: list = None) -> list:
+        """시스템 프롬프트, 대화 이력, 질문으로 초기 메시지 구성"""
+        if chat_history is None:
+            chat_history = []
+        
+        # 메시지 구성 (TODO 2: 분리된 프롬프트 사용)
+        system_message = SystemMessage(content=SYSTEM_PROMPT)
+        
+        # 단계별 추론을 유도하는 프롬프트
+        enhanced_prompt = f"""{user_input}
+
+분석 과정을 단계별로 진행하세요:
+1. 필요한 정보 파악
+2. 적절한 도구로 데이터 조회
+3. 추가 정보 필요시 다른 도구 사용
+4. 모든 정보를 종합하여 최종 답변"""
+        
+        messages = [system_message]
+        messages.extend(chat_history)
+        messages.append(HumanMessage(content=enhanced_prompt))
+        return messages
+    
+    def _record_results(self, iteration: int, results: list, tool_log: list):
+        """도구 실행 결과를 로그에 기록"""
+        for tool_call, observation in results:
             tool_log.append({
                 'iteration': iteration,
-                'tool': tool_name,
-                'success': not observation.startswith('오류')
+                'tool': tool_call['name'],
+                'success': not str(observation).startswith('오류')
             })
-            
-            self._log(f"📊 결과: {observation[:100]}...")
-            
-            # 관찰 결과를 컨텍스트에 추가 (다음 반복에서 LLM이 이 결과를 보고 다음 행동 결정)
-            messages.append(HumanMessage(
-                content=f"[도구 실행 결과 - Iteration {iteration}]\n"
-                       f"도구: {tool_name}\n"
-                       f"결과:\n{observation}\n\n"
-                       f"위 결과를 바탕으로 다음 단계를 결정하세요."
-            ))
-        
-        return "최대 반복 횟수에 도달했습니다."
+
+            self._log(f"📊 결과 ({tool_call['name']}): {str(observation)[:100]}...")
     
     def _execute_tool(self, tool_name: str, tool_args: dict) -> str:
         """도구 실행"""
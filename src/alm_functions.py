@@ -3,10 +3,26 @@ ALM 챗봇 비즈니스 로직 함수
 """
 import sqlite3
 import pandas as pd
+import atexit
+import copy
+import multiprocessing
 import os
+import queue
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 import json
-from typing import Dict, List, Any, Optional
+import math
+import re
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, wait
+from collections.abc import Mapping
+from multiprocessing import shared_memory
+from types import MappingProxyType
+from typing import Dict, List, Any, Iterator, Optional, Sequence, Tuple, Union
 import numpy as np
 
 # PDF/Excel 내보내기를 위한 라이브러리 (선택적)
@@ -36,81 +52,1670 @@ except ImportError:
 # 데이터베이스 경로
 DB_PATH = 'simple.db'
 
+# 커넥션 풀 설정
+DB_POOL_SIZE = 8                # 최대 동시 커넥션 수
+DB_POOL_TIMEOUT = 30.0          # 커넥션 대기 시간 (초)
+DB_STATEMENT_CACHE_SIZE = 256   # 커넥션별 prepared statement 캐시 크기
+DB_ENABLE_WAL = True            # 풀 생성 시 WAL 저널 모드 전환 시도
+
+# 읽기 전용 커넥션에 적용할 PRAGMA
+DB_PRAGMAS = {
+    'query_only': 1,
+    'mmap_size': 268435456,     # 256MB
+    'cache_size': -65536,       # 64MB (음수는 KiB 단위)
+    'temp_store': 'MEMORY',
+}
+
+
 def get_db_connection():
     """데이터베이스 연결 생성"""
     return sqlite3.connect(DB_PATH)
 
-def get_table_info():
-    """데이터베이스의 모든 테이블 정보 조회"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # 테이블 목록 조회
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-    tables = cursor.fetchall()
-    
-    table_info = {}
-    for table in tables:
-        table_name = table[0]
-        cursor.execute(f"PRAGMA table_info({table_name});")
-        columns = cursor.fetchall()
-        table_info[table_name] = [col[1] for col in columns]  # 컬럼명만 추출
-    
-    conn.close()
+
+class SQLiteConnectionPool:
+    """
+    읽기 전용 SQLite 커넥션 풀
+
+    - 최대 pool_size개의 커넥션을 생성하여 재사용합니다.
+    - 한 스레드가 connection()을 중첩 호출하면 이미 점유한 커넥션을 그대로 사용합니다.
+    - 커넥션은 한 번에 한 스레드만 사용하므로 check_same_thread=False로 생성합니다.
+    - 모든 커넥션은 read-only URI(mode=ro)로 열고 DB_PRAGMAS를 적용합니다.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        pool_size: int = DB_POOL_SIZE,
+        timeout: float = DB_POOL_TIMEOUT,
+        pragmas: Optional[Dict[str, Any]] = None,
+        enable_wal: bool = DB_ENABLE_WAL
+    ):
+        """
+        Args:
+            db_path: SQLite 데이터베이스 파일 경로
+            pool_size: 최대 커넥션 수
+            timeout: 빈 커넥션을 기다리는 최대 시간 (초)
+            pragmas: 커넥션별 PRAGMA (None이면 DB_PRAGMAS)
+            enable_wal: WAL 저널 모드 전환 시도 여부
+        """
+        if pool_size < 1:
+            raise ValueError(f"pool_size는 1 이상이어야 합니다: {pool_size}")
+
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.pragmas = dict(DB_PRAGMAS if pragmas is None else pragmas)
+        self.pid = os.getpid()
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._all: List[sqlite3.Connection] = []
+        self._closed = False
+        self._stats = {'created': 0, 'checkouts': 0, 'waits': 0}
+        self._data_versions: Dict[int, int] = {}
+        self._generation = 0
+
+        if enable_wal:
+            self._enable_wal()
+
+    def _enable_wal(self):
+        """WAL 모드 전환 (파일 헤더에 기록되므로 한 번만 수행, 실패 시 무시)"""
+        if not os.path.exists(self.db_path):
+            return
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL;")
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _connect(self) -> sqlite3.Connection:
+        """PRAGMA가 적용된 새 읽기 전용 커넥션 생성"""
+        uri = f"file:{os.path.abspath(self.db_path)}?mode=ro"
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=DB_STATEMENT_CACHE_SIZE
+        )
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value};")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        """유휴 커넥션을 꺼내거나 새로 생성 (풀이 가득 차면 대기)"""
+        if self._closed:
+            raise RuntimeError("커넥션 풀이 이미 종료되었습니다")
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._all) < self.pool_size:
+                conn = self._connect()
+                self._all.append(conn)
+                self._stats['created'] += 1
+                return conn
+            self._stats['waits'] += 1
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"{self.timeout}초 동안 사용 가능한 DB 커넥션이 없습니다 (pool_size={self.pool_size})"
+            )
+
+    @contextmanager
+    def connection(self):
+        """
+        풀에서 커넥션을 빌려 사용 후 반환하는 컨텍스트 매니저
+
+        Yields:
+            sqlite3.Connection
+        """
+        held = getattr(self._local, 'conn', None)
+        if held is not None:
+            # 같은 스레드의 중첩 호출은 점유 중인 커넥션 재사용
+            self._local.depth += 1
+            try:
+                yield held
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        self._local.depth = 1
+        with self._lock:
+            self._stats['checkouts'] += 1
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    def data_generation(self, conn: sqlite3.Connection) -> int:
+        """
+        다른 커넥션/프로세스의 커밋 감지 (PRAGMA data_version)
+
+        data_version 값은 커넥션마다 독립적이므로 커넥션별 마지막 값을 기억해 두고,
+        어느 커넥션에서든 값이 바뀌면 풀 전체의 세대 번호를 올립니다.
+
+        Args:
+            conn: 이 풀에서 빌린 커넥션
+
+        Returns:
+            데이터 세대 번호
+        """
+        value = conn.execute("PRAGMA data_version;").fetchone()[0]
+        key = id(conn)
+        with self._lock:
+            last = self._data_versions.get(key)
+            if last is not None and last != value:
+                self._generation += 1
+            self._data_versions[key] = value
+            return self._generation
+
+    def stats(self) -> Dict[str, Any]:
+        """풀 사용 통계"""
+        with self._lock:
+            return {
+                'db_path': self.db_path,
+                'pool_size': self.pool_size,
+                'open': len(self._all),
+                'idle': self._idle.qsize(),
+                **self._stats
+            }
+
+    def close(self):
+        """모든 커넥션 종료 (사용 중인 커넥션은 반환 시점에 종료)"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_db_pool: Optional[SQLiteConnectionPool] = None
+_db_pool_lock = threading.Lock()
+
+
+def get_db_pool() -> SQLiteConnectionPool:
+    """
+    공유 커넥션 풀 반환
+
+    DB_PATH가 바뀌었거나 fork된 자식 프로세스에서 호출되면 풀을 새로 만듭니다.
+    """
+    global _db_pool
+
+    pool = _db_pool
+    if pool is not None and pool.db_path == DB_PATH and pool.pid == os.getpid():
+        return pool
+
+    with _db_pool_lock:
+        if _db_pool is not None and _db_pool.db_path == DB_PATH and _db_pool.pid == os.getpid():
+            return _db_pool
+        if _db_pool is not None and _db_pool.pid == os.getpid():
+            _db_pool.close()
+        _db_pool = SQLiteConnectionPool(DB_PATH)
+        return _db_pool
+
+
+def configure_db_pool(
+    db_path: Optional[str] = None,
+    pool_size: int = DB_POOL_SIZE,
+    pragmas: Optional[Dict[str, Any]] = None,
+    enable_wal: bool = DB_ENABLE_WAL
+) -> SQLiteConnectionPool:
+    """
+    공유 커넥션 풀 재설정
+
+    Args:
+        db_path: 데이터베이스 경로 (None이면 현재 DB_PATH 유지)
+        pool_size: 최대 커넥션 수
+        pragmas: 커넥션별 PRAGMA (None이면 DB_PRAGMAS)
+        enable_wal: WAL 저널 모드 전환 시도 여부
+
+    Returns:
+        새로 생성된 커넥션 풀
+    """
+    global DB_PATH, _db_pool
+
+    with _db_pool_lock:
+        if db_path is not None:
+            DB_PATH = db_path
+        if _db_pool is not None and _db_pool.pid == os.getpid():
+            _db_pool.close()
+        _db_pool = SQLiteConnectionPool(DB_PATH, pool_size, pragmas=pragmas, enable_wal=enable_wal)
+        return _db_pool
+
+
+def close_db_pool():
+    """공유 커넥션 풀 종료"""
+    global _db_pool
+
+    with _db_pool_lock:
+        if _db_pool is not None and _db_pool.pid == os.getpid():
+            _db_pool.close()
+        _db_pool = None
+
+# 스키마 캐시 설정
+SCHEMA_CACHE_ENABLED = True          # 스키마 캐시 파일 사용 여부
+SCHEMA_CACHE_PATH: Optional[str] = None  # None이면 '<DB_PATH>.schema.json'
+
+_schema_cache: Optional[Dict[str, Any]] = None
+_schema_cache_lock = threading.Lock()
+# (DB/WAL 파일 서명, 스키마 서명) - 파일이 그대로면 PRAGMA schema_version을 다시 조회하지 않음
+_schema_signature_cache: Optional[Tuple[Tuple, List[int]]] = None
+
+
+def _db_file_signature(db_path: str) -> Optional[List[int]]:
+    """
+    DB 파일 변경 감지용 서명 (mtime_ns, size)
+
+    Returns:
+        서명 리스트 (파일이 없으면 None)
+    """
+    try:
+        st = os.stat(db_path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _data_file_signature(db_path: str) -> Tuple:
+    """
+    DB 파일과 WAL 파일 서명 (커밋마다 둘 중 하나의 mtime/size가 바뀜)
+
+    Returns:
+        (db mtime_ns, db size, wal mtime_ns, wal size) (없는 파일은 0)
+    """
+    return (*(_db_file_signature(db_path) or [0, 0]), *(_db_file_signature(db_path + '-wal') or [0, 0]))
+
+
+def _schema_signature() -> Optional[List[int]]:
+    """
+    스키마 변경 감지용 서명 (inode, PRAGMA schema_version)
+
+    DB 파일 mtime은 WAL 모드에서 체크포인트 전까지 바뀌지 않으므로,
+    테이블/컬럼이 바뀔 때마다 증가하는 schema_version을 사용합니다.
+    inode는 DB 파일 자체가 교체된 경우를 구분합니다.
+    schema_version 조회는 DB/WAL 파일 서명이 바뀐 경우(새 커밋)에만 커넥션을 빌려 실행합니다.
+
+    Returns:
+        서명 리스트 (파일이 없으면 None)
+    """
+    global _schema_signature_cache
+
+    try:
+        st = os.stat(DB_PATH)
+    except OSError:
+        return None
+
+    file_key = (os.path.abspath(DB_PATH), st.st_ino, *_data_file_signature(DB_PATH))
+    cached = _schema_signature_cache
+    if cached is not None and cached[0] == file_key:
+        return cached[1]
+
+    with get_db_pool().connection() as conn:
+        schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+    signature = [st.st_ino, schema_version]
+    _schema_signature_cache = (file_key, signature)
+    return signature
+
+
+def _schema_cache_file() -> str:
+    """스키마 캐시 파일 경로"""
+    return SCHEMA_CACHE_PATH or f"{DB_PATH}.schema.json"
+
+
+def _load_schema_cache_file(signature: List[int]) -> Optional[Dict[str, List[str]]]:
+    """서명이 일치하는 스키마 캐시 파일 로드 (없거나 오래되었으면 None)"""
+    try:
+        with open(_schema_cache_file(), 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if cached.get('db_path') != os.path.abspath(DB_PATH) or cached.get('signature') != signature:
+        return None
+    return cached.get('tables')
+
+
+def _save_schema_cache_file(signature: List[int], table_info: Dict[str, List[str]]):
+    """스키마 캐시 파일 저장 (쓰기 실패는 무시)"""
+    path = _schema_cache_file()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'db_path': os.path.abspath(DB_PATH),
+                'signature': signature,
+                'tables': table_info
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _introspect_schema() -> Dict[str, List[str]]:
+    """sqlite_master + pragma_table_info 단일 쿼리로 테이블별 컬럼 조회"""
+    with get_db_pool().connection() as conn:
+        rows = conn.execute("""
+            SELECT m.name, p.name
+            FROM sqlite_master m
+            JOIN pragma_table_info(m.name) p
+            WHERE m.type = 'table'
+            ORDER BY m.rowid, p.cid
+        """).fetchall()
+
+    table_info: Dict[str, List[str]] = {}
+    for table_name, column_name in rows:
+        table_info.setdefault(table_name, []).append(column_name)
     return table_info
 
-# 테이블 정보 확인
-tables = get_table_info()
-print("데이터베이스 테이블:")
-for table_name, columns in tables.items():
-    print(f"\n{table_name}: {len(columns)}개 컬럼")
-    print(f"  주요 컬럼: {', '.join(columns[:5])}...")
+
+def get_table_info(refresh: bool = False) -> Dict[str, List[str]]:
+    """
+    데이터베이스의 모든 테이블 정보 조회 (지연 로딩 + 캐싱)
+
+    처음 호출될 때 스키마를 조회하고, 스키마 서명(inode/schema_version)이 바뀌기 전까지
+    메모리 캐시를 사용합니다. SCHEMA_CACHE_ENABLED이면 캐시 파일에도 저장하여
+    다른 프로세스가 DB를 다시 조회하지 않도록 합니다.
+
+    Args:
+        refresh: True이면 캐시를 무시하고 다시 조회
+
+    Returns:
+        {'table_name': ['col1', 'col2', ...]}
+    """
+    global _schema_cache
+
+    signature = _schema_signature()
+    key = (os.path.abspath(DB_PATH), signature)
+
+    cached = _schema_cache
+    if not refresh and cached is not None and cached['key'] == key:
+        return cached['tables']
+
+    with _schema_cache_lock:
+        cached = _schema_cache
+        if not refresh and cached is not None and cached['key'] == key:
+            return cached['tables']
+
+        table_info = None
+        if SCHEMA_CACHE_ENABLED and signature is not None and not refresh:
+            table_info = _load_schema_cache_file(signature)
+
+        if table_info is None:
+            table_info = _introspect_schema()
+            if SCHEMA_CACHE_ENABLED and signature is not None:
+                _save_schema_cache_file(signature, table_info)
+
+        _schema_cache = {'key': key, 'tables': table_info}
+        return table_info
+
+
+def print_table_info():
+    """테이블 정보 출력 (노트북 확인용)"""
+    tables = get_table_info()
+    print("데이터베이스 테이블:")
+    for table_name, columns in tables.items():
+        print(f"\n{table_name}: {len(columns)}개 컬럼")
+        print(f"  주요 컬럼: {', '.join(columns[:5])}...")
 
 # ======================================================================
-# 스키마 설명 조회 (캐싱)
+# 쿼리 레지스트리 (이름 있는 파라미터 바인딩 쿼리 + 실행 통계)
 # ======================================================================
 
-# 컬럼 설명 캐시
-_column_descriptions_cache: Dict[str, str] = {}
+# 값은 모두 바인딩 파라미터(:name)로 전달하여 SQLite statement 캐시를 재사용합니다.
+QUERY_REGISTRY: Dict[str, str] = {
+    'column_descriptions_all': """
+        SELECT table_name, column_name, description
+        FROM column_descriptions
+    """,
+    'liquidity_gap': """
+        SELECT
+            TIME_BAND,
+            SUM(GAP_PRN_TOTAL) as 총_원금갭,
+            SUM(GAP_INT_TOTAL) as 총_이자갭,
+            COUNT(*) as 건수
+        FROM NFAR_LIQ_GAP_310524
+        GROUP BY TIME_BAND ORDER BY TIME_BAND
+    """,
+    'liquidity_gap_by_scenario': """
+        SELECT
+            TIME_BAND,
+            SUM(GAP_PRN_TOTAL) as 총_원금갭,
+            SUM(GAP_INT_TOTAL) as 총_이자갭,
+            COUNT(*) as 건수
+        FROM NFAR_LIQ_GAP_310524
+        WHERE SCENARIO_NO = :scenario_no
+        GROUP BY TIME_BAND ORDER BY TIME_BAND
+    """,
+    'exchange_rate': """
+        SELECT * FROM NFA_EXCH_RATE_HIST
+        WHERE UNIT_CURRENCY_CD = :currency
+        ORDER BY EFFECTIVE_DATE DESC LIMIT 10
+    """,
+    'exchange_rate_on_date': """
+        SELECT * FROM NFA_EXCH_RATE_HIST
+        WHERE UNIT_CURRENCY_CD = :currency
+          AND EFFECTIVE_DATE = :date
+        ORDER BY EFFECTIVE_DATE DESC LIMIT 10
+    """,
+    'interest_rate': """
+        SELECT * FROM NFA_IRC_RATE_HIST
+        WHERE INT_RATE_CD = :rate_cd
+        ORDER BY EFFECTIVE_DATE DESC LIMIT 10
+    """,
+    'interest_rate_by_term': """
+        SELECT * FROM NFA_IRC_RATE_HIST
+        WHERE INT_RATE_CD = :rate_cd
+          AND INT_RATE_TERM = :term
+        ORDER BY EFFECTIVE_DATE DESC LIMIT 10
+    """,
+    'report_data_overview': """
+        SELECT
+            CURRENCY_CD as 통화,
+            COUNT(*) as 계약수,
+            SUM(CUR_PAR_BAL) as 총잔액,
+            AVG(INT_RATE) as 평균금리
+        FROM ALM_INST
+        GROUP BY CURRENCY_CD
+        ORDER BY 총잔액 DESC
+    """,
+    'report_liquidity_gap': """
+        SELECT
+            TIME_BAND as 기간대,
+            SUM(GAP_PRN_TOTAL) as 원금갭,
+            SUM(GAP_INT_TOTAL) as 이자갭,
+            SUM(GAP_PRN_TOTAL + GAP_INT_TOTAL) as 총갭
+        FROM NFAR_LIQ_GAP_310524
+        GROUP BY TIME_BAND ORDER BY TIME_BAND
+    """,
+    'report_liquidity_gap_by_scenario': """
+        SELECT
+            TIME_BAND as 기간대,
+            SUM(GAP_PRN_TOTAL) as 원금갭,
+            SUM(GAP_INT_TOTAL) as 이자갭,
+            SUM(GAP_PRN_TOTAL + GAP_INT_TOTAL) as 총갭
+        FROM NFAR_LIQ_GAP_310524
+        WHERE SCENARIO_NO = :scenario_no
+        GROUP BY TIME_BAND ORDER BY TIME_BAND
+    """,
+    'report_exchange_rates': """
+        SELECT
+            UNIT_CURRENCY_CD as 통화,
+            EFFECTIVE_DATE as 일자,
+            EXCH_RATE as 환율
+        FROM NFA_EXCH_RATE_HIST
+        WHERE UNIT_CURRENCY_CD IN ('USD', 'EUR', 'JPY', 'CNY')
+        ORDER BY EFFECTIVE_DATE DESC
+        LIMIT 20
+    """,
+    'report_interest_rates': """
+        SELECT
+            INT_RATE_CD as 금리코드,
+            INT_RATE_TERM as 기간,
+            EFFECTIVE_DATE as 일자,
+            INT_RATE as 금리
+        FROM NFA_IRC_RATE_HIST
+        ORDER BY EFFECTIVE_DATE DESC
+        LIMIT 20
+    """,
+    'report_alm_dimensions': """
+        SELECT
+            ALM_DIMN_CD as ALM차원,
+            COUNT(*) as 건수,
+            SUM(CUR_PAR_BAL) as 총잔액
+        FROM ALM_INST
+        GROUP BY ALM_DIMN_CD
+        ORDER BY 총잔액 DESC
+        LIMIT 10
+    """,
+    'trend_exchange_rate': """
+        SELECT EFFECTIVE_DATE as 일자, EXCH_RATE as 값
+        FROM NFA_EXCH_RATE_HIST
+        WHERE (:code IS NULL OR UNIT_CURRENCY_CD = :code)
+          AND (:start_date IS NULL OR EFFECTIVE_DATE >= :start_date)
+          AND (:end_date IS NULL OR EFFECTIVE_DATE <= :end_date)
+        ORDER BY EFFECTIVE_DATE
+    """,
+    'trend_interest_rate': """
+        SELECT EFFECTIVE_DATE as 일자, INT_RATE as 값
+        FROM NFA_IRC_RATE_HIST
+        WHERE (:code IS NULL OR INT_RATE_CD = :code)
+          AND (:start_date IS NULL OR EFFECTIVE_DATE >= :start_date)
+          AND (:end_date IS NULL OR EFFECTIVE_DATE <= :end_date)
+        ORDER BY EFFECTIVE_DATE
+    """,
+    # 추세 통계 저장소 증분 갱신: 전체 건수/합계 확인 + 마지막 일자 이후 행만 조회
+    'trend_exchange_rate_summary': """
+        SELECT COUNT(EXCH_RATE) as cnt, TOTAL(EXCH_RATE) as total
+        FROM NFA_EXCH_RATE_HIST
+        WHERE (:code IS NULL OR UNIT_CURRENCY_CD = :code)
+    """,
+    'trend_interest_rate_summary': """
+        SELECT COUNT(INT_RATE) as cnt, TOTAL(INT_RATE) as total
+        FROM NFA_IRC_RATE_HIST
+        WHERE (:code IS NULL OR INT_RATE_CD = :code)
+    """,
+    'trend_exchange_rate_after': """
+        SELECT EFFECTIVE_DATE as 일자, EXCH_RATE as 값
+        FROM NFA_EXCH_RATE_HIST
+        WHERE (:code IS NULL OR UNIT_CURRENCY_CD = :code)
+          AND EFFECTIVE_DATE > :after_date
+        ORDER BY EFFECTIVE_DATE
+    """,
+    'trend_interest_rate_after': """
+        SELECT EFFECTIVE_DATE as 일자, INT_RATE as 값
+        FROM NFA_IRC_RATE_HIST
+        WHERE (:code IS NULL OR INT_RATE_CD = :code)
+          AND EFFECTIVE_DATE > :after_date
+        ORDER BY EFFECTIVE_DATE
+    """,
+    # :target_date 스냅샷에는 있지만 :other_date 스냅샷에는 없는 계약
+    # (신규: target=현재/other=이전, 소멸: target=이전/other=현재)
+    # BASE_DATE는 LIKE 대신 [날짜, 다음 날짜 접두어) 범위 조건으로 비교해 인덱스를 사용할 수 있게 합니다.
+    'position_delta_contracts': """
+        SELECT
+            t1.REFERENCE_NO,
+            t1.CURRENCY_CD,
+            t1.CUR_PAR_BAL,
+            t1.CUR_RATE,
+            t1.DIM_PROD,
+            t1.DIM_ORG,
+            t1.DIM_ALM
+        FROM ALM_INST t1
+        WHERE t1.BASE_DATE >= :target_start AND t1.BASE_DATE < :target_end
+          AND NOT EXISTS (
+              SELECT 1 FROM ALM_INST t2
+              WHERE t2.REFERENCE_NO = t1.REFERENCE_NO
+                AND t2.BASE_DATE >= :other_start AND t2.BASE_DATE < :other_end
+          )
+        ORDER BY t1.REFERENCE_NO
+    """,
+}
+
+# 유동성 갭 큐브 (build_liquidity_gap_cube()가 만든 NFAR_LIQ_GAP_CUBE) 조회
+# 원본 쿼리와 컬럼명/순서가 같도록 작성합니다.
+QUERY_REGISTRY.update({
+    'liquidity_gap_source_fingerprint': """
+        SELECT COUNT(*) as cnt, MAX(rowid) as max_rowid FROM NFAR_LIQ_GAP_310524
+    """,
+    'derived_table_fingerprint': """
+        SELECT FINGERPRINT FROM ALM_DERIVED_META WHERE NAME = :name
+    """,
+    'cube_liquidity_gap': """
+        SELECT
+            TIME_BAND,
+            SUM(GAP_PRN_TOTAL) as 총_원금갭,
+            SUM(GAP_INT_TOTAL) as 총_이자갭,
+            SUM(ROW_COUNT) as 건수
+        FROM NFAR_LIQ_GAP_CUBE
+        GROUP BY TIME_BAND ORDER BY TIME_BAND
+    """,
+    'cube_liquidity_gap_by_scenario': """
+        SELECT
+            TIME_BAND,
+            GAP_PRN_TOTAL as 총_원금갭,
+            GAP_INT_TOTAL as 총_이자갭,
+            ROW_COUNT as 건수
+        FROM NFAR_LIQ_GAP_CUBE
+        WHERE SCENARIO_NO = :scenario_no
+        ORDER BY TIME_BAND
+    """,
+    'cube_report_liquidity_gap': """
+        SELECT
+            TIME_BAND as 기간대,
+            SUM(GAP_PRN_TOTAL) as 원금갭,
+            SUM(GAP_INT_TOTAL) as 이자갭,
+            SUM(GAP_TOTAL) as 총갭
+        FROM NFAR_LIQ_GAP_CUBE
+        GROUP BY TIME_BAND ORDER BY TIME_BAND
+    """,
+    'cube_report_liquidity_gap_by_scenario': """
+        SELECT
+            TIME_BAND as 기간대,
+            GAP_PRN_TOTAL as 원금갭,
+            GAP_INT_TOTAL as 이자갭,
+            GAP_TOTAL as 총갭
+        FROM NFAR_LIQ_GAP_CUBE
+        WHERE SCENARIO_NO = :scenario_no
+        ORDER BY TIME_BAND
+    """,
+})
 
-def get_column_description(table_name: str, column_name: str) -> Optional[str]:
+# 원화 환산용 환율 이력 / 기준일·통화별 잔액
+QUERY_REGISTRY.update({
+    'fx_rate_history': """
+        SELECT UNIT_CURRENCY_CD, EFFECTIVE_DATE, EXCH_RATE
+        FROM NFA_EXCH_RATE_HIST
+        WHERE EXCH_RATE IS NOT NULL
+        ORDER BY UNIT_CURRENCY_CD, EFFECTIVE_DATE
+    """,
+    'balance_by_date_currency': """
+        SELECT BASE_DATE, CURRENCY_CD, SUM(CUR_PAR_BAL) as 잔액
+        FROM ALM_INST
+        GROUP BY BASE_DATE, CURRENCY_CD
+    """,
+})
+
+# 다중 시계열 일괄 조회 (시나리오 일괄 조회와 같은 방식으로 파라미터 수 고정)
+TREND_SERIES_BATCH_SIZE = 20
+
+QUERY_REGISTRY['trend_exchange_rate_multi'] = f"""
+    SELECT UNIT_CURRENCY_CD as 코드, EFFECTIVE_DATE as 일자, EXCH_RATE as 값
+    FROM NFA_EXCH_RATE_HIST
+    WHERE UNIT_CURRENCY_CD IN ({', '.join(f':c{i}' for i in range(TREND_SERIES_BATCH_SIZE))})
+    ORDER BY UNIT_CURRENCY_CD, EFFECTIVE_DATE
+"""
+
+QUERY_REGISTRY['trend_interest_rate_multi'] = f"""
+    SELECT INT_RATE_CD as 코드, EFFECTIVE_DATE as 일자, INT_RATE as 값
+    FROM NFA_IRC_RATE_HIST
+    WHERE INT_RATE_CD IN ({', '.join(f':c{i}' for i in range(TREND_SERIES_BATCH_SIZE))})
+    ORDER BY INT_RATE_CD, EFFECTIVE_DATE
+"""
+
+# 다중 시나리오 일괄 조회: 항상 같은 쿼리 문자열을 쓰도록 파라미터 수를 고정하고
+# 마지막 배치는 마지막 값을 반복해 채웁니다 (SQLite 변수 개수 제한 999 이내).
+SCENARIO_BATCH_SIZE = 500
+
+QUERY_REGISTRY['scenario_gap_batch'] = f"""
+    SELECT
+        SCENARIO_NO as 시나리오,
+        TIME_BAND as 기간대,
+        SUM(GAP_PRN_TOTAL) as 원금갭,
+        SUM(GAP_INT_TOTAL) as 이자갭,
+        SUM(GAP_PRN_TOTAL + GAP_INT_TOTAL) as 총갭
+    FROM NFAR_LIQ_GAP_310524
+    WHERE SCENARIO_NO IN ({', '.join(f':s{i}' for i in range(SCENARIO_BATCH_SIZE))})
+    GROUP BY SCENARIO_NO, TIME_BAND
+    ORDER BY SCENARIO_NO, TIME_BAND
+"""
+
+QUERY_REGISTRY['cube_scenario_gap_batch'] = f"""
+    SELECT
+        SCENARIO_NO as 시나리오,
+        TIME_BAND as 기간대,
+        GAP_PRN_TOTAL as 원금갭,
+        GAP_INT_TOTAL as 이자갭,
+        GAP_TOTAL as 총갭
+    FROM NFAR_LIQ_GAP_CUBE
+    WHERE SCENARIO_NO IN ({', '.join(f':s{i}' for i in range(SCENARIO_BATCH_SIZE))})
+    ORDER BY SCENARIO_NO, TIME_BAND
+"""
+
+# 포지션 변동 차원별 집계 대상 컬럼
+POSITION_DIMENSIONS = ['DIM_PROD', 'DIM_ORG', 'DIM_ALM']
+
+# 포지션 변동 인덱스 조회 (build_position_delta_index()가 만든 파생 테이블)
+QUERY_REGISTRY.update({
+    'base_date_fingerprint': """
+        SELECT COUNT(*) as cnt, MAX(rowid) as max_rowid
+        FROM ALM_INST
+        WHERE BASE_DATE >= :start AND BASE_DATE < :end
+    """,
+    'position_index_pair': """
+        SELECT *
+        FROM ALM_POSITION_DELTA_PAIR
+        WHERE PREV_DATE >= :prev_start AND PREV_DATE < :prev_end
+          AND CURR_DATE >= :curr_start AND CURR_DATE < :curr_end
+    """,
+    'position_index_pairs_all': """
+        SELECT PREV_DATE, CURR_DATE
+        FROM ALM_POSITION_DELTA_PAIR
+        ORDER BY PREV_DATE
+    """,
+    'position_index_refs': """
+        SELECT REFERENCE_NO, CURRENCY_CD, CUR_PAR_BAL, CUR_RATE, DIM_PROD, DIM_ORG, DIM_ALM
+        FROM ALM_POSITION_DELTA_REF
+        WHERE PREV_DATE = :prev_date AND CURR_DATE = :curr_date AND KIND = :kind
+        ORDER BY REFERENCE_NO
+        LIMIT :limit
+    """,
+    'position_index_dims': """
+        SELECT DIMENSION, DIM_VALUE as 차원값, CNT as 건수, BALANCE as 잔액
+        FROM ALM_POSITION_DELTA_DIM
+        WHERE PREV_DATE = :prev_date AND CURR_DATE = :curr_date AND KIND = :kind
+        ORDER BY DIMENSION, BALANCE IS NULL, BALANCE DESC, CAST(DIM_VALUE AS TEXT)
+    """,
+})
+
+# 단기 금리 모형 추정용 금리 이력 (몬테카를로 금리 시나리오)
+QUERY_REGISTRY.update({
+    'interest_rate_terms': """
+        SELECT DISTINCT INT_RATE_TERM
+        FROM NFA_IRC_RATE_HIST
+        WHERE INT_RATE_CD = :rate_cd
+        ORDER BY INT_RATE_TERM
+    """,
+    'short_rate_history': """
+        SELECT EFFECTIVE_DATE as 일자, INT_RATE as 값
+        FROM NFA_IRC_RATE_HIST
+        WHERE INT_RATE_CD = :rate_cd
+          AND (:term IS NULL OR INT_RATE_TERM = :term)
+          AND (:start_date IS NULL OR EFFECTIVE_DATE >= :start_date)
+          AND (:end_date IS NULL OR EFFECTIVE_DATE <= :end_date)
+        ORDER BY EFFECTIVE_DATE
+    """,
+})
+
+# 지연시간 히스토그램 버킷 상한 (밀리초)
+QUERY_LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+_query_stats: Dict[str, Dict[str, Any]] = {}
+_query_stats_lock = threading.Lock()
+
+
+def _record_query_stats(name: str, elapsed_ms: float, success: bool):
+    """쿼리 실행 횟수 및 지연시간 히스토그램 기록"""
+    with _query_stats_lock:
+        stats = _query_stats.get(name)
+        if stats is None:
+            stats = {
+                'count': 0,
+                'errors': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+                'histogram': [0] * (len(QUERY_LATENCY_BUCKETS_MS) + 1)
+            }
+            _query_stats[name] = stats
+
+        stats['count'] += 1
+        if not success:
+            stats['errors'] += 1
+        stats['total_ms'] += elapsed_ms
+        stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+
+        bucket = len(QUERY_LATENCY_BUCKETS_MS)
+        for i, upper in enumerate(QUERY_LATENCY_BUCKETS_MS):
+            if elapsed_ms <= upper:
+                bucket = i
+                break
+        stats['histogram'][bucket] += 1
+
+
+def get_query_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    쿼리별 실행 통계 조회 (모니터링용)
+
+    Returns:
+        {
+            'query_name': {
+                'count': int,
+                'errors': int,
+                'avg_ms': float,
+                'max_ms': float,
+                'histogram': {'<=1ms': int, ..., '>5000ms': int}
+            },
+            ...
+        }
     """
-    컬럼 설명 조회 (캐싱 포함)
+    labels = [f"<={upper}ms" for upper in QUERY_LATENCY_BUCKETS_MS]
+    labels.append(f">{QUERY_LATENCY_BUCKETS_MS[-1]}ms")
+
+    with _query_stats_lock:
+        return {
+            name: {
+                'count': stats['count'],
+                'errors': stats['errors'],
+                'avg_ms': stats['total_ms'] / stats['count'] if stats['count'] else 0.0,
+                'max_ms': stats['max_ms'],
+                'histogram': dict(zip(labels, stats['histogram']))
+            }
+            for name, stats in _query_stats.items()
+        }
+
+
+def reset_query_stats():
+    """쿼리 실행 통계 초기화"""
+    with _query_stats_lock:
+        _query_stats.clear()
+
+
+def run_registered_query(name: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    QUERY_REGISTRY에 등록된 쿼리를 바인딩 파라미터로 실행
 
     Args:
-        table_name: 테이블명 (예: 'ALM_INST', 'INST_ALM_01')
-        column_name: 컬럼명 (예: 'DIM_PROD')
+        name: 등록된 쿼리 이름
+        params: 바인딩 파라미터 {'param': value}
 
     Returns:
-        컬럼 설명 (없으면 None)
+        execute_sql_query()와 동일한 결과 딕셔너리
+    """
+    if name not in QUERY_REGISTRY:
+        raise KeyError(f"등록되지 않은 쿼리: {name}")
+    return execute_sql_query(QUERY_REGISTRY[name], params or {}, name=name)
+
+
+def _validate_identifiers(table_name: str, columns: List[str]) -> Optional[str]:
+    """
+    테이블/컬럼 식별자를 스키마로 검증 (식별자는 바인딩할 수 없으므로)
+
+    Returns:
+        오류 메시지 (정상이면 None)
+    """
+    # SQLite 식별자는 대소문자를 구분하지 않음
+    tables = {name.upper(): cols for name, cols in get_table_info().items()}
+    if table_name.upper() not in tables:
+        return f"알 수 없는 테이블: {table_name}"
+
+    known = {col.upper() for col in tables[table_name.upper()]}
+    unknown = [col for col in columns if col.upper() not in known]
+    if unknown:
+        return f"{table_name} 테이블에 없는 컬럼: {unknown}"
+    return None
+
+
+# ======================================================================
+# 쿼리 결과 캐시 (LRU + TTL, 데이터 버전 기반 무효화)
+# ======================================================================
+
+RESULT_CACHE_ENABLED = True
+RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024   # 전체 캐시 메모리 상한
+RESULT_CACHE_MAX_ENTRY_RATIO = 0.25          # 단일 결과가 차지할 수 있는 최대 비율
+RESULT_CACHE_TTL = 300.0                     # 초
+
+_SQL_STRING_LITERAL = re.compile(r"('(?:[^']|'')*')")
+
+
+def get_data_version(conn: Optional[sqlite3.Connection] = None) -> Tuple:
     """
-    cache_key = f"{table_name}.{column_name}"
+    현재 데이터 버전 토큰
 
-    # 캐시 확인
-    if cache_key in _column_descriptions_cache:
-        return _column_descriptions_cache[cache_key]
+    DB 경로, 풀 커넥션의 PRAGMA data_version 세대와 DB/WAL 파일의 mtime/size를 조합합니다.
+    다른 프로세스가 데이터를 변경하거나 DB_PATH가 바뀌면 토큰이 바뀝니다.
+
+    Args:
+        conn: 이미 빌린 풀 커넥션 (None이면 새로 빌림)
+
+    Returns:
+        비교 가능한 버전 튜플
+    """
+    pool = get_db_pool()
+    if conn is None:
+        with pool.connection() as held:
+            generation = pool.data_generation(held)
+    else:
+        generation = pool.data_generation(conn)
+
+    return (os.path.abspath(pool.db_path), generation, *_data_file_signature(pool.db_path))
+
+
+def _normalize_sql(query: str) -> str:
+    """캐시 키용 SQL 정규화 (문자열 리터럴 밖의 공백만 압축)"""
+    parts = _SQL_STRING_LITERAL.split(query)
+    return ''.join(
+        part if i % 2 else ' '.join(part.split())
+        for i, part in enumerate(parts)
+    ).strip()
+
+
+def _result_cache_key(query: str, params: Any) -> Optional[Tuple]:
+    """캐시 키 생성 (캐싱할 수 없는 쿼리/파라미터면 None)"""
+    normalized = _normalize_sql(query)
+    head = normalized.split(None, 1)[0].upper() if normalized else ''
+    if head not in ('SELECT', 'WITH'):
+        return None
+
+    if params is None:
+        param_key: Tuple = ()
+    elif isinstance(params, dict):
+        param_key = tuple(sorted(params.items()))
+    else:
+        param_key = tuple(params)
 
-    # DB 조회
     try:
-        query = f"""
-        SELECT description
-        FROM column_descriptions
-        WHERE table_name = '{table_name}'
-          AND column_name = '{column_name}'
-        LIMIT 1
+        hash(param_key)
+    except TypeError:
+        return None
+    return (normalized, param_key)
+
+
+class QueryResultCache:
+    """
+    읽기 전용 쿼리 결과 캐시
+
+    - LRU 순서로 관리하며 전체 메모리 추정치가 max_bytes를 넘으면 오래된 항목부터 제거
+    - 항목별 TTL 만료
+    - 데이터 버전이 바뀌면 전체 무효화
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = RESULT_CACHE_MAX_BYTES,
+        ttl: float = RESULT_CACHE_TTL,
+        max_entry_ratio: float = RESULT_CACHE_MAX_ENTRY_RATIO
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_entry_bytes = int(max_bytes * max_entry_ratio)
+
+        self._entries: "OrderedDict[Tuple, Tuple[float, int, Any]]" = OrderedDict()
+        self._version: Optional[Tuple] = None
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0,
+                       'invalidations': 0, 'rejected': 0}
+
+    def _sync_version(self, version: Tuple):
+        """데이터 버전이 바뀌었으면 전체 무효화 (lock 보유 상태에서 호출)"""
+        if self._version != version:
+            if self._entries:
+                self._stats['invalidations'] += len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            self._version = version
+
+    def get(self, key: Tuple, version: Tuple) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되었으면 None)"""
+        with self._lock:
+            self._sync_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+
+            expires_at, size, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    def put(self, key: Tuple, version: Tuple, value: Any, size: int):
+        """캐시 저장 (항목이 너무 크면 저장하지 않음)"""
+        if size > self.max_entry_bytes:
+            with self._lock:
+                self._stats['rejected'] += 1
+            return
+
+        with self._lock:
+            self._sync_version(version)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+            self._entries[key] = (time.monotonic() + self.ttl, size, value)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats['evictions'] += 1
+
+    def clear(self):
+        """전체 삭제"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """히트/미스/제거 통계"""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'hit_rate': self._stats['hits'] / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes
+            }
+
+
+_result_cache = QueryResultCache()
+
+
+def get_result_cache_stats() -> Dict[str, Any]:
+    """쿼리 결과 캐시 통계 조회"""
+    return _result_cache.stats()
+
+
+def clear_result_cache():
+    """쿼리 결과 캐시 비우기"""
+    _result_cache.clear()
+
+
+def configure_result_cache(
+    max_bytes: int = RESULT_CACHE_MAX_BYTES,
+    ttl: float = RESULT_CACHE_TTL,
+    enabled: bool = True
+):
+    """
+    쿼리 결과 캐시 재설정
+
+    Args:
+        max_bytes: 전체 메모리 상한 (바이트)
+        ttl: 항목 유효 시간 (초)
+        enabled: 캐시 사용 여부
+    """
+    global _result_cache, RESULT_CACHE_ENABLED
+
+    _result_cache = QueryResultCache(max_bytes=max_bytes, ttl=ttl)
+    RESULT_CACHE_ENABLED = enabled
+
+# ======================================================================
+# 기준일 캘린더 (정렬된 일자 목록 + bisect 조회)
+# ======================================================================
+
+# 캘린더를 만들 수 있는 (테이블, 일자 컬럼) 및 시계열 구분 컬럼
+DATE_CALENDAR_SOURCES = {
+    ('ALM_INST', 'BASE_DATE'): None,
+    ('NFA_EXCH_RATE_HIST', 'EFFECTIVE_DATE'): 'UNIT_CURRENCY_CD',
+    ('NFA_IRC_RATE_HIST', 'EFFECTIVE_DATE'): 'INT_RATE_CD',
+}
+
+_calendar_cache: Dict[Tuple, Tuple[Tuple, 'DateCalendar']] = {}
+_calendar_cache_lock = threading.Lock()
+
+
+class DateCalendar:
+    """
+    정렬된 일자 목록
+
+    일자 값은 DB에 저장된 원래 문자열('2020-06-30 00:00:00' 등)을 그대로 반환하며,
+    비교는 앞 10자리(YYYY-MM-DD) 기준으로 bisect를 사용해 O(log n)으로 수행합니다.
+    """
+
+    def __init__(self, dates: Sequence[str]):
+        self.dates = sorted(str(d) for d in dates if d is not None)
+        self._keys = [d[:10] for d in self.dates]
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __contains__(self, date: str) -> bool:
+        return self.find(date) is not None
+
+    def find(self, date: str) -> Optional[str]:
+        """date와 같은 날의 일자 (없으면 None)"""
+        key = date[:10]
+        i = bisect_left(self._keys, key)
+        return self.dates[i] if i < len(self._keys) and self._keys[i] == key else None
+
+    def previous(self, date: str) -> Optional[str]:
+        """date보다 이전 날의 가장 최근 일자"""
+        i = bisect_left(self._keys, date[:10])
+        return self.dates[i - 1] if i > 0 else None
+
+    def next(self, date: str) -> Optional[str]:
+        """date보다 이후 날의 가장 빠른 일자"""
+        i = bisect_right(self._keys, date[:10])
+        return self.dates[i] if i < len(self._keys) else None
+
+    def on_or_before(self, date: str) -> Optional[str]:
+        """date 당일 또는 그 이전의 가장 최근 일자"""
+        i = bisect_right(self._keys, date[:10])
+        return self.dates[i - 1] if i > 0 else None
+
+    def nearest(self, date: str) -> Optional[str]:
+        """date와 가장 가까운 일자 (같은 거리면 이전 일자)"""
+        before = self.on_or_before(date)
+        after = self.next(date)
+        if before is None or after is None:
+            return before or after
+        try:
+            target = datetime.strptime(date[:10], '%Y-%m-%d')
+            gap_before = target - datetime.strptime(before[:10], '%Y-%m-%d')
+            gap_after = datetime.strptime(after[:10], '%Y-%m-%d') - target
+        except ValueError:
+            return before
+        return before if gap_before <= gap_after else after
+
+    def between(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[str]:
+        """[start_date, end_date] 범위의 일자 목록 (None이면 제한 없음)"""
+        lo = bisect_left(self._keys, start_date[:10]) if start_date else 0
+        hi = bisect_right(self._keys, end_date[:10]) if end_date else len(self._keys)
+        return self.dates[lo:hi]
+
+    @property
+    def first(self) -> Optional[str]:
+        return self.dates[0] if self.dates else None
+
+    @property
+    def last(self) -> Optional[str]:
+        return self.dates[-1] if self.dates else None
+
+
+def get_date_calendar(
+    table: str = 'ALM_INST',
+    date_column: str = 'BASE_DATE',
+    series: Optional[Any] = None
+) -> DateCalendar:
+    """
+    테이블의 일자 캘린더 조회 (데이터 버전이 바뀌면 다시 조회)
+
+    Args:
+        table: 테이블명 (DATE_CALENDAR_SOURCES에 등록된 테이블)
+        date_column: 일자 컬럼명
+        series: 시계열 구분 값 (예: 환율은 통화 코드, 금리는 금리 코드). None이면 전체
+
+    Returns:
+        DateCalendar
+    """
+    if (table, date_column) not in DATE_CALENDAR_SOURCES:
+        raise KeyError(f"캘린더를 지원하지 않는 테이블/컬럼: {table}.{date_column}")
+
+    series_column = DATE_CALENDAR_SOURCES[(table, date_column)]
+    cache_key = (table, date_column, series if series_column else None)
+    version = get_data_version()
+
+    with _calendar_cache_lock:
+        cached = _calendar_cache.get(cache_key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    query = f"SELECT DISTINCT {date_column} FROM {table}"
+    params: Dict[str, Any] = {}
+    if series_column and series is not None:
+        query += f" WHERE {series_column} = :series"
+        params['series'] = series
+
+    result = execute_sql_query(query, params, name=f'calendar_{table.lower()}', use_cache=False)
+    if not result['success']:
+        raise RuntimeError(result['error'])
+
+    calendar = DateCalendar(row[0] for row in result.rows)
+    with _calendar_cache_lock:
+        _calendar_cache[cache_key] = (version, calendar)
+    return calendar
+
+
+def get_base_date_calendar() -> DateCalendar:
+    """ALM_INST BASE_DATE 캘린더"""
+    return get_date_calendar('ALM_INST', 'BASE_DATE')
+
+# ======================================================================
+# 환율 as-of 조인 (원화 환산)
+# ======================================================================
+
+# 환산 기준 통화 (환율 1.0)
+FX_BASE_CURRENCY = 'KRW'
+
+# 일자별 환율표 캐시 크기
+FX_DAILY_TABLE_CACHE_SIZE = 64
+
+
+class FxTable:
+    """
+    통화별 (고시일, 환율) 정렬 배열
+
+    rates_as_of()는 통화별로 searchsorted를 한 번씩 실행해
+    각 일자의 직전(당일 포함) 고시 환율을 벡터 연산으로 찾습니다.
+    일자는 앞 10자리(YYYY-MM-DD)로 비교합니다.
+    """
+
+    def __init__(self, rows: Sequence[tuple]):
+        grouped: Dict[str, List[tuple]] = {}
+        for currency, date, rate in rows:
+            grouped.setdefault(currency, []).append((str(date)[:10], float(rate)))
+
+        self.currencies: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for currency, points in grouped.items():
+            points.sort(key=lambda p: p[0])
+            self.currencies[currency] = (
+                np.array([d for d, _ in points], dtype='<U10'),
+                np.array([r for _, r in points], dtype=float)
+            )
+        self._daily: OrderedDict = OrderedDict()
+        self._daily_lock = threading.Lock()
+
+    def rates_as_of(self, currencies: Sequence[Any], dates: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (통화, 일자) 쌍별 직전 고시 환율
+
+        Returns:
+            (환율 배열, 적용 고시일 배열) - 환율이 없으면 NaN / ''
+            (FX_BASE_CURRENCY는 항상 1.0)
         """
+        currencies = np.asarray([str(c) if c is not None else '' for c in currencies], dtype=object)
+        dates = np.array([str(d)[:10] if d is not None else '' for d in dates], dtype='<U10')
+        rates = np.full(len(currencies), np.nan)
+        effective = np.full(len(currencies), '', dtype='<U10')
+
+        rates[currencies == FX_BASE_CURRENCY] = 1.0
+        effective[currencies == FX_BASE_CURRENCY] = dates[currencies == FX_BASE_CURRENCY]
+
+        for currency in set(currencies.tolist()) & self.currencies.keys():
+            if currency == FX_BASE_CURRENCY:
+                continue
+            mask = currencies == currency
+            fx_dates, fx_rates = self.currencies[currency]
+            idx = np.searchsorted(fx_dates, dates[mask], side='right') - 1
+            found = idx >= 0
+            rates[np.flatnonzero(mask)[found]] = fx_rates[idx[found]]
+            effective[np.flatnonzero(mask)[found]] = fx_dates[idx[found]]
+
+        return rates, effective
+
+    def on(self, date: str) -> Dict[str, Tuple[float, str]]:
+        """일자별 환율표 {통화: (환율, 적용 고시일)} (LRU 캐시)"""
+        key = str(date)[:10]
+        with self._daily_lock:
+            if key in self._daily:
+                self._daily.move_to_end(key)
+                return self._daily[key]
+
+        currencies = [FX_BASE_CURRENCY] + [c for c in self.currencies if c != FX_BASE_CURRENCY]
+        rates, effective = self.rates_as_of(currencies, [key] * len(currencies))
+        table = {
+            currency: (float(rate), str(eff))
+            for currency, rate, eff in zip(currencies, rates, effective)
+            if not np.isnan(rate)
+        }
 
-        result = execute_sql_query(query)
+        with self._daily_lock:
+            self._daily[key] = table
+            while len(self._daily) > FX_DAILY_TABLE_CACHE_SIZE:
+                self._daily.popitem(last=False)
+        return table
 
-        if result['success'] and result['row_count'] > 0:
-            desc = result['data'][0]['description']
-            _column_descriptions_cache[cache_key] = desc
-            return desc
-        else:
-            # 없으면 None 캐싱 (재조회 방지)
-            _column_descriptions_cache[cache_key] = None
-            return None
+
+_fx_table_cache: Optional[Tuple[Tuple, FxTable]] = None
+_fx_table_lock = threading.Lock()
+
+
+def get_fx_table() -> FxTable:
+    """NFA_EXCH_RATE_HIST 전체 환율표 (데이터 버전별 캐시)"""
+    global _fx_table_cache
+
+    version = get_data_version()
+    with _fx_table_lock:
+        if _fx_table_cache is not None and _fx_table_cache[0] == version:
+            return _fx_table_cache[1]
+
+    result = run_registered_query('fx_rate_history')
+    if not result['success']:
+        raise RuntimeError(result['error'])
+    table = FxTable(result.rows)
+
+    with _fx_table_lock:
+        _fx_table_cache = (version, table)
+    return table
+
+
+def convert_to_krw(
+    currencies: Sequence[Any],
+    dates: Sequence[Any],
+    amounts: Sequence[Any]
+) -> Dict[str, Any]:
+    """
+    금액 배열을 일자별 직전 고시 환율로 원화 환산
+
+    Returns:
+        {
+            'krw': ndarray,         # 환산 금액 (환율이 없으면 NaN)
+            'rates': ndarray,       # 적용 환율
+            'effective_dates': ndarray,
+            'missing': List[str]    # 환율이 없어 환산하지 못한 '통화 (일자)'
+        }
+    """
+    rates, effective = get_fx_table().rates_as_of(currencies, dates)
+    amounts = np.array([np.nan if a is None else a for a in amounts], dtype=float)
+    missing = sorted({f"{c} ({str(d)[:10]})" for c, d, r in zip(currencies, dates, rates) if np.isnan(r)})
+    return {
+        'krw': amounts * rates,
+        'rates': rates,
+        'effective_dates': effective,
+        'missing': missing
+    }
+
+
+def get_krw_balance_summary() -> Dict[str, Any]:
+    """
+    ALM_INST 기준일·통화별 잔액을 원화 환산해 통화별로 합산
+
+    Returns:
+        {
+            'success': bool,
+            'total': float,                 # 환산 가능한 잔액의 원화 합계
+            'by_currency': [{'통화', '잔액', '원화환산잔액'}, ...],
+            'missing': List[str]            # 환율이 없는 '통화 (기준일)' (합계에서 제외)
+        }
+    """
+    result = run_registered_query('balance_by_date_currency')
+    if not result['success']:
+        return {'success': False, 'error': result['error']}
+    try:
+        if not result.rows:
+            return {'success': True, 'total': 0.0, 'by_currency': [], 'missing': []}
+        base_dates, currencies, balances = zip(*result.rows)
+        converted = convert_to_krw(currencies, base_dates, balances)
     except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+    frame = pd.DataFrame({
+        '통화': [str(c) for c in currencies],
+        '잔액': np.array(balances, dtype=float),
+        '원화환산잔액': converted['krw']
+    })
+    # 환율이 없는 기준일이 하나라도 있으면 통화 합계도 NaN (부분 환산 방지)
+    grouped = frame.groupby('통화', sort=False).agg(
+        잔액=('잔액', 'sum'),
+        원화환산잔액=('원화환산잔액', lambda s: s.sum(min_count=len(s)))
+    ).sort_values('원화환산잔액', ascending=False)
+
+    return {
+        'success': True,
+        'total': float(np.nansum(grouped['원화환산잔액'].to_numpy())),
+        'by_currency': [
+            {
+                '통화': currency,
+                '잔액': float(row['잔액']),
+                '원화환산잔액': None if pd.isna(row['원화환산잔액']) else float(row['원화환산잔액'])
+            }
+            for currency, row in grouped.iterrows()
+        ],
+        'missing': converted['missing']
+    }
+
+
+# ======================================================================
+# 유동성 갭 큐브 (SCENARIO_NO × TIME_BAND 사전 집계 테이블)
+# ======================================================================
+
+LIQUIDITY_GAP_CUBE_NAME = 'NFAR_LIQ_GAP_CUBE'
+LIQUIDITY_GAP_SOURCE_TABLE = 'NFAR_LIQ_GAP_310524'
+
+# 파생 테이블 메타 (이름별 원본 테이블 지문)
+DERIVED_META_DDL = """
+    CREATE TABLE IF NOT EXISTS ALM_DERIVED_META (
+        NAME TEXT PRIMARY KEY,
+        SOURCE_TABLE TEXT NOT NULL,
+        FINGERPRINT TEXT NOT NULL,
+        BUILT_AT TEXT
+    )
+"""
+
+# 원본 테이블이 바뀌면 파생 데이터의 지문을 이 값으로 바꿔 무효화 (트리거)
+DERIVED_STALE_FINGERPRINT = 'stale'
+DERIVED_TRIGGER_EVENTS = ('INSERT', 'UPDATE', 'DELETE')
+
+# 원본 행이 추가/수정/삭제되면 큐브 지문을 무효화 (건수/rowid가 그대로인 제자리 UPDATE 포함)
+LIQUIDITY_GAP_CUBE_TRIGGERS = {
+    f"TR_{LIQUIDITY_GAP_CUBE_NAME}_STALE_{event}": f"""
+    CREATE TRIGGER IF NOT EXISTS TR_{LIQUIDITY_GAP_CUBE_NAME}_STALE_{event}
+    AFTER {event} ON {LIQUIDITY_GAP_SOURCE_TABLE}
+    BEGIN
+        UPDATE ALM_DERIVED_META SET FINGERPRINT = '{DERIVED_STALE_FINGERPRINT}'
+        WHERE NAME = '{LIQUIDITY_GAP_CUBE_NAME}' AND FINGERPRINT != '{DERIVED_STALE_FINGERPRINT}';
+    END
+    """
+    for event in DERIVED_TRIGGER_EVENTS
+}
+
+LIQUIDITY_GAP_CUBE_BUILD_SQL = [
+    f"DROP TABLE IF EXISTS {LIQUIDITY_GAP_CUBE_NAME}",
+    f"""
+    CREATE TABLE {LIQUIDITY_GAP_CUBE_NAME} (
+        SCENARIO_NO,
+        TIME_BAND,
+        GAP_PRN_TOTAL REAL,
+        GAP_INT_TOTAL REAL,
+        GAP_TOTAL REAL,          -- SUM(GAP_PRN_TOTAL + GAP_INT_TOTAL) (원본 리포트 쿼리와 같은 NULL 처리)
+        ROW_COUNT INTEGER,
+        CUM_GAP_TOTAL REAL,      -- 시나리오 내 기간대 순 누적 총갭
+        PRIMARY KEY (SCENARIO_NO, TIME_BAND)
+    )
+    """,
+    f"""
+    INSERT INTO {LIQUIDITY_GAP_CUBE_NAME}
+    SELECT
+        SCENARIO_NO,
+        TIME_BAND,
+        GAP_PRN_TOTAL,
+        GAP_INT_TOTAL,
+        GAP_TOTAL,
+        ROW_COUNT,
+        SUM(GAP_TOTAL) OVER (PARTITION BY SCENARIO_NO ORDER BY TIME_BAND) as CUM_GAP_TOTAL
+    FROM (
+        SELECT
+            SCENARIO_NO,
+            TIME_BAND,
+            SUM(GAP_PRN_TOTAL) as GAP_PRN_TOTAL,
+            SUM(GAP_INT_TOTAL) as GAP_INT_TOTAL,
+            SUM(GAP_PRN_TOTAL + GAP_INT_TOTAL) as GAP_TOTAL,
+            COUNT(*) as ROW_COUNT
+        FROM {LIQUIDITY_GAP_SOURCE_TABLE}
+        GROUP BY SCENARIO_NO, TIME_BAND
+    )
+    """,
+]
+
+_gap_cube_freshness: Optional[Tuple[Tuple, bool]] = None
+
+
+def _liquidity_gap_source_fingerprint(conn: sqlite3.Connection) -> str:
+    """
+    원본 유동성 갭 테이블 지문 ('건수:최대 rowid')
+
+    테이블을 다시 적재한 경우를 구분하며, 제자리 UPDATE는 트리거가 무효화합니다.
+    """
+    row = conn.execute(QUERY_REGISTRY['liquidity_gap_source_fingerprint']).fetchone()
+    return f"{row[0]}:{row[1]}"
+
+
+def _triggers_installed(conn: sqlite3.Connection, names: Sequence[str]) -> bool:
+    """무효화 트리거가 모두 있는지 확인 (원본 테이블을 DROP 후 다시 만들면 트리거도 사라짐)"""
+    placeholders = ', '.join('?' for _ in names)
+    count = conn.execute(
+        f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name IN ({placeholders})",
+        list(names)
+    ).fetchone()[0]
+    return count == len(names)
+
+
+def build_liquidity_gap_cube(db_path: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
+    """
+    유동성 갭 큐브 생성 (데이터 적재 후 1회 실행하는 오프라인 작업)
+
+    원본 지문이 ALM_DERIVED_META에 기록된 값과 같으면 다시 만들지 않습니다.
+    원본 테이블에 무효화 트리거를 설치하므로, 이후 원본이 수정되면(제자리 UPDATE 포함)
+    기록된 지문이 'stale'로 바뀌어 다음 실행 때 다시 만듭니다.
+
+    Args:
+        db_path: 대상 DB 경로 (None이면 DB_PATH)
+        force: True면 지문과 관계없이 다시 생성
+
+    Returns:
+        {'success': bool, 'built': bool, 'rows': int, 'fingerprint': str}
+    """
+    db_path = db_path or DB_PATH
+    if not os.path.exists(db_path):
+        return {'success': False, 'error': f"DB 파일을 찾을 수 없습니다: {db_path}"}
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(DERIVED_META_DDL)
+        fingerprint = _liquidity_gap_source_fingerprint(conn)
+        stored = conn.execute(
+            "SELECT FINGERPRINT FROM ALM_DERIVED_META WHERE NAME = ?", (LIQUIDITY_GAP_CUBE_NAME,)
+        ).fetchone()
+        triggers_ready = _triggers_installed(conn, list(LIQUIDITY_GAP_CUBE_TRIGGERS))
+
+        built = force or stored is None or stored[0] != fingerprint or not triggers_ready
+        if built:
+            with conn:
+                for sql in LIQUIDITY_GAP_CUBE_BUILD_SQL:
+                    conn.execute(sql)
+                for sql in LIQUIDITY_GAP_CUBE_TRIGGERS.values():
+                    conn.execute(sql)
+                conn.execute(
+                    "INSERT OR REPLACE INTO ALM_DERIVED_META VALUES (?, ?, ?, ?)",
+                    (LIQUIDITY_GAP_CUBE_NAME, LIQUIDITY_GAP_SOURCE_TABLE, fingerprint,
+                     datetime.now().isoformat(timespec='seconds'))
+                )
+
+        rows = conn.execute(f"SELECT COUNT(*) FROM {LIQUIDITY_GAP_CUBE_NAME}").fetchone()[0]
+        return {'success': True, 'built': built, 'rows': rows, 'fingerprint': fingerprint}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+    finally:
+        conn.close()
+
+
+def is_liquidity_gap_cube_fresh() -> bool:
+    """
+    유동성 갭 큐브가 원본 테이블과 일치하는지 확인
+
+    큐브 생성 시 기록한 원본 지문과 현재 지문을 비교하며, 결과는 데이터 버전별로 캐시합니다.
+    원본이 수정되면 트리거가 기록된 지문을 'stale'로 바꾸고, 트리거가 없으면
+    (원본 테이블을 다시 만든 경우) 최신이 아닌 것으로 보고 원본 테이블을 조회합니다.
+    """
+    global _gap_cube_freshness
+
+    tables = get_table_info()
+    if LIQUIDITY_GAP_CUBE_NAME not in tables or 'ALM_DERIVED_META' not in tables:
+        return False
+
+    try:
+        with get_db_pool().connection() as conn:
+            version = get_data_version(conn)
+            if _gap_cube_freshness is not None and _gap_cube_freshness[0] == version:
+                return _gap_cube_freshness[1]
+
+            stored = conn.execute(
+                QUERY_REGISTRY['derived_table_fingerprint'], {'name': LIQUIDITY_GAP_CUBE_NAME}
+            ).fetchone()
+            fresh = (
+                stored is not None
+                and stored[0] == _liquidity_gap_source_fingerprint(conn)
+                and _triggers_installed(conn, list(LIQUIDITY_GAP_CUBE_TRIGGERS))
+            )
+    except Exception:
+        return False
+
+    _gap_cube_freshness = (version, fresh)
+    return fresh
+
+
+def _gap_query_name(name: str) -> str:
+    """큐브가 최신이면 큐브 조회 쿼리 이름, 아니면 원본 쿼리 이름"""
+    return f'cube_{name}' if is_liquidity_gap_cube_fresh() else name
+
+# ======================================================================
+# 스키마 설명 조회 (캐싱)
+# ======================================================================
+
+# 컬럼 설명 전체 사전 (데이터 버전별로 한 번 적재, 읽기 전용)
+_column_descriptions: Optional[Tuple[Tuple, Mapping]] = None
+_column_descriptions_lock = threading.Lock()
+
+
+def _column_descriptions_cache_file() -> str:
+    """컬럼 설명 캐시 파일 경로 (스키마 캐시 파일 옆)"""
+    path = _schema_cache_file()
+    return (path[:-len('.schema.json')] if path.endswith('.schema.json') else path) + '.columns.json'
+
+
+def _load_column_descriptions_file(signature: List[Any]) -> Optional[Dict[Tuple[str, str], str]]:
+    """서명이 일치하는 컬럼 설명 캐시 파일 로드 (없거나 오래되었으면 None)"""
+    try:
+        with open(_column_descriptions_cache_file(), 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if cached.get('signature') != signature:
+        return None
+    return {(table, column): desc for table, column, desc in cached.get('descriptions', [])}
+
+
+def _save_column_descriptions_file(signature: List[Any], descriptions: Dict[Tuple[str, str], str]):
+    """컬럼 설명 캐시 파일 저장 (쓰기 실패는 무시)"""
+    path = _column_descriptions_cache_file()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'signature': signature,
+                'descriptions': [[table, column, desc] for (table, column), desc in descriptions.items()]
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def get_column_descriptions() -> Mapping:
+    """
+    column_descriptions 테이블 전체를 {(테이블명, 컬럼명): 설명} 읽기 전용 사전으로 반환
+
+    처음 호출될 때 한 번의 쿼리로 전체를 적재하고 데이터 버전이 바뀌기 전까지 재사용합니다.
+    반환값은 MappingProxyType이므로 여러 스레드가 잠금 없이 공유할 수 있습니다.
+    SCHEMA_CACHE_ENABLED이면 DB/WAL 파일 서명과 함께 캐시 파일에 저장하여
+    다른 프로세스는 DB를 다시 조회하지 않습니다.
+    테이블이 없으면 빈 사전을 반환합니다.
+    """
+    global _column_descriptions
+
+    version = get_data_version()
+    cached = _column_descriptions
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _column_descriptions_lock:
+        cached = _column_descriptions
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        # 프로세스 간 공유 서명: 세대 번호(프로세스별)를 뺀 DB 경로 + DB/WAL mtime·size
+        signature = [version[0], *version[2:]]
+        descriptions = _load_column_descriptions_file(signature) if SCHEMA_CACHE_ENABLED else None
+
+        if descriptions is None:
+            descriptions = {}
+            result = run_registered_query('column_descriptions_all')
+            if result['success']:
+                for table_name, column_name, description in result.rows:
+                    descriptions.setdefault((table_name, column_name), description)
+                if SCHEMA_CACHE_ENABLED:
+                    _save_column_descriptions_file(signature, descriptions)
+
+        mapping = MappingProxyType(descriptions)
+        _column_descriptions = (version, mapping)
+        return mapping
+
+
+def get_column_description(table_name: str, column_name: str) -> Optional[str]:
+    """
+    컬럼 설명 조회 (get_column_descriptions() 사전 조회)
+
+    Args:
+        table_name: 테이블명 (예: 'ALM_INST', 'INST_ALM_01')
+        column_name: 컬럼명 (예: 'DIM_PROD')
+
+    Returns:
+        컬럼 설명 (없으면 None)
+    """
+    try:
+        return get_column_descriptions().get((table_name, column_name))
+    except Exception:
         return None
 
 def get_column_label(column_name: str, table_name: str = 'ALM_INST') -> str:
@@ -138,29 +1743,290 @@ def get_column_label(column_name: str, table_name: str = 'ALM_INST') -> str:
 # 비즈니스 로직 함수들
 # ======================================================================
 
-def execute_sql_query(query: str) -> Dict[str, Any]:
+# fetchmany 기본 배치 크기
+DEFAULT_FETCH_BATCH_SIZE = 5000
+
+
+def _records_from_rows(columns: List[str], rows: Sequence[tuple]) -> List[Dict[str, Any]]:
+    """
+    행 튜플을 레코드 딕셔너리로 변환
+
+    pandas DataFrame.to_dict('records')와 같은 값을 만들기 위해
+    NULL이 섞인 숫자 컬럼과 int/float 혼합 컬럼은 float(NULL은 NaN)으로 맞춥니다.
+    """
+    float_columns = []
+    for j in range(len(columns)):
+        has_number = has_float = has_none = False
+        numeric = True
+        for row in rows:
+            value = row[j]
+            if value is None:
+                has_none = True
+            elif isinstance(value, float):
+                has_number = has_float = True
+            elif isinstance(value, int) and not isinstance(value, bool):
+                has_number = True
+            else:
+                numeric = False
+                break
+        if numeric and has_number and (has_none or has_float):
+            float_columns.append(j)
+
+    if not float_columns:
+        return [dict(zip(columns, row)) for row in rows]
+
+    nan = float('nan')
+    records = []
+    for row in rows:
+        values = list(row)
+        for j in float_columns:
+            value = values[j]
+            values[j] = nan if value is None else float(value)
+        records.append(dict(zip(columns, values)))
+    return records
+
+
+def _estimate_rows_bytes(rows: Sequence[tuple], sample_size: int = 100) -> int:
+    """행 튜플 메모리 사용량 추정 (앞쪽 일부 행을 표본으로 사용)"""
+    if not rows:
+        return sys.getsizeof(rows)
+
+    sample = rows[:sample_size]
+    sample_bytes = sum(
+        sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+        for row in sample
+    )
+    return sys.getsizeof(rows) + int(sample_bytes / len(sample) * len(rows))
+
+
+class QueryResult(Mapping):
+    """
+    execute_sql_query 성공 결과
+
+    조회한 행은 튜플로 한 번만 보관하고, 'data'(레코드 리스트)와
+    'dataframe'(pandas DataFrame)은 처음 접근할 때 만들어집니다.
+    기존 결과 딕셔너리와 같은 키(success, data, columns, row_count, dataframe)를 제공합니다.
+    """
+
+    _KEYS = ('success', 'data', 'columns', 'row_count', 'dataframe')
+
+    def __init__(self, columns: List[str], rows: Sequence[tuple]):
+        self.columns = list(columns)
+        self.rows = rows
+        self._data: Optional[List[Dict[str, Any]]] = None
+        self._dataframe: Optional[pd.DataFrame] = None
+
+    @property
+    def data(self) -> List[Dict[str, Any]]:
+        """레코드 리스트 (지연 생성)"""
+        if self._data is None:
+            self._data = _records_from_rows(self.columns, self.rows)
+        return self._data
+
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        """DataFrame (지연 생성)"""
+        if self._dataframe is None:
+            self._dataframe = pd.DataFrame.from_records(
+                list(self.rows), columns=self.columns, coerce_float=True
+            )
+        return self._dataframe
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'success':
+            return True
+        if key == 'data':
+            return self.data
+        if key == 'columns':
+            return self.columns
+        if key == 'row_count':
+            return len(self.rows)
+        if key == 'dataframe':
+            return self.dataframe
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return f"QueryResult(columns={self.columns}, row_count={len(self.rows)})"
+
+
+class QueryStream:
+    """
+    커서 기반 스트리밍 조회
+
+    풀 커넥션을 점유한 채 fetchmany로 배치 단위 행을 읽습니다.
+    반드시 with 문으로 사용하거나 close()를 호출해 커넥션을 반환하세요.
+
+    사용 예:
+        with stream_sql_query("SELECT ... FROM ALM_INST", batch_size=10000) as stream:
+            for batch in stream:          # List[tuple]
+                ...
+    """
+
+    def __init__(
+        self,
+        query: str,
+        params: Optional[Union[Dict[str, Any], Sequence[Any]]] = None,
+        batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+        name: Optional[str] = None
+    ):
+        self.query = query
+        self.params = params
+        self.batch_size = batch_size
+        self.name = name or 'adhoc_stream'
+        self.columns: List[str] = []
+        self.row_count = 0
+
+        self._conn_cm = None
+        self._cursor: Optional[sqlite3.Cursor] = None
+        self._start = 0.0
+
+    def open(self) -> 'QueryStream':
+        """커넥션을 빌려 쿼리 실행"""
+        self._start = time.perf_counter()
+        self._conn_cm = get_db_pool().connection()
+        conn = self._conn_cm.__enter__()
+        try:
+            self._cursor = conn.execute(self.query, self.params or ())
+        except Exception:
+            self.close(success=False)
+            raise
+        self.columns = [desc[0] for desc in self._cursor.description or []]
+        return self
+
+    def __enter__(self) -> 'QueryStream':
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(success=exc_type is None)
+
+    def __iter__(self) -> Iterator[List[tuple]]:
+        """행 튜플 배치를 순서대로 반환"""
+        if self._cursor is None:
+            raise RuntimeError("QueryStream이 열려 있지 않습니다 (with 문을 사용하세요)")
+
+        while True:
+            batch = self._cursor.fetchmany(self.batch_size)
+            if not batch:
+                break
+            self.row_count += len(batch)
+            yield batch
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """레코드 딕셔너리를 하나씩 반환"""
+        for batch in self:
+            yield from _records_from_rows(self.columns, batch)
+
+    def iter_dataframes(self) -> Iterator[pd.DataFrame]:
+        """배치별 DataFrame 반환"""
+        for batch in self:
+            yield pd.DataFrame.from_records(batch, columns=self.columns, coerce_float=True)
+
+    def close(self, success: bool = True):
+        """커서를 닫고 커넥션 반환"""
+        if self._cursor is not None:
+            self._cursor.close()
+            self._cursor = None
+        if self._conn_cm is not None:
+            self._conn_cm.__exit__(None, None, None)
+            self._conn_cm = None
+            _record_query_stats(self.name, (time.perf_counter() - self._start) * 1000, success)
+
+
+def stream_sql_query(
+    query: str,
+    params: Optional[Union[Dict[str, Any], Sequence[Any]]] = None,
+    batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+    name: Optional[str] = None
+) -> QueryStream:
+    """
+    대용량 결과를 배치 단위로 읽는 스트림 생성 (결과 캐시를 사용하지 않음)
+
+    Args:
+        query: 실행할 SQL 쿼리
+        params: 바인딩 파라미터
+        batch_size: fetchmany 배치 크기
+        name: 실행 통계에 기록할 쿼리 이름
+
+    Returns:
+        QueryStream (with 문으로 사용)
+    """
+    return QueryStream(query, params, batch_size, name)
+
+
+def stream_registered_query(
+    name: str,
+    params: Optional[Dict[str, Any]] = None,
+    batch_size: int = DEFAULT_FETCH_BATCH_SIZE
+) -> QueryStream:
+    """QUERY_REGISTRY에 등록된 쿼리의 스트림 생성"""
+    if name not in QUERY_REGISTRY:
+        raise KeyError(f"등록되지 않은 쿼리: {name}")
+    return QueryStream(QUERY_REGISTRY[name], params or {}, batch_size, name)
+
+
+def execute_sql_query(
+    query: str,
+    params: Optional[Union[Dict[str, Any], Sequence[Any]]] = None,
+    name: Optional[str] = None,
+    use_cache: bool = True,
+    max_rows: Optional[int] = None
+) -> Dict[str, Any]:
     """
     SQL 쿼리를 실행하고 결과를 반환
     
+    행은 튜플로 한 번만 가져오고 'data'/'dataframe'은 접근할 때 생성됩니다.
+    SELECT 결과는 데이터 버전이 바뀌기 전까지 쿼리 결과 캐시에서 재사용됩니다.
+    대용량 결과를 순회만 한다면 stream_sql_query()를 사용하세요.
+
     Args:
-        query: 실행할 SQL 쿼리
+        query: 실행할 SQL 쿼리 (값은 :name 또는 ? 플레이스홀더로 바인딩)
+        params: 바인딩 파라미터
+        name: 실행 통계에 기록할 쿼리 이름 (None이면 'adhoc')
+        use_cache: 쿼리 결과 캐시 사용 여부
+        max_rows: 최대로 가져올 행 수 (None이면 전체)
     
     Returns:
         결과 딕셔너리 (data, columns, row_count 포함)
     """
+    start = time.perf_counter()
     try:
-        conn = get_db_connection()
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        
-        return {
-            "success": True,
-            "data": df.to_dict('records'),
-            "columns": df.columns.tolist(),
-            "row_count": len(df),
-            "dataframe": df
-        }
+        with get_db_pool().connection() as conn:
+            cache_key = None
+            if use_cache and RESULT_CACHE_ENABLED:
+                cache_key = _result_cache_key(query, params)
+                if cache_key is not None:
+                    cache_key = cache_key + (max_rows,)
+
+            version = None
+            cached = None
+            if cache_key is not None:
+                version = get_data_version(conn)
+                cached = _result_cache.get(cache_key, version)
+
+            if cached is not None:
+                columns, rows = cached
+            else:
+                cursor = conn.execute(query, params or ())
+                try:
+                    columns = [desc[0] for desc in cursor.description or []]
+                    rows = cursor.fetchall() if max_rows is None else cursor.fetchmany(max_rows)
+                finally:
+                    cursor.close()
+                _record_query_stats(name or 'adhoc', (time.perf_counter() - start) * 1000, True)
+
+                if cache_key is not None:
+                    rows = tuple(rows)
+                    _result_cache.put(cache_key, version, (columns, rows), _estimate_rows_bytes(rows))
+
+        return QueryResult(columns, rows)
     except Exception as e:
+        _record_query_stats(name or 'adhoc', (time.perf_counter() - start) * 1000, False)
         return {
             "success": False,
             "error": str(e),
@@ -180,15 +2046,24 @@ def search_alm_contracts(filters: Optional[Dict] = None, limit: int = 10) -> str
     Returns:
         검색 결과 문자열
     """
-    query = "SELECT * FROM ALM_INST"
-    
+    conditions = []
+    params: Dict[str, Any] = {'limit': int(limit)}
+
     if filters:
-        conditions = [f"{k} = '{v}'" for k, v in filters.items()]
+        error = _validate_identifiers('ALM_INST', list(filters.keys()))
+        if error:
+            return f"오류 발생: {error}"
+
+        for i, (column, value) in enumerate(sorted(filters.items())):
+            conditions.append(f"{column} = :f{i}")
+            params[f"f{i}"] = value
+
+    query = "SELECT * FROM ALM_INST"
+    if conditions:
         query += " WHERE " + " AND ".join(conditions)
+    query += " LIMIT :limit"
     
-    query += f" LIMIT {limit}"
-    
-    result = execute_sql_query(query)
+    result = execute_sql_query(query, params, name='search_contracts')
     
     if result["success"]:
         df = result["dataframe"]
@@ -196,31 +2071,43 @@ def search_alm_contracts(filters: Optional[Dict] = None, limit: int = 10) -> str
     else:
         return f"오류 발생: {result['error']}"
 
-def analyze_liquidity_gap(scenario_no: Optional[int] = None) -> str:
+def analyze_liquidity_gap(
+    scenario_no: Optional[int] = None,
+    time_bands: Optional[Union[str, Sequence[str]]] = None,
+    base_date: Optional[str] = None
+) -> str:
     """
     유동성 갭 분석
+
+    유동성 갭 큐브(NFAR_LIQ_GAP_CUBE)가 최신이면 원본 대신 큐브에서 조회합니다.
+    time_bands를 지정하면 NFAR_LIQ_GAP_310524 대신 ALM_INST 계약 현금흐름을
+    프로젝션해 사용자 정의 기간대로 다시 집계합니다 (scenario_no는 사용하지 않음).
     
     Args:
         scenario_no: 시나리오 번호
+        time_bands: 사용자 정의 기간대 상한 (예: '1M,3M,6M,1Y,3Y')
+        base_date: 현금흐름 프로젝션 기준일 (None이면 최근 BASE_DATE)
     
     Returns:
         분석 결과 문자열
     """
-    query = """
-    SELECT 
-        TIME_BAND,
-        SUM(GAP_PRN_TOTAL) as 총_원금갭,
-        SUM(GAP_INT_TOTAL) as 총_이자갭,
-        COUNT(*) as 건수
-    FROM NFAR_LIQ_GAP_310524
-    """
-    
+    if time_bands:
+        projection = project_cash_flows(base_date)
+        if not projection['success']:
+            return f"오류 발생: {projection['error']}"
+        try:
+            df = bucket_cash_flows(projection, time_bands)
+        except ValueError as e:
+            return f"오류 발생: {e}"
+        return (
+            f"유동성 갭 분석 결과 (계약 현금흐름 기준, 기준일 {projection['base_date']}, "
+            f"계약 {projection['contract_count']:,}건):\n\n{df.to_string()}\n\n총 {len(df)}개 기간대"
+        )
+
     if scenario_no is not None:
-        query += f" WHERE SCENARIO_NO = {scenario_no}"
-    
-    query += " GROUP BY TIME_BAND ORDER BY TIME_BAND"
-    
-    result = execute_sql_query(query)
+        result = run_registered_query(_gap_query_name('liquidity_gap_by_scenario'), {'scenario_no': int(scenario_no)})
+    else:
+        result = run_registered_query(_gap_query_name('liquidity_gap'))
     
     if result["success"]:
         df = result["dataframe"]
@@ -239,18 +2126,24 @@ def get_exchange_rate(currency: str, date: Optional[str] = None) -> str:
     Returns:
         환율 정보 문자열
     """
-    query = f"SELECT * FROM NFA_EXCH_RATE_HIST WHERE UNIT_CURRENCY_CD = '{currency}'"
-    
+    note = ""
     if date:
-        query += f" AND EFFECTIVE_DATE = '{date}'"
-    
-    query += " ORDER BY EFFECTIVE_DATE DESC LIMIT 10"
-    
-    result = execute_sql_query(query)
+        # 해당 일자 고시 환율이 없으면 직전 고시일 환율 사용
+        effective_date = date
+        try:
+            calendar = get_date_calendar('NFA_EXCH_RATE_HIST', 'EFFECTIVE_DATE', currency)
+            effective_date = calendar.on_or_before(date) or date
+        except Exception:
+            pass
+        if effective_date[:10] != date[:10]:
+            note = f"({date} 고시 환율이 없어 직전 고시일 {effective_date[:10]} 기준)\n"
+        result = run_registered_query('exchange_rate_on_date', {'currency': currency, 'date': effective_date})
+    else:
+        result = run_registered_query('exchange_rate', {'currency': currency})
     
     if result["success"]:
         df = result["dataframe"]
-        return f"{currency} 환율 정보:\n\n{df.to_string()}"
+        return f"{currency} 환율 정보:\n{note}\n{df.to_string()}"
     else:
         return f"오류 발생: {result['error']}"
 
@@ -265,14 +2158,10 @@ def get_interest_rate(rate_cd: int, term: Optional[int] = None) -> str:
     Returns:
         금리 정보 문자열
     """
-    query = f"SELECT * FROM NFA_IRC_RATE_HIST WHERE INT_RATE_CD = {rate_cd}"
-    
     if term is not None:
-        query += f" AND INT_RATE_TERM = {term}"
-    
-    query += " ORDER BY EFFECTIVE_DATE DESC LIMIT 10"
-    
-    result = execute_sql_query(query)
+        result = run_registered_query('interest_rate_by_term', {'rate_cd': int(rate_cd), 'term': int(term)})
+    else:
+        result = run_registered_query('interest_rate', {'rate_cd': int(rate_cd)})
     
     if result["success"]:
         df = result["dataframe"]
@@ -280,7 +2169,12 @@ def get_interest_rate(rate_cd: int, term: Optional[int] = None) -> str:
     else:
         return f"오류 발생: {result['error']}"
 
-def get_aggregate_stats(table_name: str, group_by: str, aggregate_col: str) -> str:
+def get_aggregate_stats(
+    table_name: str,
+    group_by: str,
+    aggregate_col: str,
+    krw_equivalent: bool = False
+) -> str:
     """
     집계 통계 조회
     
@@ -288,10 +2182,20 @@ def get_aggregate_stats(table_name: str, group_by: str, aggregate_col: str) -> s
         table_name: 테이블명
         group_by: 그룹화 컬럼
         aggregate_col: 집계 컬럼
+        krw_equivalent: True면 BASE_DATE별 직전 고시 환율로 환산한 원화환산_합계 컬럼 추가
+                        (CURRENCY_CD, BASE_DATE 컬럼이 있는 테이블만)
     
     Returns:
         통계 결과 문자열
     """
+    error = _validate_identifiers(table_name, [group_by, aggregate_col])
+    if error:
+        return f"오류 발생: {error}"
+    if krw_equivalent:
+        error = _validate_identifiers(table_name, ['CURRENCY_CD', 'BASE_DATE'])
+        if error:
+            return f"오류 발생: 원화 환산에는 CURRENCY_CD, BASE_DATE 컬럼이 필요합니다 ({error})"
+
     query = f"""
     SELECT 
         {group_by},
@@ -306,338 +2210,1787 @@ def get_aggregate_stats(table_name: str, group_by: str, aggregate_col: str) -> s
     LIMIT 20
     """
     
-    result = execute_sql_query(query)
+    result = execute_sql_query(query, name='aggregate_stats')
     
     if result["success"]:
         df = result["dataframe"]
-        return f"{table_name} 테이블 {group_by}별 {aggregate_col} 집계:\n\n{df.to_string()}"
+        note = ""
+        if krw_equivalent:
+            krw = _aggregate_krw_equivalent(table_name, group_by, aggregate_col)
+            if not krw['success']:
+                return f"오류 발생: {krw['error']}"
+            df = df.assign(원화환산_합계=df[group_by].map(krw['totals']))
+            if krw['missing']:
+                note = f"\n\n(환율 없음: {', '.join(krw['missing'])} - 해당 그룹의 원화환산_합계는 NaN)"
+        return f"{table_name} 테이블 {group_by}별 {aggregate_col} 집계:\n\n{df.to_string()}{note}"
     else:
         return f"오류 발생: {result['error']}"
 
 
+def _aggregate_krw_equivalent(table_name: str, group_by: str, aggregate_col: str) -> Dict[str, Any]:
+    """그룹 × 기준일 × 통화 합계를 as-of 환율로 환산해 그룹별 원화 합계 계산"""
+    query = f"""
+    SELECT
+        {group_by} as grp,
+        BASE_DATE,
+        CURRENCY_CD,
+        SUM({aggregate_col}) as total
+    FROM {table_name}
+    GROUP BY {group_by}, BASE_DATE, CURRENCY_CD
+    """
+    result = execute_sql_query(query, name='aggregate_stats_krw')
+    if not result['success']:
+        return {'success': False, 'error': result['error']}
+    if not result.rows:
+        return {'success': True, 'totals': {}, 'missing': []}
+
+    groups, base_dates, currencies, totals = zip(*result.rows)
+    try:
+        converted = convert_to_krw(currencies, base_dates, totals)
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+    krw = pd.Series(converted['krw']).groupby(pd.Series(groups, dtype=object), sort=False, dropna=False)
+    # 환율이 없는 행이 있는 그룹은 NaN (부분 환산 방지)
+    return {
+        'success': True,
+        'totals': krw.sum(min_count=1).where(krw.count() == krw.size()).to_dict(),
+        'missing': converted['missing']
+    }
+
+
+
+
+# ============================================================
+# Phase 1: 종합 리포트 생성 함수
+# ============================================================
+
+# 섹션 병렬 실행 설정
+REPORT_MAX_WORKERS = 4
+# 섹션별 제한 시간 (초, 섹션이 작업 스레드에서 실제로 시작한 시점부터). 초과한 섹션은 리포트에서 제외하고 metadata에 기록
+REPORT_SECTION_TIMEOUT = 30.0
+# 작업 스레드를 기다리는 섹션이 있을 때 시작 여부 확인 주기 (초)
+REPORT_POLL_INTERVAL = 0.05
+
+
+def _build_data_overview_section(scenario_no: Optional[int]) -> Optional[Dict[str, Any]]:
+    """데이터 개요 섹션"""
+    result = run_registered_query('report_data_overview')
+
+    if not result["success"]:
+        return None
+
+    section = {
+        'title': '데이터 개요',
+        'data': result['data'],
+        'summary': f"총 {sum([r['계약수'] for r in result['data']])}건의 계약, "
+                  f"{len(result['data'])}개 통화"
+    }
+
+    # 기준일별 직전 고시 환율로 원화 환산 (환율표가 없으면 생략)
+    krw = get_krw_balance_summary()
+    if krw['success'] and krw['by_currency']:
+        section['krw_equivalent'] = krw
+        section['summary'] += f", 원화 환산 총잔액 {krw['total']:,.0f}원"
+        if krw['missing']:
+            section['summary'] += f" (환율 없음: {', '.join(krw['missing'])} 제외)"
+
+    return section
+
+
+def _build_liquidity_gap_section(scenario_no: Optional[int]) -> Optional[Dict[str, Any]]:
+    """유동성 갭 섹션"""
+    if scenario_no is not None:
+        result = run_registered_query(_gap_query_name('report_liquidity_gap_by_scenario'), {'scenario_no': int(scenario_no)})
+    else:
+        result = run_registered_query(_gap_query_name('report_liquidity_gap'))
+
+    if not result["success"]:
+        return None
+
+    df = result['dataframe']
+    total_gap = df['총갭'].sum() if '총갭' in df.columns else 0
+
+    return {
+        'title': '유동성 갭 분석',
+        'data': result['data'],
+        'summary': f"총 {result['row_count']}개 기간대, 총갭: {total_gap:,.0f}",
+        'scenario_no': scenario_no
+    }
+
+
+def _build_market_data_section(scenario_no: Optional[int]) -> Optional[Dict[str, Any]]:
+    """시장 데이터 섹션"""
+    exchange_result = run_registered_query('report_exchange_rates')
+    interest_result = run_registered_query('report_interest_rates')
+
+    return {
+        'title': '시장 데이터',
+        'exchange_rates': exchange_result['data'] if exchange_result['success'] else [],
+        'interest_rates': interest_result['data'] if interest_result['success'] else [],
+        'summary': f"환율 {len(exchange_result['data'])}건, 금리 {len(interest_result['data'])}건"
+    }
+
+
+def _build_dimensional_analysis_section(scenario_no: Optional[int]) -> Optional[Dict[str, Any]]:
+    """차원 분석 섹션"""
+    dim_result = run_registered_query('report_alm_dimensions')
+
+    return {
+        'title': '차원 분석',
+        'data': dim_result['data'] if dim_result['success'] else [],
+        'summary': f"총 {len(dim_result['data'])}개 ALM 차원"
+    }
+
+
+# 리포트 섹션 빌더 (순서 = 리포트 섹션 순서)
+REPORT_SECTION_BUILDERS = {
+    'data_overview': _build_data_overview_section,
+    'liquidity_gap': _build_liquidity_gap_section,
+    'market_data': _build_market_data_section,
+    'dimensional_analysis': _build_dimensional_analysis_section,
+}
+
+
+# 섹션 결과가 의존하는 리포트 파라미터 (없으면 데이터 버전에만 의존)
+REPORT_SECTION_PARAMS = {
+    'liquidity_gap': ('scenario_no',),
+}
+
+# 섹션 캐시 설정
+REPORT_SECTION_CACHE_ENABLED = True
+REPORT_SECTION_CACHE_SIZE = 64
+
+_report_section_cache: 'OrderedDict[Tuple, Dict[str, Any]]' = OrderedDict()
+_report_section_cache_lock = threading.Lock()
+_report_section_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def _report_section_cache_key(name: str, params: Dict[str, Any], version: Tuple) -> Tuple:
+    """(섹션명, 관련 파라미터, 데이터 버전) 캐시 키"""
+    relevant = tuple((param, params.get(param)) for param in REPORT_SECTION_PARAMS.get(name, ()))
+    return (name, relevant, version)
+
+
+def _get_cached_report_section(key: Tuple) -> Optional[Dict[str, Any]]:
+    """섹션 캐시 조회 (호출자가 수정해도 캐시가 바뀌지 않도록 복사본 반환)"""
+    with _report_section_cache_lock:
+        section = _report_section_cache.get(key)
+        if section is None:
+            _report_section_cache_stats['misses'] += 1
+            return None
+        _report_section_cache.move_to_end(key)
+        _report_section_cache_stats['hits'] += 1
+    return copy.deepcopy(section)
+
+
+def _put_cached_report_section(key: Tuple, section: Dict[str, Any]):
+    """섹션 캐시 저장"""
+    with _report_section_cache_lock:
+        _report_section_cache[key] = copy.deepcopy(section)
+        _report_section_cache.move_to_end(key)
+        while len(_report_section_cache) > REPORT_SECTION_CACHE_SIZE:
+            _report_section_cache.popitem(last=False)
+            _report_section_cache_stats['evictions'] += 1
+
+
+def get_report_section_cache_stats() -> Dict[str, Any]:
+    """리포트 섹션 캐시 통계"""
+    with _report_section_cache_lock:
+        stats = dict(_report_section_cache_stats)
+        stats['entries'] = len(_report_section_cache)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    return stats
+
+
+def clear_report_section_cache():
+    """리포트 섹션 캐시 및 통계 초기화"""
+    with _report_section_cache_lock:
+        _report_section_cache.clear()
+        for key in _report_section_cache_stats:
+            _report_section_cache_stats[key] = 0
+
+
+def _run_report_section(
+    name: str,
+    scenario_no: Optional[int],
+    started: Optional[Dict[str, float]] = None
+) -> Tuple[Optional[Dict[str, Any]], float]:
+    """섹션 빌더 실행 (결과, 소요 시간 ms). started가 있으면 시작 시각을 기록"""
+    start = time.perf_counter()
+    if started is not None:
+        started[name] = start
+    section = REPORT_SECTION_BUILDERS[name](scenario_no)
+    return section, (time.perf_counter() - start) * 1000
+
+
+def generate_comprehensive_report(
+    include_sections: Optional[List[str]] = None,
+    scenario_no: Optional[int] = None,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    종합 ALM 분석 리포트 생성 (Phase 1)
+
+    섹션은 서로 독립적인 읽기 전용 쿼리이므로 최대 REPORT_MAX_WORKERS개 스레드에서
+    동시에 실행됩니다 (각 스레드는 풀에서 자기 커넥션을 빌림).
+    REPORT_SECTION_TIMEOUT은 각 섹션이 작업 스레드에서 실제로 시작한 시점부터 계산하므로
+    REPORT_MAX_WORKERS보다 섹션이 많아 대기한 시간은 포함되지 않습니다.
+    제한 시간을 넘긴 섹션은 제외되고, 섹션별 소요 시간과 상태는
+    metadata['section_timings']에 기록됩니다.
+
+    섹션 결과는 (섹션명, 관련 파라미터, 데이터 버전) 단위로 캐시되므로
+    scenario_no만 바꿔 다시 생성하면 liquidity_gap 섹션만 다시 계산합니다.
+    캐시 적중 여부와 누적 통계는 metadata['section_cache']에 기록됩니다.
+
+    Args:
+        include_sections: 포함할 섹션 리스트 (None이면 모든 섹션)
+        scenario_no: 유동성 갭 분석에 사용할 시나리오 번호
+        use_cache: 섹션 캐시 사용 여부
+
+    Returns:
+        리포트 데이터 딕셔너리
+    """
+    report = {
+        'title': 'ALM 종합 분석 리포트',
+        'generated_at': datetime.now(),
+        'sections': {},
+        'metadata': {
+            'scenario_no': scenario_no,
+            'requested_sections': include_sections,
+            'section_timings': {}
+        }
+    }
+
+    all_sections = list(REPORT_SECTION_BUILDERS)
+    sections_to_include = include_sections if include_sections else all_sections
+    names = [name for name in all_sections if name in sections_to_include]
+    if not names:
+        return report
+
+    timings = report['metadata']['section_timings']
+    start = time.perf_counter()
+
+    # 캐시된 섹션은 그대로 사용하고 나머지만 계산
+    use_cache = use_cache and REPORT_SECTION_CACHE_ENABLED
+    cache_keys: Dict[str, Tuple] = {}
+    cached_sections: Dict[str, Dict[str, Any]] = {}
+    if use_cache:
+        try:
+            version = get_data_version()
+        except Exception:
+            # 데이터 버전을 확인할 수 없으면 캐시 없이 계산 (실패한 섹션은 결과에서 제외)
+            use_cache = False
+    if use_cache:
+        params = {'scenario_no': scenario_no}
+        for name in names:
+            cache_keys[name] = _report_section_cache_key(name, params, version)
+            section = _get_cached_report_section(cache_keys[name])
+            if section is not None:
+                cached_sections[name] = section
+
+    pending = [name for name in names if name not in cached_sections]
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(REPORT_MAX_WORKERS, len(pending))),
+        thread_name_prefix='alm-report'
+    )
+    try:
+        started: Dict[str, float] = {}
+        futures = {name: executor.submit(_run_report_section, name, scenario_no, started) for name in pending}
+
+        # 섹션 순서를 유지하며 결과 수집
+        for name in names:
+            if name in cached_sections:
+                timings[name] = {'status': 'cached', 'elapsed_ms': 0.0}
+                report['sections'][name] = cached_sections[name]
+                continue
+
+            future = futures[name]
+            # 작업 스레드를 얻을 때까지 대기 (대기 시간은 제한 시간에 포함하지 않음).
+            # 앞 섹션은 모두 끝났거나 제한 시간을 넘겼으므로, 이 대기가 REPORT_SECTION_TIMEOUT을
+            # 넘기면 작업 스레드가 모두 멈춘 섹션에 묶인 것으로 보고 시작하지 않음
+            queued_at = time.perf_counter()
+            while name not in started and not future.done():
+                if time.perf_counter() - queued_at >= REPORT_SECTION_TIMEOUT:
+                    break
+                wait([future], timeout=REPORT_POLL_INTERVAL)
+            if name not in started and not future.done():
+                timings[name] = {
+                    'status': 'timeout',
+                    'elapsed_ms': 0.0,
+                    'error': '제한 시간을 넘긴 섹션이 작업 스레드를 모두 점유해 시작하지 못했습니다'
+                }
+                continue
+            section_start = started.get(name, time.perf_counter())
+
+            remaining = max(0.0, section_start + REPORT_SECTION_TIMEOUT - time.perf_counter())
+            try:
+                section, elapsed_ms = future.result(timeout=remaining)
+            except FuturesTimeoutError:
+                timings[name] = {'status': 'timeout', 'elapsed_ms': (time.perf_counter() - section_start) * 1000}
+                continue
+            except Exception as e:
+                timings[name] = {
+                    'status': 'error',
+                    'elapsed_ms': (time.perf_counter() - section_start) * 1000,
+                    'error': str(e)
+                }
+                continue
+
+            timings[name] = {'status': 'ok' if section is not None else 'failed', 'elapsed_ms': elapsed_ms}
+            if section is not None:
+                report['sections'][name] = section
+                if name in cache_keys:
+                    _put_cached_report_section(cache_keys[name], section)
+    finally:
+        # 제한 시간을 넘긴 섹션은 기다리지 않음
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    report['metadata']['total_elapsed_ms'] = (time.perf_counter() - start) * 1000
+    if use_cache:
+        report['metadata']['section_cache'] = {
+            'cached_sections': list(cached_sections),
+            'computed_sections': pending,
+            'stats': get_report_section_cache_stats()
+        }
+    return report
+
+
+# ============================================================
+# Phase 2: 시나리오 비교 함수
+# ============================================================
+
+def _fetch_scenario_gaps(scenario_list: List[int]) -> Dict[str, Any]:
+    """
+    여러 시나리오의 기간대별 갭을 SCENARIO_BATCH_SIZE개씩 묶어 일괄 조회
+
+    Returns:
+        run_registered_query 형식 결과 (rows/columns는 모든 배치를 합친 값)
+    """
+    unique = list(dict.fromkeys(int(s) for s in scenario_list))
+    query_name = _gap_query_name('scenario_gap_batch')
+    rows: List[tuple] = []
+    columns: List[str] = []
+
+    for i in range(0, len(unique), SCENARIO_BATCH_SIZE):
+        chunk = unique[i:i + SCENARIO_BATCH_SIZE]
+        chunk = chunk + [chunk[-1]] * (SCENARIO_BATCH_SIZE - len(chunk))
+        result = run_registered_query(query_name, {f's{j}': v for j, v in enumerate(chunk)})
+        if not result['success']:
+            return result
+        columns = result['columns']
+        rows.extend(result.rows)
+
+    return {'success': True, 'columns': columns, 'rows': rows}
+
+
+# 합성 시나리오 분포 요약에 사용할 백분위수
+GAP_PERCENTILES = (1, 5, 50, 95, 99)
+
+# 합성 시나리오 레코드 컬럼 (report_liquidity_gap 쿼리와 동일)
+SCENARIO_GAP_COLUMNS = ['기간대', '원금갭', '이자갭', '총갭']
+
+
+def _gap_percentiles(values: np.ndarray) -> Dict[str, float]:
+    """GAP_PERCENTILES 백분위수 {'p1': float, ...} (NaN 제외)"""
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return {f'p{p}': float('nan') for p in GAP_PERCENTILES}
+    return {f'p{p}': float(v) for p, v in zip(GAP_PERCENTILES, np.percentile(values, GAP_PERCENTILES))}
+
+
+def compare_scenarios(
+    scenario_list: List[int],
+    comparison_metrics: Optional[List[str]] = None,
+    synthetic_scenarios: Optional[Dict[str, List[Dict[str, Any]]]] = None
+) -> Dict[str, Any]:
+    """
+    여러 시나리오 비교 분석 (Phase 2)
+
+    모든 시나리오를 SCENARIO_NO IN (...) GROUP BY SCENARIO_NO, TIME_BAND 쿼리로 한 번에 조회한 뒤
+    시나리오×기간대 총갭 행렬에서 합계/최대/최소/평균을 벡터 연산으로 계산합니다.
+    데이터가 없는 시나리오는 총갭 0, 나머지 지표는 NaN입니다.
+    유동성 갭 큐브가 최신이면 큐브에서 조회합니다.
+
+    synthetic_scenarios가 있으면 DB 시나리오와 같은 행렬에 합쳐 비교하고,
+    전체 시나리오의 총갭 백분위수 분포(distribution)를 함께 계산합니다.
+
+    Args:
+        scenario_list: 비교할 시나리오 번호 리스트
+        comparison_metrics: 비교할 지표 (None이면 기본 지표)
+        synthetic_scenarios: 합성 시나리오 {이름: [{'기간대', '원금갭', '이자갭', '총갭'}, ...]}
+                             (예: build_rate_gap_scenarios(as_records=True) 결과)
+
+    Returns:
+        {
+            'scenarios': List[int | str],
+            'comparison_data': Dict,
+            'gap_matrix': {'scenarios': List, 'time_bands': List[str], 'total_gap': List[List[float]]},
+            'distribution': {               # synthetic_scenarios가 있을 때만
+                'scenario_count': int,
+                'percentiles': List[int],
+                'total_gap': {'p1': float, ...},
+                'by_time_band': {기간대: {'p1': float, ...}}
+            },
+            'summary': str
+        }
+    """
+    synthetic_scenarios = synthetic_scenarios or {}
+    comparison = {
+        'scenarios': scenario_list + list(synthetic_scenarios) if synthetic_scenarios else scenario_list,
+        'comparison_data': {},
+        'summary': ''
+    }
+
+    if scenario_list:
+        result = _fetch_scenario_gaps(scenario_list)
+    else:
+        result = {'success': True, 'columns': [], 'rows': []}
+
+    if result['success']:
+        rows = list(result['rows'])
+        columns = result['columns'][1:] or SCENARIO_GAP_COLUMNS
+        for name, records in synthetic_scenarios.items():
+            rows.extend((name,) + tuple(record.get(c) for c in SCENARIO_GAP_COLUMNS) for record in records)
+
+        # 시나리오별 행 범위 (ORDER BY SCENARIO_NO 이므로 연속)
+        scenario_rows: Dict[Any, List[tuple]] = {}
+        for row in rows:
+            scenario_rows.setdefault(row[0], []).append(row[1:])
+
+        scenarios = list(dict.fromkeys(int(s) for s in scenario_list)) + list(synthetic_scenarios)
+        time_bands = sorted({row[1] for row in rows}, key=str)
+        band_index = {band: j for j, band in enumerate(time_bands)}
+        scenario_index = {scenario: i for i, scenario in enumerate(scenarios)}
+
+        # 시나리오×기간대 총갭 행렬 (데이터 없는 칸은 NaN)
+        matrix = np.full((len(scenarios), len(time_bands)), np.nan)
+        for row in rows:
+            if row[0] in scenario_index and row[4] is not None:
+                matrix[scenario_index[row[0]], band_index[row[1]]] = row[4]
+
+        present = ~np.isnan(matrix)
+        counts = present.sum(axis=1)
+        totals = np.where(present, matrix, 0.0).sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            maxima = np.where(counts > 0, np.where(present, matrix, -np.inf).max(axis=1, initial=-np.inf), np.nan)
+            minima = np.where(counts > 0, np.where(present, matrix, np.inf).min(axis=1, initial=np.inf), np.nan)
+            means = totals / counts
+
+        keys = [(s, int(s)) for s in scenario_list] + [(name, name) for name in synthetic_scenarios]
+        for scenario_no, scenario_key in keys:
+            i = scenario_index[scenario_key]
+            comparison['comparison_data'][f'scenario_{scenario_no}'] = {
+                'data': _records_from_rows(columns, scenario_rows.get(scenario_key, [])),
+                'total_gap': float(totals[i]),
+                'max_gap': float(maxima[i]),
+                'min_gap': float(minima[i]),
+                'avg_gap': float(means[i])
+            }
+
+        comparison['gap_matrix'] = {
+            'scenarios': scenarios,
+            'time_bands': time_bands,
+            'total_gap': matrix.tolist()
+        }
+
+        if synthetic_scenarios:
+            comparison['distribution'] = {
+                'scenario_count': len(scenarios),
+                'percentiles': list(GAP_PERCENTILES),
+                'total_gap': _gap_percentiles(totals),
+                'by_time_band': {band: _gap_percentiles(matrix[:, j]) for j, band in enumerate(time_bands)}
+            }
+
+    summary_lines = []
+    summary_lines.append(f"총 {len(comparison['scenarios'])}개 시나리오 비교\n")
+
+    for scenario_no in scenario_list:
+        key = f'scenario_{scenario_no}'
+        if key in comparison['comparison_data']:
+            data = comparison['comparison_data'][key]
+            summary_lines.append(
+                f"시나리오 {scenario_no}: "
+                f"총갭={data['total_gap']:,.0f}, "
+                f"평균={data['avg_gap']:,.0f}, "
+                f"최대={data['max_gap']:,.0f}, "
+                f"최소={data['min_gap']:,.0f}"
+            )
+
+    if 'distribution' in comparison:
+        # 합성 시나리오는 개별 행 대신 분포만 요약
+        total_pct = comparison['distribution']['total_gap']
+        summary_lines.append(
+            f"합성 시나리오 {len(synthetic_scenarios)}개 포함 총갭 분포: "
+            + ', '.join(f"P{p}={total_pct[f'p{p}']:,.0f}" for p in GAP_PERCENTILES)
+        )
+
+    comparison['summary'] = '\n'.join(summary_lines)
+    return comparison
+
+
+# ============================================================
+# Phase 2: 추세 분석 함수
+# ============================================================
+
+# 추세 판단 기울기 임계값 (일자 순번당 값 변화)
+TREND_SLOPE_THRESHOLD = 0.01
+
+# 리샘플링 주기 (pandas Period 빈도)
+TREND_FREQUENCIES = {'W': 'W', 'M': 'M', 'weekly': 'W', 'monthly': 'M'}
+
+# 추세 통계 저장소 배열의 초기 용량 (부족하면 2배씩 확장)
+TREND_SERIES_INITIAL_CAPACITY = 64
+
+
+class TrendSeries:
+    """
+    한 시계열(지표 × 통화/금리 코드)의 증분 통계 저장소
+
+    일자 순 값 배열에 누적합(Σy, Σy², Σg·y, g=순번)과 최소/최대 희소 테이블을 유지해
+    임의 기간의 건수/평균/표준편차/최소/최대/회귀 기울기를 O(1)에 계산합니다.
+    새 일자가 적재되면 마지막 일자 이후 행만 조회해 누적합을 이어 붙이고,
+    과거 행이 바뀐 경우(전체 건수/합계 불일치)에만 전체를 다시 읽습니다.
+    값은 첫 값을 뺀 뒤 누적해 분산 계산의 자릿수 손실을 줄입니다.
+
+    배열은 용량을 2배씩 늘리는 버퍼라 추가 시 기존 이력을 복사하지 않고,
+    희소 테이블도 단계마다 새 구간만 계산합니다 (추가 행 r개당 O(r log n)).
+    """
+
+    def __init__(self, metric_type: str, code: Any):
+        self.metric_type = metric_type
+        self.code = code
+        self.version: Optional[Tuple] = None
+        self.full_loads = 0
+        self.incremental_loads = 0
+        # 마지막 추가에서 새로 계산한 희소 테이블 칸 수
+        self.last_append_cells = 0
+        self._reset()
+        self.lock = threading.Lock()
+
+    def _reset(self):
+        self.dates: List[str] = []
+        self._offset = 0.0
+        self._values = np.empty(TREND_SERIES_INITIAL_CAPACITY)
+        self._cum_y = np.zeros(TREND_SERIES_INITIAL_CAPACITY + 1)
+        self._cum_y2 = np.zeros(TREND_SERIES_INITIAL_CAPACITY + 1)
+        self._cum_gy = np.zeros(TREND_SERIES_INITIAL_CAPACITY + 1)
+        # 희소 테이블: level k의 p번째 칸은 [p, p + 2^k) 구간의 최소/최대 (level 0은 값 버퍼 자체)
+        self._min_table: List[np.ndarray] = [self._values]
+        self._max_table: List[np.ndarray] = [self._values]
+
+    @property
+    def values(self) -> np.ndarray:
+        """일자 순 값 배열 (버퍼의 읽기 전용 뷰)"""
+        view = self._values[:len(self.dates)]
+        view.flags.writeable = False
+        return view
+
+    def refresh(self, version: Tuple):
+        """데이터 버전이 바뀌었으면 새 일자만 추가 (호출자가 lock 보유)"""
+        if self.version == version:
+            return
+
+        params = {'code': self.code}
+        # 다른 DB 파일이면 증분 갱신하지 않음 (버전 첫 항목 = DB 경로)
+        if self.dates and self.version is not None and self.version[0] == version[0]:
+            summary = run_registered_query(f'trend_{self.metric_type}_summary', params)
+            tail = run_registered_query(f'trend_{self.metric_type}_after', {**params, 'after_date': self.dates[-1]})
+            if summary['success'] and tail['success']:
+                tail_rows = [row for row in tail.rows if row[1] is not None]
+                count, total = summary.rows[0]
+                n = len(self.dates)
+                expected_total = float(self._cum_y[n] + n * self._offset) + sum(v for _, v in tail_rows)
+                unchanged = (
+                    count == len(self.dates) + len(tail_rows)
+                    and math.isclose(total, expected_total, rel_tol=1e-9, abs_tol=1e-9)
+                )
+            else:
+                unchanged = False
+            if unchanged:
+                self._append(tail_rows)
+                self.incremental_loads += 1
+                self.version = version
+                return
+
+        result = run_registered_query(f'trend_{self.metric_type}', {**params, 'start_date': None, 'end_date': None})
+        if not result['success']:
+            raise RuntimeError(result['error'])
+        self.load(result.rows, version)
+
+    def load(self, rows: Sequence[tuple], version: Tuple):
+        """전체 이력 (일자, 값) 행으로 다시 채움 (호출자가 lock 보유)"""
+        self._reset()
+        self._append(rows)
+        self.full_loads += 1
+        self.version = version
+
+    def _reserve(self, size: int):
+        """배열 용량을 size 이상으로 확장 (2배씩, 확장할 때만 기존 값 복사)"""
+        capacity = len(self._values)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+
+        def grow(array: np.ndarray, length: int) -> np.ndarray:
+            grown = np.empty(length)
+            grown[:len(array)] = array
+            return grown
+
+        self._values = grow(self._values, capacity)
+        self._cum_y = grow(self._cum_y, capacity + 1)
+        self._cum_y2 = grow(self._cum_y2, capacity + 1)
+        self._cum_gy = grow(self._cum_gy, capacity + 1)
+        self._min_table = [self._values] + [grow(level, capacity) for level in self._min_table[1:]]
+        self._max_table = [self._values] + [grow(level, capacity) for level in self._max_table[1:]]
+
+    def _append(self, rows: Sequence[tuple]):
+        rows = [(str(d), float(v)) for d, v in rows if v is not None]
+        self.last_append_cells = 0
+        if not rows:
+            return
+        if not self.dates:
+            self._offset = rows[0][1]
+
+        start = len(self.dates)
+        end = start + len(rows)
+        self._reserve(end)
+
+        new_values = np.array([v for _, v in rows])
+        shifted = new_values - self._offset
+        positions = np.arange(start, end, dtype=float)
+
+        self.dates.extend(d for d, _ in rows)
+        self._values[start:end] = new_values
+        self._cum_y[start + 1:end + 1] = self._cum_y[start] + np.cumsum(shifted)
+        self._cum_y2[start + 1:end + 1] = self._cum_y2[start] + np.cumsum(shifted ** 2)
+        self._cum_gy[start + 1:end + 1] = self._cum_gy[start] + np.cumsum(positions * shifted)
+
+        # 희소 테이블: level k에서 새 값이 포함되는 칸 [max(0, start - 2^k + 1), end - 2^k]만 계산
+        level, width = 1, 2
+        while width <= end:
+            if level == len(self._min_table):
+                self._min_table.append(np.empty(len(self._values)))
+                self._max_table.append(np.empty(len(self._values)))
+            lo, hi = max(0, start - width + 1), end - width + 1
+            half = width // 2
+            prev_min, prev_max = self._min_table[level - 1], self._max_table[level - 1]
+            np.minimum(prev_min[lo:hi], prev_min[lo + half:hi + half], out=self._min_table[level][lo:hi])
+            np.maximum(prev_max[lo:hi], prev_max[lo + half:hi + half], out=self._max_table[level][lo:hi])
+            self.last_append_cells += hi - lo
+            level, width = level + 1, width * 2
+
+    def index_range(self, start_date: Optional[str], end_date: Optional[str]) -> Tuple[int, int]:
+        """[start_date, end_date] 에 해당하는 [i, j) 순번 범위 (SQL 문자열 비교와 동일)"""
+        i = bisect_left(self.dates, start_date) if start_date else 0
+        j = bisect_right(self.dates, end_date) if end_date else len(self.dates)
+        return i, max(i, j)
+
+    def statistics(self, i: int, j: int) -> Dict[str, float]:
+        """[i, j) 구간 통계 (analyze_trends의 statistics 형식)"""
+        m = j - i
+        sum_y = self._cum_y[j] - self._cum_y[i]
+        sum_y2 = self._cum_y2[j] - self._cum_y2[i]
+        mean_shifted = sum_y / m
+        variance = max(sum_y2 / m - mean_shifted ** 2, 0.0)
+
+        level = m.bit_length() - 1
+        minimum = min(self._min_table[level][i], self._min_table[level][j - (1 << level)])
+        maximum = max(self._max_table[level][i], self._max_table[level][j - (1 << level)])
+
+        first, last = float(self.values[i]), float(self.values[j - 1])
+        stats = {
+            'count': m,
+            'mean': float(mean_shifted + self._offset),
+            'std': float(math.sqrt(variance)),
+            'min': float(minimum),
+            'max': float(maximum),
+            'first_value': first,
+            'last_value': last,
+            'change': last - first,
+            'change_pct': float((last - first) / first * 100) if first != 0 else 0
+        }
+
+        if m >= 2:
+            # x = 0..m-1 (구간 내 순번) 최소제곱 기울기
+            sum_x = m * (m - 1) / 2.0
+            sum_xx = (m - 1) * m * (2 * m - 1) / 6.0
+            sum_xy = (self._cum_gy[j] - self._cum_gy[i]) - i * sum_y
+            stats['slope'] = float((m * sum_xy - sum_x * sum_y) / (m * sum_xx - sum_x ** 2))
+
+        return stats
+
+
+_trend_series_store: Dict[Tuple[str, Any], TrendSeries] = {}
+_trend_series_store_lock = threading.Lock()
+
+
+def get_trend_series(metric_type: str, code: Any = None) -> TrendSeries:
+    """데이터 버전 기준으로 최신화된 추세 통계 저장소 반환"""
+    with _trend_series_store_lock:
+        series = _trend_series_store.get((metric_type, code))
+        if series is None:
+            series = _trend_series_store[(metric_type, code)] = TrendSeries(metric_type, code)
+
+    with series.lock:
+        series.refresh(get_data_version())
+    return series
+
+
+def get_trend_series_batch(metric_type: str, codes: Sequence[Any]) -> List[TrendSeries]:
+    """
+    여러 시계열 저장소를 한 번에 최신화
+
+    이력이 있는 시계열은 TrendSeries.refresh로 새 일자만 이어 붙이고,
+    처음 조회하는(또는 다른 DB 파일의) 시계열만 모아
+    trend_<metric>_multi 쿼리(TREND_SERIES_BATCH_SIZE개씩)로 일괄 적재합니다.
+    """
+    version = get_data_version()
+    with _trend_series_store_lock:
+        series_list = []
+        for code in codes:
+            series = _trend_series_store.get((metric_type, code))
+            if series is None:
+                series = _trend_series_store[(metric_type, code)] = TrendSeries(metric_type, code)
+            series_list.append(series)
+
+    unloaded = []
+    for series in series_list:
+        if series.version == version:
+            continue
+        if series.dates and series.version is not None and series.version[0] == version[0]:
+            with series.lock:
+                series.refresh(version)
+        else:
+            unloaded.append(series)
+
+    for lo in range(0, len(unloaded), TREND_SERIES_BATCH_SIZE):
+        chunk = unloaded[lo:lo + TREND_SERIES_BATCH_SIZE]
+        padded = [series.code for series in chunk]
+        padded += [padded[-1]] * (TREND_SERIES_BATCH_SIZE - len(padded))
+        result = run_registered_query(f'trend_{metric_type}_multi', {f'c{i}': code for i, code in enumerate(padded)})
+        if not result['success']:
+            raise RuntimeError(result['error'])
+
+        rows_by_code: Dict[Any, List[tuple]] = {}
+        for code, date, value in result.rows:
+            rows_by_code.setdefault(code, []).append((date, value))
+        for series in chunk:
+            with series.lock:
+                series.load(rows_by_code.get(series.code, []), version)
+
+    return series_list
+
+
+def clear_trend_series_store():
+    """추세 통계 저장소 비우기"""
+    with _trend_series_store_lock:
+        _trend_series_store.clear()
+
+
+def _classify_trend(slope: float) -> str:
+    """회귀 기울기 → 추세 문구"""
+    if slope > TREND_SLOPE_THRESHOLD:
+        return '상승 추세'
+    if slope < -TREND_SLOPE_THRESHOLD:
+        return '하락 추세'
+    return '안정 추세'
+
+
+def _trend_series_code(metric_type: str, code: Any) -> Any:
+    """금리 코드는 정수로 변환 (NFA_IRC_RATE_HIST.INT_RATE_CD)"""
+    if metric_type == 'interest_rate' and code is not None and str(code).strip().lstrip('-').isdigit():
+        return int(code)
+    return code
+
+
+def _rolling_trend_statistics(dates: List[str], values: np.ndarray, window: int) -> Dict[str, Any]:
+    """이동평균 / 변동성(수익률 표준편차) / 고점 대비 낙폭"""
+    series = pd.Series(values, index=pd.to_datetime(pd.Series(dates).str[:10]).values)
+    moving_average = series.rolling(window, min_periods=window).mean()
+    volatility = series.pct_change().rolling(window, min_periods=window).std()
+    drawdown = series / series.cummax() - 1.0
+
+    def to_float(value):
+        return None if pd.isna(value) else float(value)
+
+    points = [
+        {'일자': date, '값': float(v), '이동평균': to_float(ma), '변동성': to_float(vol), '낙폭': to_float(dd)}
+        for date, v, ma, vol, dd in zip(dates, values, moving_average, volatility, drawdown)
+    ]
+    trough = int(np.argmin(drawdown.values)) if len(drawdown) else 0
+
+    return {
+        'window': window,
+        'points': points,
+        'latest': points[-1] if points else {},
+        'max_drawdown': to_float(drawdown.min()) if len(drawdown) else None,
+        'max_drawdown_date': dates[trough] if len(dates) else None
+    }
+
+
+def _resample_trend(dates: List[str], values: np.ndarray, frequency: str) -> List[Dict[str, Any]]:
+    """주/월 단위 리샘플링 (기간 말 값, 평균, 최고, 최저)"""
+    periods = pd.to_datetime(pd.Series(dates).str[:10]).dt.to_period(frequency)
+    grouped = pd.Series(values).groupby(periods.values, sort=True)
+    frame = pd.DataFrame({
+        '값': grouped.last(),
+        '평균': grouped.mean(),
+        '최고': grouped.max(),
+        '최저': grouped.min(),
+        '건수': grouped.size()
+    })
+    return [
+        {'기간': str(period), **{k: (int(v) if k == '건수' else float(v)) for k, v in row.items()}}
+        for period, row in frame.iterrows()
+    ]
+
+
+def analyze_trends(
+    metric_type: str,
+    currency_or_rate_cd: Optional[Union[str, Sequence[Any]]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    window: Optional[int] = None,
+    frequency: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    시계열 추세 분석 (Phase 2)
+
+    시계열별 증분 통계 저장소(TrendSeries)의 누적합으로 기본 통계와 기울기를 계산하므로
+    같은 시계열을 반복 조회해도 전체 이력을 다시 읽지 않습니다.
+
+    통화/금리 코드를 여러 개 (리스트 또는 'USD,EUR,JPY') 지정하면
+    analyze_multi_trends() 결과 (시계열 비교표 + 상관계수)를 반환합니다.
+
+    Args:
+        metric_type: 'exchange_rate' 또는 'interest_rate'
+        currency_or_rate_cd: 통화 코드 또는 금리 코드 (여러 개 가능)
+        start_date: 시작 날짜 (YYYY-MM-DD)
+        end_date: 종료 날짜 (YYYY-MM-DD)
+        window: 이동 통계 창 크기 (관측치 수, 지정 시 'rolling' 추가)
+        frequency: 리샘플링 주기 'W'(주) 또는 'M'(월) (지정 시 'resampled' 추가,
+                   window와 함께 쓰면 리샘플링한 값으로 이동 통계 계산)
+
+    Returns:
+        {
+            'metric_type': str,
+            'data_points': List[Dict],
+            'statistics': Dict,
+            'trend': str,
+            'resampled': List[Dict],    # frequency 지정 시
+            'rolling': Dict             # window 지정 시
+        }
+    """
+    trends = {
+        'metric_type': metric_type,
+        'data_points': [],
+        'statistics': {},
+        'trend': ''
+    }
+
+    if metric_type not in ('exchange_rate', 'interest_rate'):
+        return {
+            'error': f"지원하지 않는 metric_type: {metric_type}"
+        }
+    if frequency is not None and frequency not in TREND_FREQUENCIES:
+        return {
+            'error': f"지원하지 않는 frequency: {frequency} (W 또는 M)"
+        }
+    if window is not None and window < 2:
+        return {
+            'error': f"window는 2 이상이어야 합니다: {window}"
+        }
+
+    codes = currency_or_rate_cd
+    if isinstance(codes, str):
+        codes = codes.split(',') if ',' in codes else [codes]
+    codes = [c.strip() if isinstance(c, str) else c for c in (codes or [])]
+    codes = [c for c in codes if c not in (None, '')]
+    if len(codes) > 1:
+        if window is not None or frequency is not None:
+            return {
+                'error': "window/frequency는 단일 시계열 분석에서만 지원합니다"
+            }
+        return analyze_multi_trends(metric_type, codes, start_date, end_date)
+
+    code = _trend_series_code(metric_type, codes[0]) if codes else None
+
+    try:
+        series = get_trend_series(metric_type, code)
+    except Exception as e:
+        return {'error': str(e)}
+
+    with series.lock:
+        i, j = series.index_range(start_date or None, end_date or None)
+        if j == i:
+            return trends
+        dates = series.dates[i:j]
+        values = series.values[i:j]
+        trends['statistics'] = series.statistics(i, j)
+
+    trends['data_points'] = [{'일자': d, '값': float(v)} for d, v in zip(dates, values)]
+
+    if 'slope' in trends['statistics']:
+        trends['trend'] = _classify_trend(trends['statistics']['slope'])
+
+    if frequency is not None:
+        trends['resampled'] = _resample_trend(dates, values, TREND_FREQUENCIES[frequency])
+        if window is not None:
+            resampled = trends['resampled']
+            trends['rolling'] = _rolling_trend_statistics(
+                [row['기간'] for row in resampled], np.array([row['값'] for row in resampled]), window
+            )
+    elif window is not None:
+        trends['rolling'] = _rolling_trend_statistics(dates, values, window)
 
+    return trends
 
-# ============================================================
-# Phase 1: 종합 리포트 생성 함수
-# ============================================================
 
-def generate_comprehensive_report(
-    include_sections: Optional[List[str]] = None,
-    scenario_no: Optional[int] = None
+def analyze_multi_trends(
+    metric_type: str,
+    codes: Sequence[Any],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
 ) -> Dict[str, Any]:
     """
-    종합 ALM 분석 리포트 생성 (Phase 1)
+    여러 시계열 추세 비교 (한 번의 일괄 조회 + 일자 × 시계열 행렬 연산)
+
+    시계열별 통계는 추세 통계 저장소의 누적합으로 계산하고 (단일 시계열 분석과 같은 값),
+    변동성과 상관계수는 일자 × 시계열 피벗 행렬의 변화율로 한 번에 계산합니다.
+    같은 일자에 값이 여러 개인 시계열(예: 기간이 여러 개인 금리 코드)은 일자별 평균을 사용합니다.
 
     Args:
-        include_sections: 포함할 섹션 리스트 (None이면 모든 섹션)
-        scenario_no: 유동성 갭 분석에 사용할 시나리오 번호
+        metric_type: 'exchange_rate' 또는 'interest_rate'
+        codes: 통화 코드 또는 금리 코드 리스트
+        start_date: 시작 날짜 (YYYY-MM-DD)
+        end_date: 종료 날짜 (YYYY-MM-DD)
 
     Returns:
-        리포트 데이터 딕셔너리
+        {
+            'metric_type': str,
+            'series': List,                         # 데이터가 있는 시계열
+            'missing': List,                        # 데이터가 없는 시계열
+            'statistics': {코드: Dict},             # analyze_trends의 statistics 형식
+            'trend': {코드: str},
+            'comparison': [{'시계열', '건수', '시작값', '종료값', '변화율', '평균', '표준편차',
+                            '최소', '최대', '변동성', '추세'}, ...],
+            'correlation': {코드: {코드: float | None}},   # 일별 변화율 상관계수
+            'data_points': [{'일자': str, 코드: float | None, ...}, ...]
+        }
     """
-    report = {
-        'title': 'ALM 종합 분석 리포트',
-        'generated_at': datetime.now(),
-        'sections': {},
-        'metadata': {
-            'scenario_no': scenario_no,
-            'requested_sections': include_sections
+    if metric_type not in ('exchange_rate', 'interest_rate'):
+        return {
+            'error': f"지원하지 않는 metric_type: {metric_type}"
         }
+
+    codes = list(dict.fromkeys(_trend_series_code(metric_type, c) for c in codes))
+    trends = {
+        'metric_type': metric_type,
+        'series': [],
+        'missing': [],
+        'statistics': {},
+        'trend': {},
+        'comparison': [],
+        'correlation': {},
+        'data_points': []
     }
 
-    all_sections = ['data_overview', 'liquidity_gap', 'market_data', 'dimensional_analysis']
-    sections_to_include = include_sections if include_sections else all_sections
+    try:
+        series_list = get_trend_series_batch(metric_type, codes)
+    except Exception as e:
+        return {'error': str(e)}
+
+    frames = []
+    for series in series_list:
+        with series.lock:
+            i, j = series.index_range(start_date or None, end_date or None)
+            if j == i:
+                trends['missing'].append(series.code)
+                continue
+            stats = series.statistics(i, j)
+            frames.append(pd.DataFrame({'일자': series.dates[i:j], '코드': series.code, '값': series.values[i:j]}))
+
+        trends['series'].append(series.code)
+        trends['statistics'][series.code] = stats
+        trends['trend'][series.code] = _classify_trend(stats['slope']) if 'slope' in stats else ''
+
+    if not frames:
+        return trends
+
+    # 일자 × 시계열 행렬 (열 순서 = 요청 순서)
+    matrix = pd.concat(frames).pivot_table(index='일자', columns='코드', values='값', aggfunc='mean')
+    matrix = matrix[trends['series']]
+    # 시계열별 관측일 기준 변화율 (다른 시계열의 휴일로 생긴 빈 칸은 건너뜀)
+    returns = matrix.apply(lambda column: column.dropna().pct_change())
+    volatility = returns.std()
+    correlation = returns.corr(min_periods=3)
+
+    def to_float(value):
+        return None if pd.isna(value) else float(value)
+
+    for code in trends['series']:
+        stats = trends['statistics'][code]
+        trends['comparison'].append({
+            '시계열': code,
+            '건수': stats['count'],
+            '시작값': stats['first_value'],
+            '종료값': stats['last_value'],
+            '변화율': stats['change_pct'],
+            '평균': stats['mean'],
+            '표준편차': stats['std'],
+            '최소': stats['min'],
+            '최대': stats['max'],
+            '변동성': to_float(volatility.get(code)),
+            '추세': trends['trend'][code]
+        })
+        trends['correlation'][code] = {other: to_float(correlation.loc[code, other]) for other in trends['series']}
+
+    trends['data_points'] = [
+        {'일자': date, **{code: to_float(v) for code, v in zip(trends['series'], row)}}
+        for date, row in zip(matrix.index, matrix.to_numpy())
+    ]
+    return trends
 
-    # 1. Data Overview
-    if 'data_overview' in sections_to_include:
-        query = """
-        SELECT
-            CURRENCY_CD as 통화,
-            COUNT(*) as 계약수,
-            SUM(CUR_PAR_BAL) as 총잔액,
-            AVG(INT_RATE) as 평균금리
-        FROM ALM_INST
-        GROUP BY CURRENCY_CD
-        ORDER BY 총잔액 DESC
-        """
-        result = execute_sql_query(query)
-
-        if result["success"]:
-            report['sections']['data_overview'] = {
-                'title': '데이터 개요',
-                'data': result['data'],
-                'summary': f"총 {sum([r['계약수'] for r in result['data']])}건의 계약, "
-                          f"{len(result['data'])}개 통화"
-            }
 
-    # 2. Liquidity Gap
-    if 'liquidity_gap' in sections_to_include:
-        query = """
-        SELECT
-            TIME_BAND as 기간대,
-            SUM(GAP_PRN_TOTAL) as 원금갭,
-            SUM(GAP_INT_TOTAL) as 이자갭,
-            SUM(GAP_PRN_TOTAL + GAP_INT_TOTAL) as 총갭
-        FROM NFAR_LIQ_GAP_310524
-        """
+# ============================================================
+# 포지션 변동 분석 공통 헬퍼
+# ============================================================
 
-        if scenario_no is not None:
-            query += f" WHERE SCENARIO_NO = {scenario_no}"
+def _resolve_previous_base_date(current_base_date: str) -> Optional[str]:
+    """
+    current_base_date 직전의 BASE_DATE 조회 (캐시된 기준일 캘린더 사용)
 
-        query += " GROUP BY TIME_BAND ORDER BY TIME_BAND"
+    Returns:
+        직전 BASE_DATE (없으면 None)
+    """
+    try:
+        return get_base_date_calendar().previous(current_base_date)
+    except Exception:
+        return None
 
-        result = execute_sql_query(query)
 
-        if result["success"]:
-            df = result['dataframe']
-            total_gap = df['총갭'].sum() if '총갭' in df.columns else 0
+def _date_prefix_range(base_date: str) -> Tuple[str, str]:
+    """
+    BASE_DATE LIKE 'YYYY-MM-DD%'와 같은 범위 [start, end) 반환
 
-            report['sections']['liquidity_gap'] = {
-                'title': '유동성 갭 분석',
-                'data': result['data'],
-                'summary': f"총 {result['row_count']}개 기간대, 총갭: {total_gap:,.0f}",
-                'scenario_no': scenario_no
-            }
+    예: '2020-06-30' → ('2020-06-30', '2020-06-31')
+    """
+    start = base_date[:10]
+    end = start[:-1] + chr(ord(start[-1]) + 1)
+    return start, end
 
-    # 3. Market Data
-    if 'market_data' in sections_to_include:
-        exchange_query = """
-        SELECT
-            UNIT_CURRENCY_CD as 통화,
-            EFFECTIVE_DATE as 일자,
-            EXCH_RATE as 환율
-        FROM NFA_EXCH_RATE_HIST
-        WHERE UNIT_CURRENCY_CD IN ('USD', 'EUR', 'JPY', 'CNY')
-        ORDER BY EFFECTIVE_DATE DESC
-        LIMIT 20
-        """
 
-        exchange_result = execute_sql_query(exchange_query)
+# 기준일 쌍별 변동 계산 결과 캐시 (데이터 버전이 바뀌면 재계산)
+POSITION_DELTA_CACHE_SIZE = 32
 
-        interest_query = """
-        SELECT
-            INT_RATE_CD as 금리코드,
-            INT_RATE_TERM as 기간,
-            EFFECTIVE_DATE as 일자,
-            INT_RATE as 금리
-        FROM NFA_IRC_RATE_HIST
-        ORDER BY EFFECTIVE_DATE DESC
-        LIMIT 20
-        """
+_position_delta_cache: 'OrderedDict[Tuple, Dict[str, Any]]' = OrderedDict()
+_position_delta_cache_lock = threading.Lock()
 
-        interest_result = execute_sql_query(interest_query)
 
-        report['sections']['market_data'] = {
-            'title': '시장 데이터',
-            'exchange_rates': exchange_result['data'] if exchange_result['success'] else [],
-            'interest_rates': interest_result['data'] if interest_result['success'] else [],
-            'summary': f"환율 {len(exchange_result['data'])}건, 금리 {len(interest_result['data'])}건"
-        }
+def _sorted_breakdown_rows(groups) -> List[Dict[str, Any]]:
+    """
+    (차원값, 건수, 잔액) 목록을 SQL의 GROUP BY ... ORDER BY 잔액 DESC와 같은 순서의 행으로 변환
 
-    # 4. Dimensional Analysis
-    if 'dimensional_analysis' in sections_to_include:
-        dim_query = """
-        SELECT
-            ALM_DIMN_CD as ALM차원,
-            COUNT(*) as 건수,
-            SUM(CUR_PAR_BAL) as 총잔액
-        FROM ALM_INST
-        GROUP BY ALM_DIMN_CD
-        ORDER BY 총잔액 DESC
-        LIMIT 10
-        """
+    잔액이 NULL(None)인 그룹은 마지막에 위치합니다.
+    """
+    rows = [
+        {'차원값': value, '건수': cnt, '잔액': balance}
+        for value, cnt, balance in sorted(groups, key=lambda item: str(item[0]))
+    ]
+    rows.sort(key=lambda row: (row['잔액'] is None, -(row['잔액'] or 0)))
+    return rows
+
+
+def compute_position_delta(
+    target_date: str,
+    other_date: str,
+    sample_size: int = 5,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    target_date 스냅샷에만 존재하는 계약의 변동 집계 (단일 패스)
+
+    기준일 쌍마다 anti-join을 한 번만 실행하고, 스트리밍으로 읽으면서
+    건수/잔액 합계/샘플과 모든 차원(POSITION_DIMENSIONS)별 집계를 함께 계산합니다.
+    차원별 건수는 기존 COUNT(DISTINCT REFERENCE_NO)와 같도록
+    REFERENCE_NO 정렬 순서를 이용해 중복을 제외합니다.
 
-        dim_result = execute_sql_query(dim_query)
+    Args:
+        target_date: 집계 대상 스냅샷 기준일 (신규: 현재, 소멸: 이전)
+        other_date: 비교 스냅샷 기준일
+        sample_size: 보관할 샘플 계약 수
+        use_cache: 기준일 쌍별 결과 캐시 사용 여부
 
-        report['sections']['dimensional_analysis'] = {
-            'title': '차원 분석',
-            'data': dim_result['data'] if dim_result['success'] else [],
-            'summary': f"총 {len(dim_result['data'])}개 ALM 차원"
+    Returns:
+        {
+            'success': bool,
+            'count': int,
+            'total_balance': float,
+            'contracts': List[Dict],                 # 샘플 계약
+            'breakdown': {차원: [{'차원값', '건수', '잔액'}, ...]}   # 잔액 내림차순
         }
+        (실패 시 {'success': False, 'error': str})
+    """
+    target_start, target_end = _date_prefix_range(target_date)
+    other_start, other_end = _date_prefix_range(other_date)
+
+    cache_key = None
+    if use_cache:
+        try:
+            cache_key = (target_start, other_start, sample_size, get_data_version())
+        except Exception:
+            cache_key = None
+        if cache_key is not None:
+            with _position_delta_cache_lock:
+                cached = _position_delta_cache.get(cache_key)
+                if cached is not None:
+                    _position_delta_cache.move_to_end(cache_key)
+                    return cached
+
+    count = 0
+    total_balance = 0.0
+    contracts: List[Dict[str, Any]] = []
+    # 차원 → {차원값: [건수, 잔액 합계, 마지막 REFERENCE_NO, 잔액 존재 여부]}
+    groups: Dict[str, Dict[Any, list]] = {dim: {} for dim in POSITION_DIMENSIONS}
 
-    return report
+    try:
+        with stream_registered_query('position_delta_contracts', {
+            'target_start': target_start,
+            'target_end': target_end,
+            'other_start': other_start,
+            'other_end': other_end
+        }) as stream:
+            columns = stream.columns
+            ref_idx = columns.index('REFERENCE_NO')
+            balance_idx = columns.index('CUR_PAR_BAL')
+            dim_idx = [(dim, columns.index(dim)) for dim in POSITION_DIMENSIONS]
+
+            for batch in stream:
+                if len(contracts) < sample_size:
+                    contracts.extend(_records_from_rows(columns, batch[:sample_size - len(contracts)]))
+                count += len(batch)
+
+                for row in batch:
+                    ref = row[ref_idx]
+                    balance = row[balance_idx]
+                    if balance is not None:
+                        total_balance += balance
+
+                    for dim, idx in dim_idx:
+                        value = row[idx]
+                        if value is None:
+                            continue
+                        acc = groups[dim].get(value)
+                        if acc is None:
+                            acc = groups[dim][value] = [0, 0.0, None, False]
+                        if acc[2] != ref:
+                            acc[0] += 1
+                            acc[2] = ref
+                        if balance is not None:
+                            acc[1] += balance
+                            acc[3] = True
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+    breakdown = {
+        dim: _sorted_breakdown_rows(
+            (value, acc[0], acc[1] if acc[3] else None) for value, acc in groups[dim].items()
+        )
+        for dim in POSITION_DIMENSIONS
+    }
 
+    result = {
+        'success': True,
+        'count': count,
+        'total_balance': total_balance,
+        'contracts': contracts,
+        'breakdown': breakdown
+    }
 
-# ============================================================
-# Phase 2: 시나리오 비교 함수
-# ============================================================
+    if cache_key is not None:
+        with _position_delta_cache_lock:
+            _position_delta_cache[cache_key] = result
+            while len(_position_delta_cache) > POSITION_DELTA_CACHE_SIZE:
+                _position_delta_cache.popitem(last=False)
 
-def compare_scenarios(
-    scenario_list: List[int],
-    comparison_metrics: Optional[List[str]] = None
-) -> Dict[str, Any]:
+    return result
+
+
+def _position_delta_breakdown(
+    delta: Dict[str, Any],
+    group_by_dimensions: List[str],
+    count_label: str,
+    balance_label: str
+) -> Dict[str, List[Dict]]:
     """
-    여러 시나리오 비교 분석 (Phase 2)
+    변동 집계 결과를 차원별 breakdown 형식으로 변환
 
     Args:
-        scenario_list: 비교할 시나리오 번호 리스트
-        comparison_metrics: 비교할 지표 (None이면 기본 지표)
+        delta: compute_position_delta() 결과
+        group_by_dimensions: 집계할 차원 리스트
+        count_label: 건수 컬럼 레이블 (예: '신규건수')
+        balance_label: 잔액 컬럼 레이블 (예: '신규잔액')
+
+    Returns:
+        {'by_product': [...], 'by_org': [...], 'by_alm': [...]}
+    """
+    breakdown_keys = {'DIM_PROD': 'by_product', 'DIM_ORG': 'by_org', 'DIM_ALM': 'by_alm'}
+    breakdown = {key: [] for key in breakdown_keys.values()}
+
+    for dim in POSITION_DIMENSIONS:
+        if dim not in group_by_dimensions:
+            continue
+        breakdown[breakdown_keys[dim]] = [
+            {'차원값': row['차원값'], count_label: row['건수'], balance_label: row['잔액']}
+            for row in delta['breakdown'][dim]
+        ]
+
+    return breakdown
+
+# ============================================================
+# 포지션 변동 NumPy 엔진 (정렬 배열 집합 연산)
+# ============================================================
+
+# 기준일별 스냅샷 배열 캐시 크기 (연속 두 쌍을 재사용할 수 있도록 기준일 4개)
+SNAPSHOT_ARRAY_CACHE_SIZE = 4
+
+_snapshot_array_cache: 'OrderedDict[Tuple, Dict[str, Any]]' = OrderedDict()
+_snapshot_array_cache_lock = threading.Lock()
+
+# 스냅샷 샘플 레코드에 포함할 컬럼 (position_delta_contracts와 동일)
+SNAPSHOT_COLUMNS = ['REFERENCE_NO', 'CURRENCY_CD', 'CUR_PAR_BAL', 'CUR_RATE'] + POSITION_DIMENSIONS
+
+
+def load_snapshot_arrays(base_date: str, use_cache: bool = True) -> Dict[str, Any]:
+    """
+    기준일 스냅샷을 REFERENCE_NO 기준으로 정렬된 NumPy 배열로 로드 (데이터 버전별 캐시)
 
     Returns:
         {
-            'scenarios': List[int],
-            'comparison_data': Dict,
-            'summary': str
+            'refs': ndarray,        # 정렬된 REFERENCE_NO
+            'balance': ndarray,     # CUR_PAR_BAL (NULL은 NaN)
+            'columns': {컬럼: ndarray(object)},  # SNAPSHOT_COLUMNS 원본 값
         }
     """
-    comparison = {
-        'scenarios': scenario_list,
-        'comparison_data': {},
-        'summary': ''
+    start, end = _date_prefix_range(base_date)
+    cache_key = (start, get_data_version()) if use_cache else None
+
+    if cache_key is not None:
+        with _snapshot_array_cache_lock:
+            cached = _snapshot_array_cache.get(cache_key)
+            if cached is not None:
+                _snapshot_array_cache.move_to_end(cache_key)
+                return cached
+
+    column_list = ', '.join(SNAPSHOT_COLUMNS)
+    result = execute_sql_query(f"""
+        SELECT {column_list}
+        FROM ALM_INST
+        WHERE BASE_DATE >= :start AND BASE_DATE < :end
+        ORDER BY REFERENCE_NO
+    """, {'start': start, 'end': end}, name='snapshot_arrays', use_cache=False)
+    if not result['success']:
+        raise RuntimeError(result['error'])
+
+    rows = result.rows
+    columns = {
+        col: np.array([row[j] for row in rows], dtype=object)
+        for j, col in enumerate(SNAPSHOT_COLUMNS)
+    }
+    refs = columns['REFERENCE_NO']
+    if len(refs) and all(isinstance(ref, str) for ref in refs):
+        refs = refs.astype(str)
+
+    snapshot = {
+        'refs': refs,
+        'balance': np.array(
+            [np.nan if value is None else value for value in columns['CUR_PAR_BAL']], dtype=float
+        ),
+        'columns': columns,
     }
 
-    for scenario_no in scenario_list:
-        query = f"""
-        SELECT
-            TIME_BAND as 기간대,
-            SUM(GAP_PRN_TOTAL) as 원금갭,
-            SUM(GAP_INT_TOTAL) as 이자갭,
-            SUM(GAP_PRN_TOTAL + GAP_INT_TOTAL) as 총갭
-        FROM NFAR_LIQ_GAP_310524
-        WHERE SCENARIO_NO = {scenario_no}
-        GROUP BY TIME_BAND
-        ORDER BY TIME_BAND
-        """
+    if cache_key is not None:
+        with _snapshot_array_cache_lock:
+            _snapshot_array_cache[cache_key] = snapshot
+            while len(_snapshot_array_cache) > SNAPSHOT_ARRAY_CACHE_SIZE:
+                _snapshot_array_cache.popitem(last=False)
 
-        result = execute_sql_query(query)
+    return snapshot
 
-        if result['success']:
-            df = result['dataframe']
 
-            comparison['comparison_data'][f'scenario_{scenario_no}'] = {
-                'data': result['data'],
-                'total_gap': df['총갭'].sum() if '총갭' in df.columns else 0,
-                'max_gap': df['총갭'].max() if '총갭' in df.columns else 0,
-                'min_gap': df['총갭'].min() if '총갭' in df.columns else 0,
-                'avg_gap': df['총갭'].mean() if '총갭' in df.columns else 0
-            }
+def compute_position_delta_numpy(
+    target_date: str,
+    other_date: str,
+    sample_size: int = 5
+) -> Dict[str, Any]:
+    """
+    compute_position_delta()의 NumPy 구현
 
-    summary_lines = []
-    summary_lines.append(f"총 {len(scenario_list)}개 시나리오 비교\n")
+    두 스냅샷의 정렬된 REFERENCE_NO 배열에 대해 searchsorted로 차집합을 구하고,
+    차원별 잔액/건수는 pd.factorize + np.bincount로 집계합니다.
+    반환 형식은 compute_position_delta()와 같습니다.
+    """
+    try:
+        target = load_snapshot_arrays(target_date)
+        other = load_snapshot_arrays(other_date)
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
 
-    for scenario_no in scenario_list:
-        key = f'scenario_{scenario_no}'
-        if key in comparison['comparison_data']:
-            data = comparison['comparison_data'][key]
-            summary_lines.append(
-                f"시나리오 {scenario_no}: "
-                f"총갭={data['total_gap']:,.0f}, "
-                f"평균={data['avg_gap']:,.0f}, "
-                f"최대={data['max_gap']:,.0f}, "
-                f"최소={data['min_gap']:,.0f}"
-            )
+    target_refs, other_refs = target['refs'], other['refs']
 
-    comparison['summary'] = '\n'.join(summary_lines)
-    return comparison
+    # target에만 있는 계약: 정렬된 other_refs에서 위치를 찾아 일치 여부 확인
+    if len(other_refs):
+        pos = np.searchsorted(other_refs, target_refs)
+        pos[pos >= len(other_refs)] = 0
+        mask = other_refs[pos] != target_refs
+    else:
+        mask = np.ones(len(target_refs), dtype=bool)
+
+    idx = np.flatnonzero(mask)
+    balance = target['balance'][idx]
+    has_balance = ~np.isnan(balance)
+    balance_filled = np.where(has_balance, balance, 0.0)
+
+    sample_rows = [
+        tuple(target['columns'][col][i] for col in SNAPSHOT_COLUMNS)
+        for i in idx[:sample_size]
+    ]
+
+    # 차원별 COUNT(DISTINCT REFERENCE_NO)를 위한 계약 코드
+    _, ref_codes = np.unique(target_refs[idx], return_inverse=True)
+    n_refs = int(ref_codes.max()) + 1 if len(ref_codes) else 1
+
+    breakdown = {}
+    for dim in POSITION_DIMENSIONS:
+        values = target['columns'][dim][idx]
+        valid = np.array([value is not None for value in values], dtype=bool)
+        if not valid.any():
+            breakdown[dim] = []
+            continue
+
+        # 원래 값으로 그룹 구분 (SQLite GROUP BY처럼 1과 '1'은 다른 그룹, 1과 1.0은 같은 그룹)
+        codes, keys = pd.factorize(values[valid])
+
+        n_groups = len(keys)
+        sums = np.bincount(codes, weights=balance_filled[valid], minlength=n_groups)
+        balance_counts = np.bincount(codes, weights=has_balance[valid], minlength=n_groups)
+        pairs = np.unique(codes.astype(np.int64) * n_refs + ref_codes[valid])
+        counts = np.bincount(pairs // n_refs, minlength=n_groups)
+
+        breakdown[dim] = _sorted_breakdown_rows(
+            (keys[g], int(counts[g]), float(sums[g]) if balance_counts[g] else None)
+            for g in range(n_groups)
+        )
 
+    return {
+        'success': True,
+        'count': int(len(idx)),
+        'total_balance': float(balance_filled.sum()),
+        'contracts': _records_from_rows(SNAPSHOT_COLUMNS, sample_rows),
+        'breakdown': breakdown
+    }
 
 # ============================================================
-# Phase 2: 추세 분석 함수
+# 포지션 변동 인덱스 (기준일 쌍별 사전 계산)
 # ============================================================
 
-def analyze_trends(
-    metric_type: str,
-    currency_or_rate_cd: Optional[str] = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None
+# 파생 테이블 DDL (ALM_INST와 같은 DB 파일에 저장)
+POSITION_DELTA_INDEX_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS ALM_POSITION_DELTA_PAIR (
+        PREV_DATE TEXT NOT NULL,
+        CURR_DATE TEXT NOT NULL,
+        FINGERPRINT TEXT NOT NULL,
+        NEW_COUNT INTEGER, NEW_BALANCE REAL,
+        EXPIRED_COUNT INTEGER, EXPIRED_BALANCE REAL,
+        CONTINUING_COUNT INTEGER, CONTINUING_BALANCE REAL,
+        BUILT_AT TEXT,
+        PRIMARY KEY (PREV_DATE, CURR_DATE)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ALM_POSITION_DELTA_REF (
+        PREV_DATE TEXT NOT NULL,
+        CURR_DATE TEXT NOT NULL,
+        KIND TEXT NOT NULL,
+        -- ALM_INST 값을 그대로 보존하도록 복사 컬럼에는 타입을 지정하지 않음
+        REFERENCE_NO, CURRENCY_CD, CUR_PAR_BAL, CUR_RATE,
+        DIM_PROD, DIM_ORG, DIM_ALM
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS IX_ALM_POSITION_DELTA_REF ON ALM_POSITION_DELTA_REF (PREV_DATE, CURR_DATE, KIND, REFERENCE_NO)",
+    """
+    CREATE TABLE IF NOT EXISTS ALM_POSITION_DELTA_DIM (
+        PREV_DATE TEXT NOT NULL,
+        CURR_DATE TEXT NOT NULL,
+        KIND TEXT NOT NULL,
+        DIMENSION TEXT NOT NULL,
+        DIM_VALUE,
+        CNT INTEGER,
+        BALANCE REAL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS IX_ALM_POSITION_DELTA_DIM ON ALM_POSITION_DELTA_DIM (PREV_DATE, CURR_DATE, KIND)",
+    # 무효화 트리거의 CURR_DATE 조건용
+    "CREATE INDEX IF NOT EXISTS IX_ALM_POSITION_DELTA_PAIR_CURR ON ALM_POSITION_DELTA_PAIR (CURR_DATE)",
+    # 기준일 범위 조회 및 anti-join용 (BASE_DATE, REFERENCE_NO) 인덱스
+    "CREATE INDEX IF NOT EXISTS IX_ALM_INST_BASE_DATE_REF ON ALM_INST (BASE_DATE, REFERENCE_NO)",
+]
+
+POSITION_DELTA_INDEX_TABLES = ['ALM_POSITION_DELTA_PAIR', 'ALM_POSITION_DELTA_REF', 'ALM_POSITION_DELTA_DIM']
+
+# ALM_INST 행이 추가/수정/삭제되면 해당 BASE_DATE가 포함된 쌍만 무효화
+# (건수/rowid가 그대로인 잔액·차원 UPDATE 포함)
+_POSITION_DELTA_TRIGGER_DATES = {
+    'INSERT': 'NEW.BASE_DATE',
+    'UPDATE': 'OLD.BASE_DATE, NEW.BASE_DATE',
+    'DELETE': 'OLD.BASE_DATE',
+}
+POSITION_DELTA_INDEX_TRIGGERS = {
+    f"TR_ALM_POSITION_DELTA_STALE_{event}": f"""
+    CREATE TRIGGER IF NOT EXISTS TR_ALM_POSITION_DELTA_STALE_{event}
+    AFTER {event} ON ALM_INST
+    BEGIN
+        UPDATE ALM_POSITION_DELTA_PAIR SET FINGERPRINT = '{DERIVED_STALE_FINGERPRINT}'
+        WHERE (PREV_DATE IN ({dates}) OR CURR_DATE IN ({dates}))
+          AND FINGERPRINT != '{DERIVED_STALE_FINGERPRINT}';
+    END
+    """
+    for event, dates in _POSITION_DELTA_TRIGGER_DATES.items()
+}
+
+_position_delta_tracking: Optional[Tuple[Tuple, bool]] = None
+
+
+def _base_date_fingerprint(conn: sqlite3.Connection, base_date: str) -> str:
+    """
+    기준일 스냅샷 지문 ('건수:최대 rowid', 쌍을 계산할 때 기록)
+
+    (BASE_DATE, REFERENCE_NO) 인덱스만으로 계산됩니다. 스냅샷 변경 감지는
+    POSITION_DELTA_INDEX_TRIGGERS가 담당합니다.
+    """
+    start, end = _date_prefix_range(base_date)
+    row = conn.execute(QUERY_REGISTRY['base_date_fingerprint'], {'start': start, 'end': end}).fetchone()
+    return f"{row[0]}:{row[1]}"
+
+
+def _pair_fingerprint(conn: sqlite3.Connection, prev_date: str, curr_date: str) -> str:
+    """기준일 쌍 지문"""
+    return f"{_base_date_fingerprint(conn, prev_date)}|{_base_date_fingerprint(conn, curr_date)}"
+
+
+def _build_position_delta_pair(conn: sqlite3.Connection, prev_date: str, curr_date: str, fingerprint: str):
+    """
+    기준일 쌍 하나의 신규/소멸/유지 집계를 계산해 파생 테이블에 저장 (쓰기 커넥션 사용)
+    """
+    prev_start, prev_end = _date_prefix_range(prev_date)
+    curr_start, curr_end = _date_prefix_range(curr_date)
+    pair = {'prev_date': prev_date, 'curr_date': curr_date}
+
+    for table in POSITION_DELTA_INDEX_TABLES:
+        conn.execute(f"DELETE FROM {table} WHERE PREV_DATE = :prev_date AND CURR_DATE = :curr_date", pair)
+
+    # 신규(NEW): 현재에만 존재 / 소멸(EXPIRED): 이전에만 존재
+    for kind, target, other in (
+        ('NEW', (curr_start, curr_end), (prev_start, prev_end)),
+        ('EXPIRED', (prev_start, prev_end), (curr_start, curr_end)),
+    ):
+        conn.execute(f"""
+            INSERT INTO ALM_POSITION_DELTA_REF
+            SELECT :prev_date, :curr_date, :kind, * FROM (
+                {QUERY_REGISTRY['position_delta_contracts']}
+            )
+        """, {
+            **pair, 'kind': kind,
+            'target_start': target[0], 'target_end': target[1],
+            'other_start': other[0], 'other_end': other[1]
+        })
+
+        for dim in POSITION_DIMENSIONS:
+            conn.execute(f"""
+                INSERT INTO ALM_POSITION_DELTA_DIM
+                SELECT PREV_DATE, CURR_DATE, KIND, '{dim}', {dim},
+                       COUNT(DISTINCT REFERENCE_NO), SUM(CUR_PAR_BAL)
+                FROM ALM_POSITION_DELTA_REF
+                WHERE PREV_DATE = :prev_date AND CURR_DATE = :curr_date AND KIND = :kind
+                  AND {dim} IS NOT NULL
+                GROUP BY {dim}
+            """, {**pair, 'kind': kind})
+
+    totals = {
+        kind: conn.execute("""
+            SELECT COUNT(*), COALESCE(SUM(CUR_PAR_BAL), 0)
+            FROM ALM_POSITION_DELTA_REF
+            WHERE PREV_DATE = :prev_date AND CURR_DATE = :curr_date AND KIND = :kind
+        """, {**pair, 'kind': kind}).fetchone()
+        for kind in ('NEW', 'EXPIRED')
+    }
+
+    # 유지(CONTINUING): 현재 스냅샷 중 신규가 아닌 계약
+    curr_count, curr_balance = conn.execute("""
+        SELECT COUNT(*), COALESCE(SUM(CUR_PAR_BAL), 0)
+        FROM ALM_INST
+        WHERE BASE_DATE >= :start AND BASE_DATE < :end
+    """, {'start': curr_start, 'end': curr_end}).fetchone()
+
+    conn.execute("""
+        INSERT INTO ALM_POSITION_DELTA_PAIR VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (
+        prev_date, curr_date, fingerprint,
+        totals['NEW'][0], totals['NEW'][1],
+        totals['EXPIRED'][0], totals['EXPIRED'][1],
+        curr_count - totals['NEW'][0], curr_balance - totals['NEW'][1],
+        datetime.now().isoformat(timespec='seconds')
+    ))
+
+
+def build_position_delta_index(
+    db_path: Optional[str] = None,
+    rebuild: bool = False,
+    verbose: bool = False
 ) -> Dict[str, Any]:
     """
-    시계열 추세 분석 (Phase 2)
+    연속된 BASE_DATE 쌍별 신규/소멸/유지 계약 집합과 차원별 집계를 사전 계산 (오프라인 작업)
+
+    ALM_INST에 무효화 트리거를 설치하므로, 다시 실행하면 새로 생긴 쌍(보통 가장 최근 쌍)과
+    트리거가 'stale'로 표시한 쌍만 다시 계산합니다. 트리거가 없었으면(첫 실행, ALM_INST 재생성)
+    기존 쌍의 변경 여부를 알 수 없으므로 모든 쌍을 다시 계산합니다.
+    챗봇 프로세스의 풀 커넥션은 읽기 전용이므로 별도의 쓰기 커넥션을 사용합니다.
 
     Args:
-        metric_type: 'exchange_rate' 또는 'interest_rate'
-        currency_or_rate_cd: 통화 코드 또는 금리 코드
-        start_date: 시작 날짜 (YYYY-MM-DD)
-        end_date: 종료 날짜 (YYYY-MM-DD)
+        db_path: 대상 DB 경로 (None이면 DB_PATH)
+        rebuild: True면 모든 쌍을 다시 계산
+        verbose: 진행 상황 출력
 
     Returns:
-        {
-            'metric_type': str,
-            'data_points': List[Dict],
-            'statistics': Dict,
-            'trend': str
-        }
+        {'success': bool, 'pairs': int, 'built': List[Tuple], 'skipped': int}
     """
-    import numpy as np
+    db_path = db_path or DB_PATH
+    if not os.path.exists(db_path):
+        return {'success': False, 'error': f"DB 파일을 찾을 수 없습니다: {db_path}"}
+
+    conn = sqlite3.connect(db_path)
+    try:
+        triggers_ready = _triggers_installed(conn, list(POSITION_DELTA_INDEX_TRIGGERS))
+        for ddl in [*POSITION_DELTA_INDEX_DDL, *POSITION_DELTA_INDEX_TRIGGERS.values()]:
+            conn.execute(ddl)
+        conn.commit()
+
+        dates = [row[0] for row in conn.execute("SELECT DISTINCT BASE_DATE FROM ALM_INST ORDER BY BASE_DATE")]
+        stored = {
+            (row[0], row[1]): row[2]
+            for row in conn.execute("SELECT PREV_DATE, CURR_DATE, FINGERPRINT FROM ALM_POSITION_DELTA_PAIR")
+        }
+
+        pairs = list(zip(dates, dates[1:]))
+        built = []
+        for prev_date, curr_date in pairs:
+            stored_fingerprint = stored.get((prev_date, curr_date))
+            if (not rebuild and triggers_ready
+                    and stored_fingerprint not in (None, DERIVED_STALE_FINGERPRINT)):
+                continue
+
+            start = time.perf_counter()
+            fingerprint = _pair_fingerprint(conn, prev_date, curr_date)
+            with conn:
+                _build_position_delta_pair(conn, prev_date, curr_date, fingerprint)
+            built.append((prev_date, curr_date))
+            if verbose:
+                print(f"  {prev_date} → {curr_date}: {time.perf_counter() - start:.2f}초")
+
+        # 더 이상 연속되지 않는 쌍 정리
+        stale = set(stored) - set(pairs)
+        if stale:
+            with conn:
+                for prev_date, curr_date in stale:
+                    for table in POSITION_DELTA_INDEX_TABLES:
+                        conn.execute(
+                            f"DELETE FROM {table} WHERE PREV_DATE = ? AND CURR_DATE = ?",
+                            (prev_date, curr_date)
+                        )
+
+        return {
+            'success': True,
+            'pairs': len(pairs),
+            'built': built,
+            'skipped': len(pairs) - len(built),
+            'removed': len(stale)
+        }
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+    finally:
+        conn.close()
 
-    trends = {
-        'metric_type': metric_type,
-        'data_points': [],
-        'statistics': {},
-        'trend': ''
-    }
 
-    if metric_type == 'exchange_rate':
-        query = "SELECT EFFECTIVE_DATE as 일자, EXCH_RATE as 값 FROM NFA_EXCH_RATE_HIST"
+def _position_delta_index_tracked() -> bool:
+    """ALM_INST 무효화 트리거가 있는지 확인 (데이터 버전별 캐시)"""
+    global _position_delta_tracking
 
-        conditions = []
-        if currency_or_rate_cd:
-            conditions.append(f"UNIT_CURRENCY_CD = '{currency_or_rate_cd}'")
-        if start_date:
-            conditions.append(f"EFFECTIVE_DATE >= '{start_date}'")
-        if end_date:
-            conditions.append(f"EFFECTIVE_DATE <= '{end_date}'")
+    try:
+        with get_db_pool().connection() as conn:
+            version = get_data_version(conn)
+            cached = _position_delta_tracking
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            tracked = _triggers_installed(conn, list(POSITION_DELTA_INDEX_TRIGGERS))
+    except Exception:
+        return False
+
+    _position_delta_tracking = (version, tracked)
+    return tracked
+
+
+def lookup_position_delta_index(
+    target_date: str,
+    other_date: str,
+    kind: str,
+    sample_size: int = 5
+) -> Optional[Dict[str, Any]]:
+    """
+    사전 계산된 포지션 변동 인덱스 조회
 
-        if conditions:
-            query += " WHERE " + " AND ".join(conditions)
+    compute_position_delta()와 같은 형식을 반환하며,
+    인덱스가 없거나 해당 쌍이 없거나 트리거가 무효화했거나(원본 변경)
+    트리거가 없으면(ALM_INST 재생성) None을 반환합니다.
 
-        query += " ORDER BY EFFECTIVE_DATE"
+    Args:
+        target_date: 집계 대상 스냅샷 기준일
+        other_date: 비교 스냅샷 기준일
+        kind: 'NEW' (target=현재, other=이전) 또는 'EXPIRED' (target=이전, other=현재)
+        sample_size: 샘플 계약 수
+    """
+    if 'ALM_POSITION_DELTA_PAIR' not in get_table_info():
+        return None
 
-    elif metric_type == 'interest_rate':
-        query = "SELECT EFFECTIVE_DATE as 일자, INT_RATE as 값 FROM NFA_IRC_RATE_HIST"
+    prev_date, curr_date = (other_date, target_date) if kind == 'NEW' else (target_date, other_date)
+    prev_start, prev_end = _date_prefix_range(prev_date)
+    curr_start, curr_end = _date_prefix_range(curr_date)
 
-        conditions = []
-        if currency_or_rate_cd:
-            conditions.append(f"INT_RATE_CD = {currency_or_rate_cd}")
-        if start_date:
-            conditions.append(f"EFFECTIVE_DATE >= '{start_date}'")
-        if end_date:
-            conditions.append(f"EFFECTIVE_DATE <= '{end_date}'")
+    pair_result = run_registered_query('position_index_pair', {
+        'prev_start': prev_start, 'prev_end': prev_end,
+        'curr_start': curr_start, 'curr_end': curr_end
+    })
+    if not pair_result['success'] or pair_result['row_count'] != 1:
+        return None
+    pair_row = pair_result['data'][0]
 
-        if conditions:
-            query += " WHERE " + " AND ".join(conditions)
+    if pair_row['FINGERPRINT'] == DERIVED_STALE_FINGERPRINT or not _position_delta_index_tracked():
+        return None
 
-        query += " ORDER BY EFFECTIVE_DATE"
+    params = {'prev_date': pair_row['PREV_DATE'], 'curr_date': pair_row['CURR_DATE'], 'kind': kind}
+    refs = run_registered_query('position_index_refs', {**params, 'limit': sample_size})
+    dims = run_registered_query('position_index_dims', params)
+    if not refs['success'] or not dims['success']:
+        return None
 
-    else:
-        return {
-            'error': f"지원하지 않는 metric_type: {metric_type}"
-        }
+    breakdown = {dim: [] for dim in POSITION_DIMENSIONS}
+    for row in dims['data']:
+        breakdown[row['DIMENSION']].append(
+            {'차원값': row['차원값'], '건수': row['건수'], '잔액': row['잔액']}
+        )
 
-    result = execute_sql_query(query)
-
-    if result['success'] and result['row_count'] > 0:
-        df = result['dataframe']
-        trends['data_points'] = result['data']
-
-        values = df['값'].values
-        trends['statistics'] = {
-            'count': len(values),
-            'mean': float(np.mean(values)),
-            'std': float(np.std(values)),
-            'min': float(np.min(values)),
-            'max': float(np.max(values)),
-            'first_value': float(values[0]),
-            'last_value': float(values[-1]),
-            'change': float(values[-1] - values[0]),
-            'change_pct': float((values[-1] - values[0]) / values[0] * 100) if values[0] != 0 else 0
+    prefix = 'NEW' if kind == 'NEW' else 'EXPIRED'
+    return {
+        'success': True,
+        'count': pair_row[f'{prefix}_COUNT'],
+        'total_balance': float(pair_row[f'{prefix}_BALANCE'] or 0),
+        'contracts': list(refs['data']),
+        'breakdown': breakdown,
+        'continuing': {
+            'count': pair_row['CONTINUING_COUNT'],
+            'total_balance': pair_row['CONTINUING_BALANCE']
         }
+    }
 
-        if len(values) >= 2:
-            x = np.arange(len(values))
-            slope = np.polyfit(x, values, 1)[0]
 
-            if slope > 0.01:
-                trends['trend'] = '상승 추세'
-            elif slope < -0.01:
-                trends['trend'] = '하락 추세'
-            else:
-                trends['trend'] = '안정 추세'
+def verify_position_delta_index(rel_tol: float = 1e-9) -> Dict[str, Any]:
+    """
+    사전 계산된 인덱스를 실시간 계산(compute_position_delta) 결과와 비교 검증
 
-            trends['statistics']['slope'] = float(slope)
+    Returns:
+        {'success': bool, 'pairs': int, 'mismatches': List[Dict]}
+    """
+    if 'ALM_POSITION_DELTA_PAIR' not in get_table_info(refresh=True):
+        return {'success': False, 'error': "포지션 변동 인덱스가 없습니다. build_position_delta_index()를 먼저 실행하세요."}
+
+    pairs = run_registered_query('position_index_pairs_all')
+    if not pairs['success']:
+        return {'success': False, 'error': pairs['error']}
+
+    def same(a, b):
+        if isinstance(a, float) or isinstance(b, float):
+            return a is not None and b is not None and math.isclose(a, b, rel_tol=rel_tol)
+        return a == b
+
+    mismatches = []
+    for pair in pairs['data']:
+        prev_date, curr_date = pair['PREV_DATE'], pair['CURR_DATE']
+        for kind, target, other in (('NEW', curr_date, prev_date), ('EXPIRED', prev_date, curr_date)):
+            indexed = lookup_position_delta_index(target, other, kind)
+            live = compute_position_delta(target, other, use_cache=False)
+            if indexed is None:
+                mismatches.append({'prev_date': prev_date, 'curr_date': curr_date, 'kind': kind, 'field': 'stale'})
+                continue
+            if not live['success']:
+                return {'success': False, 'error': live['error']}
+
+            for field in ('count', 'total_balance'):
+                if not same(indexed[field], live[field]):
+                    mismatches.append({
+                        'prev_date': prev_date, 'curr_date': curr_date, 'kind': kind,
+                        'field': field, 'index': indexed[field], 'live': live[field]
+                    })
+            for dim in POSITION_DIMENSIONS:
+                indexed_rows = {row['차원값']: row for row in indexed['breakdown'][dim]}
+                live_rows = {row['차원값']: row for row in live['breakdown'][dim]}
+                ok = indexed_rows.keys() == live_rows.keys() and all(
+                    indexed_rows[k]['건수'] == live_rows[k]['건수']
+                    and (indexed_rows[k]['잔액'] == live_rows[k]['잔액']
+                         or same(indexed_rows[k]['잔액'], live_rows[k]['잔액']))
+                    for k in live_rows
+                )
+                if not ok:
+                    mismatches.append({
+                        'prev_date': prev_date, 'curr_date': curr_date, 'kind': kind, 'field': dim
+                    })
 
-    return trends
+    return {
+        'success': not mismatches,
+        'pairs': pairs['row_count'],
+        'mismatches': mismatches
+    }
+
+
+def get_position_delta(
+    target_date: str,
+    other_date: str,
+    kind: str,
+    engine: str = 'auto'
+) -> Dict[str, Any]:
+    """
+    포지션 변동 집계 (엔진 선택)
 
+    Args:
+        target_date: 집계 대상 스냅샷 기준일
+        other_date: 비교 스냅샷 기준일
+        kind: 'NEW' 또는 'EXPIRED'
+        engine: 'auto' (인덱스가 유효하면 사용, 아니면 SQL), 'index', 'sql', 'numpy'
+    """
+    if engine in ('auto', 'index'):
+        indexed = lookup_position_delta_index(target_date, other_date, kind)
+        if indexed is not None:
+            return indexed
+        if engine == 'index':
+            return {'success': False, 'error': "해당 기준일 쌍의 포지션 변동 인덱스가 없거나 최신이 아닙니다"}
+    elif engine == 'numpy':
+        return compute_position_delta_numpy(target_date, other_date)
+    elif engine != 'sql':
+        return {'success': False, 'error': f"지원하지 않는 엔진: {engine}"}
+
+    return compute_position_delta(target_date, other_date)
 
 # ============================================================
 # 신규 포지션 증가분 분석
@@ -646,7 +3999,8 @@ def analyze_trends(
 def analyze_new_position_growth(
     current_base_date: str,
     previous_base_date: Optional[str] = None,
-    group_by_dimensions: Optional[List[str]] = None
+    group_by_dimensions: Optional[List[str]] = None,
+    engine: str = 'auto'
 ) -> Dict[str, Any]:
     """
     당월 신규 포지션 증가분 분석
@@ -659,6 +4013,7 @@ def analyze_new_position_growth(
         previous_base_date: 이전 기준일 (None이면 자동으로 직전 BASE_DATE 선택)
         group_by_dimensions: 그룹화 차원 리스트 ['DIM_PROD', 'DIM_ORG', 'DIM_ALM']
                             None이면 모든 차원으로 분석
+        engine: 집계 엔진 ('auto': 사전 계산 인덱스가 유효하면 사용, 'index', 'sql', 'numpy')
 
     Returns:
         {
@@ -678,72 +4033,24 @@ def analyze_new_position_growth(
         }
     """
 
-    # 1. previous_base_date 자동 선택 (None인 경우)
-    if previous_base_date is None:
-        query = f"""
-        SELECT DISTINCT BASE_DATE
-        FROM ALM_INST
-        WHERE BASE_DATE LIKE '{current_base_date}%'
-           OR BASE_DATE < '{current_base_date}'
-        ORDER BY BASE_DATE DESC
-        LIMIT 2
-        """
-
-        result = execute_sql_query(query)
-
-        if result['success'] and result['row_count'] >= 2:
-            # Get the second one (first is current_base_date itself)
-            previous_base_date = result['data'][1]['BASE_DATE']
-        elif result['success'] and result['row_count'] == 1:
-            # Only one date found, try to get previous
-            query = f"""
-            SELECT DISTINCT BASE_DATE
-            FROM ALM_INST
-            WHERE BASE_DATE < '{current_base_date}'
-            ORDER BY BASE_DATE DESC
-            LIMIT 1
-            """
-            result2 = execute_sql_query(query)
-            if result2['success'] and result2['row_count'] > 0:
-                previous_base_date = result2['data'][0]['BASE_DATE']
-            else:
-                return {
-                    'error': f"이전 기준일을 찾을 수 없습니다. {current_base_date}보다 이전 데이터가 없습니다."
-                }
-        else:
+    # 1. previous_base_date 자동 선택 (None인 경우)
+    if previous_base_date is None:
+        previous_base_date = _resolve_previous_base_date(current_base_date)
+        if previous_base_date is None:
             return {
                 'error': f"이전 기준일을 찾을 수 없습니다. {current_base_date}보다 이전 데이터가 없습니다."
             }
 
     # 2. 신규 계약 식별 및 기본 통계
-    new_contracts_query = f"""
-    SELECT
-        t1.REFERENCE_NO,
-        t1.CURRENCY_CD,
-        t1.CUR_PAR_BAL,
-        t1.CUR_RATE,
-        t1.DIM_PROD,
-        t1.DIM_ORG,
-        t1.DIM_ALM
-    FROM ALM_INST t1
-    LEFT JOIN ALM_INST t2
-        ON t1.REFERENCE_NO = t2.REFERENCE_NO
-        AND t2.BASE_DATE LIKE '{previous_base_date[:10]}%'
-    WHERE t1.BASE_DATE LIKE '{current_base_date[:10]}%'
-      AND t2.REFERENCE_NO IS NULL
-    """
-
-    new_contracts_result = execute_sql_query(new_contracts_query)
+    new_contracts_result = get_position_delta(current_base_date, previous_base_date, 'NEW', engine)
 
     if not new_contracts_result['success']:
         return {
             'error': f"신규 계약 조회 실패: {new_contracts_result['error']}"
         }
 
-    df = new_contracts_result['dataframe']
-
     # 신규 계약이 없는 경우
-    if len(df) == 0:
+    if new_contracts_result['count'] == 0:
         return {
             'current_date': current_base_date,
             'previous_date': previous_base_date,
@@ -760,89 +4067,18 @@ def analyze_new_position_growth(
             'summary': f"{current_base_date} 기준 신규 계약이 없습니다 (비교: {previous_base_date})"
         }
 
-    # 기본 통계
-    new_count = len(df)
-    total_balance = df['CUR_PAR_BAL'].sum() if 'CUR_PAR_BAL' in df.columns else 0
-
-    # 샘플 계약 (최대 5건)
-    sample_contracts = new_contracts_result['data'][:5]
+    # 기본 통계 및 샘플 계약 (최대 5건)
+    new_count = new_contracts_result['count']
+    total_balance = new_contracts_result['total_balance']
+    sample_contracts = new_contracts_result['contracts']
 
     # 3. 차원별 집계
-    dimensional_breakdown = {
-        'by_product': [],
-        'by_org': [],
-        'by_alm': []
-    }
-
-    # 기본 차원 설정
     if group_by_dimensions is None:
-        group_by_dimensions = ['DIM_PROD', 'DIM_ORG', 'DIM_ALM']
-
-    # DIM_PROD별 집계
-    if 'DIM_PROD' in group_by_dimensions:
-        dim_query = f"""
-        SELECT
-            t1.DIM_PROD as 차원값,
-            COUNT(DISTINCT t1.REFERENCE_NO) as 신규건수,
-            SUM(t1.CUR_PAR_BAL) as 신규잔액
-        FROM ALM_INST t1
-        LEFT JOIN ALM_INST t2
-            ON t1.REFERENCE_NO = t2.REFERENCE_NO
-            AND t2.BASE_DATE LIKE '{previous_base_date[:10]}%'
-        WHERE t1.BASE_DATE LIKE '{current_base_date[:10]}%'
-          AND t2.REFERENCE_NO IS NULL
-          AND t1.DIM_PROD IS NOT NULL
-        GROUP BY t1.DIM_PROD
-        ORDER BY 신규잔액 DESC
-        """
-
-        dim_result = execute_sql_query(dim_query)
-        if dim_result['success']:
-            dimensional_breakdown['by_product'] = dim_result['data']
-
-    # DIM_ORG별 집계
-    if 'DIM_ORG' in group_by_dimensions:
-        dim_query = f"""
-        SELECT
-            t1.DIM_ORG as 차원값,
-            COUNT(DISTINCT t1.REFERENCE_NO) as 신규건수,
-            SUM(t1.CUR_PAR_BAL) as 신규잔액
-        FROM ALM_INST t1
-        LEFT JOIN ALM_INST t2
-            ON t1.REFERENCE_NO = t2.REFERENCE_NO
-            AND t2.BASE_DATE LIKE '{previous_base_date[:10]}%'
-        WHERE t1.BASE_DATE LIKE '{current_base_date[:10]}%'
-          AND t2.REFERENCE_NO IS NULL
-          AND t1.DIM_ORG IS NOT NULL
-        GROUP BY t1.DIM_ORG
-        ORDER BY 신규잔액 DESC
-        """
-
-        dim_result = execute_sql_query(dim_query)
-        if dim_result['success']:
-            dimensional_breakdown['by_org'] = dim_result['data']
-
-    # DIM_ALM별 집계
-    if 'DIM_ALM' in group_by_dimensions:
-        dim_query = f"""
-        SELECT
-            t1.DIM_ALM as 차원값,
-            COUNT(DISTINCT t1.REFERENCE_NO) as 신규건수,
-            SUM(t1.CUR_PAR_BAL) as 신규잔액
-        FROM ALM_INST t1
-        LEFT JOIN ALM_INST t2
-            ON t1.REFERENCE_NO = t2.REFERENCE_NO
-            AND t2.BASE_DATE LIKE '{previous_base_date[:10]}%'
-        WHERE t1.BASE_DATE LIKE '{current_base_date[:10]}%'
-          AND t2.REFERENCE_NO IS NULL
-          AND t1.DIM_ALM IS NOT NULL
-        GROUP BY t1.DIM_ALM
-        ORDER BY 신규잔액 DESC
-        """
+        group_by_dimensions = POSITION_DIMENSIONS
 
-        dim_result = execute_sql_query(dim_query)
-        if dim_result['success']:
-            dimensional_breakdown['by_alm'] = dim_result['data']
+    dimensional_breakdown = _position_delta_breakdown(
+        new_contracts_result, group_by_dimensions, '신규건수', '신규잔액'
+    )
 
     # 4. 요약 생성
     summary = f"{current_base_date} 기준 신규 {new_count}건, 총 잔액 {total_balance:,.0f} (비교: {previous_base_date})"
@@ -859,7 +4095,6 @@ def analyze_new_position_growth(
         'summary': summary
     }
 
-
 # ============================================================
 # 소멸 포지션 감소분 분석
 # ============================================================
@@ -867,7 +4102,8 @@ def analyze_new_position_growth(
 def analyze_expired_position_decrease(
     current_base_date: str,
     previous_base_date: Optional[str] = None,
-    group_by_dimensions: Optional[List[str]] = None
+    group_by_dimensions: Optional[List[str]] = None,
+    engine: str = 'auto'
 ) -> Dict[str, Any]:
     """
     당월 소멸 포지션 감소분 분석
@@ -880,6 +4116,7 @@ def analyze_expired_position_decrease(
         previous_base_date: 이전 기준일 (None이면 자동으로 직전 BASE_DATE 선택)
         group_by_dimensions: 그룹화 차원 리스트 ['DIM_PROD', 'DIM_ORG', 'DIM_ALM']
                             None이면 모든 차원으로 분석
+        engine: 집계 엔진 ('auto': 사전 계산 인덱스가 유효하면 사용, 'index', 'sql', 'numpy')
 
     Returns:
         {
@@ -901,68 +4138,22 @@ def analyze_expired_position_decrease(
 
     # 1. previous_base_date 자동 선택 (None인 경우)
     if previous_base_date is None:
-        query = f"""
-        SELECT DISTINCT BASE_DATE
-        FROM ALM_INST
-        WHERE BASE_DATE LIKE '{current_base_date}%'
-           OR BASE_DATE < '{current_base_date}'
-        ORDER BY BASE_DATE DESC
-        LIMIT 2
-        """
-
-        result = execute_sql_query(query)
-
-        if result['success'] and result['row_count'] >= 2:
-            previous_base_date = result['data'][1]['BASE_DATE']
-        elif result['success'] and result['row_count'] == 1:
-            query = f"""
-            SELECT DISTINCT BASE_DATE
-            FROM ALM_INST
-            WHERE BASE_DATE < '{current_base_date}'
-            ORDER BY BASE_DATE DESC
-            LIMIT 1
-            """
-            result2 = execute_sql_query(query)
-            if result2['success'] and result2['row_count'] > 0:
-                previous_base_date = result2['data'][0]['BASE_DATE']
-            else:
-                return {
-                    'error': f"이전 기준일을 찾을 수 없습니다. {current_base_date}보다 이전 데이터가 없습니다."
-                }
-        else:
+        previous_base_date = _resolve_previous_base_date(current_base_date)
+        if previous_base_date is None:
             return {
                 'error': f"이전 기준일을 찾을 수 없습니다. {current_base_date}보다 이전 데이터가 없습니다."
             }
 
     # 2. 소멸 계약 식별 (이전에는 있었지만 현재는 없는 계약)
-    expired_contracts_query = f"""
-    SELECT
-        t1.REFERENCE_NO,
-        t1.CURRENCY_CD,
-        t1.CUR_PAR_BAL,
-        t1.CUR_RATE,
-        t1.DIM_PROD,
-        t1.DIM_ORG,
-        t1.DIM_ALM
-    FROM ALM_INST t1
-    LEFT JOIN ALM_INST t2
-        ON t1.REFERENCE_NO = t2.REFERENCE_NO
-        AND t2.BASE_DATE LIKE '{current_base_date[:10]}%'
-    WHERE t1.BASE_DATE LIKE '{previous_base_date[:10]}%'
-      AND t2.REFERENCE_NO IS NULL
-    """
-
-    expired_contracts_result = execute_sql_query(expired_contracts_query)
+    expired_contracts_result = get_position_delta(previous_base_date, current_base_date, 'EXPIRED', engine)
 
     if not expired_contracts_result['success']:
         return {
             'error': f"소멸 계약 조회 실패: {expired_contracts_result['error']}"
         }
 
-    df = expired_contracts_result['dataframe']
-
     # 소멸 계약이 없는 경우
-    if len(df) == 0:
+    if expired_contracts_result['count'] == 0:
         return {
             'current_date': current_base_date,
             'previous_date': previous_base_date,
@@ -979,89 +4170,18 @@ def analyze_expired_position_decrease(
             'summary': f"{current_base_date} 기준 소멸 계약이 없습니다 (비교: {previous_base_date})"
         }
 
-    # 기본 통계
-    expired_count = len(df)
-    total_balance = df['CUR_PAR_BAL'].sum() if 'CUR_PAR_BAL' in df.columns else 0
-
-    # 샘플 계약 (최대 5건)
-    sample_contracts = expired_contracts_result['data'][:5]
+    # 기본 통계 및 샘플 계약 (최대 5건)
+    expired_count = expired_contracts_result['count']
+    total_balance = expired_contracts_result['total_balance']
+    sample_contracts = expired_contracts_result['contracts']
 
     # 3. 차원별 집계
-    dimensional_breakdown = {
-        'by_product': [],
-        'by_org': [],
-        'by_alm': []
-    }
-
-    # 기본 차원 설정
     if group_by_dimensions is None:
-        group_by_dimensions = ['DIM_PROD', 'DIM_ORG', 'DIM_ALM']
-
-    # DIM_PROD별 집계
-    if 'DIM_PROD' in group_by_dimensions:
-        dim_query = f"""
-        SELECT
-            t1.DIM_PROD as 차원값,
-            COUNT(DISTINCT t1.REFERENCE_NO) as 소멸건수,
-            SUM(t1.CUR_PAR_BAL) as 소멸잔액
-        FROM ALM_INST t1
-        LEFT JOIN ALM_INST t2
-            ON t1.REFERENCE_NO = t2.REFERENCE_NO
-            AND t2.BASE_DATE LIKE '{current_base_date[:10]}%'
-        WHERE t1.BASE_DATE LIKE '{previous_base_date[:10]}%'
-          AND t2.REFERENCE_NO IS NULL
-          AND t1.DIM_PROD IS NOT NULL
-        GROUP BY t1.DIM_PROD
-        ORDER BY 소멸잔액 DESC
-        """
-
-        dim_result = execute_sql_query(dim_query)
-        if dim_result['success']:
-            dimensional_breakdown['by_product'] = dim_result['data']
-
-    # DIM_ORG별 집계
-    if 'DIM_ORG' in group_by_dimensions:
-        dim_query = f"""
-        SELECT
-            t1.DIM_ORG as 차원값,
-            COUNT(DISTINCT t1.REFERENCE_NO) as 소멸건수,
-            SUM(t1.CUR_PAR_BAL) as 소멸잔액
-        FROM ALM_INST t1
-        LEFT JOIN ALM_INST t2
-            ON t1.REFERENCE_NO = t2.REFERENCE_NO
-            AND t2.BASE_DATE LIKE '{current_base_date[:10]}%'
-        WHERE t1.BASE_DATE LIKE '{previous_base_date[:10]}%'
-          AND t2.REFERENCE_NO IS NULL
-          AND t1.DIM_ORG IS NOT NULL
-        GROUP BY t1.DIM_ORG
-        ORDER BY 소멸잔액 DESC
-        """
-
-        dim_result = execute_sql_query(dim_query)
-        if dim_result['success']:
-            dimensional_breakdown['by_org'] = dim_result['data']
-
-    # DIM_ALM별 집계
-    if 'DIM_ALM' in group_by_dimensions:
-        dim_query = f"""
-        SELECT
-            t1.DIM_ALM as 차원값,
-            COUNT(DISTINCT t1.REFERENCE_NO) as 소멸건수,
-            SUM(t1.CUR_PAR_BAL) as 소멸잔액
-        FROM ALM_INST t1
-        LEFT JOIN ALM_INST t2
-            ON t1.REFERENCE_NO = t2.REFERENCE_NO
-            AND t2.BASE_DATE LIKE '{current_base_date[:10]}%'
-        WHERE t1.BASE_DATE LIKE '{previous_base_date[:10]}%'
-          AND t2.REFERENCE_NO IS NULL
-          AND t1.DIM_ALM IS NOT NULL
-        GROUP BY t1.DIM_ALM
-        ORDER BY 소멸잔액 DESC
-        """
+        group_by_dimensions = POSITION_DIMENSIONS
 
-        dim_result = execute_sql_query(dim_query)
-        if dim_result['success']:
-            dimensional_breakdown['by_alm'] = dim_result['data']
+    dimensional_breakdown = _position_delta_breakdown(
+        expired_contracts_result, group_by_dimensions, '소멸건수', '소멸잔액'
+    )
 
     # 4. 요약 생성
     summary = f"{current_base_date} 기준 소멸 {expired_count}건, 총 잔액 {total_balance:,.0f} (비교: {previous_base_date})"
@@ -1078,6 +4198,886 @@ def analyze_expired_position_decrease(
         'summary': summary
     }
 
+# ============================================================
+# 금리 충격 분석 엔진 (ΔNII / ΔEVE)
+# ============================================================
+
+# 역할별 ALM_INST 컬럼 후보 (앞에 있는 컬럼을 우선 사용)
+RATE_SHOCK_COLUMN_CANDIDATES = {
+    'balance': ['CUR_PAR_BAL', 'CUR_BAL', 'PAR_BAL'],
+    'rate': ['CUR_RATE', 'INT_RATE', 'CUR_NET_RATE'],
+    'maturity': ['MATURITY_DATE', 'MATUR_DATE', 'MAT_DATE'],
+    'repricing': ['NEXT_REPRICE_DATE', 'REPRICE_DATE', 'NEXT_RESET_DATE'],
+}
+
+# 충격 크기 (bp): 평행 / 단기 / 장기 (BCBS IRRBB 표준 충격 형태)
+RATE_SHOCK_SIZES_BP = {'parallel': 200.0, 'short': 250.0, 'long': 150.0}
+
+# 표준 충격 시나리오
+STANDARD_RATE_SHOCKS = [
+    'parallel_up', 'parallel_down', 'steepener', 'flattener', 'short_up', 'short_down'
+]
+
+# 한 번에 계산할 계약 수 (시나리오 수 × 계약 수 행렬의 메모리 상한 조절)
+RATE_SHOCK_CHUNK_SIZE = 200_000
+
+_rate_shock_book_cache: Optional[Tuple[Tuple, Dict[str, Any]]] = None
+_rate_shock_book_lock = threading.Lock()
+
+
+def _resolve_rate_shock_columns() -> Dict[str, Optional[str]]:
+    """RATE_SHOCK_COLUMN_CANDIDATES에서 ALM_INST에 실제로 있는 컬럼 선택"""
+    columns = {c.upper(): c for c in get_table_info().get('ALM_INST', [])}
+    return {
+        role: next((columns[c] for c in candidates if c in columns), None)
+        for role, candidates in RATE_SHOCK_COLUMN_CANDIDATES.items()
+    }
+
+
+def _year_fractions(dates: Sequence[Any], base: datetime) -> np.ndarray:
+    """날짜 문자열 배열 → 기준일로부터의 연수 (파싱 실패/NULL은 0)"""
+    parsed = pd.to_datetime(pd.Series(dates, dtype=object), errors='coerce')
+    days = (parsed - pd.Timestamp(base)).dt.days.to_numpy(dtype=float, na_value=0.0)
+    return np.maximum(days, 0.0) / 365.25
+
+
+def load_rate_shock_book(base_date: Optional[str] = None) -> Dict[str, Any]:
+    """
+    금리 충격 분석용 ALM_INST 계약 배열 로드 (기준일·데이터 버전별 캐시)
+
+    Args:
+        base_date: 기준일 (None이면 최근 BASE_DATE)
+
+    Returns:
+        {
+            'base_date': str,
+            'columns': {역할: 컬럼명},
+            'balance': ndarray,     # 잔액
+            'rate': ndarray,        # 연 금리 (소수, 예: 0.035)
+            'maturity': ndarray,    # 만기까지 연수
+            'repricing': ndarray,   # 다음 금리 재조정까지 연수 (없으면 만기)
+        }
+    """
+    global _rate_shock_book_cache
+
+    calendar = get_base_date_calendar()
+    resolved_date = calendar.find(base_date) if base_date else calendar.last
+    if resolved_date is None:
+        raise ValueError(f"기준일 데이터가 없습니다: {base_date or 'ALM_INST'}")
+
+    version = get_data_version()
+    with _rate_shock_book_lock:
+        cached = _rate_shock_book_cache
+        if cached is not None and cached[0] == (resolved_date, version):
+            return cached[1]
+
+    columns = _resolve_rate_shock_columns()
+    if columns['balance'] is None or columns['rate'] is None or columns['maturity'] is None:
+        missing = [role for role in ('balance', 'rate', 'maturity') if columns[role] is None]
+        raise ValueError(f"ALM_INST에서 필요한 컬럼을 찾을 수 없습니다: {missing}")
+
+    select = [columns['balance'], columns['rate'], columns['maturity']]
+    if columns['repricing']:
+        select.append(columns['repricing'])
+
+    start, end = _date_prefix_range(resolved_date)
+    balance_parts, rate_parts, maturity_parts, repricing_parts = [], [], [], []
+    base = datetime.strptime(resolved_date[:10], '%Y-%m-%d')
+
+    with stream_sql_query(
+        f"SELECT {', '.join(select)} FROM ALM_INST WHERE BASE_DATE >= :start AND BASE_DATE < :end",
+        {'start': start, 'end': end},
+        batch_size=RATE_SHOCK_CHUNK_SIZE,
+        name='rate_shock_book'
+    ) as stream:
+        for batch in stream:
+            cols = list(zip(*batch))
+            balance_parts.append(np.array(cols[0], dtype=float))
+            rate_parts.append(np.array(cols[1], dtype=float))
+            maturity = _year_fractions(cols[2], base)
+            maturity_parts.append(maturity)
+            if columns['repricing']:
+                repricing = _year_fractions(cols[3], base)
+                # 재조정일이 없거나 만기 이후면 만기에 재조정
+                repricing_parts.append(np.where((repricing > 0) & (repricing < maturity), repricing, maturity))
+            else:
+                repricing_parts.append(maturity)
+
+    def concat(parts):
+        return np.concatenate(parts) if parts else np.empty(0)
+
+    rate = np.nan_to_num(concat(rate_parts))
+    book = {
+        'base_date': resolved_date,
+        'columns': columns,
+        'balance': np.nan_to_num(concat(balance_parts)),
+        # 금리 컬럼은 % 단위 (예: 3.5) → 소수
+        'rate': rate / 100.0,
+        'maturity': concat(maturity_parts),
+        'repricing': concat(repricing_parts),
+    }
+
+    with _rate_shock_book_lock:
+        _rate_shock_book_cache = ((resolved_date, version), book)
+    return book
+
+
+def rate_shock_curve(shock: str, tenors: np.ndarray) -> np.ndarray:
+    """
+    충격 시나리오별 만기(연)별 금리 변화 (소수)
+
+    지원 형식:
+        - 표준: parallel_up/down, short_up/down, steepener, flattener
+        - 사용자 평행 충격: 'parallel:+100' (bp)
+
+    Raises:
+        ValueError: 지원하지 않는 시나리오
+    """
+    sizes = {k: v / 10000.0 for k, v in RATE_SHOCK_SIZES_BP.items()}
+    short_weight = np.exp(-tenors / 4.0)
+
+    if shock.startswith('parallel:'):
+        return np.full_like(tenors, float(shock.split(':', 1)[1]) / 10000.0, dtype=float)
+    if shock == 'parallel_up':
+        return np.full_like(tenors, sizes['parallel'], dtype=float)
+    if shock == 'parallel_down':
+        return np.full_like(tenors, -sizes['parallel'], dtype=float)
+    if shock == 'short_up':
+        return sizes['short'] * short_weight
+    if shock == 'short_down':
+        return -sizes['short'] * short_weight
+    if shock == 'steepener':
+        return -0.65 * sizes['short'] * short_weight + 0.9 * sizes['long'] * (1 - short_weight)
+    if shock == 'flattener':
+        return 0.8 * sizes['short'] * short_weight - 0.6 * sizes['long'] * (1 - short_weight)
+
+    raise ValueError(f"지원하지 않는 충격 시나리오: {shock}")
+
+
+def analyze_rate_shock(
+    shocks: Optional[List[str]] = None,
+    base_date: Optional[str] = None,
+    horizon_years: float = 1.0
+) -> Dict[str, Any]:
+    """
+    금리 충격 시나리오별 ΔNII / ΔEVE 분석
+
+    ALM_INST 계약을 NumPy 배열로 한 번 로드한 뒤, 시나리오 × 계약 행렬을
+    RATE_SHOCK_CHUNK_SIZE개 계약 단위로 계산합니다.
+
+    단순화 가정:
+        - 계약별 현금흐름은 재조정일(없으면 만기)에 원금 + 단리 이자가 한 번에 발생
+        - 할인율은 계약 금리, 충격은 재조정 시점 만기의 금리 변화를 적용
+        - ΔNII: 기간(horizon) 내 재조정되는 계약이 남은 기간 동안 충격만큼 이자 변화 (잔액 유지 가정)
+        - 잔액 부호를 그대로 사용 (부채는 음수 잔액이어야 순효과가 계산됨)
+
+    Args:
+        shocks: 시나리오 리스트 (None이면 STANDARD_RATE_SHOCKS)
+        base_date: 기준일 (None이면 최근 BASE_DATE)
+        horizon_years: NII 측정 기간 (연)
+
+    Returns:
+        {
+            'base_date': str,
+            'contract_count': int,
+            'base_eve': float,
+            'results': [{'scenario', 'delta_eve', 'delta_eve_pct', 'delta_nii'}, ...],
+            'column_mapping': Dict,
+            'elapsed_ms': float
+        }
+    """
+    start = time.perf_counter()
+    shocks = shocks or STANDARD_RATE_SHOCKS
+
+    try:
+        book = load_rate_shock_book(base_date)
+        for shock in shocks:
+            rate_shock_curve(shock, np.zeros(1))
+    except Exception as e:
+        return {'error': str(e)}
+
+    n = len(book['balance'])
+    delta_eve = np.zeros(len(shocks))
+    delta_nii = np.zeros(len(shocks))
+    base_eve = 0.0
+
+    for lo in range(0, n, RATE_SHOCK_CHUNK_SIZE):
+        hi = min(lo + RATE_SHOCK_CHUNK_SIZE, n)
+        balance = book['balance'][lo:hi]
+        rate = book['rate'][lo:hi]
+        t = book['repricing'][lo:hi]
+
+        # 기준 현재가치: 재조정일 현금흐름(원금 + 이자)을 계약 금리로 할인
+        cash_flow = balance * (1.0 + rate * t)
+        pv = cash_flow * np.exp(-rate * t)
+        base_eve += float(pv.sum())
+
+        # 시나리오 × 계약 금리 변화 행렬
+        shock_matrix = np.vstack([rate_shock_curve(shock, t) for shock in shocks])
+
+        delta_eve += ((np.exp(-shock_matrix * t) - 1.0) * pv).sum(axis=1)
+        nii_weight = balance * np.maximum(horizon_years - t, 0.0)
+        delta_nii += shock_matrix @ nii_weight
+
+    results = [
+        {
+            'scenario': shock,
+            'delta_eve': float(delta_eve[i]),
+            'delta_eve_pct': float(delta_eve[i] / base_eve * 100) if base_eve else 0.0,
+            'delta_nii': float(delta_nii[i])
+        }
+        for i, shock in enumerate(shocks)
+    ]
+
+    return {
+        'base_date': book['base_date'],
+        'contract_count': n,
+        'horizon_years': horizon_years,
+        'base_eve': base_eve,
+        'results': results,
+        'column_mapping': book['columns'],
+        'elapsed_ms': (time.perf_counter() - start) * 1000
+    }
+
+# ============================================================
+# 몬테카를로 금리 시나리오 (Vasicek 단기 금리 모형)
+# ============================================================
+
+# 기본 경로 수 / 시뮬레이션 기간 (월). 갭 분포를 배열로 계산하므로 꼬리 백분위수(P1/P99)가
+# 안정되도록 프로세스 풀 기준(MC_PARALLEL_MIN_PATHS)과 같은 경로 수를 기본으로 사용
+MC_DEFAULT_PATHS = 20000
+MC_DEFAULT_HORIZON_MONTHS = 12
+
+# 이자갭 조정 계수의 분모 하한 (%). 시작 금리가 0 근처이거나 음수여도 계수가 발산하거나 부호가 뒤집히지 않음
+MC_RATE_FACTOR_FLOOR = 0.5
+
+# 한 작업 단위로 계산할 경로 수 (배치마다 독립 난수 스트림 → 작업자 수와 무관하게 같은 결과)
+MC_PATH_BATCH_SIZE = 2000
+
+# 이 경로 수 이상일 때만 프로세스 풀 사용 (작으면 프로세스 기동 비용이 더 큼)
+MC_PARALLEL_MIN_PATHS = 20000
+
+# 프로세스 풀 최대 작업자 수 (None이면 CPU 수)
+MC_MAX_WORKERS: Optional[int] = None
+
+# 한 번에 시뮬레이션할 수 있는 최대 경로 수
+MC_MAX_PATHS = 200000
+
+_mc_pool: Optional[ProcessPoolExecutor] = None
+_mc_pool_workers = 0
+_mc_pool_lock = threading.Lock()
+
+
+def _get_mc_pool(workers: int) -> ProcessPoolExecutor:
+    """몬테카를로 프로세스 풀 (요청 간 재사용, 작업자 수가 바뀌면 재생성)"""
+    global _mc_pool, _mc_pool_workers
+
+    with _mc_pool_lock:
+        if _mc_pool is None or _mc_pool_workers != workers:
+            if _mc_pool is not None:
+                _mc_pool.shutdown(wait=False, cancel_futures=True)
+            # 커넥션 풀 스레드가 있는 프로세스에서 fork하지 않도록 spawn 사용
+            _mc_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _mc_pool_workers = workers
+        return _mc_pool
+
+
+def shutdown_mc_pool():
+    """몬테카를로 프로세스 풀 종료"""
+    global _mc_pool, _mc_pool_workers
+
+    with _mc_pool_lock:
+        if _mc_pool is not None:
+            _mc_pool.shutdown(wait=True, cancel_futures=True)
+            _mc_pool = None
+            _mc_pool_workers = 0
+
+
+atexit.register(shutdown_mc_pool)
+
+
+def fit_short_rate_model(
+    rate_cd: int,
+    term: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    NFA_IRC_RATE_HIST 금리 이력으로 Vasicek 단기 금리 모형 추정
+
+    dr = kappa * (theta - r) dt + sigma dW 의 정확한 이산화
+    r[t+1] = alpha + beta * r[t] + e 를 최소제곱으로 추정합니다.
+    평균 회귀가 추정되지 않으면 (beta <= 0 또는 beta >= 1) kappa=0인 랜덤 워크로 둡니다.
+    금리는 NFA_IRC_RATE_HIST와 같은 % 단위입니다.
+
+    Args:
+        rate_cd: 금리 코드
+        term: 금리 기간 (None이면 해당 코드의 가장 짧은 기간)
+        start_date: 추정 시작일 (YYYY-MM-DD)
+        end_date: 추정 종료일 (YYYY-MM-DD)
+
+    Returns:
+        {
+            'success': bool,
+            'rate_cd': int, 'term': int,
+            'observations': int,
+            'last_date': str,
+            'dt': float,       # 관측 간격 (연)
+            'r0': float,       # 마지막 관측 금리
+            'kappa': float, 'theta': float, 'sigma': float
+        }
+    """
+    if term is None:
+        terms = run_registered_query('interest_rate_terms', {'rate_cd': rate_cd})
+        if not terms['success']:
+            return {'success': False, 'error': terms['error']}
+        if terms['row_count'] == 0:
+            return {'success': False, 'error': f"금리 코드 {rate_cd}의 데이터가 없습니다"}
+        term = terms.rows[0][0]
+
+    history = run_registered_query('short_rate_history', {
+        'rate_cd': rate_cd,
+        'term': term,
+        'start_date': start_date or None,
+        'end_date': end_date or None
+    })
+    if not history['success']:
+        return {'success': False, 'error': history['error']}
+
+    rows = [(d, v) for d, v in history.rows if v is not None]
+    if len(rows) < 3:
+        return {'success': False, 'error': f"모형 추정에 필요한 관측치가 부족합니다 (금리 코드 {rate_cd}, 기간 {term}: {len(rows)}건)"}
+
+    dates = pd.to_datetime(pd.Series([d for d, _ in rows], dtype=object).str[:10], errors='coerce')
+    gaps = dates.diff().dt.days.dropna()
+    gaps = gaps[gaps > 0]
+    dt = float(gaps.median()) / 365.0 if len(gaps) else 1.0 / 365.0
+
+    rates = np.array([v for _, v in rows], dtype=float)
+    x, y = rates[:-1], rates[1:]
+    var_x = float(np.var(x))
+    beta = float(np.cov(x, y, bias=True)[0, 1] / var_x) if var_x > 0 else 1.0
+    alpha = float(y.mean() - beta * x.mean())
+    residuals = y - (alpha + beta * x)
+    resid_std = float(np.sqrt(np.sum(residuals ** 2) / max(len(x) - 2, 1)))
+
+    if 0.0 < beta < 1.0:
+        kappa = -math.log(beta) / dt
+        theta = alpha / (1.0 - beta)
+        sigma = resid_std * math.sqrt(2.0 * kappa / (1.0 - beta ** 2))
+    else:
+        kappa = 0.0
+        theta = float(rates[-1])
+        sigma = float(np.std(np.diff(rates), ddof=1)) / math.sqrt(dt)
+
+    return {
+        'success': True,
+        'rate_cd': rate_cd,
+        'term': term,
+        'observations': len(rows),
+        'last_date': str(rows[-1][0]),
+        'dt': dt,
+        'r0': float(rates[-1]),
+        'kappa': kappa,
+        'theta': theta,
+        'sigma': sigma
+    }
+
+
+def _fill_short_rate_paths(out: np.ndarray, model: Dict[str, float], step_years: float, rng: np.random.Generator):
+    """out[:, 0]=r0에서 시작하는 Vasicek 경로를 out에 채움 (정확한 이산화)"""
+    kappa, theta, sigma = model['kappa'], model['theta'], model['sigma']
+    if kappa > 0:
+        decay = math.exp(-kappa * step_years)
+        scale = sigma * math.sqrt((1.0 - decay ** 2) / (2.0 * kappa))
+    else:
+        decay = 1.0
+        scale = sigma * math.sqrt(step_years)
+
+    shocks = rng.standard_normal((out.shape[0], out.shape[1] - 1))
+    out[:, 0] = model['r0']
+    for step in range(1, out.shape[1]):
+        out[:, step] = theta + (out[:, step - 1] - theta) * decay + scale * shocks[:, step - 1]
+
+
+def _simulate_short_rate_batch(
+    shm_name: str,
+    shape: Tuple[int, int],
+    start: int,
+    stop: int,
+    model: Dict[str, float],
+    step_years: float,
+    seed: np.random.SeedSequence
+) -> int:
+    """
+    프로세스 풀 작업: 공유 메모리 결과 배열의 [start, stop) 경로 계산
+
+    결과를 반환값으로 돌려주지 않고 공유 메모리에 직접 써서 직렬화 비용을 없앱니다.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        paths = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        _fill_short_rate_paths(paths[start:stop], model, step_years, np.random.default_rng(seed))
+        del paths
+    finally:
+        shm.close()
+    return stop - start
+
+
+def simulate_short_rate_paths(
+    model: Dict[str, Any],
+    n_paths: int = MC_DEFAULT_PATHS,
+    horizon_months: int = MC_DEFAULT_HORIZON_MONTHS,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    추정된 단기 금리 모형으로 월 단위 금리 경로 시뮬레이션
+
+    경로를 MC_PATH_BATCH_SIZE개씩 나눠 배치마다 SeedSequence.spawn()으로 만든
+    독립 난수 스트림을 사용하므로, seed가 같으면 작업자 수와 관계없이 같은 경로가 나옵니다.
+    경로 수가 MC_PARALLEL_MIN_PATHS 이상이면 배치를 프로세스 풀에 나눠
+    공유 메모리 결과 배열에 직접 기록합니다.
+
+    Args:
+        model: fit_short_rate_model() 결과
+        n_paths: 경로 수
+        horizon_months: 시뮬레이션 기간 (월)
+        seed: 난수 시드 (None이면 매번 다른 경로)
+        workers: 작업자 수 (None이면 MC_MAX_WORKERS 또는 CPU 수, 1이면 현재 프로세스에서 계산)
+
+    Returns:
+        {
+            'times': ndarray,    # (horizon_months + 1,) 연 단위 시점
+            'paths': ndarray,    # (n_paths, horizon_months + 1) 금리 (%)
+            'workers': int,
+            'elapsed_ms': float
+        }
+    """
+    start_time = time.perf_counter()
+    if n_paths < 1 or n_paths > MC_MAX_PATHS:
+        raise ValueError(f"경로 수는 1 ~ {MC_MAX_PATHS:,} 사이여야 합니다: {n_paths}")
+    if horizon_months < 1:
+        raise ValueError(f"시뮬레이션 기간은 1개월 이상이어야 합니다: {horizon_months}")
+
+    step_years = 1.0 / 12.0
+    shape = (n_paths, horizon_months + 1)
+    params = {k: float(model[k]) for k in ('r0', 'kappa', 'theta', 'sigma')}
+    bounds = [(lo, min(lo + MC_PATH_BATCH_SIZE, n_paths)) for lo in range(0, n_paths, MC_PATH_BATCH_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(bounds))
+
+    if workers is None:
+        workers = MC_MAX_WORKERS or os.cpu_count() or 1
+    workers = max(1, min(workers, len(bounds)))
+    if n_paths < MC_PARALLEL_MIN_PATHS:
+        workers = 1
+
+    if workers == 1:
+        paths = np.empty(shape)
+        for (lo, hi), batch_seed in zip(bounds, seeds):
+            _fill_short_rate_paths(paths[lo:hi], params, step_years, np.random.default_rng(batch_seed))
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+        try:
+            pool = _get_mc_pool(workers)
+            futures = [
+                pool.submit(_simulate_short_rate_batch, shm.name, shape, lo, hi, params, step_years, batch_seed)
+                for (lo, hi), batch_seed in zip(bounds, seeds)
+            ]
+            for future in futures:
+                future.result()
+            paths = np.ndarray(shape, dtype=np.float64, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    return {
+        'times': np.arange(horizon_months + 1) * step_years,
+        'paths': paths,
+        'workers': workers,
+        'elapsed_ms': (time.perf_counter() - start_time) * 1000
+    }
+
+
+_TIME_BAND_UNIT_YEARS = {
+    'D': 1.0 / 365.0, '일': 1.0 / 365.0,
+    'W': 7.0 / 365.0, '주': 7.0 / 365.0,
+    'M': 1.0 / 12.0, '개월': 1.0 / 12.0, '월': 1.0 / 12.0,
+    'Y': 1.0, '년': 1.0,
+}
+_TIME_BAND_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(개월|[DWMY일주월년])', re.IGNORECASE)
+
+
+def _time_band_years(time_band: Any) -> Optional[float]:
+    """TIME_BAND 라벨 (예: '03_6M', '1Y', '3개월')의 마지막 기간 표기를 연 단위로 변환"""
+    matches = _TIME_BAND_PATTERN.findall(str(time_band))
+    if not matches:
+        return None
+    value, unit = matches[-1]
+    return float(value) * _TIME_BAND_UNIT_YEARS[unit.upper() if unit.isascii() else unit]
+
+
+def build_rate_gap_scenarios(
+    simulation: Dict[str, Any],
+    base_scenario_no: Optional[int] = None,
+    prefix: str = 'mc',
+    as_records: bool = False
+) -> Dict[str, Any]:
+    """
+    시뮬레이션 금리 경로를 경로×기간대 합성 유동성 갭 행렬로 변환
+
+    기준 유동성 갭(원금갭/이자갭)에서 원금갭은 그대로 두고, 이자갭을 각 기간대 시점의
+    경로 금리 변화에 비례해 조정합니다 (이자 현금흐름이 금리에 비례한다는 단순화 가정):
+    이자갭 × (1 + (경로 금리 - 시작 금리) / max(|시작 금리|, MC_RATE_FACTOR_FLOOR)).
+    시작 금리가 MC_RATE_FACTOR_FLOOR 이상이면 경로 금리 / 시작 금리 비율과 같습니다.
+    기간대 라벨에서 기간을 읽을 수 없으면 기간대 순서대로 시뮬레이션 기간에 고르게 배치합니다.
+
+    Args:
+        simulation: simulate_short_rate_paths() 결과 (+ 'model': fit_short_rate_model() 결과)
+        base_scenario_no: 기준 갭 시나리오 번호 (None이면 전체 합계)
+        prefix: 합성 시나리오 이름 접두어
+        as_records: True면 compare_scenarios()에 넣을 시나리오별 레코드('scenarios')도 생성
+                    (경로 수 × 기간대 개수만큼 dict를 만들므로 필요할 때만 사용)
+
+    Returns:
+        {
+            'success': bool,
+            'time_bands': List[str],
+            'band_years': List[float],
+            'principal': ndarray,       # (기간대,) 원금갭
+            'interest_gap': ndarray,    # (경로, 기간대) 이자갭
+            'total_gap': ndarray,       # (경로, 기간대) 총갭
+            'scenarios': {'mc_00001': [{'기간대', '원금갭', '이자갭', '총갭'}, ...], ...}  # as_records=True일 때만
+        }
+    """
+    if base_scenario_no is not None:
+        base = run_registered_query(_gap_query_name('report_liquidity_gap_by_scenario'), {'scenario_no': base_scenario_no})
+    else:
+        base = run_registered_query(_gap_query_name('report_liquidity_gap'))
+    if not base['success']:
+        return {'success': False, 'error': base['error']}
+    if base['row_count'] == 0:
+        return {'success': False, 'error': f"기준 유동성 갭 데이터가 없습니다 (시나리오 {base_scenario_no})"}
+
+    times, paths = simulation['times'], simulation['paths']
+    bands = [row[0] for row in base.rows]
+    principal = np.array([row[1] or 0.0 for row in base.rows], dtype=float)
+    interest = np.array([row[2] or 0.0 for row in base.rows], dtype=float)
+
+    band_years = [_time_band_years(band) for band in bands]
+    if any(y is None for y in band_years):
+        band_years = list(np.linspace(times[-1] / len(bands), times[-1], len(bands)))
+    steps = np.clip(np.searchsorted(times, np.asarray(band_years, dtype=float)), 0, len(times) - 1)
+
+    r0 = paths[0, 0]
+    band_rates = paths[:, steps]
+    factors = 1.0 + (band_rates - r0) / max(abs(r0), MC_RATE_FACTOR_FLOOR)
+    interest_gap = factors * interest
+    total_gap = interest_gap + principal
+
+    synthetic = {
+        'success': True,
+        'time_bands': bands,
+        'band_years': [float(y) for y in band_years],
+        'principal': principal,
+        'interest_gap': interest_gap,
+        'total_gap': total_gap
+    }
+
+    if as_records:
+        width = len(str(len(paths)))
+        synthetic['scenarios'] = {
+            f'{prefix}_{i + 1:0{width}d}': [
+                {'기간대': band, '원금갭': float(principal[j]), '이자갭': float(interest_gap[i, j]), '총갭': float(total_gap[i, j])}
+                for j, band in enumerate(bands)
+            ]
+            for i in range(len(paths))
+        }
+
+    return synthetic
+
+
+def simulate_rate_scenarios(
+    rate_cd: int,
+    term: Optional[int] = None,
+    n_paths: int = MC_DEFAULT_PATHS,
+    horizon_months: int = MC_DEFAULT_HORIZON_MONTHS,
+    base_scenario_no: Optional[int] = None,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    include_comparison: bool = False
+) -> Dict[str, Any]:
+    """
+    몬테카를로 금리 시나리오 → 합성 유동성 갭 행렬 → 총갭 분포
+
+    fit_short_rate_model() → simulate_short_rate_paths() → build_rate_gap_scenarios() 순서로 실행하고,
+    경로×기간대 총갭 행렬에서 백분위수를 배열 연산으로 계산합니다
+    (compare_scenarios()의 distribution과 같은 형식).
+
+    Args:
+        include_comparison: True면 경로별 레코드로 compare_scenarios()를 실행해
+                            'comparison'에 전체 결과를 포함 (경로 수만큼 dict를 만들므로 느림)
+
+    Returns:
+        {
+            'model': Dict,                  # 추정 모형
+            'n_paths': int, 'horizon_months': int, 'workers': int,
+            'rate_distribution': {'p1': float, ...},   # 기간 말 금리 백분위수 (%)
+            'distribution': {               # 총갭 분포
+                'scenario_count': int,
+                'percentiles': List[int],
+                'total_gap': {'p1': float, ...},
+                'by_time_band': {기간대: {'p1': float, ...}}
+            },
+            'comparison': Dict,             # include_comparison=True일 때만 (compare_scenarios() 결과)
+            'elapsed_ms': float
+        }
+        또는 {'error': str}
+    """
+    start = time.perf_counter()
+
+    model = fit_short_rate_model(rate_cd, term)
+    if not model['success']:
+        return {'error': model['error']}
+
+    try:
+        simulation = simulate_short_rate_paths(model, n_paths, horizon_months, seed=seed, workers=workers)
+    except ValueError as e:
+        return {'error': str(e)}
+
+    synthetic = build_rate_gap_scenarios(simulation, base_scenario_no, as_records=include_comparison)
+    if not synthetic['success']:
+        return {'error': synthetic['error']}
+
+    total_gap = synthetic['total_gap']
+    band_percentiles = np.percentile(total_gap, GAP_PERCENTILES, axis=0)
+    result = {
+        'model': model,
+        'n_paths': n_paths,
+        'horizon_months': horizon_months,
+        'workers': simulation['workers'],
+        'base_scenario_no': base_scenario_no,
+        'rate_distribution': _gap_percentiles(simulation['paths'][:, -1]),
+        'distribution': {
+            'scenario_count': n_paths,
+            'percentiles': list(GAP_PERCENTILES),
+            'total_gap': _gap_percentiles(total_gap.sum(axis=1)),
+            'by_time_band': {
+                band: {f'p{p}': float(v) for p, v in zip(GAP_PERCENTILES, band_percentiles[:, j])}
+                for j, band in enumerate(synthetic['time_bands'])
+            }
+        }
+    }
+
+    if include_comparison:
+        comparison = compare_scenarios([], synthetic_scenarios=synthetic['scenarios'])
+        if 'distribution' not in comparison:
+            return {'error': '합성 시나리오 비교에 실패했습니다'}
+        result['comparison'] = comparison
+
+    result['elapsed_ms'] = (time.perf_counter() - start) * 1000
+    return result
+
+# ============================================================
+# 계약 현금흐름 프로젝션 (계약 × 기간 배열, 사용자 정의 기간대)
+# ============================================================
+
+# 한 번에 배열로 만들 계약 수 (청크 배열 크기 = 계약 수 × CASH_FLOW_MAX_MONTHS × 8바이트 × 2)
+CASH_FLOW_CHUNK_SIZE = 10_000
+
+# 프로젝션 기간 (월). 이후 만기 현금흐름은 마지막 월에 합산
+CASH_FLOW_MAX_MONTHS = 360
+
+_TIME_BAND_SPEC_PATTERN = re.compile(r'^(\d+)\s*(개월|[MY년])$', re.IGNORECASE)
+
+_cash_flow_projection_cache: Optional[Tuple[Tuple, Dict[str, Any]]] = None
+_cash_flow_projection_lock = threading.Lock()
+
+
+def parse_time_bands(time_bands: Union[str, Sequence[str]]) -> List[Tuple[str, int]]:
+    """
+    사용자 정의 기간대 상한 목록 파싱
+
+    Args:
+        time_bands: '1M,3M,6M,1Y,3Y' 형식 문자열 또는 리스트 (월: M/개월, 년: Y/년)
+
+    Returns:
+        [(TIME_BAND 라벨, 상한 개월 수), ...]
+        (라벨은 NFAR_LIQ_GAP_310524와 같은 '01_1M' 형식, 마지막 상한 초과 구간 '06_3Y+' 포함)
+
+    Raises:
+        ValueError: 형식 오류 또는 상한이 증가하지 않음
+    """
+    tokens = [t.strip() for t in (time_bands.split(',') if isinstance(time_bands, str) else time_bands) if t.strip()]
+    if not tokens:
+        raise ValueError("기간대가 비어 있습니다")
+
+    bounds = []
+    for token in tokens:
+        match = _TIME_BAND_SPEC_PATTERN.match(token)
+        if not match:
+            raise ValueError(f"기간대 형식 오류: '{token}' (예: 1M, 3M, 1Y)")
+        value, unit = int(match.group(1)), match.group(2).upper()
+        months = value * 12 if unit in ('Y', '년') else value
+        if months <= 0 or (bounds and months <= bounds[-1][1]):
+            raise ValueError(f"기간대 상한은 0보다 크고 증가해야 합니다: {', '.join(tokens)}")
+        bounds.append((token.upper().replace(' ', ''), months))
+
+    bands = [(f"{i + 1:02d}_{label}", months) for i, (label, months) in enumerate(bounds)]
+    bands.append((f"{len(bounds) + 1:02d}_{bounds[-1][0]}+", CASH_FLOW_MAX_MONTHS))
+    return bands
+
+
+def iter_cash_flow_chunks(
+    base_date: Optional[str] = None,
+    max_months: int = CASH_FLOW_MAX_MONTHS,
+    chunk_size: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    기준일 ALM_INST 계약별 월 단위 계약 현금흐름을 청크 단위 배열로 생성
+
+    계약을 chunk_size개씩 스트리밍으로 읽어 (계약 수 × max_months) 원금/이자 배열을 만들므로
+    전체 북이 메모리에 들어가지 않아도 됩니다.
+
+    단순화 가정:
+        - 원금: 만기 월에 잔액 전액 상환 (bullet)
+        - 이자: 1개월차부터 만기 월까지 매월 잔액 × 금리 / 12
+        - 만기가 기준일 이전이거나 없으면 1개월차, max_months 이후면 마지막 월로 처리
+
+    Yields:
+        {
+            'base_date': str,
+            'principal': ndarray,       # (계약 수, max_months)
+            'interest': ndarray,        # (계약 수, max_months)
+            'maturity_month': ndarray   # (계약 수,) 만기 월 (1부터)
+        }
+    """
+    calendar = get_base_date_calendar()
+    resolved_date = calendar.find(base_date) if base_date else calendar.last
+    if resolved_date is None:
+        raise ValueError(f"기준일 데이터가 없습니다: {base_date or 'ALM_INST'}")
+
+    columns = _resolve_rate_shock_columns()
+    missing = [role for role in ('balance', 'rate', 'maturity') if columns[role] is None]
+    if missing:
+        raise ValueError(f"ALM_INST에서 필요한 컬럼을 찾을 수 없습니다: {missing}")
+
+    start, end = _date_prefix_range(resolved_date)
+    base = datetime.strptime(resolved_date[:10], '%Y-%m-%d')
+    months = np.arange(1, max_months + 1)
+
+    with stream_sql_query(
+        f"SELECT {columns['balance']}, {columns['rate']}, {columns['maturity']} "
+        f"FROM ALM_INST WHERE BASE_DATE >= :start AND BASE_DATE < :end",
+        {'start': start, 'end': end},
+        batch_size=chunk_size or CASH_FLOW_CHUNK_SIZE,
+        name='cash_flow_projection'
+    ) as stream:
+        for batch in stream:
+            cols = list(zip(*batch))
+            balance = np.nan_to_num(np.array(cols[0], dtype=float))
+            rate = np.nan_to_num(np.array(cols[1], dtype=float)) / 100.0
+            maturity_month = np.clip(np.ceil(_year_fractions(cols[2], base) * 12).astype(int), 1, max_months)
+
+            principal = np.zeros((len(balance), max_months))
+            principal[np.arange(len(balance)), maturity_month - 1] = balance
+            interest = (months <= maturity_month[:, None]) * (balance * rate / 12.0)[:, None]
+
+            yield {
+                'base_date': resolved_date,
+                'principal': principal,
+                'interest': interest,
+                'maturity_month': maturity_month
+            }
+
+
+def project_cash_flows(
+    base_date: Optional[str] = None,
+    max_months: int = CASH_FLOW_MAX_MONTHS,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    기준일 전체 계약의 월별 원금/이자 현금흐름 합계 (청크별 배열을 월 축으로 누적)
+
+    결과는 기준일·데이터 버전별로 캐시하며, 기간대 집계는 bucket_cash_flows()로 합니다.
+
+    Returns:
+        {
+            'success': bool,
+            'base_date': str,
+            'contract_count': int,
+            'principal': ndarray,           # (max_months,) 월별 원금 합계
+            'interest': ndarray,            # (max_months,) 월별 이자 합계
+            'maturity_count': ndarray,      # (max_months,) 월별 만기 계약 수
+            'chunks': int,
+            'elapsed_ms': float
+        }
+    """
+    global _cash_flow_projection_cache
+
+    start = time.perf_counter()
+    principal = np.zeros(max_months)
+    interest = np.zeros(max_months)
+    maturity_count = np.zeros(max_months, dtype=np.int64)
+    contract_count = 0
+    chunks = 0
+    resolved_date = base_date
+
+    try:
+        key = (base_date, max_months, get_data_version())
+        if use_cache:
+            with _cash_flow_projection_lock:
+                cached = _cash_flow_projection_cache
+                if cached is not None and cached[0] == key:
+                    return cached[1]
+
+        resolved_date = get_base_date_calendar().find(base_date) if base_date else get_base_date_calendar().last
+        for chunk in iter_cash_flow_chunks(base_date, max_months):
+            resolved_date = chunk['base_date']
+            principal += chunk['principal'].sum(axis=0)
+            interest += chunk['interest'].sum(axis=0)
+            maturity_count += np.bincount(chunk['maturity_month'] - 1, minlength=max_months)
+            contract_count += len(chunk['maturity_month'])
+            chunks += 1
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+    projection = {
+        'success': True,
+        'base_date': resolved_date,
+        'contract_count': contract_count,
+        'principal': principal,
+        'interest': interest,
+        'maturity_count': maturity_count,
+        'chunks': chunks,
+        'elapsed_ms': (time.perf_counter() - start) * 1000
+    }
+
+    with _cash_flow_projection_lock:
+        _cash_flow_projection_cache = (key, projection)
+    return projection
+
+
+def bucket_cash_flows(projection: Dict[str, Any], time_bands: Union[str, Sequence[str]]) -> pd.DataFrame:
+    """
+    월별 현금흐름을 사용자 정의 기간대로 집계
+
+    Returns:
+        analyze_liquidity_gap 조회 결과와 같은 컬럼의 DataFrame
+        (TIME_BAND, 총_원금갭, 총_이자갭, 건수)
+    """
+    bands = parse_time_bands(time_bands)
+    upper = np.array([months for _, months in bands[:-1]])
+    months = np.arange(1, len(projection['principal']) + 1)
+    band_of_month = np.searchsorted(upper, months, side='left')
+
+    n_bands = len(bands)
+    return pd.DataFrame({
+        'TIME_BAND': [label for label, _ in bands],
+        '총_원금갭': np.bincount(band_of_month, weights=projection['principal'], minlength=n_bands),
+        '총_이자갭': np.bincount(band_of_month, weights=projection['interest'], minlength=n_bands),
+        '건수': np.bincount(band_of_month, weights=projection['maturity_count'], minlength=n_bands).astype(np.int64),
+    })
 
 # ============================================================
 # Phase 1,3: 내보내기 함수들
@@ -0,0 +1,130 @@
+"""
+ALM 데이터 유지보수 작업
+
+새 기준일 데이터를 적재한 뒤 실행하는 오프라인 작업 모음
+(챗봇 프로세스는 읽기 전용 커넥션만 사용하므로 파생 테이블은 이 스크립트로 갱신)
+
+사용 예:
+    python alm_maintenance.py build-position-index --db simple.db
+    python alm_maintenance.py verify-position-index --db simple.db
+    python alm_maintenance.py build-gap-cube --db simple.db
+    python alm_maintenance.py check-gap-cube --db simple.db
+"""
+
+import sys
+import argparse
+
+import alm_functions
+
+
+def cmd_build_position_index(args) -> int:
+    """포지션 변동 인덱스 생성/증분 갱신"""
+    print(f"📦 포지션 변동 인덱스 {'재생성' if args.rebuild else '갱신'}: {args.db}")
+    result = alm_functions.build_position_delta_index(args.db, rebuild=args.rebuild, verbose=True)
+
+    if not result['success']:
+        print(f"❌ 실패: {result['error']}")
+        return 1
+
+    print(f"✅ 기준일 쌍 {result['pairs']}개 중 {len(result['built'])}개 계산, "
+          f"{result['skipped']}개 최신 상태, {result['removed']}개 정리")
+    return 0
+
+
+def cmd_verify_position_index(args) -> int:
+    """포지션 변동 인덱스를 실시간 계산 결과와 비교"""
+    alm_functions.configure_db_pool(args.db)
+    print(f"🔍 포지션 변동 인덱스 검증: {args.db}")
+    result = alm_functions.verify_position_delta_index()
+
+    if 'error' in result:
+        print(f"❌ 실패: {result['error']}")
+        return 1
+
+    for mismatch in result['mismatches']:
+        print(f"  ⚠️ {mismatch['prev_date']} → {mismatch['curr_date']} "
+              f"[{mismatch['kind']}] {mismatch['field']} 불일치")
+
+    if result['success']:
+        print(f"✅ 기준일 쌍 {result['pairs']}개 모두 일치")
+        return 0
+
+    print(f"❌ 불일치 {len(result['mismatches'])}건 (build-position-index --rebuild로 재생성하세요)")
+    return 1
+
+
+def cmd_build_gap_cube(args) -> int:
+    """유동성 갭 큐브 생성 (원본이 바뀐 경우에만)"""
+    print(f"📦 유동성 갭 큐브 {'재생성' if args.force else '갱신'}: {args.db}")
+    result = alm_functions.build_liquidity_gap_cube(args.db, force=args.force)
+
+    if not result['success']:
+        print(f"❌ 실패: {result['error']}")
+        return 1
+
+    state = '생성 완료' if result['built'] else '이미 최신 상태'
+    print(f"✅ {state} ({result['rows']}행, 원본 지문 {result['fingerprint']})")
+    return 0
+
+
+def cmd_check_gap_cube(args) -> int:
+    """유동성 갭 큐브 최신 여부 확인"""
+    alm_functions.configure_db_pool(args.db)
+    if alm_functions.is_liquidity_gap_cube_fresh():
+        print("✅ 유동성 갭 큐브가 최신입니다 (조회 시 큐브 사용)")
+        return 0
+
+    print("⚠️ 유동성 갭 큐브가 없거나 최신이 아닙니다 (원본 테이블로 조회). build-gap-cube를 실행하세요")
+    return 1
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='ALM 데이터 유지보수 작업')
+    parser.add_argument(
+        '--db',
+        default=alm_functions.DB_PATH,
+        help='대상 SQLite DB 파일 경로'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser(
+        'build-position-index',
+        help='연속 기준일 쌍별 신규/소멸/유지 포지션 인덱스 생성 (변경된 쌍만 계산)'
+    )
+    build_parser.add_argument(
+        '--rebuild',
+        action='store_true',
+        help='모든 기준일 쌍을 다시 계산'
+    )
+    build_parser.set_defaults(func=cmd_build_position_index)
+
+    verify_parser = subparsers.add_parser(
+        'verify-position-index',
+        help='포지션 변동 인덱스를 실시간 계산 결과와 비교'
+    )
+    verify_parser.set_defaults(func=cmd_verify_position_index)
+
+    cube_parser = subparsers.add_parser(
+        'build-gap-cube',
+        help='시나리오×기간대 유동성 갭 큐브 생성 (원본이 바뀐 경우에만)'
+    )
+    cube_parser.add_argument(
+        '--force',
+        action='store_true',
+        help='원본 지문과 관계없이 다시 생성'
+    )
+    cube_parser.set_defaults(func=cmd_build_gap_cube)
+
+    check_parser = subparsers.add_parser(
+        'check-gap-cube',
+        help='유동성 갭 큐브 최신 여부 확인'
+    )
+    check_parser.set_defaults(func=cmd_check_gap_cube)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -20,7 +20,10 @@ from alm_functions import (
     export_report,
     analyze_new_position_growth,
     analyze_expired_position_decrease,
-    get_column_label
+    analyze_rate_shock,
+    simulate_rate_scenarios,
+    get_column_label,
+    MC_DEFAULT_PATHS
 )
 
 # ======================================================================
@@ -39,6 +42,10 @@ class SearchContractsInput(BaseModel):
 
 class LiquidityGapInput(BaseModel):
     scenario_no: str = Field(default="", description="시나리오 번호")
+    time_bands: str = Field(
+        default="",
+        description="사용자 정의 기간대 상한 (쉼표 구분, 예: '1M,3M,6M,1Y,3Y'). 지정하면 계약 현금흐름으로 다시 집계"
+    )
 
 class ExchangeRateInput(BaseModel):
     currency_and_date: str = Field(description="통화코드 또는 '통화코드,날짜'")
@@ -48,6 +55,10 @@ class InterestRateInput(BaseModel):
 
 class AggregateStatsInput(BaseModel):
     params: str = Field(description="'테이블명,그룹컬럼,집계컬럼'")
+    krw_equivalent: bool = Field(
+        default=False,
+        description="True면 기준일별 직전 고시 환율로 환산한 원화 합계 추가 (ALM_INST 잔액 등 통화가 섞인 금액)"
+    )
 
 # TODO 4: VisualizeInput 및 _visualize_data 제거됨
 
@@ -59,9 +70,14 @@ class CompareScenariosInput(BaseModel):
 
 class AnalyzeTrendsInput(BaseModel):
     metric_type: str = Field(description="'exchange_rate' 또는 'interest_rate'")
-    currency_or_rate_cd: str = Field(default="", description="통화 코드 또는 금리 코드 (선택사항)")
+    currency_or_rate_cd: str = Field(
+        default="",
+        description="통화 코드 또는 금리 코드 (선택사항). 여러 시계열 비교는 쉼표로 구분 (예: 'USD,EUR,JPY')"
+    )
     start_date: str = Field(default="", description="시작 날짜 YYYY-MM-DD (선택사항)")
     end_date: str = Field(default="", description="종료 날짜 YYYY-MM-DD (선택사항)")
+    window: str = Field(default="", description="이동평균/변동성/낙폭 계산 창 크기 (관측치 수, 선택사항)")
+    frequency: str = Field(default="", description="리샘플링 주기 'W'(주) 또는 'M'(월) (선택사항)")
 
 # Phase 1/3: 리포트 생성 및 내보내기
 class GenerateReportInput(BaseModel):
@@ -88,6 +104,23 @@ class AnalyzeExpiredPositionDecreaseInput(BaseModel):
         description="그룹화 차원 (콤마로 구분: DIM_PROD,DIM_ORG,DIM_ALM)"
     )
 
+class AnalyzeRateShockInput(BaseModel):
+    shocks: str = Field(
+        default="",
+        description="충격 시나리오 (쉼표 구분: parallel_up,parallel_down,steepener,flattener,short_up,short_down "
+                    "또는 'parallel:+100' 형식의 bp 평행 충격). 공백이면 표준 6개 시나리오"
+    )
+    base_date: str = Field(default="", description="기준일 YYYY-MM-DD (공백이면 최근 기준일)")
+    horizon_years: str = Field(default="1", description="NII 측정 기간 (연, 기본 1)")
+
+
+class SimulateRateScenariosInput(BaseModel):
+    rate_cd: int = Field(description="모형을 추정할 금리 코드 (NFA_IRC_RATE_HIST.INT_RATE_CD)")
+    term: Optional[int] = Field(default=None, description="금리 기간 (선택사항, 없으면 가장 짧은 기간)")
+    n_paths: int = Field(default=MC_DEFAULT_PATHS, description=f"시뮬레이션 경로 수 (기본 {MC_DEFAULT_PATHS})")
+    horizon_months: int = Field(default=12, description="시뮬레이션 기간 (월, 기본 12)")
+    base_scenario_no: Optional[int] = Field(default=None, description="기준 유동성 갭 시나리오 번호 (선택사항, 없으면 전체 합계)")
+
 
 # 도구 함수들
 
@@ -112,19 +145,52 @@ def _compare_scenarios(scenario_list: str, comparison_metrics: str = "") -> str:
 
     return output
 
+def _format_multi_trends(result: Dict[str, Any]) -> str:
+    """다중 시계열 추세 비교 결과를 비교표와 상관계수 행렬로 정리합니다."""
+    series = result['series']
+    output = f"✓ 다중 시계열 추세 비교 완료 ({result['metric_type']}, {len(series)}개)\n\n"
+
+    if result['missing']:
+        output += f"데이터 없음: {', '.join(str(c) for c in result['missing'])}\n\n"
+    if not series:
+        return output
+
+    output += f"{'시계열':<10}{'건수':>6}{'시작':>12}{'종료':>12}{'변화율(%)':>10}{'평균':>12}{'표준편차':>10}{'변동성':>10}  추세\n"
+    for row in result['comparison']:
+        volatility = f"{row['변동성']:>10.6f}" if row['변동성'] is not None else f"{'-':>10}"
+        output += (
+            f"{str(row['시계열']):<10}{row['건수']:>6}{row['시작값']:>12.4f}{row['종료값']:>12.4f}"
+            f"{row['변화율']:>10.2f}{row['평균']:>12.4f}{row['표준편차']:>10.4f}{volatility}  {row['추세']}\n"
+        )
+
+    if len(series) > 1:
+        output += "\n일별 변화율 상관계수:\n"
+        output += f"{'':<10}" + ''.join(f"{str(c):>10}" for c in series) + "\n"
+        for code in series:
+            cells = [result['correlation'][code][other] for other in series]
+            output += f"{str(code):<10}" + ''.join(f"{v:>10.3f}" if v is not None else f"{'-':>10}" for v in cells) + "\n"
+
+    return output
+
 def _analyze_trends(metric_type: str, currency_or_rate_cd: str = "",
-                   start_date: str = "", end_date: str = "") -> str:
+                   start_date: str = "", end_date: str = "",
+                   window: str = "", frequency: str = "") -> str:
     """시계열 추세를 분석합니다."""
     result = analyze_trends(
         metric_type=metric_type,
         currency_or_rate_cd=currency_or_rate_cd if currency_or_rate_cd else None,
         start_date=start_date if start_date else None,
-        end_date=end_date if end_date else None
+        end_date=end_date if end_date else None,
+        window=int(window) if window else None,
+        frequency=frequency.strip() if frequency else None
     )
 
     if 'error' in result:
         return f"오류: {result['error']}"
 
+    if 'comparison' in result:
+        return _format_multi_trends(result)
+
     stats = result['statistics']
     output = f"✓ 추세 분석 완료 ({result['metric_type']})\n\n"
     output += f"추세: {result['trend']}\n\n"
@@ -138,6 +204,22 @@ def _analyze_trends(metric_type: str, currency_or_rate_cd: str = "",
     if 'slope' in stats:
         output += f"  - 기울기: {stats['slope']:.6f}\n"
 
+    if 'resampled' in result:
+        output += f"\n리샘플링 ({frequency}, {len(result['resampled'])}개 기간):\n"
+        for row in result['resampled'][-12:]:
+            output += f"  - {row['기간']}: 기말 {row['값']:.4f}, 평균 {row['평균']:.4f}, 범위 {row['최저']:.4f} ~ {row['최고']:.4f}\n"
+
+    if 'rolling' in result:
+        rolling = result['rolling']
+        latest = rolling['latest']
+        output += f"\n이동 통계 (창 {rolling['window']}):\n"
+        if latest.get('이동평균') is not None:
+            output += f"  - 최근 이동평균: {latest['이동평균']:.4f}\n"
+        if latest.get('변동성') is not None:
+            output += f"  - 최근 변동성(변화율 표준편차): {latest['변동성']:.6f}\n"
+        if rolling['max_drawdown'] is not None:
+            output += f"  - 최대 낙폭: {rolling['max_drawdown'] * 100:.2f}% ({rolling['max_drawdown_date']})\n"
+
     return output
 
 # 전역 변수로 마지막 리포트 저장
@@ -187,10 +269,10 @@ def _search_alm_contracts(filters_json: str = "") -> str:
     filters = json.loads(filters_json) if filters_json else None
     return search_alm_contracts(filters)
 
-def _analyze_liquidity_gap(scenario_no: str = "") -> str:
+def _analyze_liquidity_gap(scenario_no: str = "", time_bands: str = "") -> str:
     """유동성 갭을 분석합니다."""
     scenario = int(scenario_no) if scenario_no else None
-    return analyze_liquidity_gap(scenario)
+    return analyze_liquidity_gap(scenario, time_bands=time_bands or None)
 
 def _get_exchange_rate(currency_and_date: str) -> str:
     """환율 정보를 조회합니다."""
@@ -206,12 +288,12 @@ def _get_interest_rate(rate_info: str) -> str:
     term = int(parts[1].strip()) if len(parts) > 1 else None
     return get_interest_rate(rate_cd, term)
 
-def _get_aggregate_stats(params: str) -> str:
+def _get_aggregate_stats(params: str, krw_equivalent: bool = False) -> str:
     """테이블의 집계 통계를 조회합니다."""
     parts = params.split(',')
     if len(parts) != 3:
         return "오류: 정확히 3개의 파라미터가 필요합니다"
-    return get_aggregate_stats(parts[0].strip(), parts[1].strip(), parts[2].strip())
+    return get_aggregate_stats(parts[0].strip(), parts[1].strip(), parts[2].strip(), krw_equivalent=krw_equivalent)
 
 def _analyze_new_position_growth(
     current_base_date: str = "",
@@ -323,55 +405,138 @@ def _analyze_expired_position_decrease(
 
     return '\n'.join(output_lines)
 
+def _analyze_rate_shock(shocks: str = "", base_date: str = "", horizon_years: str = "1") -> str:
+    """금리 충격 시나리오별 ΔNII / ΔEVE를 분석합니다."""
+    shock_list = [s.strip() for s in shocks.split(',') if s.strip()] if shocks else None
+
+    result = analyze_rate_shock(
+        shocks=shock_list,
+        base_date=base_date if base_date else None,
+        horizon_years=float(horizon_years) if horizon_years else 1.0
+    )
+
+    if 'error' in result:
+        return f"오류: {result['error']}"
+
+    output_lines = []
+    output_lines.append(f"=== 금리 충격 분석 (ΔNII / ΔEVE) ===\n")
+    output_lines.append(f"기준일: {result['base_date']} | 계약 {result['contract_count']:,}건 | NII 기간 {result['horizon_years']}년")
+    output_lines.append(f"기준 EVE: {result['base_eve']:,.0f}\n")
+    output_lines.append(f"{'시나리오':<16}{'ΔEVE':>16}{'ΔEVE(%)':>10}{'ΔNII':>16}")
+    for row in result['results']:
+        output_lines.append(
+            f"{row['scenario']:<16}{row['delta_eve']:>16,.0f}{row['delta_eve_pct']:>10.2f}{row['delta_nii']:>16,.0f}"
+        )
+
+    return '\n'.join(output_lines)
+
+def _simulate_rate_scenarios(
+    rate_cd: int,
+    term: Optional[int] = None,
+    n_paths: int = MC_DEFAULT_PATHS,
+    horizon_months: int = 12,
+    base_scenario_no: Optional[int] = None
+) -> str:
+    """몬테카를로 금리 경로로 합성 유동성 갭 시나리오를 만들어 총갭 분포를 분석합니다."""
+    result = simulate_rate_scenarios(
+        rate_cd=rate_cd,
+        term=term,
+        n_paths=n_paths,
+        horizon_months=horizon_months,
+        base_scenario_no=base_scenario_no
+    )
+
+    if 'error' in result:
+        return f"오류: {result['error']}"
+
+    model = result['model']
+    distribution = result['distribution']
+    percentiles = distribution['percentiles']
+
+    output_lines = []
+    output_lines.append(f"=== 몬테카를로 금리 시나리오 분석 ===\n")
+    output_lines.append(
+        f"금리 코드 {model['rate_cd']} (기간 {model['term']}) | 관측 {model['observations']}건 | 최근 {model['last_date']} 금리 {model['r0']:.4f}%"
+    )
+    output_lines.append(
+        f"Vasicek 추정: 평균회귀속도 κ={model['kappa']:.4f}, 장기평균 θ={model['theta']:.4f}%, 변동성 σ={model['sigma']:.4f}"
+    )
+    output_lines.append(
+        f"경로 {result['n_paths']:,}개 × {result['horizon_months']}개월 | 기준 갭: "
+        f"{'시나리오 ' + str(result['base_scenario_no']) if result['base_scenario_no'] is not None else '전체 합계'}\n"
+    )
+
+    header = ''.join(f"{'P' + str(p):>16}" for p in percentiles)
+    output_lines.append(f"{'구분':<12}{header}")
+    output_lines.append(
+        f"{'기간말 금리(%)':<12}" + ''.join(f"{result['rate_distribution'][f'p{p}']:>16.4f}" for p in percentiles)
+    )
+    output_lines.append(
+        f"{'총갭 합계':<12}" + ''.join(f"{distribution['total_gap'][f'p{p}']:>16,.0f}" for p in percentiles)
+    )
+    for band, band_pct in distribution['by_time_band'].items():
+        output_lines.append(f"{str(band):<12}" + ''.join(f"{band_pct[f'p{p}']:>16,.0f}" for p in percentiles))
+
+    return '\n'.join(output_lines)
+
 # StructuredTool로 도구 생성 (visualize_data 제거됨)
+# metadata read_only: DB 조회만 하는 도구 (한 턴의 여러 호출을 동시에 실행 가능)
 tools = [
     StructuredTool.from_function(
         func=_search_alm_contracts,
         name="search_alm_contracts",
         description="ALM 계약 정보를 검색합니다. filters_json: JSON 형식의 필터 조건 또는 빈 문자열",
-        args_schema=SearchContractsInput
+        args_schema=SearchContractsInput,
+        metadata={'read_only': True}
     ),
     StructuredTool.from_function(
         func=_analyze_liquidity_gap,
         name="analyze_liquidity_gap",
-        description="유동성 갭을 분석합니다. scenario_no: 시나리오 번호 (선택사항)",
-        args_schema=LiquidityGapInput
+        description="유동성 갭을 분석합니다. scenario_no: 시나리오 번호 (선택사항), time_bands: 사용자 정의 기간대 상한 (선택사항, 예: '1M,3M,1Y')",
+        args_schema=LiquidityGapInput,
+        metadata={'read_only': True}
     ),
     StructuredTool.from_function(
         func=_get_exchange_rate,
         name="get_exchange_rate",
         description="환율 정보를 조회합니다. currency_and_date: 통화코드 또는 '통화코드,날짜'",
-        args_schema=ExchangeRateInput
+        args_schema=ExchangeRateInput,
+        metadata={'read_only': True}
     ),
     StructuredTool.from_function(
         func=_get_interest_rate,
         name="get_interest_rate",
         description="금리 정보를 조회합니다. rate_info: 금리코드 또는 '금리코드,기간'",
-        args_schema=InterestRateInput
+        args_schema=InterestRateInput,
+        metadata={'read_only': True}
     ),
     StructuredTool.from_function(
         func=_get_aggregate_stats,
         name="get_aggregate_stats",
-        description="테이블의 집계 통계를 조회합니다. params: '테이블명,그룹컬럼,집계컬럼'",
-        args_schema=AggregateStatsInput
+        description="테이블의 집계 통계를 조회합니다. params: '테이블명,그룹컬럼,집계컬럼', krw_equivalent: 원화 환산 합계 추가 여부",
+        args_schema=AggregateStatsInput,
+        metadata={'read_only': True}
     ),
     StructuredTool.from_function(
         func=_compare_scenarios,
         name="compare_scenarios",
         description="여러 시나리오의 유동성 갭을 비교 분석합니다",
-        args_schema=CompareScenariosInput
+        args_schema=CompareScenariosInput,
+        metadata={'read_only': True}
     ),
     StructuredTool.from_function(
         func=_analyze_trends,
         name="analyze_trends",
-        description="환율 또는 금리의 시계열 추세를 분석합니다",
-        args_schema=AnalyzeTrendsInput
+        description="환율 또는 금리의 시계열 추세를 분석합니다. 여러 통화/금리 코드를 쉼표로 지정하면 한 번에 비교표와 상관계수를 계산합니다",
+        args_schema=AnalyzeTrendsInput,
+        metadata={'read_only': True}
     ),
     StructuredTool.from_function(
         func=_generate_report,
         name="generate_comprehensive_report",
         description="ALM 종합 분석 리포트를 생성합니다",
-        args_schema=GenerateReportInput
+        args_schema=GenerateReportInput,
+        metadata={'read_only': True}
     ),
     StructuredTool.from_function(
         func=_export_report,
@@ -383,12 +548,28 @@ tools = [
         func=_analyze_new_position_growth,
         name="analyze_new_position_growth",
         description="당월 신규 포지션 증가분을 분석합니다. 이전 기준일 대비 새로 추가된 계약(REFERENCE_NO)을 식별하고 차원별로 집계합니다.",
-        args_schema=AnalyzeNewPositionGrowthInput
+        args_schema=AnalyzeNewPositionGrowthInput,
+        metadata={'read_only': True}
     ),
     StructuredTool.from_function(
         func=_analyze_expired_position_decrease,
         name="analyze_expired_position_decrease",
         description="당월 소멸 포지션 감소분을 분석합니다. 이전 기준일에 존재했지만 현재 기준일에는 사라진 계약(REFERENCE_NO)을 식별하고 차원별로 집계합니다.",
-        args_schema=AnalyzeExpiredPositionDecreaseInput
+        args_schema=AnalyzeExpiredPositionDecreaseInput,
+        metadata={'read_only': True}
+    ),
+    StructuredTool.from_function(
+        func=_analyze_rate_shock,
+        name="analyze_rate_shock",
+        description="금리 충격(평행 이동, 스티프너, 플래트너, 단기 금리 충격) 시나리오별 순이자이익 변화(ΔNII)와 자기자본 경제적 가치 변화(ΔEVE)를 분석합니다.",
+        args_schema=AnalyzeRateShockInput,
+        metadata={'read_only': True}
+    ),
+    StructuredTool.from_function(
+        func=_simulate_rate_scenarios,
+        name="simulate_rate_scenarios",
+        description="금리 이력으로 단기 금리 모형을 추정해 수천 개 금리 경로를 시뮬레이션하고, 합성 유동성 갭 시나리오의 총갭 백분위수(예: 99% 분위 갭)를 분석합니다.",
+        args_schema=SimulateRateScenariosInput,
+        metadata={'read_only': True}
     ),
 ]
@@ -24,6 +24,8 @@ from multi_agent.agents import (
     PositionAgent, ReportAgent, ExportAgent
 )
 from multi_agent import SupervisorAgent
+from multi_agent.fast_router import FastRouter, load_training_examples
+import alm_functions
 
 
 class BenchmarkRunner:
@@ -53,6 +55,8 @@ class BenchmarkRunner:
             'export_agent': ExportAgent(llm, tools_list, verbose=False)
         }
         self.multi_agent_supervisor = SupervisorAgent(llm, agents, verbose=False)
+        # 빠른 라우터 학습 데이터 (질문마다 해당 질문을 제외하고 다시 학습 → leave-one-out)
+        self.routing_examples = load_training_examples()
 
         if self.verbose:
             print("✅ 단일 에이전트 및 멀티 에이전트 시스템 초기화 완료")
@@ -71,19 +75,29 @@ class BenchmarkRunner:
         start_time = time.time()
 
         try:
+            routing = None
             if agent_type == 'single':
                 response = self.single_agent.run(question)
             else:  # multi
+                self.multi_agent_supervisor.last_routing_decision = None
+                if self.multi_agent_supervisor.fast_router is not None:
+                    self.multi_agent_supervisor.fast_router = self._holdout_router(question)
                 response = self.multi_agent_supervisor.run(question)
+                routing = self._routing_summary(
+                    question_data, self.multi_agent_supervisor.last_routing_decision
+                )
 
             elapsed = time.time() - start_time
 
-            return {
+            result = {
                 'success': True,
                 'response': response,
                 'time': elapsed,
                 'error': None
             }
+            if routing is not None:
+                result['routing'] = routing
+            return result
 
         except Exception as e:
             elapsed = time.time() - start_time
@@ -94,6 +108,71 @@ class BenchmarkRunner:
                 'error': str(e)
             }
 
+    def _holdout_router(self, question: str) -> FastRouter:
+        """평가할 질문을 학습 데이터에서 제외한 빠른 라우터
+
+        평가 질문이 빠른 라우터 학습 데이터에 포함되어 있으면
+        적중률/정확도가 학습 데이터 기준(in-sample)으로 부풀려지므로 제외하고 학습합니다.
+
+        Args:
+            question: 평가할 질문
+
+        Returns:
+            학습된 FastRouter
+        """
+        return FastRouter().fit([
+            example for example in self.routing_examples if example[0] != question
+        ])
+
+    def _routing_summary(
+        self,
+        question_data: Dict[str, Any],
+        routing_decision: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """라우팅 결정과 정답(expected_multi_agent) 비교
+
+        Args:
+            question_data: 질문 데이터
+            routing_decision: SupervisorAgent의 라우팅 결정
+
+        Returns:
+            {'agents', 'source', 'confidence', 'correct'}
+        """
+        routing_decision = routing_decision or {}
+        agents = routing_decision.get('agents', [])
+        return {
+            'agents': agents,
+            'source': routing_decision.get('source', 'llm'),
+            'confidence': routing_decision.get('confidence'),
+            'correct': set(agents) == set(expected_agents(question_data))
+        }
+
+    def calculate_routing_stats(self, question_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """빠른 라우터 적중률과 라우팅 정확도 계산
+
+        Args:
+            question_results: 질문 결과 리스트
+
+        Returns:
+            라우팅 통계 딕셔너리
+        """
+        routings = [q['multi']['routing'] for q in question_results if 'routing' in q['multi']]
+        fast = [r for r in routings if r['source'] == 'fast_router']
+        llm = [r for r in routings if r['source'] != 'fast_router']
+
+        def accuracy(items):
+            return sum(r['correct'] for r in items) / len(items) * 100 if items else 0
+
+        return {
+            'total': len(routings),
+            'fast_path_hits': len(fast),
+            'fast_path_hit_rate': len(fast) / len(routings) * 100 if routings else 0,
+            'fast_path_accuracy': accuracy(fast),
+            'llm_routings': len(llm),
+            'llm_routing_accuracy': accuracy(llm),
+            'routing_accuracy': accuracy(routings)
+        }
+
     def evaluate_accuracy(
         self,
         question_data: Dict[str, Any],
@@ -186,6 +265,9 @@ class BenchmarkRunner:
         # 카테고리별 통계
         results['category_stats'] = self.calculate_category_stats(results['questions'])
 
+        # 빠른 라우터 통계
+        results['routing'] = self.calculate_routing_stats(results['questions'])
+
         # 저장
         json_path = self.save_results(results, save_dir)
         md_path = self.generate_report(results, save_dir)
@@ -345,6 +427,25 @@ class BenchmarkRunner:
 | 정확도 | {cat_single['accuracy']:.1f}% | {cat_multi['accuracy']:.1f}% |
 | 평균 시간 | {cat_single['avg_time']:.2f}초 | {cat_multi['avg_time']:.2f}초 |
 
+"""
+
+        # 빠른 라우터 통계
+        routing = results.get('routing')
+        if routing and routing['total']:
+            llm_accuracy = f"{routing['llm_routing_accuracy']:.1f}% ({routing['llm_routings']}건)" if routing['llm_routings'] else "-"
+            report += f"""---
+
+## ⚡ 라우팅 (멀티 에이전트)
+
+빠른 라우터는 질문마다 해당 질문을 제외한 학습 데이터로 다시 학습하여 평가했습니다 (leave-one-out).
+
+| 지표 | 값 |
+|------|----|
+| 빠른 라우터 적중률 | {routing['fast_path_hit_rate']:.1f}% ({routing['fast_path_hits']}/{routing['total']}) |
+| 빠른 라우터 정확도 | {routing['fast_path_accuracy']:.1f}% |
+| LLM 라우팅 정확도 | {llm_accuracy} |
+| 전체 라우팅 정확도 | {routing['routing_accuracy']:.1f}% |
+
 """
 
         # 실패 사례 분석
@@ -418,6 +519,110 @@ class BenchmarkRunner:
         return filepath
 
 
+def expected_agents(question_data: Dict[str, Any]) -> List[str]:
+    """질문 데이터의 expected_multi_agent를 에이전트 리스트로 변환"""
+    return [name.strip() for name in question_data.get('expected_multi_agent', '').split(',') if name.strip()]
+
+
+def run_fast_router_benchmark(questions: List[Dict[str, Any]]) -> Dict[str, float]:
+    """빠른 라우터 적중률/정확도/응답 시간 측정 (LLM 불필요)
+
+    학습 데이터와 평가 질문이 같으므로 leave-one-out으로 평가합니다
+    (각 질문을 제외한 나머지로 학습한 라우터로 해당 질문을 라우팅).
+
+    Args:
+        questions: 질문 리스트
+
+    Returns:
+        {'hit_rate', 'accuracy', 'hits', 'correct', 'avg_us'}
+    """
+    examples = [(q['question'], expected_agents(q)) for q in questions]
+    hits = correct = 0
+    elapsed = 0.0
+
+    for i, q in enumerate(questions):
+        router = FastRouter().fit(examples[:i] + examples[i + 1:])
+
+        start = time.perf_counter()
+        decision = router.route(q['question'])
+        elapsed += time.perf_counter() - start
+
+        if decision is None:
+            continue
+        hits += 1
+        if set(decision['agents']) == set(examples[i][1]):
+            correct += 1
+
+    total = len(questions)
+    stats = {
+        'hits': hits,
+        'correct': correct,
+        'hit_rate': hits / total * 100 if total else 0,
+        'accuracy': correct / hits * 100 if hits else 0,
+        'avg_us': elapsed / total * 1e6 if total else 0
+    }
+    print(f"  적중률 {stats['hit_rate']:.1f}% ({hits}/{total}), "
+          f"적중 시 정확도 {stats['accuracy']:.1f}% ({correct}/{hits}), "
+          f"평균 {stats['avg_us']:.0f}µs/질문")
+    return stats
+
+
+def run_position_engine_benchmark(
+    current_base_date: str,
+    previous_base_date: str = None,
+    repeat: int = 5
+) -> Dict[str, Dict[str, float]]:
+    """포지션 변동 엔진(SQL / NumPy / 사전 계산 인덱스) 응답 시간 비교
+
+    Args:
+        current_base_date: 현재 기준일
+        previous_base_date: 이전 기준일 (None이면 직전 BASE_DATE)
+        repeat: 엔진별 반복 횟수
+
+    Returns:
+        {엔진: {'first': 첫 실행 시간(초), 'avg': 평균(초), 'min': 최소(초)}}
+    """
+    if previous_base_date is None:
+        previous_base_date = alm_functions._resolve_previous_base_date(current_base_date)
+        if previous_base_date is None:
+            raise ValueError(f"{current_base_date} 이전 기준일을 찾을 수 없습니다")
+
+    engines = {
+        'sql': lambda t, o, kind: alm_functions.compute_position_delta(t, o, use_cache=False),
+        'numpy': lambda t, o, kind: alm_functions.compute_position_delta_numpy(t, o),
+        'index': lambda t, o, kind: alm_functions.lookup_position_delta_index(t, o, kind),
+    }
+
+    results = {}
+    for engine, func in engines.items():
+        times = []
+        for _ in range(repeat):
+            start = time.time()
+            # 신규 + 소멸 한 쌍을 1회로 측정
+            new = func(current_base_date, previous_base_date, 'NEW')
+            expired = func(previous_base_date, current_base_date, 'EXPIRED')
+            times.append(time.time() - start)
+
+            if new is None or expired is None:
+                break
+
+        if new is None or expired is None:
+            print(f"  {engine:>6}: 사용 불가 (alm_maintenance.py build-position-index 실행 필요)")
+            continue
+
+        results[engine] = {
+            'first': times[0],
+            'avg': float(np.mean(times)),
+            'min': float(np.min(times)),
+            'new_count': new['count'],
+            'expired_count': expired['count']
+        }
+        print(f"  {engine:>6}: 첫 실행 {times[0]:.3f}초, 평균 {np.mean(times):.3f}초, "
+              f"최소 {np.min(times):.3f}초 (신규 {new['count']}건 / 소멸 {expired['count']}건)")
+
+    return results
+
+
 def main():
     """메인 함수"""
     parser = argparse.ArgumentParser(description='ALM 챗봇 벤치마크')
@@ -441,8 +646,37 @@ def main():
         action='store_true',
         help='상세 로그 출력'
     )
+    parser.add_argument(
+        '--position-engines',
+        metavar='BASE_DATE',
+        help='LLM 없이 포지션 변동 엔진(SQL/NumPy/인덱스) 응답 시간만 비교'
+    )
+    parser.add_argument(
+        '--fast-router',
+        action='store_true',
+        help='LLM 없이 빠른 라우터 적중률/정확도만 측정 (leave-one-out)'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='--position-engines 반복 횟수'
+    )
     args = parser.parse_args()
 
+    # 포지션 변동 엔진 벤치마크 (LLM 불필요)
+    if args.position_engines:
+        print(f"⏱️ 포지션 변동 엔진 벤치마크: {args.position_engines}")
+        run_position_engine_benchmark(args.position_engines, repeat=args.repeat)
+        return
+
+    # 빠른 라우터 벤치마크 (LLM 불필요)
+    if args.fast_router:
+        print(f"⚡ 빠른 라우터 벤치마크: {args.questions}")
+        with open(args.questions, 'r', encoding='utf-8') as f:
+            run_fast_router_benchmark(json.load(f)['questions'])
+        return
+
     # LLM 초기화 (로컬 Qwen 32B)
     try:
         from langchain_community.chat_models import ChatOllama
@@ -491,6 +725,9 @@ def main():
           f"{results['single_agent']['avg_time']:.2f}초 평균")
     print(f"멀티 에이전트: {results['multi_agent']['accuracy']:.1f}% 정확도, "
           f"{results['multi_agent']['avg_time']:.2f}초 평균")
+    if results['routing']['total']:
+        print(f"빠른 라우터 (leave-one-out): 적중률 {results['routing']['fast_path_hit_rate']:.1f}%, "
+              f"적중 시 정확도 {results['routing']['fast_path_accuracy']:.1f}%")
     print(f"{'='*60}\n")
 
 
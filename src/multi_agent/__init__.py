@@ -7,7 +7,7 @@ ALM 챗봇 멀티에이전트 시스템
 from multi_agent.base import BaseAgent
 from multi_agent.state import AgentState, create_initial_state, ALL_AGENTS
 from multi_agent.supervisor import SupervisorAgent
-from multi_agent.workflow import create_workflow, run_workflow
+from multi_agent.workflow import create_workflow, run_workflow, arun_workflow
 
 __version__ = '1.0.0'
 __all__ = [
@@ -17,5 +17,6 @@ __all__ = [
     'ALL_AGENTS',
     'SupervisorAgent',
     'create_workflow',
-    'run_workflow'
+    'run_workflow',
+    'arun_workflow'
 ]
@@ -14,9 +14,11 @@ class AnalysisAgent(BaseAgent):
         - get_aggregate_stats: 집계 통계
         - compare_scenarios: 시나리오 비교
         - analyze_trends: 트렌드 분석
+        - analyze_rate_shock: 금리 충격 ΔNII/ΔEVE 분석
+        - simulate_rate_scenarios: 몬테카를로 금리 시나리오 갭 분포
 
     역할:
-        유동성 갭 분석, 집계 통계, 시나리오 비교, 트렌드 분석 등
+        유동성 갭 분석, 집계 통계, 시나리오 비교, 트렌드 분석, 금리 충격 분석 등
         복잡한 분석 작업을 수행합니다.
     """
 
@@ -32,14 +34,16 @@ class AnalysisAgent(BaseAgent):
             'analyze_liquidity_gap',
             'get_aggregate_stats',
             'compare_scenarios',
-            'analyze_trends'
+            'analyze_trends',
+            'analyze_rate_shock',
+            'simulate_rate_scenarios'
         ]
         analysis_tools = [t for t in tools if t.name in analysis_tool_names]
 
-        if len(analysis_tools) != 4:
+        if len(analysis_tools) != len(analysis_tool_names):
             found = [t.name for t in analysis_tools]
             raise ValueError(
-                f"AnalysisAgent: 4개의 도구가 필요하지만 {len(analysis_tools)}개만 발견되었습니다. "
+                f"AnalysisAgent: {len(analysis_tool_names)}개의 도구가 필요하지만 {len(analysis_tools)}개만 발견되었습니다. "
                 f"필요: {analysis_tool_names}, 발견: {found}"
             )
 
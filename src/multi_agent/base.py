@@ -7,6 +7,10 @@ BaseAgent 클래스는 모든 전문 에이전트가 상속받는 추상 클래
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from tool_execution import aexecute_tool_calls, execute_tool_calls, normalize_tool_calls, to_tool_messages
+
+# ReAct 루프 최대 반복 횟수
+MAX_ITERATIONS = 5
 
 
 class BaseAgent(ABC):
@@ -68,72 +72,159 @@ class BaseAgent(ABC):
 
         try:
             # 메시지 초기화
-            messages = [
-                SystemMessage(content=self.get_system_prompt()),
-                HumanMessage(content=task)
-            ]
-
-            # 컨텍스트가 있으면 추가
-            if context:
-                context_str = f"\n\n컨텍스트 정보:\n{self._format_context(context)}"
-                messages.append(HumanMessage(content=context_str))
-
-            # ReAct 루프 (최대 5회 반복)
-            max_iterations = 5
-            for iteration in range(max_iterations):
-                if self.verbose:
-                    print(f"  [반복 {iteration+1}/{max_iterations}]")
+            messages = self._build_messages(task, context)
+
+            # ReAct 루프 (최대 MAX_ITERATIONS회 반복)
+            for iteration in range(MAX_ITERATIONS):
+                self._log_iteration(iteration)
 
                 # LLM 호출
                 response = self.llm_with_tools.invoke(messages)
 
                 # 도구 호출이 없으면 종료 (최종 답변)
-                if not response.tool_calls:
-                    if self.verbose:
-                        print(f"  [완료] 최종 응답 생성")
-
-                    return {
-                        'success': True,
-                        'result': response.content,
-                        'error': None
-                    }
-
-                # 도구 실행
-                tool_call = response.tool_calls[0]
-                tool_name = tool_call['name']
-                tool_args = tool_call['args']
-
-                if self.verbose:
-                    print(f"  [도구 호출] {tool_name}({tool_args})")
-
-                # 도구 실행
-                observation = self._execute_tool(tool_name, tool_args)
-
-                if self.verbose:
-                    print(f"  [도구 결과] {observation[:100]}...")
-
-                # 메시지에 추가
-                messages.append(AIMessage(content=response.content, tool_calls=response.tool_calls))
-                messages.append(HumanMessage(
-                    content=f"도구 실행 결과:\n{observation}\n\n위 결과를 바탕으로 다음 단계를 결정하세요."
-                ))
-
-            # 최대 반복 도달
-            return {
-                'success': False,
-                'result': None,
-                'error': f"최대 반복 횟수({max_iterations})에 도달했습니다."
-            }
+                tool_calls = self._prepare_tool_calls(response, iteration)
+                if not tool_calls:
+                    return self._final_result(response)
+
+                # 도구 실행 (한 턴의 모든 tool_calls, 읽기 전용 도구는 동시 실행)
+                results = execute_tool_calls(tool_calls, self._execute_tool, self.tools)
+                self._observe(messages, response, tool_calls, results)
+
+            return self._max_iterations_result()
 
         except Exception as e:
-            if self.verbose:
-                print(f"  [오류] {str(e)}")
+            return self._error_result(e)
 
-            return {
-                'success': False,
-                'result': None,
-                'error': str(e)
-            }
+    async def arun(self, task: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """작업 실행 (비동기)
+
+        run()과 같은 ReAct 루프를 LLM ainvoke로 수행하고, 도구(DB 조회)는
+        스레드 풀에서 실행하여 이벤트 루프를 막지 않습니다.
+
+        Args:
+            task: 수행할 작업 (자연어)
+            context: 컨텍스트 정보 (옵션)
+
+        Returns:
+            run()과 같은 형식
+        """
+        if self.verbose:
+            print(f"\n[{self.name}] 비동기 실행 시작: {task[:50]}...")
+
+        try:
+            messages = self._build_messages(task, context)
+
+            for iteration in range(MAX_ITERATIONS):
+                self._log_iteration(iteration)
+
+                response = await self.llm_with_tools.ainvoke(messages)
+
+                tool_calls = self._prepare_tool_calls(response, iteration)
+                if not tool_calls:
+                    return self._final_result(response)
+
+                results = await aexecute_tool_calls(tool_calls, self._execute_tool, self.tools)
+                self._observe(messages, response, tool_calls, results)
+
+            return self._max_iterations_result()
+
+        except Exception as e:
+            return self._error_result(e)
+
+    def _log_iteration(self, iteration: int):
+        """반복 시작 로그 (verbose)"""
+        if self.verbose:
+            print(f"  [반복 {iteration+1}/{MAX_ITERATIONS}]")
+
+    def _prepare_tool_calls(self, response, iteration: int) -> List[dict]:
+        """LLM 응답의 tool_calls에 id를 부여하고 로그 출력
+
+        Args:
+            response: LLM 응답 (AIMessage)
+            iteration: 반복 순번 (tool_call id 접두어에 사용)
+
+        Returns:
+            tool_calls 리스트 (도구 호출이 없으면 빈 리스트)
+        """
+        if not response.tool_calls:
+            return []
+
+        tool_calls = normalize_tool_calls(response.tool_calls, prefix=f"{self.name}_{iteration}")
+
+        if self.verbose:
+            for tool_call in tool_calls:
+                print(f"  [도구 호출] {tool_call['name']}({tool_call['args']})")
+
+        return tool_calls
+
+    def _observe(self, messages: List, response, tool_calls: List[dict], results: List):
+        """도구 실행 결과를 로그 출력하고 메시지에 추가
+
+        Args:
+            messages: 대화 메시지 리스트 (제자리 수정)
+            response: 도구를 호출한 LLM 응답
+            tool_calls: id가 부여된 tool_calls
+            results: [(tool_call, observation), ...]
+        """
+        if self.verbose:
+            for tool_call, observation in results:
+                print(f"  [도구 결과] {tool_call['name']}: {str(observation)[:100]}...")
+
+        # 메시지에 추가 (tool_call_id로 연결된 ToolMessage)
+        messages.append(AIMessage(content=response.content, tool_calls=tool_calls))
+        messages.extend(to_tool_messages(results))
+
+    def _final_result(self, response) -> Dict[str, Any]:
+        """도구 호출 없는 최종 응답의 결과"""
+        if self.verbose:
+            print(f"  [완료] 최종 응답 생성")
+
+        return {
+            'success': True,
+            'result': response.content,
+            'error': None
+        }
+
+    def _max_iterations_result(self) -> Dict[str, Any]:
+        """최대 반복 횟수에 도달한 경우의 결과"""
+        return {
+            'success': False,
+            'result': None,
+            'error': f"최대 반복 횟수({MAX_ITERATIONS})에 도달했습니다."
+        }
+
+    def _error_result(self, error: Exception) -> Dict[str, Any]:
+        """실행 중 예외가 발생한 경우의 결과"""
+        if self.verbose:
+            print(f"  [오류] {str(error)}")
+
+        return {
+            'success': False,
+            'result': None,
+            'error': str(error)
+        }
+
+    def _build_messages(self, task: str, context: Optional[Dict[str, Any]]) -> List:
+        """시스템 프롬프트, 작업, 컨텍스트로 초기 메시지 구성
+
+        Args:
+            task: 수행할 작업 (자연어)
+            context: 컨텍스트 정보 (옵션)
+
+        Returns:
+            메시지 리스트
+        """
+        messages = [
+            SystemMessage(content=self.get_system_prompt()),
+            HumanMessage(content=task)
+        ]
+
+        # 컨텍스트가 있으면 추가
+        if context:
+            context_str = f"\n\n컨텍스트 정보:\n{self._format_context(context)}"
+            messages.append(HumanMessage(content=context_str))
+
+        return messages
 
     def _execute_tool(self, tool_name: str, tool_args: dict) -> str:
         """도구 실행
@@ -0,0 +1,296 @@
+"""
+빠른 라우터 (Fast Router)
+
+SupervisorAgent.route()의 LLM 호출 전에 실행하는 로컬 분류기입니다.
+키워드 규칙과 문자 n-gram 나이브 베이즈 모델을 결합하여
+신뢰도가 높은 질문은 LLM 없이 바로 에이전트를 결정합니다.
+
+- 키워드 규칙: 절(…하고 / …한 후) 단위로 도메인 키워드를 찾아 에이전트 목록 구성
+- 나이브 베이즈: multi_agent/routing_examples.py의 라벨 예제로 학습
+- 신뢰도가 FAST_ROUTER_THRESHOLD 미만이면 None을 반환 → LLM 라우터로 폴백
+- 학습 데이터가 없으면 키워드 규칙만으로 라우팅
+"""
+
+import json
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from multi_agent.state import (
+    ALL_AGENTS,
+    SEARCH_AGENT,
+    MARKET_AGENT,
+    ANALYSIS_AGENT,
+    POSITION_AGENT,
+    REPORT_AGENT,
+    EXPORT_AGENT,
+)
+from multi_agent.routing_examples import ROUTING_EXAMPLES
+
+# 이 신뢰도 이상이면 LLM 없이 라우팅
+FAST_ROUTER_THRESHOLD = 0.9
+# 키워드 규칙 자체의 신뢰도 (모델 확률과 결합)
+FAST_ROUTER_RULE_CONFIDENCE = 0.8
+# 문자 n-gram 범위와 라플라스 평활 계수
+FAST_ROUTER_NGRAM_RANGE = (2, 3)
+FAST_ROUTER_ALPHA = 0.1
+
+# 도메인 키워드 규칙 (에이전트, 정규식)
+ROUTING_RULES = [
+    (SEARCH_AGENT, re.compile(r'계약')),
+    (MARKET_AGENT, re.compile(r'환율|금리')),
+    (ANALYSIS_AGENT, re.compile(r'갭|시나리오|통계|트렌드|추세|충격|NII|EVE|시뮬레이션|몬테카를로|상관')),
+    (POSITION_AGENT, re.compile(r'포지션|신규|소멸|증감')),
+    (REPORT_AGENT, re.compile(r'리포트|보고서')),
+    (EXPORT_AGENT, re.compile(r'PDF|Excel|엑셀|Markdown|마크다운|내보내', re.IGNORECASE)),
+]
+
+# 여러 단계 요청의 절 구분 ("분석하고 …", "확인한 후 …")
+CLAUSE_SEPARATOR = re.compile(r'(?:하고|한\s*후)\s*')
+
+
+def match_rules(question: str) -> List[str]:
+    """키워드 규칙으로 에이전트 목록 결정
+
+    절마다 키워드가 걸린 에이전트를 모으되, 한 절 안에서는
+    - 리포트/내보내기 키워드가 있으면 리포트/내보내기만 ("유동성 갭 리포트")
+    - 분석 키워드가 있으면 시장 데이터 제외 ("금리 변동 시나리오")
+    - 포지션 키워드가 있으면 검색/시장 데이터 제외
+    를 적용합니다. 결과는 질문에 처음 등장한 순서입니다.
+
+    Args:
+        question: 사용자 질문
+
+    Returns:
+        에이전트 이름 리스트 (규칙에 걸리지 않으면 빈 리스트)
+    """
+    positions: Dict[str, int] = {}
+    offset = 0
+
+    for clause in CLAUSE_SEPARATOR.split(question):
+        matched = {}
+        for agent_name, pattern in ROUTING_RULES:
+            found = pattern.search(clause)
+            if found:
+                matched[agent_name] = offset + found.start()
+
+        if REPORT_AGENT in matched or EXPORT_AGENT in matched:
+            matched = {k: v for k, v in matched.items() if k in (REPORT_AGENT, EXPORT_AGENT)}
+        if ANALYSIS_AGENT in matched:
+            matched.pop(MARKET_AGENT, None)
+        if POSITION_AGENT in matched:
+            matched.pop(SEARCH_AGENT, None)
+            matched.pop(MARKET_AGENT, None)
+
+        for agent_name, position in matched.items():
+            positions.setdefault(agent_name, position)
+
+        offset += len(clause)
+
+    return sorted(positions, key=positions.get)
+
+
+def _char_ngrams(text: str) -> Counter:
+    """문자 n-gram 빈도 (공백 정규화, 소문자)"""
+    text = ' '.join(text.lower().split())
+    low, high = FAST_ROUTER_NGRAM_RANGE
+    return Counter(
+        text[i:i + n]
+        for n in range(low, high + 1)
+        for i in range(len(text) - n + 1)
+    )
+
+
+class FastRouter:
+    """키워드 규칙 + 나이브 베이즈 빠른 라우터
+
+    Attributes:
+        threshold: LLM 없이 라우팅할 최소 신뢰도
+        labels: 학습된 라벨 {label: 에이전트 리스트}
+    """
+
+    def __init__(self, threshold: float = FAST_ROUTER_THRESHOLD, alpha: float = FAST_ROUTER_ALPHA):
+        """
+        Args:
+            threshold: LLM 없이 라우팅할 최소 신뢰도
+            alpha: 라플라스 평활 계수
+        """
+        self.threshold = threshold
+        self.alpha = alpha
+        self.labels: Dict[str, List[str]] = {}
+        self._log_prior: Dict[str, float] = {}
+        self._log_likelihood: Dict[str, Dict[str, float]] = {}
+        self._log_unseen: Dict[str, float] = {}
+
+    def fit(self, examples: List[Tuple[str, List[str]]]) -> 'FastRouter':
+        """(질문, 에이전트 리스트) 예제로 나이브 베이즈 모델 학습
+
+        Args:
+            examples: 학습 예제 리스트
+
+        Returns:
+            self
+        """
+        doc_counts: Counter = Counter()
+        feature_counts: Dict[str, Counter] = defaultdict(Counter)
+        vocabulary = set()
+
+        for question, agents in examples:
+            label = ','.join(agents)
+            self.labels.setdefault(label, list(agents))
+            doc_counts[label] += 1
+            features = _char_ngrams(question)
+            feature_counts[label].update(features)
+            vocabulary.update(features)
+
+        total_docs = sum(doc_counts.values())
+        vocab_size = len(vocabulary)
+
+        # 예측 시 곱셈만 하도록 로그 확률을 미리 계산
+        for label, count in doc_counts.items():
+            counts = feature_counts[label]
+            denominator = sum(counts.values()) + self.alpha * vocab_size
+            self._log_prior[label] = math.log(count / total_docs)
+            self._log_likelihood[label] = {
+                feature: math.log((n + self.alpha) / denominator) for feature, n in counts.items()
+            }
+            self._log_unseen[label] = math.log(self.alpha / denominator)
+
+        self._vocabulary = vocabulary
+        return self
+
+    @property
+    def is_trained(self) -> bool:
+        return bool(self._log_prior)
+
+    def predict_proba(self, question: str) -> Dict[str, float]:
+        """라벨별 사후 확률
+
+        Args:
+            question: 사용자 질문
+
+        Returns:
+            {label: 확률} (학습되지 않았으면 빈 딕셔너리)
+        """
+        if not self.is_trained:
+            return {}
+
+        features = {f: n for f, n in _char_ngrams(question).items() if f in self._vocabulary}
+        scores = {}
+        for label, log_prior in self._log_prior.items():
+            likelihood = self._log_likelihood[label]
+            unseen = self._log_unseen[label]
+            scores[label] = log_prior + sum(n * likelihood.get(f, unseen) for f, n in features.items())
+
+        # log-sum-exp 정규화
+        top = max(scores.values())
+        exp_scores = {label: math.exp(score - top) for label, score in scores.items()}
+        total = sum(exp_scores.values())
+        return {label: value / total for label, value in exp_scores.items()}
+
+    def classify(self, question: str) -> Dict[str, Any]:
+        """규칙과 모델을 결합하여 에이전트와 신뢰도 계산
+
+        - 규칙에 걸리면 규칙 결과를 사용하고, 모델이 같은 에이전트 조합에 준 확률로 신뢰도를 보정:
+          1 - (1 - 모델 확률) × (1 - FAST_ROUTER_RULE_CONFIDENCE)
+          (모델이 동의하지 않으면 임계값 미만이 되어 LLM으로 폴백)
+        - 규칙에 걸리지 않으면 모델 최고 확률의 라벨을 사용
+        - 학습되지 않은 라우터는 규칙 결과를 그대로 사용 (신뢰도 = threshold)
+
+        Args:
+            question: 사용자 질문
+
+        Returns:
+            {'agents', 'confidence', 'source' ('rule' | 'model' | 'none')}
+        """
+        rule_agents = match_rules(question)
+        proba = self.predict_proba(question)
+
+        if rule_agents and not self.is_trained:
+            # 보정할 모델이 없으면 규칙만으로 라우팅
+            return {'agents': rule_agents, 'confidence': self.threshold, 'source': 'rule'}
+
+        if rule_agents:
+            rule_set = set(rule_agents)
+            model_probability = sum(
+                p for label, p in proba.items() if set(self.labels[label]) == rule_set
+            )
+            confidence = 1 - (1 - model_probability) * (1 - FAST_ROUTER_RULE_CONFIDENCE)
+            return {'agents': rule_agents, 'confidence': confidence, 'source': 'rule'}
+
+        if proba:
+            top_label = max(proba, key=proba.get)
+            return {'agents': self.labels[top_label], 'confidence': proba[top_label], 'source': 'model'}
+
+        return {'agents': [], 'confidence': 0.0, 'source': 'none'}
+
+    def route(self, question: str) -> Optional[Dict[str, Any]]:
+        """신뢰도가 충분하면 SupervisorAgent.route()와 같은 형식의 라우팅 결정 반환
+
+        Args:
+            question: 사용자 질문
+
+        Returns:
+            라우팅 결정 또는 None (LLM 라우터로 폴백)
+        """
+        result = self.classify(question)
+        if not result['agents'] or result['confidence'] < self.threshold:
+            return None
+
+        agents = result['agents']
+        # 리포트/내보내기는 앞 단계 결과를 사용하므로 순차, 그 외 여러 에이전트는 병렬
+        parallel = len(agents) > 1 and not ({REPORT_AGENT, EXPORT_AGENT} & set(agents))
+
+        return {
+            'agents': agents,
+            'parallel': parallel,
+            'reasoning': f"빠른 라우터({result['source']}, 신뢰도 {result['confidence']:.2f})",
+            'source': 'fast_router',
+            'confidence': result['confidence']
+        }
+
+
+def load_training_examples(path: Optional[Path] = None) -> List[Tuple[str, List[str]]]:
+    """빠른 라우터 학습 예제 로드
+
+    Args:
+        path: 질문 데이터셋 JSON 경로 (expected_multi_agent 라벨 사용).
+              None이면 multi_agent/routing_examples.py의 ROUTING_EXAMPLES
+
+    Returns:
+        (질문, 에이전트 리스트) 예제 리스트 (파일이 없으면 빈 리스트)
+    """
+    if path is None:
+        return [(question, list(agents)) for question, agents in ROUTING_EXAMPLES]
+
+    path = Path(path)
+    if not path.exists():
+        return []
+
+    with open(path, 'r', encoding='utf-8') as f:
+        questions = json.load(f)['questions']
+
+    examples = []
+    for q in questions:
+        agents = [name.strip() for name in q.get('expected_multi_agent', '').split(',') if name.strip()]
+        if agents and all(name in ALL_AGENTS for name in agents):
+            examples.append((q['question'], agents))
+    return examples
+
+
+_fast_router: Optional[FastRouter] = None
+_fast_router_lock = threading.Lock()
+
+
+def get_fast_router() -> FastRouter:
+    """학습된 빠른 라우터 (프로세스당 1개, 최초 호출 시 학습)"""
+    global _fast_router
+    with _fast_router_lock:
+        if _fast_router is None:
+            _fast_router = FastRouter().fit(load_training_examples())
+            if not _fast_router.is_trained:
+                print("Warning: fast router has no training examples. Routing with keyword rules only.")
+        return _fast_router
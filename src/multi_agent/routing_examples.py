@@ -0,0 +1,121 @@
+"""
+빠른 라우터 학습 데이터
+
+FastRouter 나이브 베이즈 모델의 (질문, 에이전트 리스트) 라벨 예제입니다.
+벤치마크 질문(tests/test_questions.json)의 expected_multi_agent 라벨에서 가져왔으며,
+라우팅 규칙을 바꾸거나 새 질문 유형을 추가할 때 함께 갱신합니다.
+"""
+
+ROUTING_EXAMPLES = [
+    # search
+    ("USD 통화 계약을 검색해줘", ['search_agent']),
+    ("2020-06-30 기준일 계약을 찾아줘", ['search_agent']),
+    ("DEPOSIT 상품 유형의 계약을 조회해줘", ['search_agent']),
+    ("만기일이 2021년 이후인 계약을 검색해줘", ['search_agent']),
+    ("EUR 통화이면서 DEPOSIT 상품인 계약을 찾아줘", ['search_agent']),
+    ("2020년 6월에 생성된 모든 계약을 조회해줘", ['search_agent']),
+    ("JPY 통화 계약이 몇 개나 있는지 확인해줘", ['search_agent']),
+    ("LOAN 상품 유형 계약을 검색해줘", ['search_agent']),
+    ("2020년 상반기에 생성된 계약을 찾아줘", ['search_agent']),
+    ("외화 계약만 조회해줘", ['search_agent']),
+    ("만기일이 2021-12-31인 계약을 검색해줘", ['search_agent']),
+    ("USD 또는 EUR 통화 계약을 모두 찾아줘", ['search_agent']),
+    ("계약 ID가 INST001인 계약을 조회해줘", ['search_agent']),
+    ("2020년에 만기가 도래하는 계약을 검색해줘", ['search_agent']),
+    ("모든 ALM 계약 목록을 보여줘", ['search_agent']),
+
+    # market
+    ("USD 환율을 조회해줘", ['market_agent']),
+    ("EUR 환율이 얼마인지 확인해줘", ['market_agent']),
+    ("1년 만기 금리를 조회해줘", ['market_agent']),
+    ("3개월 금리가 얼마인지 확인해줘", ['market_agent']),
+    ("JPY 환율과 1년 금리를 조회해줘", ['market_agent']),
+    ("USD 환율과 3개월 금리를 확인해줘", ['market_agent']),
+    ("6개월 금리를 조회해줘", ['market_agent']),
+    ("CNY 환율을 확인해줘", ['market_agent']),
+    ("2년 만기 금리가 얼마인지 조회해줘", ['market_agent']),
+    ("EUR 환율과 6개월 금리를 모두 확인해줘", ['market_agent']),
+    ("주요 통화 환율을 모두 조회해줘", ['market_agent']),
+    ("1년과 2년 금리를 비교해줘", ['market_agent']),
+    ("GBP 환율을 확인해줘", ['market_agent']),
+    ("5년 만기 금리를 조회해줘", ['market_agent']),
+    ("모든 만기별 금리를 확인해줘", ['market_agent']),
+
+    # analysis
+    ("유동성 갭을 분석해줘", ['analysis_agent']),
+    ("1개월 만기 구간의 유동성 갭을 확인해줘", ['analysis_agent']),
+    ("USD 통화의 유동성 갭을 분석해줘", ['analysis_agent']),
+    ("집계 통계를 조회해줘", ['analysis_agent']),
+    ("통화별 집계 통계를 확인해줘", ['analysis_agent']),
+    ("상품 유형별 집계 통계를 분석해줘", ['analysis_agent']),
+    ("시나리오 1과 2를 비교해줘", ['analysis_agent']),
+    ("기준 시나리오와 스트레스 시나리오를 비교 분석해줘", ['analysis_agent']),
+    ("금리 변동에 따른 시나리오를 비교해줘", ['analysis_agent']),
+    ("트렌드를 분석해줘", ['analysis_agent']),
+    ("월별 트렌드를 확인해줘", ['analysis_agent']),
+    ("분기별 트렌드를 분석해줘", ['analysis_agent']),
+    ("유동성 갭과 집계 통계를 함께 분석해줘", ['analysis_agent']),
+    ("EUR 통화의 유동성 갭을 분석해줘", ['analysis_agent']),
+    ("3개월 만기 구간의 유동성 갭을 확인해줘", ['analysis_agent']),
+    ("만기별 집계 통계를 조회해줘", ['analysis_agent']),
+    ("낙관 시나리오와 비관 시나리오를 비교해줘", ['analysis_agent']),
+    ("연도별 트렌드를 분석해줘", ['analysis_agent']),
+    ("JPY 통화의 집계 통계를 확인해줘", ['analysis_agent']),
+    ("6개월 만기 구간의 유동성 갭을 분석해줘", ['analysis_agent']),
+    ("시나리오 A, B, C를 비교 분석해줘", ['analysis_agent']),
+    ("전체 통화의 집계 통계를 확인해줘", ['analysis_agent']),
+    ("1년 만기 구간의 유동성 갭을 분석해줘", ['analysis_agent']),
+    ("계절별 트렌드를 확인해줘", ['analysis_agent']),
+    ("모든 시나리오를 종합 비교해줘", ['analysis_agent']),
+
+    # position
+    ("신규 포지션을 분석해줘", ['position_agent']),
+    ("신규 포지션 증가를 확인해줘", ['position_agent']),
+    ("2020-06-30 기준일의 신규 포지션을 분석해줘", ['position_agent']),
+    ("소멸 포지션을 분석해줘", ['position_agent']),
+    ("소멸 포지션 감소를 확인해줘", ['position_agent']),
+    ("2020-06-30 기준일의 소멸 포지션을 분석해줘", ['position_agent']),
+    ("신규 포지션과 소멸 포지션을 비교해줘", ['position_agent']),
+    ("포지션 증감을 분석해줘", ['position_agent']),
+    ("USD 통화의 신규 포지션을 확인해줘", ['position_agent']),
+    ("EUR 통화의 소멸 포지션을 분석해줘", ['position_agent']),
+    ("월별 신규 포지션 증가를 확인해줘", ['position_agent']),
+    ("월별 소멸 포지션 감소를 분석해줘", ['position_agent']),
+    ("JPY 통화의 포지션 증감을 확인해줘", ['position_agent']),
+    ("DEPOSIT 상품의 신규 포지션을 분석해줘", ['position_agent']),
+    ("LOAN 상품의 소멸 포지션을 확인해줘", ['position_agent']),
+    ("분기별 신규 포지션을 분석해줘", ['position_agent']),
+    ("분기별 소멸 포지션을 확인해줘", ['position_agent']),
+    ("전체 통화의 포지션 증감을 비교해줘", ['position_agent']),
+    ("상품별 신규 포지션을 분석해줘", ['position_agent']),
+    ("상품별 소멸 포지션을 확인해줘", ['position_agent']),
+
+    # report
+    ("종합 리포트를 생성해줘", ['report_agent']),
+    ("ALM 리포트를 만들어줘", ['report_agent']),
+    ("전체 리포트를 생성해줘", ['report_agent']),
+    ("2020-06-30 기준 리포트를 작성해줘", ['report_agent']),
+    ("USD 통화 리포트를 생성해줘", ['report_agent']),
+    ("유동성 갭 리포트를 만들어줘", ['report_agent']),
+    ("시나리오 비교 리포트를 생성해줘", ['report_agent']),
+    ("트렌드 분석 리포트를 작성해줘", ['report_agent']),
+    ("포지션 증감 리포트를 만들어줘", ['report_agent']),
+    ("월간 ALM 리포트를 생성해줘", ['report_agent']),
+    ("분기 리포트를 작성해줘", ['report_agent']),
+    ("상세 리포트를 생성해줘", ['report_agent']),
+    ("요약 리포트를 만들어줘", ['report_agent']),
+    ("경영진 보고용 리포트를 작성해줘", ['report_agent']),
+    ("통합 리포트를 생성해줘", ['report_agent']),
+
+    # mixed
+    ("유동성 갭을 분석하고 리포트를 생성해줘", ['analysis_agent', 'report_agent']),
+    ("시나리오를 비교하고 리포트를 만들어줘", ['analysis_agent', 'report_agent']),
+    ("포지션 증감을 분석하고 리포트를 작성해줘", ['position_agent', 'report_agent']),
+    ("USD 계약을 검색하고 환율을 확인한 후 유동성 갭을 분석해줘", ['search_agent', 'market_agent', 'analysis_agent']),
+    ("집계 통계를 확인하고 트렌드를 분석한 후 리포트를 생성해줘", ['analysis_agent', 'report_agent']),
+    ("신규 포지션을 분석하고 리포트를 Excel로 내보내줘", ['position_agent', 'report_agent', 'export_agent']),
+    ("EUR 환율과 금리를 조회하고 유동성 갭을 분석해줘", ['market_agent', 'analysis_agent']),
+    ("통화별 통계를 확인하고 시나리오를 비교한 후 리포트를 PDF로 내보내줘", ['analysis_agent', 'report_agent', 'export_agent']),
+    ("모든 계약을 검색하고 트렌드를 분석한 후 리포트를 생성해줘", ['search_agent', 'analysis_agent', 'report_agent']),
+    ("포지션 증감과 유동성 갭을 모두 분석하고 종합 리포트를 Markdown으로 내보내줘", ['position_agent', 'analysis_agent', 'report_agent', 'export_agent']),
+]
@@ -9,6 +9,15 @@ from typing import TypedDict, List, Dict, Any, Annotated
 import operator
 
 
+def merge_agent_results(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """agent_results 리듀서
+
+    병렬로 실행된 에이전트 노드가 각자 {agent_name: result}만 반환하면
+    LangGraph가 이 함수로 기존 결과와 병합합니다.
+    """
+    return {**(left or {}), **(right or {})}
+
+
 class AgentState(TypedDict):
     """에이전트 간 공유 상태
 
@@ -19,7 +28,9 @@ class AgentState(TypedDict):
         user_input: 사용자의 원본 질문
         current_agent: 현재 실행 중인 에이전트 이름
         next_agent: 다음에 실행할 에이전트 이름 (Supervisor가 결정)
-        agent_results: 각 에이전트의 실행 결과 {agent_name: result}
+        agent_results: 각 에이전트의 실행 결과 {agent_name: result} (병렬 노드 결과 병합)
+        agent_plan: Supervisor가 한 번 라우팅해 정한 실행 단계 (wave 리스트)
+        wave: 현재 실행 중인 wave 인덱스
         messages: 대화 이력 (메시지 리스트, 누적)
         final_response: 최종 사용자 응답 (Supervisor가 생성)
         errors: 발생한 오류 리스트 (누적)
@@ -32,8 +43,12 @@ class AgentState(TypedDict):
     current_agent: str
     next_agent: str
 
-    # 에이전트 결과
-    agent_results: Dict[str, Any]
+    # 에이전트 결과 (병렬 노드 결과 병합)
+    agent_results: Annotated[Dict[str, Any], merge_agent_results]
+
+    # 실행 계획 (wave 단위 fan-out)
+    agent_plan: List[List[str]]
+    wave: int
 
     # 메시지 (누적)
     messages: Annotated[List[str], operator.add]
@@ -66,6 +81,8 @@ def create_initial_state(user_input: str, max_iterations: int = 10) -> AgentStat
         'current_agent': 'supervisor',  # 항상 supervisor부터 시작
         'next_agent': '',
         'agent_results': {},
+        'agent_plan': [],
+        'wave': 0,
         'messages': [],
         'final_response': '',
         'errors': [],
@@ -93,3 +110,9 @@ ALL_AGENTS = [
     REPORT_AGENT,
     EXPORT_AGENT
 ]
+
+# 에이전트 간 의존성 {에이전트: [먼저 실행되어야 하는 에이전트]}
+# 함께 선택된 경우에만 적용되며, 의존 관계가 없는 에이전트는 병렬 실행 가능
+AGENT_DEPENDENCIES = {
+    EXPORT_AGENT: [REPORT_AGENT],
+}
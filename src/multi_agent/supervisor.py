@@ -5,10 +5,61 @@ Supervisor Agent - 중앙 조정자
 여러 에이전트의 결과를 통합하여 최종 응답을 생성합니다.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+import asyncio
 import json
+import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from langchain_core.messages import HumanMessage, SystemMessage
 from multi_agent.prompts import SUPERVISOR_PROMPT, RESULT_COMBINATION_PROMPT
+from multi_agent.state import AGENT_DEPENDENCIES
+from multi_agent.fast_router import get_fast_router
+
+# 에이전트 병렬 실행 설정
+# 동시에 실행 중인 에이전트 호출 수 상한 (SupervisorAgent 단위, 제한 시간을 넘겨 아직 실행 중인 호출 포함)
+AGENT_MAX_CONCURRENCY = 3
+# 병렬 실행 에이전트별 제한 시간 (초, 에이전트가 실제로 시작한 시점부터). 초과한 에이전트는 실패로 기록하고 기다리지 않음
+# 순차 실행(parallel: False)에는 적용하지 않음
+AGENT_TIMEOUT = 180.0
+# 실행 슬롯을 기다리는 에이전트가 있을 때 제한 시간 확인 주기 (초)
+AGENT_POLL_INTERVAL = 0.05
+
+
+def plan_agent_waves(agent_names: List[str], parallel: bool = True) -> List[List[str]]:
+    """에이전트 실행 단계(wave) 계산
+
+    같은 wave의 에이전트는 동시에 실행하고, AGENT_DEPENDENCIES에 따라
+    선행 에이전트가 함께 선택된 경우 그 다음 wave로 미룹니다.
+
+    Args:
+        agent_names: 라우팅된 에이전트 이름 리스트 (선택 순서)
+        parallel: False면 선택 순서대로 한 개씩 실행
+
+    Returns:
+        wave 리스트 (예: [['market_agent', 'report_agent'], ['export_agent']])
+    """
+    if not parallel:
+        return [[name] for name in agent_names]
+
+    remaining = list(dict.fromkeys(agent_names))
+    selected = set(remaining)
+    done = set()
+    waves = []
+
+    while remaining:
+        wave = [
+            name for name in remaining
+            if all(dep in done or dep not in selected for dep in AGENT_DEPENDENCIES.get(name, []))
+        ]
+        if not wave:
+            # 순환 의존성: 선택 순서대로 하나씩 진행
+            wave = remaining[:1]
+        waves.append(wave)
+        done.update(wave)
+        remaining = [name for name in remaining if name not in done]
+
+    return waves
 
 
 class SupervisorAgent:
@@ -23,19 +74,26 @@ class SupervisorAgent:
         llm: LangChain ChatModel 인스턴스
         agents: 전문 에이전트 딕셔너리 {agent_name: agent_instance}
         verbose: 디버그 출력 여부
+        fast_router: 빠른 라우터 (None이면 항상 LLM 라우팅)
+        last_routing_decision: 마지막 run()/arun()의 라우팅 결정 (벤치마크용)
     """
 
-    def __init__(self, llm, agents: Dict[str, Any], verbose: bool = False):
+    def __init__(self, llm, agents: Dict[str, Any], verbose: bool = False, use_fast_router: bool = True):
         """
         Args:
             llm: LangChain ChatModel 인스턴스
             agents: 전문 에이전트 딕셔너리
                     예: {'search_agent': SearchAgent(...), ...}
             verbose: 디버그 출력 여부
+            use_fast_router: LLM 라우팅 전에 빠른 라우터(키워드 규칙 + 로컬 분류기) 사용 여부
         """
         self.llm = llm
         self.agents = agents
         self.verbose = verbose
+        self.fast_router = get_fast_router() if use_fast_router else None
+        self.last_routing_decision: Optional[Dict[str, Any]] = None
+        # 병렬 실행 슬롯: wave와 호출 사이에 공유하며, 에이전트 스레드가 실제로 끝나야 반환됨
+        self._agent_slots = threading.Semaphore(AGENT_MAX_CONCURRENCY)
 
         # 사용 가능한 에이전트 검증
         required_agents = [
@@ -66,23 +124,87 @@ class SupervisorAgent:
             {
                 'agents': List[str],  # 실행할 에이전트 이름 리스트
                 'parallel': bool,     # 병렬 실행 여부
-                'reasoning': str      # 선택 이유
+                'reasoning': str,     # 선택 이유
+                'source': str         # 'fast_router', 'llm', 'fallback'
             }
         """
+        # 신뢰도가 높은 질문은 LLM 호출 없이 라우팅
+        fast_decision = self._fast_route(user_input)
+        if fast_decision is not None:
+            return fast_decision
+
+        # LLM에게 에이전트 선택 요청
+        messages = self._routing_messages(user_input)
+
+        try:
+            response = self.llm.invoke(messages)
+        except Exception as e:
+            return self._routing_fallback('라우팅 오류', e)
+
+        return self._parse_routing_response(response.content)
+
+    async def aroute(self, user_input: str) -> Dict[str, Any]:
+        """route()의 비동기 버전 (LLM ainvoke 사용)"""
+        fast_decision = self._fast_route(user_input)
+        if fast_decision is not None:
+            return fast_decision
+
+        messages = self._routing_messages(user_input)
+
+        try:
+            response = await self.llm.ainvoke(messages)
+        except Exception as e:
+            return self._routing_fallback('라우팅 오류', e)
+
+        return self._parse_routing_response(response.content)
+
+    def _fast_route(self, user_input: str) -> Optional[Dict[str, Any]]:
+        """빠른 라우터 결정 (신뢰도가 낮거나 비활성화면 None)"""
+        if self.fast_router is None:
+            return None
+
+        decision = self.fast_router.route(user_input)
+        if decision is None or any(name not in self.agents for name in decision['agents']):
+            return None
+
+        if self.verbose:
+            print(f"\n[SupervisorAgent] 빠른 라우팅: {decision['agents']} (신뢰도 {decision['confidence']:.2f})")
+
+        return decision
+
+    def _routing_messages(self, user_input: str) -> List:
+        """라우팅 요청 메시지 구성"""
         if self.verbose:
             print(f"\n[SupervisorAgent] 라우팅 시작")
             print(f"  사용자 입력: {user_input[:50]}...")
 
-        # LLM에게 에이전트 선택 요청
-        messages = [
+        return [
             SystemMessage(content=SUPERVISOR_PROMPT),
             HumanMessage(content=f"사용자 질문: {user_input}")
         ]
 
-        try:
-            response = self.llm.invoke(messages)
-            response_text = response.content
+    def _routing_fallback(self, reason: str, error: Exception) -> Dict[str, Any]:
+        """라우팅 실패 시 기본 search_agent 사용"""
+        if self.verbose:
+            print(f"  ❌ {reason}: {error}")
+
+        return {
+            'agents': ['search_agent'],
+            'parallel': False,
+            'reasoning': f'{reason}로 기본 에이전트 사용: {str(error)}',
+            'source': 'fallback'
+        }
 
+    def _parse_routing_response(self, response_text: str) -> Dict[str, Any]:
+        """LLM 라우팅 응답(JSON)을 파싱하고 검증
+
+        Args:
+            response_text: LLM 응답 텍스트
+
+        Returns:
+            라우팅 결정 (파싱/검증 실패 시 폴백)
+        """
+        try:
             if self.verbose:
                 print(f"  LLM 응답: {response_text[:100]}...")
 
@@ -117,30 +239,17 @@ class SupervisorAgent:
                 print(f"  병렬 실행: {routing_decision.get('parallel', False)}")
                 print(f"  이유: {routing_decision.get('reasoning', 'N/A')}")
 
+            routing_decision['source'] = 'llm'
             return routing_decision
 
         except json.JSONDecodeError as e:
             if self.verbose:
-                print(f"  ❌ JSON 파싱 오류: {e}")
                 print(f"  응답 텍스트: {response_text}")
 
-            # 폴백: 기본 search_agent 사용
-            return {
-                'agents': ['search_agent'],
-                'parallel': False,
-                'reasoning': f'JSON 파싱 오류로 기본 에이전트 사용: {str(e)}'
-            }
+            return self._routing_fallback('JSON 파싱 오류', e)
 
         except Exception as e:
-            if self.verbose:
-                print(f"  ❌ 라우팅 오류: {e}")
-
-            # 폴백: 기본 search_agent 사용
-            return {
-                'agents': ['search_agent'],
-                'parallel': False,
-                'reasoning': f'라우팅 오류로 기본 에이전트 사용: {str(e)}'
-            }
+            return self._routing_fallback('라우팅 오류', e)
 
     def execute_agents(
         self,
@@ -165,45 +274,213 @@ class SupervisorAgent:
         """
         agent_names = routing_decision['agents']
         is_parallel = routing_decision.get('parallel', False)
+        waves = plan_agent_waves(agent_names, parallel=is_parallel)
 
         results = {}
 
         if self.verbose:
             print(f"\n[SupervisorAgent] 에이전트 실행")
-            print(f"  실행 순서: {agent_names}")
+            print(f"  실행 순서: {waves}")
             print(f"  실행 방식: {'병렬' if is_parallel else '순차'}")
 
-        # 현재는 순차 실행만 구현 (병렬은 LangGraph에서 처리 예정)
-        for agent_name in agent_names:
-            agent = self.agents[agent_name]
+        # wave 단위 실행: 같은 wave는 동시에, 이전 wave의 결과는 컨텍스트로 전달
+        for wave in waves:
+            if is_parallel:
+                results.update(self._execute_wave(user_input, wave, dict(results)))
+                continue
+
+            # 순차 실행은 기존과 같이 호출 스레드에서 실행 (제한 시간 없음)
+            for agent_name in wave:
+                results[agent_name] = self._run_agent_sequential(user_input, agent_name, dict(results))
+
+        return results
+
+    def _run_agent_sequential(
+        self,
+        user_input: str,
+        agent_name: str,
+        context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """에이전트 하나를 호출 스레드에서 끝날 때까지 실행 (순차 실행용)"""
+        if self.verbose:
+            print(f"\n  [{agent_name}] 실행 시작...")
+
+        try:
+            result = self.agents[agent_name].run(user_input, context=context or None)
+        except Exception as e:
+            result = self._agent_error_result(agent_name, e)
+
+        self._log_agent_result(agent_name, result)
+        return result
 
+    def _execute_wave(
+        self,
+        user_input: str,
+        wave: List[str],
+        context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """한 wave의 에이전트를 스레드 풀에서 동시에 실행
+
+        동시에 실행 중인 에이전트 호출은 AGENT_MAX_CONCURRENCY개로 제한하며,
+        AGENT_TIMEOUT은 각 에이전트가 실행 슬롯을 얻어 실제로 시작한 시점부터 계산합니다.
+        제한 시간을 넘긴 에이전트는 실패로 기록하고 기다리지 않지만, 스레드는 강제로
+        멈출 수 없으므로 슬롯은 그 호출이 실제로 끝날 때 반환됩니다. 모든 슬롯이
+        제한 시간을 넘긴 호출에 묶여 AGENT_TIMEOUT 동안 슬롯을 얻지 못한 에이전트는
+        시작하지 않고 실패로 기록합니다.
+
+        Args:
+            user_input: 사용자 질문
+            wave: 동시에 실행할 에이전트 이름 리스트
+            context: 이전 wave까지의 에이전트 결과
+
+        Returns:
+            {agent_name: {'success', 'result', 'error'}} (wave 순서 유지)
+        """
+        slots = self._agent_slots
+        lock = threading.Lock()
+        started: Dict[str, float] = {}
+
+        def run_agent(agent_name: str) -> Dict[str, Any]:
+            # 슬롯이 AGENT_TIMEOUT 동안 하나도 반환되지 않았다면 실행 중인 호출은 모두 제한 시간을 넘긴 것
+            if not slots.acquire(timeout=AGENT_TIMEOUT):
+                return self._agent_slot_timeout_result()
+            with lock:
+                started[agent_name] = time.perf_counter()
             if self.verbose:
                 print(f"\n  [{agent_name}] 실행 시작...")
-
             try:
-                # 에이전트 실행
-                result = agent.run(user_input, context=results)
-                results[agent_name] = result
+                return self.agents[agent_name].run(user_input, context=context or None)
+            finally:
+                slots.release()
 
-                if self.verbose:
-                    if result['success']:
-                        print(f"  [{agent_name}] ✅ 성공")
-                        print(f"    결과: {result['result'][:100]}...")
-                    else:
-                        print(f"  [{agent_name}] ❌ 실패: {result['error']}")
+        results = {}
+        # 슬롯 대기는 스레드 안에서 하므로 wave 크기만큼 스레드 생성
+        executor = ThreadPoolExecutor(max_workers=max(1, len(wave)), thread_name_prefix='alm-agent')
+        try:
+            pending = {name: executor.submit(run_agent, name) for name in wave}
+
+            while pending:
+                for agent_name, future in list(pending.items()):
+                    if future.done():
+                        try:
+                            results[agent_name] = future.result()
+                        except Exception as e:
+                            results[agent_name] = self._agent_error_result(agent_name, e)
+                        del pending[agent_name]
+
+                now = time.perf_counter()
+                with lock:
+                    deadlines = {
+                        name: started[name] + AGENT_TIMEOUT for name in pending if name in started
+                    }
+                for agent_name, deadline in deadlines.items():
+                    if deadline <= now:
+                        results[agent_name] = self._agent_timeout_result()
+                        del pending[agent_name]
+
+                if pending:
+                    # 다음 완료 또는 가장 이른 제한 시간까지 대기 (아직 시작 전인 에이전트가 있으면 짧게)
+                    timeout = min(deadlines.values(), default=now + AGENT_POLL_INTERVAL) - now
+                    if len(deadlines) < len(pending):
+                        timeout = min(timeout, AGENT_POLL_INTERVAL)
+                    wait(list(pending.values()), timeout=max(0.0, timeout), return_when=FIRST_COMPLETED)
+        finally:
+            # 제한 시간을 넘긴 에이전트는 기다리지 않음 (끝날 때까지 슬롯을 점유)
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        results = {name: results[name] for name in wave}
+        for agent_name, result in results.items():
+            self._log_agent_result(agent_name, result)
+        return results
 
-            except Exception as e:
-                if self.verbose:
-                    print(f"  [{agent_name}] ❌ 예외 발생: {e}")
+    async def aexecute_agents(
+        self,
+        user_input: str,
+        routing_decision: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """execute_agents()의 비동기 버전
 
-                results[agent_name] = {
-                    'success': False,
-                    'result': None,
-                    'error': str(e)
-                }
+        같은 wave의 에이전트는 asyncio.gather로 동시에 실행합니다.
+        동기 버전과 같이 세마포어로 AGENT_MAX_CONCURRENCY개까지 실행하고,
+        AGENT_TIMEOUT은 세마포어를 얻은 뒤(실제로 시작한 시점)부터 계산합니다.
+        제한 시간을 넘긴 에이전트는 LLM 호출까지 취소되므로 슬롯을 바로 다음
+        에이전트에 넘깁니다. 순차 실행(parallel: False)에는 제한 시간을 두지 않습니다.
+        """
+        agent_names = routing_decision['agents']
+        is_parallel = routing_decision.get('parallel', False)
+        waves = plan_agent_waves(agent_names, parallel=is_parallel)
+
+        results = {}
+
+        if self.verbose:
+            print(f"\n[SupervisorAgent] 에이전트 비동기 실행")
+            print(f"  실행 순서: {waves}")
+            print(f"  실행 방식: {'병렬' if is_parallel else '순차'}")
+
+        semaphore = asyncio.Semaphore(AGENT_MAX_CONCURRENCY)
+
+        async def run_agent(agent_name: str, context: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                if self.verbose:
+                    print(f"\n  [{agent_name}] 실행 시작...")
+                try:
+                    call = self.agents[agent_name].arun(user_input, context=context or None)
+                    if not is_parallel:
+                        return await call
+                    return await asyncio.wait_for(call, timeout=AGENT_TIMEOUT)
+                except asyncio.TimeoutError:
+                    return self._agent_timeout_result()
+                except Exception as e:
+                    return self._agent_error_result(agent_name, e)
+
+        for wave in waves:
+            context = dict(results)
+            wave_results = await asyncio.gather(*(run_agent(name, context) for name in wave))
+            for agent_name, result in zip(wave, wave_results):
+                results[agent_name] = result
+                self._log_agent_result(agent_name, result)
 
         return results
 
+    def _agent_timeout_result(self) -> Dict[str, Any]:
+        """제한 시간을 넘긴 에이전트의 결과"""
+        return {
+            'success': False,
+            'result': None,
+            'error': f"제한 시간({AGENT_TIMEOUT:.0f}초)을 초과했습니다."
+        }
+
+    def _agent_slot_timeout_result(self) -> Dict[str, Any]:
+        """제한 시간을 넘긴 호출들이 슬롯을 모두 점유해 시작하지 못한 에이전트의 결과"""
+        return {
+            'success': False,
+            'result': None,
+            'error': (
+                f"제한 시간({AGENT_TIMEOUT:.0f}초) 동안 실행 슬롯을 얻지 못했습니다 "
+                f"(제한 시간을 넘긴 에이전트가 아직 실행 중)."
+            )
+        }
+
+    def _agent_error_result(self, agent_name: str, error: Exception) -> Dict[str, Any]:
+        """예외가 발생한 에이전트의 결과"""
+        if self.verbose:
+            print(f"  [{agent_name}] ❌ 예외 발생: {error}")
+
+        return {
+            'success': False,
+            'result': None,
+            'error': str(error)
+        }
+
+    def _log_agent_result(self, agent_name: str, result: Dict[str, Any]):
+        """에이전트 실행 결과 출력 (verbose 모드)"""
+        if self.verbose:
+            if result['success']:
+                print(f"  [{agent_name}] ✅ 성공")
+                print(f"    결과: {result['result'][:100]}...")
+            else:
+                print(f"  [{agent_name}] ❌ 실패: {result['error']}")
+
     def combine_results(
         self,
         user_input: str,
@@ -218,6 +495,45 @@ class SupervisorAgent:
         Returns:
             통합된 최종 응답 문자열
         """
+        direct_response, messages, results_text = self._prepare_combination(user_input, agent_results)
+        if direct_response is not None:
+            return direct_response
+
+        try:
+            response = self.llm.invoke(messages)
+        except Exception as e:
+            return self._combination_fallback(results_text, e)
+
+        return self._combined_response(response.content)
+
+    async def acombine_results(
+        self,
+        user_input: str,
+        agent_results: Dict[str, Any]
+    ) -> str:
+        """combine_results()의 비동기 버전 (LLM ainvoke 사용)"""
+        direct_response, messages, results_text = self._prepare_combination(user_input, agent_results)
+        if direct_response is not None:
+            return direct_response
+
+        try:
+            response = await self.llm.ainvoke(messages)
+        except Exception as e:
+            return self._combination_fallback(results_text, e)
+
+        return self._combined_response(response.content)
+
+    def _prepare_combination(
+        self,
+        user_input: str,
+        agent_results: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[List], str]:
+        """결과 통합 준비
+
+        Returns:
+            (LLM 없이 바로 반환할 응답, 통합 요청 메시지, 결과 텍스트)
+            바로 반환할 응답이 있으면 메시지는 None
+        """
         if self.verbose:
             print(f"\n[SupervisorAgent] 결과 통합 시작")
 
@@ -234,11 +550,11 @@ class SupervisorAgent:
                 f"- {name}: {result['error']}"
                 for name, result in agent_results.items()
             ])
-            return f"죄송합니다. 요청을 처리하는 중 오류가 발생했습니다:\n\n{error_summary}"
+            return f"죄송합니다. 요청을 처리하는 중 오류가 발생했습니다:\n\n{error_summary}", None, ''
 
         # 단일 에이전트 결과만 있으면 그대로 반환
         if len(successful_results) == 1:
-            return list(successful_results.values())[0]
+            return list(successful_results.values())[0], None, ''
 
         # 여러 에이전트 결과를 LLM으로 통합
         results_text = "\n\n".join([
@@ -256,21 +572,21 @@ class SupervisorAgent:
 """)
         ]
 
-        try:
-            response = self.llm.invoke(messages)
-            combined_result = response.content
+        return None, messages, results_text
 
-            if self.verbose:
-                print(f"  통합 완료: {combined_result[:100]}...")
+    def _combined_response(self, combined_result: str) -> str:
+        """LLM 통합 응답 반환"""
+        if self.verbose:
+            print(f"  통합 완료: {combined_result[:100]}...")
 
-            return combined_result
+        return combined_result
 
-        except Exception as e:
-            if self.verbose:
-                print(f"  ❌ 통합 오류: {e}")
+    def _combination_fallback(self, results_text: str, error: Exception) -> str:
+        """통합 실패 시 폴백: 단순 연결"""
+        if self.verbose:
+            print(f"  ❌ 통합 오류: {error}")
 
-            # 폴백: 단순 연결
-            return results_text
+        return results_text
 
     def run(self, user_input: str) -> str:
         """전체 워크플로우 실행
@@ -290,6 +606,7 @@ class SupervisorAgent:
 
         # 1. 라우팅
         routing_decision = self.route(user_input)
+        self.last_routing_decision = routing_decision
 
         # 2. 에이전트 실행
         agent_results = self.execute_agents(user_input, routing_decision)
@@ -303,3 +620,37 @@ class SupervisorAgent:
             print("=" * 60)
 
         return final_response
+
+    async def arun(self, user_input: str) -> str:
+        """전체 워크플로우 실행 (비동기)
+
+        run()과 같은 흐름을 aroute → aexecute_agents → acombine_results로 수행하여
+        한 프로세스에서 여러 세션을 동시에 처리할 수 있습니다.
+
+        Args:
+            user_input: 사용자 질문
+
+        Returns:
+            최종 응답 문자열
+        """
+        if self.verbose:
+            print("=" * 60)
+            print("[SupervisorAgent] 전체 워크플로우 시작")
+            print("=" * 60)
+
+        # 1. 라우팅
+        routing_decision = await self.aroute(user_input)
+        self.last_routing_decision = routing_decision
+
+        # 2. 에이전트 실행
+        agent_results = await self.aexecute_agents(user_input, routing_decision)
+
+        # 3. 결과 통합
+        final_response = await self.acombine_results(user_input, agent_results)
+
+        if self.verbose:
+            print("\n" + "=" * 60)
+            print("[SupervisorAgent] 워크플로우 완료")
+            print("=" * 60)
+
+        return final_response
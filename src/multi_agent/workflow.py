@@ -3,12 +3,19 @@ LangGraph 워크플로우 구성
 
 멀티에이전트 시스템의 StateGraph를 정의하고,
 조건부 라우팅 및 병렬 실행을 구현합니다.
+
+supervisor(라우팅 1회) → [wave의 에이전트들 병렬 실행 (Send)] → join → ... → combiner → END
 """
 
-from typing import Dict, Any, List, Literal
+from typing import Dict, Any, List, Optional, Union
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
-from multi_agent.state import AgentState, SUPERVISOR, FINISH
-from multi_agent.supervisor import SupervisorAgent
+from langgraph.types import Send
+from multi_agent.state import AgentState, ALL_AGENTS, SUPERVISOR, FINISH, create_initial_state
+from multi_agent.supervisor import SupervisorAgent, plan_agent_waves
+
+JOIN = 'join'
+COMBINER = 'combiner'
 
 
 def create_supervisor_node(supervisor: SupervisorAgent):
@@ -18,47 +25,64 @@ def create_supervisor_node(supervisor: SupervisorAgent):
         supervisor: SupervisorAgent 인스턴스
 
     Returns:
-        StateGraph 노드로 사용할 함수
+        StateGraph 노드 (invoke/ainvoke 모두 지원하는 RunnableLambda)
     """
 
-    def supervisor_node(state: AgentState) -> AgentState:
-        """사용자 입력을 분석하여 다음 에이전트 결정
-
-        Args:
-            state: 현재 상태
-
-        Returns:
-            업데이트된 상태
-        """
-        user_input = state['user_input']
+    def check_iterations(state: AgentState) -> Optional[Dict[str, Any]]:
+        """최대 반복 횟수에 도달했으면 종료 업데이트 반환"""
         iteration = state['iteration']
         max_iterations = state['max_iterations']
 
-        # 최대 반복 횟수 체크
         if iteration >= max_iterations:
             return {
-                **state,
                 'next_agent': FINISH,
+                'agent_plan': [],
                 'errors': [f"최대 반복 횟수({max_iterations})에 도달했습니다."],
                 'iteration': iteration + 1
             }
+        return None
 
-        # 라우팅 결정
-        routing_decision = supervisor.route(user_input)
-
-        # 첫 번째 에이전트 선택
-        agents = routing_decision['agents']
-        next_agent = agents[0] if agents else FINISH
+    def plan_update(state: AgentState, routing_decision: Dict[str, Any]) -> Dict[str, Any]:
+        """라우팅 결정을 의존성을 반영한 wave 계획으로 변환 (같은 wave는 병렬 실행)"""
+        plan = plan_agent_waves(
+            routing_decision.get('agents', []),
+            parallel=routing_decision.get('parallel', False)
+        )
 
         return {
-            **state,
             'current_agent': SUPERVISOR,
-            'next_agent': next_agent,
+            'next_agent': ','.join(plan[0]) if plan else FINISH,
+            'agent_plan': plan,
+            'wave': 0,
             'messages': [f"[Supervisor] {routing_decision.get('reasoning', '')}"],
-            'iteration': iteration + 1
+            'iteration': state['iteration'] + 1
         }
 
-    return supervisor_node
+    def supervisor_node(state: AgentState) -> Dict[str, Any]:
+        """사용자 입력을 한 번만 라우팅하여 전체 실행 계획(wave) 결정
+
+        Args:
+            state: 현재 상태
+
+        Returns:
+            상태 업데이트
+        """
+        stop = check_iterations(state)
+        if stop is not None:
+            return stop
+
+        # 라우팅 결정 (LLM 호출 1회)
+        return plan_update(state, supervisor.route(state['user_input']))
+
+    async def asupervisor_node(state: AgentState) -> Dict[str, Any]:
+        """supervisor_node의 비동기 버전"""
+        stop = check_iterations(state)
+        if stop is not None:
+            return stop
+
+        return plan_update(state, await supervisor.aroute(state['user_input']))
+
+    return RunnableLambda(supervisor_node, afunc=asupervisor_node, name=SUPERVISOR)
 
 
 def create_agent_node(agent_name: str, agent):
@@ -69,37 +93,74 @@ def create_agent_node(agent_name: str, agent):
         agent: 에이전트 인스턴스
 
     Returns:
-        StateGraph 노드로 사용할 함수
+        StateGraph 노드 (invoke/ainvoke 모두 지원하는 RunnableLambda)
     """
 
-    def agent_node(state: AgentState) -> AgentState:
+    def agent_update(result: Dict[str, Any]) -> Dict[str, Any]:
+        """같은 wave의 다른 에이전트와 병렬로 실행되므로 리듀서가 있는 필드만 반환"""
+        return {
+            'agent_results': {agent_name: result},
+            'messages': [f"[{agent_name}] 실행 완료"]
+        }
+
+    def agent_node(state: AgentState) -> Dict[str, Any]:
         """에이전트 실행
 
         Args:
-            state: 현재 상태
+            state: Send로 전달된 상태 (이전 wave까지의 결과 포함)
 
         Returns:
-            업데이트된 상태
+            상태 업데이트
         """
-        user_input = state['user_input']
-        agent_results = state['agent_results']
+        # 에이전트 실행 (이전 wave 결과를 컨텍스트로 전달)
+        result = agent.run(state['user_input'], context=state['agent_results'] or None)
+        return agent_update(result)
 
-        # 에이전트 실행
-        result = agent.run(user_input, context=agent_results)
+    async def aagent_node(state: AgentState) -> Dict[str, Any]:
+        """agent_node의 비동기 버전"""
+        result = await agent.arun(state['user_input'], context=state['agent_results'] or None)
+        return agent_update(result)
 
-        # 결과 저장
-        new_results = {**agent_results, agent_name: result}
+    return RunnableLambda(agent_node, afunc=aagent_node, name=agent_name)
 
-        # 다음 에이전트 결정 (간단히 finish로 설정, Supervisor가 다시 라우팅)
-        return {
-            **state,
-            'current_agent': agent_name,
-            'next_agent': SUPERVISOR,  # 다시 Supervisor로 돌아가서 다음 에이전트 결정
-            'agent_results': new_results,
-            'messages': [f"[{agent_name}] 실행 완료"]
+
+def create_join_node():
+    """wave 종료 노드 함수 생성
+
+    한 wave의 모든 에이전트 노드가 끝난 뒤 한 번 실행되어 다음 wave로 넘어갑니다.
+
+    Returns:
+        StateGraph 노드로 사용할 함수
+    """
+
+    def join_node(state: AgentState) -> Dict[str, Any]:
+        """다음 wave로 이동
+
+        Args:
+            state: 현재 상태
+
+        Returns:
+            상태 업데이트
+        """
+        plan = state['agent_plan']
+        wave = state['wave'] + 1
+        iteration = state['iteration'] + 1
+        max_iterations = state['max_iterations']
+
+        update = {
+            'current_agent': JOIN,
+            'wave': wave,
+            'iteration': iteration
         }
 
-    return agent_node
+        if wave < len(plan) and iteration >= max_iterations:
+            update['wave'] = len(plan)
+            update['errors'] = [f"최대 반복 횟수({max_iterations})에 도달했습니다."]
+
+        update['next_agent'] = ','.join(plan[update['wave']]) if update['wave'] < len(plan) else FINISH
+        return update
+
+    return join_node
 
 
 def create_combiner_node(supervisor: SupervisorAgent):
@@ -109,63 +170,55 @@ def create_combiner_node(supervisor: SupervisorAgent):
         supervisor: SupervisorAgent 인스턴스
 
     Returns:
-        StateGraph 노드로 사용할 함수
+        StateGraph 노드 (invoke/ainvoke 모두 지원하는 RunnableLambda)
     """
 
-    def combiner_node(state: AgentState) -> AgentState:
+    def combiner_update(final_response: str) -> Dict[str, Any]:
+        return {
+            'current_agent': COMBINER,
+            'next_agent': FINISH,
+            'final_response': final_response,
+            'messages': ["[Combiner] 결과 통합 완료"]
+        }
+
+    def combiner_node(state: AgentState) -> Dict[str, Any]:
         """여러 에이전트 결과를 통합
 
         Args:
             state: 현재 상태
 
         Returns:
-            업데이트된 상태
+            상태 업데이트
         """
-        user_input = state['user_input']
-        agent_results = state['agent_results']
-
         # 결과 통합
-        final_response = supervisor.combine_results(user_input, agent_results)
+        return combiner_update(supervisor.combine_results(state['user_input'], state['agent_results']))
 
-        return {
-            **state,
-            'current_agent': 'combiner',
-            'next_agent': FINISH,
-            'final_response': final_response,
-            'messages': ["[Combiner] 결과 통합 완료"]
-        }
+    async def acombiner_node(state: AgentState) -> Dict[str, Any]:
+        """combiner_node의 비동기 버전"""
+        return combiner_update(await supervisor.acombine_results(state['user_input'], state['agent_results']))
 
-    return combiner_node
+    return RunnableLambda(combiner_node, afunc=acombiner_node, name=COMBINER)
 
 
-def router(state: AgentState) -> Literal[
-    'search_agent',
-    'market_agent',
-    'analysis_agent',
-    'position_agent',
-    'report_agent',
-    'export_agent',
-    'combiner',
-    'finish'
-]:
-    """조건부 라우팅 함수
+def router(state: AgentState) -> Union[List[Send], str]:
+    """조건부 라우팅 함수 (fan-out)
 
-    Supervisor가 결정한 next_agent에 따라 다음 노드 선택
+    현재 wave의 모든 에이전트를 Send로 동시에 실행하고,
+    남은 wave가 없으면 combiner로 이동합니다.
 
     Args:
         state: 현재 상태
 
     Returns:
-        다음 노드 이름
+        Send 리스트 또는 'combiner'
     """
-    next_agent = state.get('next_agent', FINISH)
+    plan = state.get('agent_plan') or []
+    wave = state.get('wave', 0)
 
-    # finish 신호이거나 결과가 충분하면 combiner로
-    if next_agent == FINISH or next_agent == '':
-        return 'combiner'
+    if wave >= len(plan):
+        return COMBINER
 
-    # 에이전트 이름 반환
-    return next_agent
+    return [Send(agent_name, state) for agent_name in plan[wave]]
 
 
 def create_workflow(supervisor: SupervisorAgent, agents: Dict[str, Any]) -> StateGraph:
@@ -183,42 +236,29 @@ def create_workflow(supervisor: SupervisorAgent, agents: Dict[str, Any]) -> Stat
     workflow = StateGraph(AgentState)
 
     # 노드 추가
-    workflow.add_node("supervisor", create_supervisor_node(supervisor))
-    workflow.add_node("search_agent", create_agent_node('search_agent', agents['search_agent']))
-    workflow.add_node("market_agent", create_agent_node('market_agent', agents['market_agent']))
-    workflow.add_node("analysis_agent", create_agent_node('analysis_agent', agents['analysis_agent']))
-    workflow.add_node("position_agent", create_agent_node('position_agent', agents['position_agent']))
-    workflow.add_node("report_agent", create_agent_node('report_agent', agents['report_agent']))
-    workflow.add_node("export_agent", create_agent_node('export_agent', agents['export_agent']))
-    workflow.add_node("combiner", create_combiner_node(supervisor))
+    workflow.add_node(SUPERVISOR, create_supervisor_node(supervisor))
+    for agent_name in ALL_AGENTS:
+        workflow.add_node(agent_name, create_agent_node(agent_name, agents[agent_name]))
+    workflow.add_node(JOIN, create_join_node())
+    workflow.add_node(COMBINER, create_combiner_node(supervisor))
 
     # 엣지 추가
 
-    # 1. Supervisor → 조건부 라우팅 → 각 에이전트 또는 Combiner
-    workflow.add_conditional_edges(
-        "supervisor",
-        router,
-        {
-            'search_agent': 'search_agent',
-            'market_agent': 'market_agent',
-            'analysis_agent': 'analysis_agent',
-            'position_agent': 'position_agent',
-            'report_agent': 'report_agent',
-            'export_agent': 'export_agent',
-            'combiner': 'combiner',
-            'finish': 'combiner'
-        }
-    )
+    # 1. Supervisor → 첫 wave의 에이전트들 (Send로 병렬 fan-out) 또는 Combiner
+    workflow.add_conditional_edges(SUPERVISOR, router, ALL_AGENTS + [COMBINER])
+
+    # 2. 각 에이전트 → Join (wave의 모든 에이전트가 끝나면 한 번 실행)
+    for agent_name in ALL_AGENTS:
+        workflow.add_edge(agent_name, JOIN)
 
-    # 2. 각 에이전트 → Supervisor (다음 에이전트 결정)
-    for agent_name in agents.keys():
-        workflow.add_edge(agent_name, "supervisor")
+    # 3. Join → 다음 wave 또는 Combiner
+    workflow.add_conditional_edges(JOIN, router, ALL_AGENTS + [COMBINER])
 
-    # 3. Combiner → END
-    workflow.add_edge("combiner", END)
+    # 4. Combiner → END
+    workflow.add_edge(COMBINER, END)
 
-    # 4. 시작점 설정
-    workflow.set_entry_point("supervisor")
+    # 5. 시작점 설정
+    workflow.set_entry_point(SUPERVISOR)
 
     # 컴파일
     return workflow.compile()
@@ -241,29 +281,68 @@ def run_workflow(
     Returns:
         최종 상태 (final_response 포함)
     """
-    from multi_agent.state import create_initial_state
-
     # 초기 상태 생성
     initial_state = create_initial_state(user_input, max_iterations)
 
     if verbose:
-        print("=" * 60)
-        print("[Workflow] 실행 시작")
-        print("=" * 60)
-        print(f"사용자 입력: {user_input}")
-        print(f"최대 반복 횟수: {max_iterations}")
-        print()
+        _print_workflow_start(user_input, max_iterations)
 
     # 워크플로우 실행
     final_state = workflow.invoke(initial_state)
 
     if verbose:
-        print("\n" + "=" * 60)
-        print("[Workflow] 실행 완료")
-        print("=" * 60)
-        print(f"반복 횟수: {final_state['iteration']}")
-        print(f"실행된 에이전트: {list(final_state['agent_results'].keys())}")
-        print(f"오류: {final_state['errors']}")
-        print()
+        _print_workflow_end(final_state)
 
     return final_state
+
+
+async def arun_workflow(
+    workflow,
+    user_input: str,
+    max_iterations: int = 10,
+    verbose: bool = False
+) -> Dict[str, Any]:
+    """워크플로우 실행 (비동기)
+
+    workflow.ainvoke로 실행하여 노드의 비동기 경로(aroute, arun, acombine_results)를
+    사용합니다. 한 이벤트 루프에서 여러 세션을 동시에 처리할 때 사용합니다.
+
+    Args:
+        workflow: 컴파일된 StateGraph
+        user_input: 사용자 질문
+        max_iterations: 최대 반복 횟수
+        verbose: 디버그 출력 여부
+
+    Returns:
+        최종 상태 (final_response 포함)
+    """
+    initial_state = create_initial_state(user_input, max_iterations)
+
+    if verbose:
+        _print_workflow_start(user_input, max_iterations)
+
+    final_state = await workflow.ainvoke(initial_state)
+
+    if verbose:
+        _print_workflow_end(final_state)
+
+    return final_state
+
+
+def _print_workflow_start(user_input: str, max_iterations: int):
+    print("=" * 60)
+    print("[Workflow] 실행 시작")
+    print("=" * 60)
+    print(f"사용자 입력: {user_input}")
+    print(f"최대 반복 횟수: {max_iterations}")
+    print()
+
+
+def _print_workflow_end(final_state: Dict[str, Any]):
+    print("\n" + "=" * 60)
+    print("[Workflow] 실행 완료")
+    print("=" * 60)
+    print(f"반복 횟수: {final_state['iteration']}")
+    print(f"실행된 에이전트: {list(final_state['agent_results'].keys())}")
+    print(f"오류: {final_state['errors']}")
+    print()
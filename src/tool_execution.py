@@ -0,0 +1,153 @@
+"""
+도구 호출 실행기
+
+LLM 한 턴에서 요청된 tool_calls를 모두 실행하고 ToolMessage로 변환합니다.
+ALMAgent(단일 에이전트)와 BaseAgent(멀티 에이전트)가 공통으로 사용합니다.
+
+- metadata={'read_only': True}인 도구가 연속되면 스레드 풀에서 동시에 실행합니다.
+- 읽기 전용이 아닌 도구(파일 내보내기 등)는 순서 경계로 보고 단독 실행합니다.
+- 결과는 항상 tool_calls 순서대로 반환합니다.
+- aexecute_tool_calls는 같은 규칙으로 실행하되 이벤트 루프를 막지 않습니다 (arun 경로).
+"""
+
+import asyncio
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from langchain_core.messages import ToolMessage
+
+# 동시 실행 설정 (DB 커넥션 풀 크기 이하로 유지)
+TOOL_MAX_WORKERS = 4
+
+_tool_pool: Optional[ThreadPoolExecutor] = None
+_tool_pool_lock = threading.Lock()
+
+
+def _get_tool_pool() -> ThreadPoolExecutor:
+    """도구 실행용 스레드 풀 (프로세스당 1개, 지연 생성)"""
+    global _tool_pool
+    with _tool_pool_lock:
+        if _tool_pool is None:
+            _tool_pool = ThreadPoolExecutor(
+                max_workers=TOOL_MAX_WORKERS,
+                thread_name_prefix='alm-tool'
+            )
+        return _tool_pool
+
+
+def shutdown_tool_pool():
+    """도구 실행 스레드 풀 종료"""
+    global _tool_pool
+    with _tool_pool_lock:
+        if _tool_pool is not None:
+            _tool_pool.shutdown(wait=True)
+            _tool_pool = None
+
+
+atexit.register(shutdown_tool_pool)
+
+
+def is_read_only_tool(tool) -> bool:
+    """도구가 읽기 전용(동시 실행 가능)으로 표시되어 있는지 확인"""
+    return tool is not None and bool((getattr(tool, 'metadata', None) or {}).get('read_only'))
+
+
+def normalize_tool_calls(tool_calls: List[dict], prefix: str = 'call') -> List[dict]:
+    """tool_call id가 없는 응답(일부 로컬 모델)에 id를 부여
+
+    AIMessage의 tool_calls와 ToolMessage의 tool_call_id가 짝을 이뤄야 하므로
+    AIMessage를 대화에 추가하기 전에 호출합니다.
+    """
+    normalized = []
+    for i, tool_call in enumerate(tool_calls):
+        tool_call = dict(tool_call)
+        if not tool_call.get('id'):
+            tool_call['id'] = f"{prefix}_{i}"
+        normalized.append(tool_call)
+    return normalized
+
+
+def _plan_batches(tools: Dict[str, object], tool_calls: List[dict]) -> List[List[int]]:
+    """tool_calls를 실행 묶음으로 분할
+
+    연속된 읽기 전용 도구는 한 묶음(동시 실행), 그 외 도구는 단독 묶음입니다.
+    """
+    batches: List[List[int]] = []
+    previous_read_only = False
+    for i, tool_call in enumerate(tool_calls):
+        read_only = is_read_only_tool(tools.get(tool_call['name']))
+        if read_only and previous_read_only:
+            batches[-1].append(i)
+        else:
+            batches.append([i])
+        previous_read_only = read_only
+    return batches
+
+
+def execute_tool_calls(
+    tool_calls: List[dict],
+    execute: Callable[[str, dict], str],
+    tools: Dict[str, object]
+) -> List[Tuple[dict, str]]:
+    """한 턴의 tool_calls를 모두 실행
+
+    Args:
+        tool_calls: LLM 응답의 tool_calls (normalize_tool_calls 적용 권장)
+        execute: (tool_name, tool_args) -> 결과 문자열 (예외를 오류 문자열로 변환하는 함수)
+        tools: 도구 딕셔너리 {tool_name: tool_object}
+
+    Returns:
+        [(tool_call, observation), ...] (tool_calls 순서 유지)
+    """
+    observations: List[Optional[str]] = [None] * len(tool_calls)
+
+    for batch in _plan_batches(tools, tool_calls):
+        if len(batch) == 1:
+            i = batch[0]
+            observations[i] = execute(tool_calls[i]['name'], tool_calls[i]['args'])
+            continue
+
+        pool = _get_tool_pool()
+        futures = {
+            i: pool.submit(execute, tool_calls[i]['name'], tool_calls[i]['args'])
+            for i in batch
+        }
+        for i, future in futures.items():
+            observations[i] = future.result()
+
+    return list(zip(tool_calls, observations))
+
+
+async def aexecute_tool_calls(
+    tool_calls: List[dict],
+    execute: Callable[[str, dict], str],
+    tools: Dict[str, object]
+) -> List[Tuple[dict, str]]:
+    """execute_tool_calls의 비동기 버전
+
+    도구(DB 조회)는 동기 함수이므로 도구 스레드 풀에서 실행하고,
+    이벤트 루프는 그동안 다른 세션의 요청을 처리합니다.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _get_tool_pool()
+    observations: List[Optional[str]] = [None] * len(tool_calls)
+
+    for batch in _plan_batches(tools, tool_calls):
+        batch_observations = await asyncio.gather(*(
+            loop.run_in_executor(pool, execute, tool_calls[i]['name'], tool_calls[i]['args'])
+            for i in batch
+        ))
+        for i, observation in zip(batch, batch_observations):
+            observations[i] = observation
+
+    return list(zip(tool_calls, observations))
+
+
+def to_tool_messages(results: List[Tuple[dict, str]]) -> List[ToolMessage]:
+    """실행 결과를 tool_call_id가 연결된 ToolMessage 리스트로 변환"""
+    return [
+        ToolMessage(content=str(observation), tool_call_id=tool_call['id'], name=tool_call['name'])
+        for tool_call, observation in results
+    ]
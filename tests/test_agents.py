@@ -66,12 +66,12 @@ print(f"   - 실제 도구: {[t.name for t in market_tools]}")
 print(f"   - 개수: {len(market_tools)}/2 ✅" if len(market_tools) == 2 else f"   - 개수: {len(market_tools)}/2 ❌")
 
 # AnalysisAgent
-analysis_tool_names = ['analyze_liquidity_gap', 'get_aggregate_stats', 'compare_scenarios', 'analyze_trends']
+analysis_tool_names = ['analyze_liquidity_gap', 'get_aggregate_stats', 'compare_scenarios', 'analyze_trends', 'analyze_rate_shock', 'simulate_rate_scenarios']
 analysis_tools = [t for t in tools if t.name in analysis_tool_names]
 print(f"\n3. AnalysisAgent:")
 print(f"   - 예상 도구: {analysis_tool_names}")
 print(f"   - 실제 도구: {[t.name for t in analysis_tools]}")
-print(f"   - 개수: {len(analysis_tools)}/4 ✅" if len(analysis_tools) == 4 else f"   - 개수: {len(analysis_tools)}/4 ❌")
+print(f"   - 개수: {len(analysis_tools)}/6 ✅" if len(analysis_tools) == 6 else f"   - 개수: {len(analysis_tools)}/6 ❌")
 
 # PositionAgent
 position_tool_names = ['analyze_new_position_growth', 'analyze_expired_position_decrease']
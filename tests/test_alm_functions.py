@@ -0,0 +1,967 @@
+"""
+alm_functions 데이터 계층 테스트
+
+샘플 SQLite 데이터베이스를 임시 디렉토리에 만들어
+커넥션 풀 및 쿼리 실행 경로를 검증합니다.
+"""
+
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import alm_functions
+
+
+def build_sample_db(path):
+    """테스트용 ALM 샘플 데이터베이스 생성"""
+    conn = sqlite3.connect(path)
+    cur = conn.cursor()
+
+    cur.execute("""
+        CREATE TABLE ALM_INST (
+            BASE_DATE TEXT, REFERENCE_NO TEXT, CURRENCY_CD TEXT,
+            CUR_PAR_BAL REAL, CUR_RATE REAL, INT_RATE REAL,
+            DIM_PROD TEXT, DIM_ORG TEXT, DIM_ALM TEXT, ALM_DIMN_CD TEXT,
+            MATURITY_DATE TEXT
+        )
+    """)
+    rows = []
+    # 2020-05-31: R001~R006, 2020-06-30: R003~R009 (R001,R002 소멸 / R007~R009 신규)
+    snapshots = {
+        '2020-05-31 00:00:00': range(1, 7),
+        '2020-06-30 00:00:00': range(3, 10),
+    }
+    for base_date, refs in snapshots.items():
+        for i in refs:
+            rows.append((
+                base_date, f"R{i:03d}", ['KRW', 'USD', 'EUR'][i % 3],
+                1000.0 * i, 2.0 + i * 0.1, 2.0 + i * 0.1,
+                f"P{i % 2}", f"O{i % 3}", f"A{i % 2}", f"ALM{i % 2}",
+                f"202{i % 5 + 1}-06-30"
+            ))
+    cur.executemany("INSERT INTO ALM_INST VALUES (?,?,?,?,?,?,?,?,?,?,?)", rows)
+
+    cur.execute("""
+        CREATE TABLE NFAR_LIQ_GAP_310524 (
+            SCENARIO_NO INTEGER, TIME_BAND TEXT, GAP_PRN_TOTAL REAL, GAP_INT_TOTAL REAL
+        )
+    """)
+    gap_rows = []
+    for scenario in (1, 2, 3):
+        for band_idx, band in enumerate(['01_1M', '02_3M', '03_6M', '04_1Y']):
+            for k in range(2):
+                gap_rows.append((scenario, band, 100.0 * scenario + band_idx * 10 + k, 5.0 * scenario + k))
+    cur.executemany("INSERT INTO NFAR_LIQ_GAP_310524 VALUES (?,?,?,?)", gap_rows)
+
+    cur.execute("""
+        CREATE TABLE NFA_EXCH_RATE_HIST (
+            UNIT_CURRENCY_CD TEXT, EFFECTIVE_DATE TEXT, EXCH_RATE REAL
+        )
+    """)
+    fx_rows = []
+    for day in range(1, 31):
+        date = f"2020-06-{day:02d}"
+        fx_rows.append(('USD', date, 1200.0 + day))
+        fx_rows.append(('EUR', date, 1350.0 - day * 0.5))
+    cur.executemany("INSERT INTO NFA_EXCH_RATE_HIST VALUES (?,?,?)", fx_rows)
+
+    cur.execute("""
+        CREATE TABLE NFA_IRC_RATE_HIST (
+            INT_RATE_CD INTEGER, INT_RATE_TERM INTEGER, EFFECTIVE_DATE TEXT, INT_RATE REAL
+        )
+    """)
+    irc_rows = []
+    for day in range(1, 31):
+        date = f"2020-06-{day:02d}"
+        irc_rows.append((1, 3, date, 1.5 + day * 0.01))
+        irc_rows.append((1, 12, date, 1.8 + day * 0.01))
+    cur.executemany("INSERT INTO NFA_IRC_RATE_HIST VALUES (?,?,?,?)", irc_rows)
+
+    cur.execute("""
+        CREATE TABLE column_descriptions (
+            table_name TEXT, column_name TEXT, description TEXT
+        )
+    """)
+    cur.executemany("INSERT INTO column_descriptions VALUES (?,?,?)", [
+        ('ALM_INST', 'DIM_PROD', '차원-상품코드'),
+        ('INST_ALM_01', 'DIM_ORG', '차원-조직코드'),
+    ])
+
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def sample_db(tmp_path):
+    """샘플 DB로 공유 커넥션 풀을 재설정"""
+    db_path = str(tmp_path / 'sample.db')
+    build_sample_db(db_path)
+    original_path = alm_functions.DB_PATH
+    alm_functions.configure_db_pool(db_path)
+    yield db_path
+    alm_functions.close_db_pool()
+    alm_functions.DB_PATH = original_path
+
+
+def test_pool_reuses_connections(sample_db):
+    """같은 스레드의 연속 쿼리는 커넥션을 새로 만들지 않는다"""
+    for _ in range(5):
+        result = alm_functions.execute_sql_query("SELECT COUNT(*) AS cnt FROM ALM_INST")
+        assert result['success']
+        assert result['data'][0]['cnt'] == 13
+
+    stats = alm_functions.get_db_pool().stats()
+    assert stats['created'] == 1
+    assert stats['checkouts'] == 5
+
+
+def test_pool_is_read_only(sample_db):
+    """풀 커넥션으로는 쓰기가 불가능하다"""
+    result = alm_functions.execute_sql_query("DELETE FROM ALM_INST")
+    assert not result['success']
+
+    count = alm_functions.execute_sql_query("SELECT COUNT(*) AS cnt FROM ALM_INST")
+    assert count['data'][0]['cnt'] == 13
+
+
+def test_pool_bounded_under_concurrency(sample_db):
+    """동시 요청에서도 커넥션 수는 pool_size를 넘지 않는다"""
+    pool = alm_functions.configure_db_pool(sample_db, pool_size=2)
+    errors = []
+
+    def worker():
+        for _ in range(10):
+            result = alm_functions.execute_sql_query(
+                "SELECT CURRENCY_CD, SUM(CUR_PAR_BAL) AS bal FROM ALM_INST GROUP BY CURRENCY_CD"
+            )
+            if not result['success']:
+                errors.append(result['error'])
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert pool.stats()['open'] <= 2
+
+
+def test_nested_connection_reuses_thread_connection(sample_db):
+    """중첩 호출은 점유 중인 커넥션을 재사용한다"""
+    pool = alm_functions.get_db_pool()
+    with pool.connection() as outer:
+        with pool.connection() as inner:
+            assert outer is inner
+    assert pool.stats()['open'] == 1
+
+
+def test_schema_info_is_lazy_and_cached(sample_db, monkeypatch):
+    """스키마는 첫 호출 시 조회되고 캐시 파일로 재사용된다"""
+    tables = alm_functions.get_table_info(refresh=True)
+    assert 'ALM_INST' in tables
+    assert tables['ALM_INST'][:2] == ['BASE_DATE', 'REFERENCE_NO']
+
+    # 메모리 캐시를 비워도 캐시 파일에서 복원되어 DB를 조회하지 않는다
+    monkeypatch.setattr(alm_functions, '_schema_cache', None)
+
+    def fail_introspect():
+        raise AssertionError("스키마 캐시 파일을 사용해야 합니다")
+
+    monkeypatch.setattr(alm_functions, '_introspect_schema', fail_introspect)
+    assert alm_functions.get_table_info() == tables
+
+    # 파일이 그대로면 스키마 서명 조회에 풀 커넥션을 빌리지 않는다
+    pool = alm_functions.get_db_pool()
+    checkouts = pool.stats()['checkouts']
+    assert alm_functions.get_table_info() == tables
+    assert pool.stats()['checkouts'] == checkouts
+
+    # 다른 커넥션이 만든 테이블은 WAL 체크포인트 전에도 보인다
+    monkeypatch.undo()
+    conn = sqlite3.connect(sample_db)
+    conn.execute("PRAGMA wal_autocheckpoint = 0")
+    conn.execute("CREATE TABLE NEW_TABLE (ID INTEGER)")
+    conn.commit()
+    assert alm_functions.get_table_info()['NEW_TABLE'] == ['ID']
+    conn.close()
+
+
+def test_business_functions_use_registered_queries(sample_db):
+    """비즈니스 함수는 바인딩 파라미터 쿼리를 사용하고 실행 통계가 기록된다"""
+    alm_functions.reset_query_stats()
+
+    assert '유동성 갭 분석 결과' in alm_functions.analyze_liquidity_gap(1)
+    assert 'USD 환율 정보' in alm_functions.get_exchange_rate('USD', '2020-06-15')
+    assert '금리 정보' in alm_functions.get_interest_rate(1, 3)
+
+    # 값에 따옴표가 포함되어도 SQL이 깨지지 않는다
+    assert '검색 결과: 0건' in alm_functions.search_alm_contracts({'CURRENCY_CD': "KRW' OR '1'='1"})
+    assert '오류 발생' in alm_functions.search_alm_contracts({'NO_SUCH_COLUMN': 'x'})
+
+    stats = alm_functions.get_query_stats()
+    assert stats['liquidity_gap_by_scenario']['count'] == 1
+    assert stats['exchange_rate_on_date']['count'] == 1
+    assert stats['interest_rate_by_term']['count'] == 1
+    assert stats['search_contracts']['count'] == 1
+    assert sum(stats['liquidity_gap_by_scenario']['histogram'].values()) == 1
+
+
+def test_position_growth_and_decrease(sample_db):
+    """신규/소멸 포지션 분석 결과 검증"""
+    growth = alm_functions.analyze_new_position_growth('2020-06-30')
+    assert growth['previous_date'].startswith('2020-05-31')
+    assert growth['new_contracts']['count'] == 3
+    assert growth['new_contracts']['total_balance'] == 24000.0
+    by_product = {row['차원값']: row for row in growth['dimensional_breakdown']['by_product']}
+    assert by_product['P1']['신규건수'] == 2
+    assert by_product['P1']['신규잔액'] == 16000.0
+
+    expired = alm_functions.analyze_expired_position_decrease('2020-06-30', '2020-05-31')
+    assert expired['expired_contracts']['count'] == 2
+    assert expired['expired_contracts']['total_balance'] == 3000.0
+    assert len(expired['expired_contracts']['contracts']) == 2
+    assert expired['dimensional_breakdown']['by_alm'][0]['소멸잔액'] == 2000.0
+
+
+def test_report_and_trends(sample_db):
+    """리포트 섹션 및 추세 분석 결과 검증"""
+    report = alm_functions.generate_comprehensive_report(scenario_no=2)
+    assert list(report['sections']) == ['data_overview', 'liquidity_gap', 'market_data', 'dimensional_analysis']
+    assert len(report['sections']['liquidity_gap']['data']) == 4
+
+    comparison = alm_functions.compare_scenarios([1, 2])
+    assert comparison['comparison_data']['scenario_1']['total_gap'] == 968.0
+
+    trends = alm_functions.analyze_trends('exchange_rate', 'USD', '2020-06-10', '2020-06-19')
+    assert trends['statistics']['count'] == 10
+    assert trends['trend'] == '상승 추세'
+
+    rate_trends = alm_functions.analyze_trends('interest_rate', '1')
+    assert rate_trends['statistics']['count'] == 60
+
+
+def test_result_cache_hits_and_invalidation(sample_db):
+    """동일 쿼리는 캐시에서 반환되고, 데이터가 바뀌면 무효화된다"""
+    alm_functions.configure_result_cache()
+    alm_functions.reset_query_stats()
+
+    first = alm_functions.analyze_liquidity_gap(1)
+    assert alm_functions.analyze_liquidity_gap(1) == first
+
+    stats = alm_functions.get_result_cache_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert alm_functions.get_query_stats()['liquidity_gap_by_scenario']['count'] == 1
+
+    # 정규화: 공백만 다른 쿼리는 같은 캐시 항목을 사용한다
+    alm_functions.execute_sql_query("SELECT COUNT(*) AS cnt FROM ALM_INST")
+    result = alm_functions.execute_sql_query("SELECT  COUNT(*) AS cnt\n FROM ALM_INST")
+    assert result['data'][0]['cnt'] == 13
+    assert alm_functions.get_result_cache_stats()['hits'] == 2
+
+    # 외부 커넥션에서 데이터 변경 → 다음 조회는 새 결과
+    conn = sqlite3.connect(sample_db)
+    conn.execute("DELETE FROM ALM_INST WHERE REFERENCE_NO = 'R009'")
+    conn.commit()
+    conn.close()
+
+    result = alm_functions.execute_sql_query("SELECT COUNT(*) AS cnt FROM ALM_INST")
+    assert result['data'][0]['cnt'] == 12
+    assert alm_functions.get_result_cache_stats()['invalidations'] > 0
+
+
+def test_result_cache_eviction(sample_db):
+    """메모리 상한을 넘으면 오래된 항목부터 제거된다"""
+    alm_functions.configure_result_cache(max_bytes=1200)
+
+    for day in range(1, 11):
+        alm_functions.get_exchange_rate('USD', f"2020-06-{day:02d}")
+
+    stats = alm_functions.get_result_cache_stats()
+    assert stats['evictions'] > 0
+    assert stats['bytes'] <= 1200
+    alm_functions.configure_result_cache()
+
+
+def test_stream_sql_query_batches(sample_db):
+    """스트리밍 조회는 배치 단위로 행을 반환하고 커넥션을 반납한다"""
+    query = "SELECT REFERENCE_NO, CUR_PAR_BAL FROM ALM_INST ORDER BY BASE_DATE, REFERENCE_NO"
+    with alm_functions.stream_sql_query(query, batch_size=4) as stream:
+        assert stream.columns == ['REFERENCE_NO', 'CUR_PAR_BAL']
+        batches = list(stream)
+
+    assert [len(batch) for batch in batches] == [4, 4, 4, 1]
+    assert stream.row_count == 13
+    assert alm_functions.get_db_pool().stats()['idle'] == 1
+
+    with alm_functions.stream_sql_query(query, batch_size=5) as stream:
+        total = sum(frame['CUR_PAR_BAL'].sum() for frame in stream.iter_dataframes())
+    assert total == 1000.0 * (sum(range(1, 7)) + sum(range(3, 10)))
+
+
+def test_query_result_views_are_lazy(sample_db):
+    """결과의 data/dataframe은 접근할 때 생성되며 기존 결과 형식과 같다"""
+    result = alm_functions.execute_sql_query(
+        "SELECT REFERENCE_NO, CUR_PAR_BAL, NULLIF(CUR_PAR_BAL, 3000.0) AS bal FROM ALM_INST",
+        use_cache=False
+    )
+    assert result['success'] and result['row_count'] == 13
+    assert result._data is None and result._dataframe is None
+
+    expected = result['dataframe'].to_dict('records')
+    data = result['data']
+    assert [row['REFERENCE_NO'] for row in data] == [row['REFERENCE_NO'] for row in expected]
+    assert sum(1 for row in data if row['bal'] != row['bal']) == 2  # NULL → NaN
+
+    limited = alm_functions.execute_sql_query("SELECT * FROM ALM_INST", max_rows=3)
+    assert limited['row_count'] == 3
+
+
+def test_position_delta_single_pass(sample_db):
+    """변동 엔진은 기준일 쌍마다 anti-join을 한 번만 실행하고 기존 집계와 일치한다"""
+    # 같은 기준일에 중복 REFERENCE_NO, 차원값 NULL 계약 추가
+    conn = sqlite3.connect(sample_db)
+    conn.execute("""INSERT INTO ALM_INST VALUES
+        ('2020-06-30 00:00:00', 'R008', 'USD', 500.0, 2.0, 2.0, 'P0', 'O2', 'A0', 'ALM0', '2022-06-30'),
+        ('2020-06-30 00:00:00', 'R010', 'KRW', 700.0, 2.0, 2.0, NULL, 'O1', 'A1', 'ALM1', '2022-06-30')""")
+    conn.commit()
+    conn.close()
+
+    alm_functions.reset_query_stats()
+    growth = alm_functions.analyze_new_position_growth('2020-06-30', '2020-05-31')
+    alm_functions.analyze_new_position_growth('2020-06-30', '2020-05-31', ['DIM_ORG'])
+    assert alm_functions.get_query_stats()['position_delta_contracts']['count'] == 1
+
+    assert growth['new_contracts']['count'] == 5
+    assert growth['new_contracts']['total_balance'] == 25200.0
+
+    # 기존 GROUP BY 쿼리와 동일한 결과
+    for dim, key in (('DIM_PROD', 'by_product'), ('DIM_ORG', 'by_org'), ('DIM_ALM', 'by_alm')):
+        expected = alm_functions.execute_sql_query(f"""
+            SELECT t1.{dim} as 차원값, COUNT(DISTINCT t1.REFERENCE_NO) as 건수, SUM(t1.CUR_PAR_BAL) as 잔액
+            FROM ALM_INST t1
+            LEFT JOIN ALM_INST t2
+                ON t1.REFERENCE_NO = t2.REFERENCE_NO AND t2.BASE_DATE LIKE '2020-05-31%'
+            WHERE t1.BASE_DATE LIKE '2020-06-30%' AND t2.REFERENCE_NO IS NULL AND t1.{dim} IS NOT NULL
+            GROUP BY t1.{dim}
+            ORDER BY 잔액 DESC
+        """)['data']
+        actual = [
+            {'차원값': row['차원값'], '건수': row['신규건수'], '잔액': row['신규잔액']}
+            for row in growth['dimensional_breakdown'][key]
+        ]
+        assert actual == expected
+
+
+def test_position_delta_index_incremental(sample_db):
+    """사전 계산 인덱스는 실시간 계산과 같고, 새 기준일 적재 시 최신 쌍만 다시 계산한다"""
+    built = alm_functions.build_position_delta_index(sample_db)
+    assert built['success'] and len(built['built']) == 1
+
+    for func in (alm_functions.analyze_new_position_growth, alm_functions.analyze_expired_position_decrease):
+        indexed = func('2020-06-30', engine='index')
+        assert 'error' not in indexed
+        assert indexed == func('2020-06-30', engine='sql')
+
+    assert alm_functions.verify_position_delta_index()['success']
+    assert alm_functions.build_position_delta_index(sample_db)['built'] == []
+
+    # 새 기준일 적재 → 새 쌍만 계산
+    conn = sqlite3.connect(sample_db)
+    conn.execute("""
+        INSERT INTO ALM_INST
+        SELECT '2020-07-31 00:00:00', REFERENCE_NO, CURRENCY_CD, CUR_PAR_BAL, CUR_RATE, INT_RATE,
+               DIM_PROD, DIM_ORG, DIM_ALM, ALM_DIMN_CD, MATURITY_DATE
+        FROM ALM_INST WHERE BASE_DATE = '2020-06-30 00:00:00' AND REFERENCE_NO != 'R005'
+    """)
+    conn.commit()
+    conn.close()
+
+    built = alm_functions.build_position_delta_index(sample_db)
+    assert built['built'] == [('2020-06-30 00:00:00', '2020-07-31 00:00:00')]
+    expired = alm_functions.analyze_expired_position_decrease('2020-07-31', engine='index')
+    assert expired['expired_contracts']['count'] == 1
+    assert alm_functions.verify_position_delta_index()['success']
+
+    # 제자리 UPDATE(건수/rowid 동일)도 해당 기준일이 포함된 쌍만 무효화
+    conn = sqlite3.connect(sample_db)
+    conn.execute("""
+        UPDATE ALM_INST SET CUR_PAR_BAL = CUR_PAR_BAL + 1000, DIM_PROD = 'P9'
+        WHERE BASE_DATE = '2020-05-31 00:00:00' AND REFERENCE_NO = 'R001'
+    """)
+    conn.commit()
+    conn.close()
+    assert 'error' in alm_functions.analyze_expired_position_decrease('2020-06-30', engine='index')
+    assert 'error' not in alm_functions.analyze_expired_position_decrease('2020-07-31', engine='index')
+    expired = alm_functions.analyze_expired_position_decrease('2020-06-30')
+    assert expired['expired_contracts']['total_balance'] == 4000.0
+    assert 'P9' in [row['차원값'] for row in expired['dimensional_breakdown']['by_product']]
+
+    built = alm_functions.build_position_delta_index(sample_db)
+    assert built['built'] == [('2020-05-31 00:00:00', '2020-06-30 00:00:00')]
+    assert alm_functions.analyze_expired_position_decrease('2020-06-30', engine='index') == expired
+    assert alm_functions.verify_position_delta_index()['success']
+
+    # 기존 스냅샷이 바뀌면 인덱스는 사용되지 않는다
+    conn = sqlite3.connect(sample_db)
+    conn.execute("DELETE FROM ALM_INST WHERE BASE_DATE = '2020-07-31 00:00:00' AND REFERENCE_NO = 'R009'")
+    conn.commit()
+    conn.close()
+    assert 'error' in alm_functions.analyze_expired_position_decrease('2020-07-31', engine='index')
+    assert alm_functions.analyze_expired_position_decrease('2020-07-31')['expired_contracts']['count'] == 2
+
+
+def test_position_delta_numpy_engine_matches_sql(sample_db):
+    """NumPy 엔진은 SQL 엔진과 같은 결과를 반환한다"""
+    conn = sqlite3.connect(sample_db)
+    conn.execute("""INSERT INTO ALM_INST VALUES
+        ('2020-06-30 00:00:00', 'R008', 'USD', 500.0, 2.0, 2.0, 'P0', 'O2', 'A0', 'ALM0', '2022-06-30'),
+        ('2020-06-30 00:00:00', 'R010', 'KRW', NULL, 2.0, 2.0, NULL, 'O1', 'A1', 'ALM1', '2022-06-30'),
+        ('2020-06-30 00:00:00', 'R000', 'KRW', 300.0, 2.0, 2.0, 'P1', NULL, 'A1', 'ALM1', '2022-06-30')""")
+    conn.commit()
+    conn.close()
+
+    for func in (alm_functions.analyze_new_position_growth, alm_functions.analyze_expired_position_decrease):
+        sql_result = func('2020-06-30', engine='sql')
+        numpy_result = func('2020-06-30', engine='numpy')
+        assert 'error' not in numpy_result
+        assert str(numpy_result) == str(sql_result)
+
+    assert 'error' in alm_functions.analyze_new_position_growth('2020-06-30', engine='bogus')
+
+    # 타입 없는 차원 컬럼에 정수 1과 문자열 '1'이 섞여 있으면 SQL GROUP BY처럼 다른 그룹
+    conn = sqlite3.connect(sample_db)
+    conn.executescript("""
+        CREATE TABLE ALM_INST_MIXED AS SELECT * FROM ALM_INST WHERE 0;
+        ALTER TABLE ALM_INST_MIXED DROP COLUMN DIM_PROD;
+        ALTER TABLE ALM_INST_MIXED ADD COLUMN DIM_PROD;
+        INSERT INTO ALM_INST_MIXED (BASE_DATE, REFERENCE_NO, CURRENCY_CD, CUR_PAR_BAL, DIM_ORG, DIM_ALM, DIM_PROD)
+            SELECT BASE_DATE, REFERENCE_NO, CURRENCY_CD, CUR_PAR_BAL, DIM_ORG, DIM_ALM, DIM_PROD FROM ALM_INST;
+        DROP TABLE ALM_INST;
+        ALTER TABLE ALM_INST_MIXED RENAME TO ALM_INST;
+        UPDATE ALM_INST SET DIM_PROD = 1 WHERE REFERENCE_NO IN ('R007', 'R009');
+        UPDATE ALM_INST SET DIM_PROD = '1' WHERE REFERENCE_NO = 'R008';
+    """)
+    conn.close()
+
+    sql_result = alm_functions.analyze_new_position_growth('2020-06-30', engine='sql')
+    numpy_result = alm_functions.analyze_new_position_growth('2020-06-30', engine='numpy')
+    assert str(numpy_result) == str(sql_result)
+    products = [row['차원값'] for row in numpy_result['dimensional_breakdown']['by_product']]
+    assert 1 in products and '1' in products
+
+
+def test_date_calendar_lookup_and_refresh(sample_db):
+    """기준일 캘린더는 캐시되어 재사용되고 데이터가 바뀌면 다시 조회된다"""
+    alm_functions.reset_query_stats()
+    calendar = alm_functions.get_base_date_calendar()
+    assert calendar.dates == ['2020-05-31 00:00:00', '2020-06-30 00:00:00']
+    assert calendar.previous('2020-06-30') == '2020-05-31 00:00:00'
+    assert calendar.previous('2020-05-31') is None
+    assert calendar.next('2020-06-01') == '2020-06-30 00:00:00'
+    assert calendar.nearest('2020-06-10') == '2020-05-31 00:00:00'
+    assert calendar.nearest('2020-06-20') == '2020-06-30 00:00:00'
+    assert '2020-06-30' in calendar
+
+    alm_functions.analyze_new_position_growth('2020-06-30')
+    alm_functions.analyze_expired_position_decrease('2020-06-30')
+    assert alm_functions.get_query_stats()['calendar_alm_inst']['count'] == 1
+
+    conn = sqlite3.connect(sample_db)
+    conn.execute("""
+        INSERT INTO ALM_INST (BASE_DATE, REFERENCE_NO, CUR_PAR_BAL)
+        VALUES ('2020-07-31 00:00:00', 'R001', 1.0)
+    """)
+    conn.commit()
+    conn.close()
+    assert alm_functions.get_base_date_calendar().last == '2020-07-31 00:00:00'
+
+
+def test_exchange_rate_falls_back_to_previous_date(sample_db):
+    """고시 환율이 없는 날짜는 직전 고시일 환율을 사용한다"""
+    conn = sqlite3.connect(sample_db)
+    conn.execute("DELETE FROM NFA_EXCH_RATE_HIST WHERE EFFECTIVE_DATE = '2020-06-14'")
+    conn.commit()
+    conn.close()
+
+    text = alm_functions.get_exchange_rate('USD', '2020-06-14')
+    assert '직전 고시일 2020-06-13' in text
+    assert '1213.0' in text
+
+    trends = alm_functions.analyze_trends('exchange_rate', 'USD', '2021-01-01', '2021-12-31')
+    assert trends['statistics'] == {}
+
+
+def test_report_sections_run_in_parallel_with_timeout(sample_db, monkeypatch):
+    """리포트 섹션은 병렬 실행되고, 제한 시간을 넘긴 섹션만 제외된다"""
+    release = threading.Event()
+    original = alm_functions.REPORT_SECTION_BUILDERS['market_data']
+
+    def slow_market_data(scenario_no):
+        release.wait(5)
+        return original(scenario_no)
+
+    monkeypatch.setitem(alm_functions.REPORT_SECTION_BUILDERS, 'market_data', slow_market_data)
+    monkeypatch.setattr(alm_functions, 'REPORT_SECTION_TIMEOUT', 0.5)
+
+    report = alm_functions.generate_comprehensive_report(scenario_no=1, use_cache=False)
+    release.set()
+
+    timings = report['metadata']['section_timings']
+    assert list(report['sections']) == ['data_overview', 'liquidity_gap', 'dimensional_analysis']
+    assert timings['market_data']['status'] == 'timeout'
+    assert timings['market_data']['elapsed_ms'] >= 500
+    assert all(timings[name]['status'] == 'ok' for name in report['sections'])
+    assert report['metadata']['total_elapsed_ms'] < 5000
+
+    # 제한 시간은 섹션별로 작업 스레드에서 시작한 시점부터 계산 (작업 스레드 대기 시간 제외)
+    def slow_section(builder):
+        def build(scenario_no):
+            time.sleep(0.3)
+            return builder(scenario_no)
+        return build
+
+    for name in ('data_overview', 'liquidity_gap', 'market_data', 'dimensional_analysis'):
+        monkeypatch.setitem(alm_functions.REPORT_SECTION_BUILDERS, name, slow_section(original if name == 'market_data' else alm_functions.REPORT_SECTION_BUILDERS[name]))
+    monkeypatch.setattr(alm_functions, 'REPORT_MAX_WORKERS', 1)
+    report = alm_functions.generate_comprehensive_report(scenario_no=1, use_cache=False)
+    timings = report['metadata']['section_timings']
+    assert list(report['sections']) == ['data_overview', 'liquidity_gap', 'market_data', 'dimensional_analysis']
+    assert all(300 <= timings[name]['elapsed_ms'] < 500 for name in report['sections'])
+    assert report['metadata']['total_elapsed_ms'] >= 1200
+
+
+def test_report_section_cache_recomputes_changed_sections(sample_db):
+    """scenario_no만 바꾸면 liquidity_gap 섹션만 다시 계산한다"""
+    alm_functions.clear_report_section_cache()
+
+    first = alm_functions.generate_comprehensive_report(scenario_no=1)
+    assert first['metadata']['section_cache']['cached_sections'] == []
+
+    second = alm_functions.generate_comprehensive_report(scenario_no=2)
+    cache = second['metadata']['section_cache']
+    assert cache['computed_sections'] == ['liquidity_gap']
+    assert cache['cached_sections'] == ['data_overview', 'market_data', 'dimensional_analysis']
+    assert second['metadata']['section_timings']['data_overview']['status'] == 'cached'
+    assert second['sections']['data_overview'] == first['sections']['data_overview']
+    assert second['sections']['liquidity_gap']['scenario_no'] == 2
+    assert cache['stats']['hits'] == 3
+
+    # 데이터가 바뀌면 모든 섹션을 다시 계산
+    conn = sqlite3.connect(sample_db)
+    conn.execute("DELETE FROM ALM_INST WHERE REFERENCE_NO = 'R009'")
+    conn.commit()
+    conn.close()
+    third = alm_functions.generate_comprehensive_report(['data_overview'], scenario_no=2)
+    assert third['metadata']['section_cache']['computed_sections'] == ['data_overview']
+
+
+def test_report_without_database_omits_failed_sections(tmp_path, monkeypatch):
+    """DB를 열 수 없어도 리포트/현금흐름은 예외 없이 반환된다 (실패한 섹션은 제외)"""
+    monkeypatch.setattr(alm_functions, 'DB_PATH', str(tmp_path / 'missing' / 'simple.db'))
+    alm_functions.clear_report_section_cache()
+
+    report = alm_functions.generate_comprehensive_report()
+    assert set(report) == {'title', 'generated_at', 'sections', 'metadata'}
+    assert 'data_overview' not in report['sections']
+    assert 'section_cache' not in report['metadata']
+
+    projection = alm_functions.project_cash_flows()
+    assert not projection['success'] and projection['error']
+
+
+def test_compare_scenarios_batched(sample_db):
+    """시나리오 비교는 배치 쿼리로 조회하고 기존 지표와 같은 값을 계산한다"""
+    conn = sqlite3.connect(sample_db)
+    conn.executemany(
+        "INSERT INTO NFAR_LIQ_GAP_310524 VALUES (?,?,?,?)",
+        [(scenario, '01_1M', float(scenario), 1.0) for scenario in range(10, 610)]
+    )
+    conn.commit()
+    conn.close()
+
+    alm_functions.reset_query_stats()
+    comparison = alm_functions.compare_scenarios([1, 2, 9999] + list(range(10, 610)))
+    assert alm_functions.get_query_stats()['scenario_gap_batch']['count'] == 2
+
+    scenario_1 = comparison['comparison_data']['scenario_1']
+    assert scenario_1['total_gap'] == 968.0
+    assert (scenario_1['max_gap'], scenario_1['min_gap'], scenario_1['avg_gap']) == (272.0, 212.0, 242.0)
+    assert [row['기간대'] for row in scenario_1['data']] == ['01_1M', '02_3M', '03_6M', '04_1Y']
+
+    missing = comparison['comparison_data']['scenario_9999']
+    assert missing['data'] == [] and missing['total_gap'] == 0
+    assert missing['max_gap'] != missing['max_gap']  # NaN
+
+    assert comparison['comparison_data']['scenario_609']['total_gap'] == 610.0
+    assert len(comparison['gap_matrix']['total_gap']) == 603
+    assert comparison['gap_matrix']['time_bands'] == ['01_1M', '02_3M', '03_6M', '04_1Y']
+
+
+def test_liquidity_gap_cube_freshness(sample_db):
+    """큐브가 최신이면 세 함수 모두 큐브를 읽고, 원본이 바뀌면 원본으로 돌아간다"""
+    raw_gap = alm_functions.analyze_liquidity_gap()
+    raw_gap_2 = alm_functions.analyze_liquidity_gap(2)
+    raw_report = alm_functions.generate_comprehensive_report(['liquidity_gap'], 2, use_cache=False)
+    raw_compare = alm_functions.compare_scenarios([1, 3])
+
+    assert not alm_functions.is_liquidity_gap_cube_fresh()
+    built = alm_functions.build_liquidity_gap_cube(sample_db)
+    assert built['success'] and built['built'] and built['rows'] == 12
+    assert not alm_functions.build_liquidity_gap_cube(sample_db)['built']
+    assert alm_functions.is_liquidity_gap_cube_fresh()
+
+    alm_functions.reset_query_stats()
+    assert alm_functions.analyze_liquidity_gap() == raw_gap
+    assert alm_functions.analyze_liquidity_gap(2) == raw_gap_2
+    report = alm_functions.generate_comprehensive_report(['liquidity_gap'], 2, use_cache=False)
+    assert report['sections'] == raw_report['sections']
+    compare = alm_functions.compare_scenarios([1, 3])
+    assert compare['comparison_data'] == raw_compare['comparison_data']
+
+    stats = alm_functions.get_query_stats()
+    assert {'cube_liquidity_gap', 'cube_liquidity_gap_by_scenario',
+            'cube_report_liquidity_gap_by_scenario', 'cube_scenario_gap_batch'} <= set(stats)
+
+    cumulative = alm_functions.execute_sql_query(
+        "SELECT CUM_GAP_TOTAL FROM NFAR_LIQ_GAP_CUBE WHERE SCENARIO_NO = 1 ORDER BY TIME_BAND"
+    )
+    assert cumulative['data'][-1]['CUM_GAP_TOTAL'] == 968.0
+
+    # 원본 제자리 UPDATE (건수/rowid 동일) → 트리거가 큐브를 무효화
+    conn = sqlite3.connect(sample_db)
+    conn.execute("UPDATE NFAR_LIQ_GAP_310524 SET GAP_PRN_TOTAL = GAP_PRN_TOTAL + 1000000")
+    conn.commit()
+    assert not alm_functions.is_liquidity_gap_cube_fresh()
+    assert alm_functions.analyze_liquidity_gap() != raw_gap
+    conn.execute("UPDATE NFAR_LIQ_GAP_310524 SET GAP_PRN_TOTAL = GAP_PRN_TOTAL - 1000000")
+    conn.commit()
+    assert not alm_functions.is_liquidity_gap_cube_fresh()
+    assert alm_functions.build_liquidity_gap_cube(sample_db)['built']
+    assert alm_functions.is_liquidity_gap_cube_fresh()
+
+    # 원본 적재 → 큐브는 최신이 아님
+    conn.execute("INSERT INTO NFAR_LIQ_GAP_310524 VALUES (1, '01_1M', 1000.0, 0.0)")
+    conn.commit()
+    conn.close()
+    assert not alm_functions.is_liquidity_gap_cube_fresh()
+    assert alm_functions.compare_scenarios([1])['comparison_data']['scenario_1']['total_gap'] == 1968.0
+
+
+def test_rate_shock_engine(sample_db, monkeypatch):
+    """금리 충격 엔진: 충격 방향별 부호, 청크 계산 일관성, 오류 처리"""
+    result = alm_functions.analyze_rate_shock(horizon_years=10.0)
+    assert result['base_date'] == '2020-06-30 00:00:00'
+    assert result['contract_count'] == 7
+    assert result['column_mapping']['balance'] == 'CUR_PAR_BAL'
+
+    by_name = {row['scenario']: row for row in result['results']}
+    assert by_name['parallel_up']['delta_eve'] < 0 < by_name['parallel_down']['delta_eve']
+    assert by_name['parallel_up']['delta_nii'] > 0
+    assert by_name['parallel_up']['delta_nii'] == pytest.approx(-by_name['parallel_down']['delta_nii'])
+
+    # 청크 크기와 무관하게 같은 결과
+    monkeypatch.setattr(alm_functions, 'RATE_SHOCK_CHUNK_SIZE', 2)
+    monkeypatch.setattr(alm_functions, '_rate_shock_book_cache', None)
+    chunked = alm_functions.analyze_rate_shock(horizon_years=10.0)
+    for row, expected in zip(chunked['results'], result['results']):
+        assert row['delta_eve'] == pytest.approx(expected['delta_eve'])
+        assert row['delta_nii'] == pytest.approx(expected['delta_nii'])
+
+    custom = alm_functions.analyze_rate_shock(['parallel:+200'], horizon_years=10.0)
+    assert custom['results'][0]['delta_eve'] == pytest.approx(by_name['parallel_up']['delta_eve'])
+
+    assert 'error' in alm_functions.analyze_rate_shock(['bogus'])
+    assert 'error' in alm_functions.analyze_rate_shock(base_date='1999-01-31')
+
+
+def test_monte_carlo_rate_scenarios(sample_db, monkeypatch):
+    """몬테카를로 금리 시나리오: 모형 추정, 작업자 수와 무관한 경로, 합성 시나리오 분포"""
+    conn = sqlite3.connect(sample_db)
+    rate = 3.0
+    noise = [0.03, -0.05, 0.04, -0.02, 0.01, -0.04, 0.05, -0.01, 0.02, -0.03]
+    for day in range(60):
+        rate = rate + 0.1 * (2.5 - rate) + noise[day % len(noise)]
+        date = f"2020-{day // 30 + 7:02d}-{day % 30 + 1:02d}"
+        conn.execute("INSERT INTO NFA_IRC_RATE_HIST VALUES (?,?,?,?)", (2, 3, date, rate))
+    conn.commit()
+    conn.close()
+
+    model = alm_functions.fit_short_rate_model(2)
+    assert model['success'] and model['observations'] == 60
+    assert model['kappa'] > 0 and model['sigma'] > 0
+    assert 2.0 < model['theta'] < 3.0
+
+    # 프로세스 풀(공유 메모리)과 단일 프로세스 결과가 같다
+    monkeypatch.setattr(alm_functions, 'MC_PATH_BATCH_SIZE', 100)
+    monkeypatch.setattr(alm_functions, 'MC_PARALLEL_MIN_PATHS', 1)
+    serial = alm_functions.simulate_short_rate_paths(model, 300, 6, seed=42, workers=1)
+    parallel = alm_functions.simulate_short_rate_paths(model, 300, 6, seed=42, workers=2)
+    alm_functions.shutdown_mc_pool()
+    assert parallel['workers'] == 2
+    assert serial['paths'].shape == (300, 7)
+    assert (serial['paths'] == parallel['paths']).all()
+    assert (serial['paths'][:, 0] == model['r0']).all()
+
+    # 합성 시나리오는 DB 시나리오와 함께 compare_scenarios로 비교된다
+    synthetic = alm_functions.build_rate_gap_scenarios(serial, base_scenario_no=1, as_records=True)
+    assert synthetic['band_years'] == pytest.approx([1 / 12, 0.25, 0.5, 1.0])
+    assert synthetic['total_gap'].shape == (300, 4)
+    comparison = alm_functions.compare_scenarios([1], synthetic_scenarios=synthetic['scenarios'])
+    assert len(comparison['scenarios']) == 301
+    assert comparison['distribution']['scenario_count'] == 301
+    totals = sorted(v['total_gap'] for v in comparison['comparison_data'].values())
+    assert comparison['distribution']['total_gap']['p99'] == pytest.approx(float(np.percentile(totals, 99)))
+    principal = [row['원금갭'] for row in comparison['comparison_data']['scenario_1']['data']]
+    assert [row['원금갭'] for row in next(iter(synthetic['scenarios'].values()))] == principal
+
+    result = alm_functions.simulate_rate_scenarios(2, n_paths=200, horizon_months=6, seed=1)
+    assert result['n_paths'] == 200
+    assert 'comparison' not in result
+    p = result['distribution']['total_gap']
+    assert p['p1'] <= p['p50'] <= p['p99']
+    # 배열로 계산한 분포는 경로별 레코드를 compare_scenarios로 비교한 분포와 같다
+    detailed = alm_functions.simulate_rate_scenarios(2, n_paths=200, horizon_months=6, seed=1, include_comparison=True)
+    expected = detailed['comparison']['distribution']
+    assert expected['scenario_count'] == result['distribution']['scenario_count']
+    assert expected['total_gap'] == pytest.approx(result['distribution']['total_gap'])
+    assert list(expected['by_time_band']) == list(result['distribution']['by_time_band'])
+    for band, percentiles in expected['by_time_band'].items():
+        assert percentiles == pytest.approx(result['distribution']['by_time_band'][band])
+
+    # 시작 금리가 0 근처/음수여도 이자갭 계수가 발산하거나 부호가 뒤집히지 않는다
+    for r0 in (1e-9, -0.5):
+        paths = np.array([[r0, r0 + 0.25], [r0, r0 - 0.25]])
+        flat = alm_functions.build_rate_gap_scenarios({'times': np.array([0.0, 1.0]), 'paths': paths}, 1)
+        base_interest = flat['interest_gap'][0] / 1.5
+        assert flat['interest_gap'][1] == pytest.approx(base_interest * 0.5)
+
+    assert 'error' in alm_functions.simulate_rate_scenarios(99)
+    assert 'error' in alm_functions.simulate_rate_scenarios(2, n_paths=0)
+
+
+def test_cash_flow_projection_custom_bands(sample_db, monkeypatch):
+    """계약 현금흐름 프로젝션: 청크 크기와 무관한 집계, 사용자 정의 기간대, 합계 보존"""
+    assert alm_functions.parse_time_bands('6M, 2Y') == [('01_6M', 6), ('02_2Y', 24), ('03_2Y+', 360)]
+    with pytest.raises(ValueError):
+        alm_functions.parse_time_bands('1Y,6M')
+    with pytest.raises(ValueError):
+        alm_functions.parse_time_bands('10D')
+
+    projection = alm_functions.project_cash_flows()
+    assert projection['base_date'] == '2020-06-30 00:00:00'
+    assert projection['contract_count'] == 7
+    # 원금은 잔액 합계와 같다 (R003~R009)
+    assert projection['principal'].sum() == pytest.approx(sum(1000.0 * i for i in range(3, 10)))
+
+    df = alm_functions.bucket_cash_flows(projection, '1Y,3Y')
+    assert list(df['TIME_BAND']) == ['01_1Y', '02_3Y', '03_3Y+']
+    assert df['총_원금갭'].sum() == pytest.approx(projection['principal'].sum())
+    assert df['총_이자갭'].sum() == pytest.approx(projection['interest'].sum())
+    assert df['건수'].sum() == 7
+
+    # 만기 2021-06-30 계약 (i % 5 == 0: R005) 은 12개월차 → 1Y 구간
+    assert df.loc[0, '총_원금갭'] == pytest.approx(5000.0)
+    # 이자: R005는 12개월 × 5000 × 2.5% / 12
+    assert df.loc[0, '총_이자갭'] >= 5000.0 * 0.025
+
+    monkeypatch.setattr(alm_functions, 'CASH_FLOW_CHUNK_SIZE', 2)
+    chunked = alm_functions.project_cash_flows(use_cache=False)
+    assert chunked['chunks'] == 4
+    assert (chunked['principal'] == projection['principal']).all()
+    assert chunked['interest'] == pytest.approx(projection['interest'])
+
+    text = alm_functions.analyze_liquidity_gap(time_bands='1Y,3Y')
+    assert '03_3Y+' in text and '총 3개 기간대' in text
+    assert alm_functions.analyze_liquidity_gap(time_bands='oops').startswith('오류 발생')
+
+
+def test_trend_series_store_incremental(sample_db):
+    """추세 통계 저장소: 누적합 통계가 전체 계산과 같고 새 일자만 증분 반영"""
+    alm_functions.clear_trend_series_store()
+    trends = alm_functions.analyze_trends('exchange_rate', 'EUR', '2020-06-05', '2020-06-24')
+    values = np.array([1350.0 - day * 0.5 for day in range(5, 25)])
+    stats = trends['statistics']
+    assert stats['count'] == 20
+    assert stats['mean'] == pytest.approx(values.mean())
+    assert stats['std'] == pytest.approx(values.std())
+    assert stats['slope'] == pytest.approx(np.polyfit(np.arange(20), values, 1)[0])
+    assert (stats['min'], stats['max']) == (values.min(), values.max())
+    assert trends['trend'] == '하락 추세'
+
+    series = alm_functions.get_trend_series('exchange_rate', 'EUR')
+    alm_functions.analyze_trends('exchange_rate', 'EUR')
+    assert (series.full_loads, series.incremental_loads) == (1, 0)
+
+    # 새 일자 추가 → 마지막 일자 이후 행만 반영
+    buffer = series._values
+    conn = sqlite3.connect(sample_db)
+    conn.execute("INSERT INTO NFA_EXCH_RATE_HIST VALUES ('EUR', '2020-07-01', 1400.0)")
+    conn.commit()
+    latest = alm_functions.analyze_trends('exchange_rate', 'EUR')
+    assert (series.full_loads, series.incremental_loads) == (1, 1)
+    assert latest['statistics']['count'] == 31
+    assert latest['statistics']['max'] == 1400.0
+    # 기존 이력은 복사하지 않고, 희소 테이블은 level마다 새 칸 1개만 계산
+    assert series._values is buffer
+    assert series.last_append_cells == len(series._min_table) - 1 == 4
+
+    # 과거 값 수정 → 전체 재적재
+    conn.execute("UPDATE NFA_EXCH_RATE_HIST SET EXCH_RATE = 1000.0 WHERE UNIT_CURRENCY_CD = 'EUR' AND EFFECTIVE_DATE = '2020-06-10'")
+    conn.commit()
+    conn.close()
+    updated = alm_functions.analyze_trends('exchange_rate', 'EUR')
+    assert series.full_loads == 2
+    assert updated['statistics']['min'] == 1000.0
+
+    # 일괄 조회: 이력이 있는 시계열은 증분 갱신, 처음 조회하는 시계열만 일괄 적재
+    conn = sqlite3.connect(sample_db)
+    conn.execute("INSERT INTO NFA_EXCH_RATE_HIST VALUES ('EUR', '2020-07-02', 1401.0)")
+    conn.commit()
+    conn.close()
+    eur, usd = alm_functions.get_trend_series_batch('exchange_rate', ['EUR', 'USD'])
+    assert eur is series
+    assert (eur.full_loads, eur.incremental_loads) == (2, 2)
+    assert eur.dates[-1].startswith('2020-07-02') and len(eur.dates) == 32
+    assert (usd.full_loads, usd.incremental_loads) == (1, 0)
+
+
+def test_trend_series_append_matches_full_load():
+    """추세 통계 저장소: 여러 번 나눠 추가한 결과가 전체 적재와 같음 (용량 확장 포함)"""
+    rng = np.random.default_rng(0)
+    values = rng.normal(100.0, 5.0, 200)
+    rows = [(f"2020-01-01+{i:03d}", v) for i, v in enumerate(values)]
+
+    full = alm_functions.TrendSeries('exchange_rate', 'USD')
+    full.load(rows, ('test',))
+    series = alm_functions.TrendSeries('exchange_rate', 'USD')
+    series.load(rows[:10], ('test',))
+    for lo in range(10, 200, 13):
+        series._append(rows[lo:lo + 13])
+        assert series.last_append_cells <= len(rows[lo:lo + 13]) * len(series._min_table)
+
+    assert series.values.tolist() == values.tolist()
+    for i, j in [(0, 200), (3, 4), (17, 150), (64, 129), (190, 200)]:
+        stats = series.statistics(i, j)
+        assert stats == pytest.approx(full.statistics(i, j), abs=1e-6)
+        assert (stats['min'], stats['max']) == (values[i:j].min(), values[i:j].max())
+
+
+def test_trend_rolling_and_resample(sample_db):
+    """추세 분석: 이동 통계, 주/월 리샘플링, 잘못된 옵션"""
+    trends = alm_functions.analyze_trends('exchange_rate', 'EUR', window=5, frequency=None)
+    rolling = trends['rolling']
+    assert len(rolling['points']) == 30
+    assert rolling['points'][3]['이동평균'] is None
+    assert rolling['latest']['이동평균'] == pytest.approx(np.mean([1350.0 - d * 0.5 for d in range(26, 31)]))
+    # EUR는 매일 하락 → 마지막 일자가 최대 낙폭
+    assert rolling['max_drawdown'] == pytest.approx(1335.0 / 1349.5 - 1)
+    assert rolling['max_drawdown_date'] == '2020-06-30'
+
+    weekly = alm_functions.analyze_trends('exchange_rate', 'USD', frequency='W')
+    assert sum(row['건수'] for row in weekly['resampled']) == 30
+    assert weekly['resampled'][-1]['값'] == 1230.0
+
+    monthly = alm_functions.analyze_trends('exchange_rate', 'USD', window=2, frequency='M')
+    assert [row['기간'] for row in monthly['resampled']] == ['2020-06']
+    assert monthly['rolling']['window'] == 2
+
+    assert 'error' in alm_functions.analyze_trends('exchange_rate', 'USD', frequency='Q')
+    assert 'error' in alm_functions.analyze_trends('exchange_rate', 'USD', window=1)
+
+
+def test_multi_series_trends_single_query(sample_db):
+    """다중 시계열 추세: 한 번의 일괄 조회, 단일 분석과 같은 통계, 상관계수"""
+    alm_functions.clear_trend_series_store()
+    alm_functions.reset_query_stats()
+
+    result = alm_functions.analyze_trends('exchange_rate', 'USD, EUR, XXX', '2020-06-01', '2020-06-20')
+    assert alm_functions.get_query_stats()['trend_exchange_rate_multi']['count'] == 1
+    assert result['series'] == ['USD', 'EUR']
+    assert result['missing'] == ['XXX']
+    assert [row['추세'] for row in result['comparison']] == ['상승 추세', '하락 추세']
+
+    single = alm_functions.analyze_trends('exchange_rate', 'EUR', '2020-06-01', '2020-06-20')
+    assert result['statistics']['EUR'] == pytest.approx(single['statistics'])
+    # 저장소를 공유하므로 단일 분석은 추가 조회 없음
+    assert 'trend_exchange_rate' not in alm_functions.get_query_stats()
+
+    assert result['correlation']['USD']['USD'] == pytest.approx(1.0)
+    assert result['correlation']['USD']['EUR'] == pytest.approx(result['correlation']['EUR']['USD'])
+    assert -1.0 <= result['correlation']['USD']['EUR'] <= 1.0
+    assert len(result['data_points']) == 20
+    assert result['data_points'][0] == {'일자': '2020-06-01', 'USD': 1201.0, 'EUR': 1349.5}
+
+    rates = alm_functions.analyze_trends('interest_rate', [1, '1', 7])
+    assert rates['series'] == [1] and rates['missing'] == [7]
+    assert 'error' in alm_functions.analyze_trends('exchange_rate', 'USD,EUR', window=5)
+
+
+def test_fx_as_of_conversion(sample_db):
+    """환율 as-of 조인: 직전 고시 환율, 원화 환산 합계, 환율 없는 기준일"""
+    fx = alm_functions.get_fx_table()
+    rates, effective = fx.rates_as_of(
+        ['USD', 'USD', 'EUR', 'KRW', 'USD', 'JPY'],
+        ['2020-06-15 00:00:00', '2020-07-31', '2020-06-01', '2020-06-30', '2020-05-31', '2020-06-30']
+    )
+    assert rates[:4].tolist() == [1215.0, 1230.0, 1349.5, 1.0]
+    assert effective[1] == '2020-06-30'
+    assert np.isnan(rates[4]) and np.isnan(rates[5])
+    assert fx.on('2020-06-10')['EUR'] == (1345.0, '2020-06-10')
+    assert fx.on('2020-06-10') is fx.on('2020-06-10 00:00:00')
+
+    # 2020-05-31 기준일은 직전 환율이 없음 → USD/EUR 환산 불가, KRW만 합산
+    conn = sqlite3.connect(sample_db)
+    conn.execute("INSERT INTO NFA_EXCH_RATE_HIST VALUES ('USD', '2020-05-29', 1100.0)")
+    conn.execute("INSERT INTO NFA_EXCH_RATE_HIST VALUES ('EUR', '2020-05-29', 1300.0)")
+    conn.commit()
+    conn.close()
+
+    summary = alm_functions.get_krw_balance_summary()
+    by_currency = {row['통화']: row for row in summary['by_currency']}
+    # USD: 2020-05-31 R001,R004 (5000) × 1100 + 2020-06-30 R004,R007 (11000) × 1230
+    assert by_currency['USD']['원화환산잔액'] == pytest.approx(5000 * 1100 + 11000 * 1230)
+    assert by_currency['KRW']['원화환산잔액'] == by_currency['KRW']['잔액']
+    assert summary['missing'] == []
+    assert summary['total'] == pytest.approx(sum(row['원화환산잔액'] for row in summary['by_currency']))
+
+    section = alm_functions._build_data_overview_section(None)
+    assert section['krw_equivalent']['total'] == pytest.approx(summary['total'])
+    assert '원화 환산 총잔액' in section['summary']
+
+    text = alm_functions.get_aggregate_stats('ALM_INST', 'DIM_PROD', 'CUR_PAR_BAL', krw_equivalent=True)
+    assert '원화환산_합계' in text
+    assert alm_functions.get_aggregate_stats(
+        'NFA_EXCH_RATE_HIST', 'UNIT_CURRENCY_CD', 'EXCH_RATE', krw_equivalent=True
+    ).startswith('오류 발생')
+
+
+def test_column_descriptions_preloaded_once(sample_db, monkeypatch):
+    """컬럼 설명: 전체 1회 적재, 읽기 전용 공유, 캐시 파일 재사용, 데이터 변경 시 재적재"""
+    monkeypatch.setattr(alm_functions, '_column_descriptions', None)
+    alm_functions.reset_query_stats()
+
+    labels = [alm_functions.get_column_label(c) for c in ('DIM_PROD', 'DIM_ORG', 'DIM_ALM', 'DIM_PROD')]
+    assert labels == ['DIM_PROD (차원-상품코드)', 'DIM_ORG (차원-조직코드)', 'DIM_ALM', 'DIM_PROD (차원-상품코드)']
+    assert alm_functions.get_query_stats()['column_descriptions_all']['count'] == 1
+
+    descriptions = alm_functions.get_column_descriptions()
+    with pytest.raises(TypeError):
+        descriptions[('ALM_INST', 'DIM_ALM')] = 'x'
+
+    # 다른 프로세스 (메모리 캐시 없음) → 캐시 파일 사용, DB 조회 없음
+    monkeypatch.setattr(alm_functions, '_column_descriptions', None)
+    alm_functions.reset_query_stats()
+    assert alm_functions.get_column_description('INST_ALM_01', 'DIM_ORG') == '차원-조직코드'
+    assert 'column_descriptions_all' not in alm_functions.get_query_stats()
+
+    conn = sqlite3.connect(sample_db)
+    conn.execute("INSERT INTO column_descriptions VALUES ('ALM_INST', 'DIM_ALM', '차원-ALM')")
+    conn.commit()
+    conn.close()
+    assert alm_functions.get_column_label('DIM_ALM') == 'DIM_ALM (차원-ALM)'
+    assert alm_functions.get_query_stats()['column_descriptions_all']['count'] == 1
@@ -0,0 +1,294 @@
+"""
+SupervisorAgent 에이전트 실행 테스트
+
+의존성 기반 wave 계산, 병렬 실행, 에이전트별 제한 시간,
+빠른 라우터(LLM 호출 생략)를 검증합니다.
+"""
+
+import asyncio
+import threading
+import time
+
+from multi_agent import supervisor as supervisor_module
+from multi_agent.state import ALL_AGENTS
+from multi_agent.supervisor import SupervisorAgent, plan_agent_waves
+
+
+class FakeAgent:
+    """호출 시점과 전달된 컨텍스트를 기록하는 가짜 에이전트"""
+
+    def __init__(self, name, barrier=None, delay=0.0):
+        self.name = name
+        self.barrier = barrier
+        self.delay = delay
+        self.context = None
+
+    def run(self, task, context=None):
+        self.context = context
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        time.sleep(self.delay)
+        return {'success': True, 'result': f"{self.name} 결과", 'error': None}
+
+    async def arun(self, task, context=None):
+        self.context = context
+        if self.barrier is not None:
+            # 같은 이벤트 루프에서 동시에 실행되지 않으면 시간 초과
+            self.barrier.append(self.name)
+            while len(self.barrier) < 2:
+                await asyncio.sleep(0.001)
+        await asyncio.sleep(self.delay)
+        return {'success': True, 'result': f"{self.name} 결과", 'error': None}
+
+
+def make_supervisor(**agents):
+    all_agents = {name: FakeAgent(name) for name in ALL_AGENTS}
+    all_agents.update(agents)
+    return SupervisorAgent(llm=None, agents=all_agents, use_fast_router=False)
+
+
+def test_plan_agent_waves_respects_dependencies():
+    assert plan_agent_waves(['market_agent', 'analysis_agent']) == [['market_agent', 'analysis_agent']]
+    assert plan_agent_waves(['export_agent', 'market_agent', 'report_agent']) == [
+        ['market_agent', 'report_agent'], ['export_agent']
+    ]
+    # 선행 에이전트가 선택되지 않았으면 의존성 무시
+    assert plan_agent_waves(['export_agent']) == [['export_agent']]
+    assert plan_agent_waves(['market_agent', 'analysis_agent'], parallel=False) == [
+        ['market_agent'], ['analysis_agent']
+    ]
+
+
+def test_execute_agents_runs_independent_agents_concurrently():
+    # 두 에이전트가 동시에 실행되지 않으면 barrier에서 실패
+    barrier = threading.Barrier(2)
+    supervisor = make_supervisor(
+        market_agent=FakeAgent('market_agent', barrier),
+        report_agent=FakeAgent('report_agent', barrier),
+    )
+
+    results = supervisor.execute_agents('질문', {
+        'agents': ['market_agent', 'report_agent', 'export_agent'],
+        'parallel': True
+    })
+
+    assert list(results) == ['market_agent', 'report_agent', 'export_agent']
+    assert all(result['success'] for result in results.values())
+    # export_agent는 report_agent 결과를 컨텍스트로 받음
+    assert set(supervisor.agents['export_agent'].context) == {'market_agent', 'report_agent'}
+    assert supervisor.agents['market_agent'].context is None
+
+
+def test_execute_agents_timeout(monkeypatch):
+    monkeypatch.setattr(supervisor_module, 'AGENT_TIMEOUT', 0.05)
+    supervisor = make_supervisor(analysis_agent=FakeAgent('analysis_agent', delay=0.5))
+
+    results = supervisor.execute_agents('질문', {
+        'agents': ['market_agent', 'analysis_agent'],
+        'parallel': True
+    })
+
+    assert results['market_agent']['success']
+    assert not results['analysis_agent']['success']
+    assert '제한 시간' in results['analysis_agent']['error']
+
+
+def test_execute_agents_timeout_counts_from_agent_start(monkeypatch):
+    # 슬롯을 기다린 시간은 제한 시간에 포함되지 않음 (동기/비동기 경로 동일)
+    monkeypatch.setattr(supervisor_module, 'AGENT_MAX_CONCURRENCY', 1)
+    monkeypatch.setattr(supervisor_module, 'AGENT_TIMEOUT', 0.3)
+    routing = {'agents': ['market_agent', 'analysis_agent'], 'parallel': True}
+
+    runners = {
+        'sync': lambda supervisor: supervisor.execute_agents('질문', routing),
+        'async': lambda supervisor: asyncio.run(supervisor.aexecute_agents('질문', routing)),
+    }
+
+    for mode, execute in runners.items():
+        supervisor = make_supervisor(
+            market_agent=FakeAgent('market_agent', delay=0.2),
+            analysis_agent=FakeAgent('analysis_agent', delay=0.2),
+        )
+        results = execute(supervisor)
+        assert all(result['success'] for result in results.values()), mode
+
+    # 비동기 경로는 제한 시간을 넘긴 에이전트를 취소하고 슬롯을 다음 에이전트에 넘김
+    supervisor.agents['market_agent'].delay = 1.0
+    start = time.perf_counter()
+    results = asyncio.run(supervisor.aexecute_agents('질문', routing))
+    assert not results['market_agent']['success']
+    assert results['analysis_agent']['success']
+    assert time.perf_counter() - start < 0.9
+
+
+class CountingAgent(FakeAgent):
+    """동시에 실행 중인 run() 호출 수의 최댓값을 기록하는 가짜 에이전트"""
+
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def run(self, task, context=None):
+        with CountingAgent.lock:
+            CountingAgent.running += 1
+            CountingAgent.peak = max(CountingAgent.peak, CountingAgent.running)
+        try:
+            return super().run(task, context)
+        finally:
+            with CountingAgent.lock:
+                CountingAgent.running -= 1
+
+
+def test_execute_agents_timed_out_agent_keeps_its_slot(monkeypatch):
+    # 제한 시간을 넘겨도 스레드가 끝날 때까지 슬롯을 점유하므로 실제 동시 실행 수는 상한을 넘지 않음
+    monkeypatch.setattr(supervisor_module, 'AGENT_MAX_CONCURRENCY', 1)
+    monkeypatch.setattr(supervisor_module, 'AGENT_TIMEOUT', 0.1)
+    monkeypatch.setattr(CountingAgent, 'peak', 0)
+    supervisor = make_supervisor(
+        market_agent=CountingAgent('market_agent', delay=0.4),
+        analysis_agent=CountingAgent('analysis_agent'),
+    )
+    routing = {'agents': ['market_agent', 'analysis_agent'], 'parallel': True}
+
+    start = time.perf_counter()
+    results = supervisor.execute_agents('질문', routing)
+    assert time.perf_counter() - start < 0.35
+    assert '제한 시간' in results['market_agent']['error']
+    # market_agent가 슬롯을 점유한 채 AGENT_TIMEOUT이 지나 analysis_agent는 시작하지 못함
+    assert '실행 슬롯' in results['analysis_agent']['error']
+    assert supervisor.agents['analysis_agent'].context is None
+
+    # 멈춘 호출이 끝나면 슬롯이 반환되어 다음 호출은 정상 실행
+    time.sleep(0.4)
+    supervisor.agents['market_agent'].delay = 0.0
+    results = supervisor.execute_agents('질문', routing)
+    assert all(result['success'] for result in results.values())
+    assert CountingAgent.peak == 1
+
+
+def test_sequential_execution_has_no_timeout(monkeypatch):
+    # parallel: False는 기존 순차 실행과 같이 제한 시간 없이 끝까지 기다림
+    monkeypatch.setattr(supervisor_module, 'AGENT_TIMEOUT', 0.05)
+    routing = {'agents': ['market_agent', 'analysis_agent'], 'parallel': False}
+
+    supervisor = make_supervisor(analysis_agent=FakeAgent('analysis_agent', delay=0.2))
+    results = supervisor.execute_agents('질문', routing)
+    assert all(result['success'] for result in results.values())
+    assert set(supervisor.agents['analysis_agent'].context) == {'market_agent'}
+
+    results = asyncio.run(supervisor.aexecute_agents('질문', routing))
+    assert all(result['success'] for result in results.values())
+
+
+class RoutingLLM:
+    """고정된 라우팅 결정을 반환하고 호출 횟수를 기록하는 가짜 LLM"""
+
+    def __init__(self, decision):
+        self.decision = decision
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+
+        class Response:
+            content = self.decision
+
+        return Response()
+
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
+
+def test_workflow_routes_once_and_fans_out():
+    from multi_agent.workflow import create_workflow, run_workflow
+
+    barrier = threading.Barrier(2)
+    supervisor = make_supervisor(
+        market_agent=FakeAgent('market_agent', barrier),
+        report_agent=FakeAgent('report_agent', barrier),
+    )
+    supervisor.llm = RoutingLLM(
+        '{"agents": ["market_agent", "report_agent", "export_agent"], "parallel": true, "reasoning": "테스트"}'
+    )
+
+    workflow = create_workflow(supervisor, supervisor.agents)
+    final_state = run_workflow(workflow, '질문')
+
+    # 라우팅 1회 + 결과 통합 1회
+    assert supervisor.llm.calls == 2
+    assert final_state['agent_plan'] == [['market_agent', 'report_agent'], ['export_agent']]
+    assert set(final_state['agent_results']) == {'market_agent', 'report_agent', 'export_agent'}
+    assert set(supervisor.agents['export_agent'].context) == {'market_agent', 'report_agent'}
+    assert final_state['current_agent'] == 'combiner'
+    assert final_state['errors'] == []
+
+
+def test_async_workflow_and_supervisor():
+    from multi_agent.workflow import create_workflow, arun_workflow
+
+    decision = '{"agents": ["market_agent", "report_agent", "export_agent"], "parallel": true, "reasoning": "테스트"}'
+
+    def make():
+        barrier = []
+        supervisor = make_supervisor(
+            market_agent=FakeAgent('market_agent', barrier),
+            report_agent=FakeAgent('report_agent', barrier),
+        )
+        supervisor.llm = RoutingLLM(decision)
+        return supervisor
+
+    async def main():
+        supervisor = make()
+        workflow = create_workflow(supervisor, supervisor.agents)
+        # 여러 세션을 한 이벤트 루프에서 동시에 처리
+        states = await asyncio.wait_for(
+            asyncio.gather(*(arun_workflow(workflow, f"질문 {i}") for i in range(3))),
+            timeout=5
+        )
+        direct = await asyncio.wait_for(make().arun('질문'), timeout=5)
+        return supervisor, states, direct
+
+    supervisor, states, direct = asyncio.run(main())
+
+
+    for state in states:
+        assert set(state['agent_results']) == {'market_agent', 'report_agent', 'export_agent'}
+        assert state['current_agent'] == 'combiner'
+    assert set(supervisor.agents['export_agent'].context) == {'market_agent', 'report_agent'}
+    # 가짜 LLM은 통합 요청에도 같은 내용을 반환
+    assert direct == decision
+
+
+def test_fast_router_rules_and_fallback():
+    from multi_agent.fast_router import FastRouter, load_training_examples, match_rules
+
+    assert match_rules('유동성 갭 리포트를 만들어줘') == ['report_agent']
+    assert match_rules('포지션 증감과 유동성 갭을 모두 분석하고 종합 리포트를 Markdown으로 내보내줘') == [
+        'position_agent', 'analysis_agent', 'report_agent', 'export_agent'
+    ]
+    assert match_rules('금리 변동에 따른 시나리오를 비교해줘') == ['analysis_agent']
+
+    router = FastRouter().fit(load_training_examples())
+    decision = router.route('USD 환율 알려줘')
+    assert decision['agents'] == ['market_agent']
+    assert decision['source'] == 'fast_router'
+    assert router.route('오늘 점심 메뉴 추천해줘') is None
+
+    # 빠른 라우팅이면 LLM 호출 없음, 신뢰도가 낮으면 LLM 라우터로 폴백
+    supervisor = make_supervisor()
+    supervisor.fast_router = router
+    supervisor.llm = RoutingLLM('{"agents": ["search_agent"], "parallel": false, "reasoning": "테스트"}')
+
+    assert supervisor.route('USD 환율 알려줘')['agents'] == ['market_agent']
+    assert supervisor.llm.calls == 0
+    assert supervisor.route('오늘 점심 메뉴 추천해줘')['source'] == 'llm'
+    assert supervisor.llm.calls == 1
+
+
+def test_fast_router_untrained_uses_rules_only():
+    from multi_agent.fast_router import FastRouter
+
+    router = FastRouter()
+    assert not router.is_trained
+    assert router.route('USD 환율 알려줘')['agents'] == ['market_agent']
+    assert router.route('오늘 점심 메뉴 추천해줘') is None
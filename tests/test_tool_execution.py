@@ -0,0 +1,142 @@
+"""
+tool_execution 테스트
+
+한 턴의 tool_calls가 모두 실행되고, 읽기 전용 도구는 동시에,
+그 외 도구는 순서 경계로 단독 실행되는지 검증합니다.
+"""
+
+import asyncio
+import threading
+
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import StructuredTool
+
+import tool_execution
+
+
+def make_tools(barrier, events):
+    """동시 실행 여부를 barrier로 확인하는 가짜 도구"""
+    def read(code: str) -> str:
+        barrier.wait(timeout=5)
+        events.append(('read', code))
+        return f"read {code}"
+
+    def export(code: str) -> str:
+        events.append(('export', code))
+        return f"export {code}"
+
+    return {
+        'read': StructuredTool.from_function(
+            func=read, name='read', description='읽기', metadata={'read_only': True}
+        ),
+        'export': StructuredTool.from_function(func=export, name='export', description='내보내기'),
+    }
+
+
+def test_all_tool_calls_executed_in_order_with_concurrency():
+    barrier = threading.Barrier(2)
+    events = []
+    tools = make_tools(barrier, events)
+
+    def execute(name, args):
+        return tools[name].invoke(args)
+
+    tool_calls = tool_execution.normalize_tool_calls([
+        {'name': 'read', 'args': {'code': 'USD'}, 'id': None},
+        {'name': 'read', 'args': {'code': 'EUR'}, 'id': 'given'},
+        {'name': 'export', 'args': {'code': 'pdf'}, 'id': None},
+    ], prefix='t')
+
+    assert [c['id'] for c in tool_calls] == ['t_0', 'given', 't_2']
+
+    # 두 read가 동시에 실행되지 않으면 barrier에서 BrokenBarrierError 발생
+    results = tool_execution.execute_tool_calls(tool_calls, execute, tools)
+
+    assert [obs for _, obs in results] == ['read USD', 'read EUR', 'export pdf']
+    assert events[-1] == ('export', 'pdf')
+
+    messages = tool_execution.to_tool_messages(results)
+    assert all(isinstance(m, ToolMessage) for m in messages)
+    assert [m.tool_call_id for m in messages] == ['t_0', 'given', 't_2']
+
+
+def test_plan_batches_splits_on_non_read_only_tools():
+    tools = make_tools(threading.Barrier(1), [])
+    names = ['read', 'read', 'export', 'read', 'unknown', 'read', 'read']
+    tool_calls = [{'name': name, 'args': {}} for name in names]
+
+    assert tool_execution._plan_batches(tools, tool_calls) == [[0, 1], [2], [3], [4], [5, 6]]
+
+
+def test_async_execution_matches_sync():
+    barrier = threading.Barrier(2)
+    events = []
+    tools = make_tools(barrier, events)
+
+    def execute(name, args):
+        return tools[name].invoke(args)
+
+    tool_calls = tool_execution.normalize_tool_calls([
+        {'name': 'read', 'args': {'code': 'USD'}},
+        {'name': 'read', 'args': {'code': 'EUR'}},
+        {'name': 'export', 'args': {'code': 'pdf'}},
+    ])
+
+    results = asyncio.run(tool_execution.aexecute_tool_calls(tool_calls, execute, tools))
+
+    assert [obs for _, obs in results] == ['read USD', 'read EUR', 'export pdf']
+    assert events[-1] == ('export', 'pdf')
+
+
+class ScriptedLLM:
+    """도구 호출 1턴 후 최종 답변을 반환하고 받은 메시지를 기록하는 가짜 LLM"""
+
+    def __init__(self):
+        self.received = []
+
+    def bind_tools(self, tools):
+        return self
+
+    def invoke(self, messages):
+        from langchain_core.messages import AIMessage
+
+        self.received.append(list(messages))
+        if len(self.received) == 1:
+            return AIMessage(content='', tool_calls=[
+                {'name': 'read', 'args': {'code': 'USD'}, 'id': None},
+                {'name': 'read', 'args': {'code': 'EUR'}, 'id': None},
+            ])
+        return AIMessage(content='완료')
+
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
+
+def test_agent_run_and_arun_follow_same_loop():
+    from agent import ALMAgent
+    from multi_agent.base import BaseAgent
+
+    class ReadAgent(BaseAgent):
+        def get_system_prompt(self):
+            return '테스트'
+
+    def run_both(make_agent):
+        transcripts = []
+        for use_async in (False, True):
+            llm = ScriptedLLM()
+            agent = make_agent(llm)
+            if use_async:
+                result = asyncio.run(agent.arun('질문'))
+            else:
+                result = agent.run('질문')
+            transcripts.append((result, [(type(m).__name__, m.content) for m in llm.received[-1]]))
+        return transcripts
+
+    for make_agent in (
+        lambda llm: ALMAgent(llm, list(make_tools(threading.Barrier(2), []).values()), verbose=False),
+        lambda llm: ReadAgent(llm, list(make_tools(threading.Barrier(2), []).values())),
+    ):
+        sync, async_ = run_both(make_agent)
+        assert sync == async_
+        # 두 read 결과가 ToolMessage로 대화에 추가됨
+        assert [content for kind, content in sync[1] if kind == 'ToolMessage'] == ['read USD', 'read EUR']